@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+ipcalc API client
+
+Async client for the service in main.py. Every request goes through one
+pooled httpx.AsyncClient, so a batch reuses keep-alive connections instead of
+opening one per call:
+
+    async with IpcalcClient('http://localhost:8000') as client:
+        main_tf = await client.generate('aws', cidr='10.0.0.0/16', subnets=4, format='terraform')
+        documents = await client.generate_many([
+            {'provider': 'azure', 'cidr': '10.0.0.0/16', 'subnets': 4, 'format': 'terraform'},
+            {'provider': 'gcp', 'cidr': '10.1.0.0/16', 'subnets': 2, 'format': ['terraform', 'gcloud']},
+        ])
+        await client.download('aws', 'aws.zip', cidr='10.0.0.0/16', subnets=4, format='terraform,cli',
+                              archive='zip')
+
+generate_many runs at most `concurrency` requests at a time. Generated
+documents are kept by URL with their ETag and revalidated with If-None-Match,
+so repeating a request costs a 304 without a body. 5xx responses and
+transport errors are retried with exponential backoff. download streams the
+body to a temporary file and renames it into place when complete.
+
+Tests and scripts can run the client against the app in-process, without a
+server:
+
+    IpcalcClient(transport=httpx.ASGITransport(app=app))
+
+Requires httpx (pip install httpx).
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import Any, TypeVar
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+DEFAULT_BASE_URL = 'http://localhost:8000'
+
+# Generated documents kept for revalidation, per client
+CACHE_SIZE = 1024
+
+T = TypeVar('T')
+
+
+class APIError(Exception):
+    """An error response of the service, with the detail of its Problem Details body."""
+
+    def __init__(self, status: int, detail: str):
+        super().__init__(f'{status}: {detail}')
+        self.status = status
+        self.detail = detail
+
+
+def _query(params: Mapping[str, Any]) -> dict[str, str]:
+    """Query parameters from keyword arguments: spoke_cidrs -> spoke-cidrs, lists comma-separated, None dropped."""
+    query = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        elif isinstance(value, (list, tuple)):
+            value = ','.join(str(item) for item in value)
+        query[name.replace('_', '-')] = str(value)
+    return query
+
+
+def _raise_for_status(response: 'httpx.Response') -> None:
+    """Raise APIError for a 4xx/5xx response."""
+    if response.status_code < 400:
+        return
+    try:
+        detail = str(response.json()['detail'])
+    except (ValueError, KeyError, TypeError):
+        detail = response.text or response.reason_phrase
+    raise APIError(response.status_code, detail)
+
+
+class IpcalcClient:
+    """
+    Async client for the ipcalc API.
+
+    Args:
+        base_url: URL of the service
+        concurrency: Most requests generate_many runs at a time
+        max_connections: Size of the connection pool (default: concurrency)
+        retries: Retries of a request that fails with a 5xx response or a transport error
+        backoff: Delay before the first retry in seconds, doubled for each further retry
+        timeout: Timeout of each request in seconds
+        cache_size: Most documents kept for ETag revalidation (0 disables the cache)
+        transport: httpx transport, e.g. httpx.ASGITransport(app=app) to call the app in-process
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        *,
+        concurrency: int = 8,
+        max_connections: int | None = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
+        cache_size: int = CACHE_SIZE,
+        transport: 'httpx.AsyncBaseTransport | None' = None
+    ):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("IpcalcClient requires httpx. Install it with: pip install httpx")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        pool_size = max_connections or concurrency
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            transport=transport,
+        )
+        self._concurrency = concurrency
+        self._retries = retries
+        self._backoff = backoff
+        self._cache: 'OrderedDict[str, httpx.Response]' = OrderedDict()
+        self._cache_size = cache_size
+
+    async def __aenter__(self) -> 'IpcalcClient':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._client.aclose()
+
+    async def _retrying(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run request, retrying 5xx errors and transport errors with exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                return await request()
+            except APIError as exc:
+                if exc.status < 500 or attempt == self._retries:
+                    raise
+            except httpx.TransportError:
+                if attempt == self._retries:
+                    raise
+            await asyncio.sleep(self._backoff * 2 ** attempt)
+            attempt += 1
+
+    async def _get(self, path: str, query: dict[str, str]) -> 'httpx.Response':
+        """GET path, revalidating a cached response with If-None-Match and caching responses with an ETag."""
+        key = f'{path}?{httpx.QueryParams(sorted(query.items()))}'
+
+        async def request() -> 'httpx.Response':
+            cached = self._cache.get(key)
+            headers = {'If-None-Match': cached.headers['ETag']} if cached is not None else None
+            response = await self._client.get(path, params=query, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+            _raise_for_status(response)
+            if self._cache_size and 'ETag' in response.headers:
+                self._cache[key] = response
+                self._cache.move_to_end(key)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            return response
+
+        return await self._retrying(request)
+
+    async def generate(self, provider: str, **params: Any) -> str | dict[str, Any]:
+        """
+        Render a plan (GET /api/<provider>).
+
+        Args:
+            provider: azure, aws or gcp
+            **params: Query parameters, e.g. cidr, subnets, format, spoke_cidrs; underscores
+                become hyphens and lists are comma-separated
+
+        Returns:
+            The document of a single format; for several formats (or a CloudFormation
+            template split into nested stacks) the JSON object keyed by format
+
+        Raises:
+            APIError: If the service rejects the request, or still fails after the retries
+            ValueError: For archive requests (see download)
+        """
+        if params.get('archive'):
+            raise ValueError("Archives are streamed to a file: use download()")
+        response = await self._get(f'/api/{provider}', _query(params))
+        # A single document is sent as a file; several as one JSON object
+        if 'Content-Disposition' in response.headers:
+            return response.text
+        return response.json()
+
+    async def generate_many(
+        self,
+        specs: Iterable[Mapping[str, Any]],
+        return_exceptions: bool = False
+    ) -> list[Any]:
+        """
+        Render many plans over the pooled connections, at most `concurrency` at a time.
+
+        Args:
+            specs: generate() keyword arguments per plan, each with its 'provider'
+            return_exceptions: Return the exception of a failed plan in its place instead
+                of raising it
+
+        Returns:
+            generate() results, in the order of specs
+
+        Raises:
+            APIError: The first failure, unless return_exceptions; no further plans are started
+        """
+        specs = list(specs)
+        results: list[Any] = [None] * len(specs)
+        failures: list[BaseException] = []
+        pending = iter(enumerate(specs))
+
+        async def worker() -> None:
+            for idx, spec in pending:
+                if failures:
+                    return
+                params = dict(spec)
+                try:
+                    results[idx] = await self.generate(params.pop('provider'), **params)
+                except Exception as exc:
+                    if not return_exceptions:
+                        failures.append(exc)
+                        return
+                    results[idx] = exc
+
+        await asyncio.gather(*(worker() for _ in range(min(self._concurrency, len(specs)))))
+        if failures:
+            raise failures[0]
+        return results
+
+    async def download(self, provider: str, path: str, **params: Any) -> str:
+        """
+        Stream a rendered document or archive (archive='zip' or 'tar.gz') to a file.
+
+        The body is written to a temporary file next to path as it arrives and
+        renamed over path when complete, so path never holds a partial download.
+
+        Args:
+            provider: azure, aws or gcp
+            path: File to write
+            **params: Query parameters, as for generate()
+
+        Returns:
+            path
+
+        Raises:
+            APIError: If the service rejects the request, or still fails after the retries
+        """
+        query = _query(params)
+        tmp_path = os.path.join(os.path.dirname(path), f'.{os.path.basename(path)}.{os.getpid()}.tmp')
+
+        async def request() -> str:
+            async with self._client.stream('GET', f'/api/{provider}', params=query) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    _raise_for_status(response)
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        async for chunk in response.aiter_bytes():
+                            f.write(chunk)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            return path
+
+        return await self._retrying(request)
+
+    async def lookup(self, provider: str, ip: str | list[str], **params: Any) -> list[dict[str, Any]]:
+        """
+        Resolve IPs to the subnets of a plan (GET /api/lookup).
+
+        Args:
+            provider: Cloud provider of the plan
+            ip: Address, or list of addresses
+            **params: Plan parameters: cidr, subnets, subnet_prefix, spoke_cidrs, spoke_subnets
+
+        Returns:
+            One result per address
+        """
+        response = await self._get('/api/lookup', _query(dict(params, provider=provider, ip=ip)))
+        return response.json()['results']
+
+    async def provider_rules(self, provider: str) -> dict[str, Any]:
+        """Address limits, reserved IPs, quotas, regions and zones of a provider (GET /api/providers/<provider>)."""
+        response = await self._get(f'/api/providers/{provider}', {})
+        return response.json()
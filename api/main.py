@@ -6,9 +6,21 @@ Exposes IaC code generation via HTTP so users can curl the output directly:
   curl "https://example.com/api/azure?cidr=10.0.0.0/16&subnets=4&format=terraform" > main.tf
   curl "https://example.com/api/aws?cidr=10.0.0.0/16&subnets=4&format=terraform" > main.tf
   curl "https://example.com/api/gcp?cidr=10.0.0.0/16&subnets=4&format=terraform" > main.tf
+
+A comma-separated format renders every format from one calculation and
+returns them as a JSON object keyed by format:
+  curl "https://example.com/api/aws?cidr=10.0.0.0/16&subnets=4&format=terraform,cloudformation"
+
+archive=zip or archive=tar.gz streams them as an archive instead, with the plan:
+  curl "https://example.com/api/aws?cidr=10.0.0.0/16&subnets=4&format=terraform,cli&archive=zip" > aws.zip
+
+Generated documents carry an ETag; a request whose If-None-Match names it gets
+304 Not Modified. client.py is an async Python client for this service.
 """
 
+import hashlib
 import ipaddress
+import itertools
 import logging
 import os
 import re
@@ -18,7 +30,7 @@ from http import HTTPStatus
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -29,9 +41,14 @@ _SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'skills', 'ipcalc-f
 _TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), '..', 'skills', 'ipcalc-for-cloud', 'templates')
 sys.path.insert(0, os.path.abspath(_SCRIPTS_DIR))
 
-from ipcalc import calculate_subnets, generate_hub_spoke_topology  # noqa: E402
-from template_processor import process_template  # noqa: E402
+from bundle import ARCHIVE_FORMATS, stream_archive  # noqa: E402
+from ipcalc import (  # noqa: E402
+    calculate_subnets, check_outputs, generate_hub_spoke_topology, render_nested_stacks, render_outputs
+)
+from network_ir import NetworkPlan, build_plan  # noqa: E402
 from diagram_generator import AzureDiagramGenerator  # noqa: E402
+from cloud_provider_config import CLOUD_PROVIDERS, get_catalogue_entry  # noqa: E402
+from subnet_lookup import SubnetLookup  # noqa: E402
 
 TEMPLATES_DIR = os.path.abspath(_TEMPLATES_DIR)
 _ICONS_DIR = os.path.join(os.path.dirname(__file__), 'icons')
@@ -39,6 +56,7 @@ _ICONS_DIR = os.path.join(os.path.dirname(__file__), 'icons')
 # Content-type and suggested filename per output format
 AZURE_FORMAT_CONFIG: dict[str, tuple[str, str]] = {
     'terraform':      ('text/plain',         'main.tf'),
+    'terraform-json': ('application/json',   'main.tf.json'),
     'cli':            ('text/x-shellscript', 'deploy.sh'),
     'bicep':          ('text/plain',         'main.bicep'),
     'arm':            ('application/json',   'azuredeploy.json'),
@@ -48,14 +66,17 @@ AZURE_FORMAT_CONFIG: dict[str, tuple[str, str]] = {
 }
 
 AWS_FORMAT_CONFIG: dict[str, tuple[str, str]] = {
-    'terraform':      ('text/plain',         'main.tf'),
-    'cli':            ('text/x-shellscript', 'deploy.sh'),
-    'cloudformation': ('text/plain',         'template.yaml'),
+    'terraform':           ('text/plain',         'main.tf'),
+    'terraform-json':      ('application/json',   'main.tf.json'),
+    'cli':                 ('text/x-shellscript', 'deploy.sh'),
+    'cloudformation':      ('text/plain',         'template.yaml'),
+    'cloudformation-json': ('application/json',   'template.json'),
 }
 
 GCP_FORMAT_CONFIG: dict[str, tuple[str, str]] = {
-    'terraform': ('text/plain',         'main.tf'),
-    'gcloud':    ('text/x-shellscript', 'deploy.sh'),
+    'terraform':      ('text/plain',         'main.tf'),
+    'terraform-json': ('application/json',   'main.tf.json'),
+    'gcloud':         ('text/x-shellscript', 'deploy.sh'),
 }
 
 # RFC 9457 — Problem Details for HTTP APIs
@@ -87,6 +108,8 @@ def _problem(status: int, detail: str) -> JSONResponse:
 _MAX_SPOKE_COUNT = 10
 _CIDR_MAX_LEN = 18       # "255.255.255.255/32"
 _SPOKE_LIST_MAX_LEN = (_CIDR_MAX_LEN + 1) * _MAX_SPOKE_COUNT  # ~190 chars
+_MAX_LOOKUP_IPS = 100
+_IP_LIST_MAX_LEN = 16 * _MAX_LOOKUP_IPS  # "255.255.255.255,"
 
 
 # ---------------------------------------------------------------------------
@@ -193,6 +216,160 @@ def _parse_spoke_subnets(raw: str, expected_count: int) -> list[int]:
     return counts
 
 
+def _parse_formats(raw: str, format_config: dict[str, tuple[str, str]]) -> list[str]:
+    """Parse and validate a format, or a comma-separated list of formats."""
+    formats = [f.strip() for f in raw.split(',') if f.strip()]
+    invalid = [f for f in formats if f not in format_config]
+    if not formats or invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Invalid format '{invalid[0] if invalid else raw}'. "
+                f"Supported formats: {', '.join(format_config)}."
+            ),
+        )
+    if len(set(formats)) != len(formats):
+        raise HTTPException(status_code=400, detail=f"'format' lists a format more than once: {raw}.")
+    return formats
+
+
+def _parse_archive(raw: str | None) -> str | None:
+    """Validate the archive format of a bundle request."""
+    if raw is not None and raw not in ARCHIVE_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid archive '{raw}'. Supported archives: {', '.join(ARCHIVE_FORMATS)}.",
+        )
+    return raw
+
+
+def _archive_response(
+    plan: NetworkPlan,
+    formats: list[str],
+    format_config: dict[str, tuple[str, str]],
+    documents: dict[str, str],
+    compact: bool,
+    minify: bool,
+    archive: str,
+) -> StreamingResponse:
+    """Stream the requested formats, CloudFormation nested stacks and the JSON plan as one archive.
+
+    Each file is rendered as it is added to the archive, so the archive is never
+    held in memory. Every format is checked against the plan (check_outputs) and
+    the first chunk is produced before the response starts, so plan errors still
+    return Problem Details; an unexpected error in a later file ends the stream
+    with a truncated archive.
+    """
+    def files():
+        for f in formats:
+            content = documents[f] if f in documents else render_outputs(plan, [f], TEMPLATES_DIR, compact, minify)[f]
+            yield format_config[f][1], content
+        if 'cloudformation' in formats:
+            yield from render_nested_stacks(plan, TEMPLATES_DIR).items()
+        yield 'plan.json', render_outputs(plan, ['json'], TEMPLATES_DIR, minify=minify)['json']
+
+    chunks = stream_archive(files(), archive)
+    try:
+        check_outputs(plan, [f for f in formats if f not in documents], compact)
+        first = next(chunks, b'')
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except (FileNotFoundError, NotImplementedError) as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+    return StreamingResponse(
+        itertools.chain([first], chunks),
+        media_type=ARCHIVE_FORMATS[archive],
+        headers={'Content-Disposition': f'attachment; filename="{plan.name_prefix}-{plan.provider}.{archive}"'},
+    )
+
+
+def _etag(body: bytes) -> str:
+    """Strong ETag of a generated document (outputs are a pure function of the query)."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header names etag (weak comparison, RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in tags or etag in tags
+
+
+def _render_response(
+    plan: NetworkPlan,
+    formats: list[str],
+    format_config: dict[str, tuple[str, str]],
+    documents: dict[str, str] | None = None,
+    compact: bool = False,
+    minify: bool = False,
+    archive: str | None = None,
+) -> Response:
+    """Render a plan in the requested formats.
+
+    One format returns the file itself; several return a JSON object mapping each
+    format to its filename, content type and content. documents holds formats
+    already rendered by the caller (Azure diagrams). compact selects the compact
+    loop-based layout of Terraform, Bicep and ARM; minify renders JSON formats on
+    one line without whitespace. A CloudFormation template
+    split into nested stacks is always returned as JSON, its entry carrying the
+    nested stacks under nestedStacks. archive (zip or tar.gz) streams every file
+    as one archive instead (_archive_response). Other responses carry an ETag of
+    their body.
+    """
+    documents = dict(documents or {})
+    if archive:
+        return _archive_response(plan, formats, format_config, documents, compact, minify, archive)
+    try:
+        documents.update(render_outputs(
+            plan, [f for f in formats if f not in documents], TEMPLATES_DIR, compact, minify
+        ))
+        nested_stacks = render_nested_stacks(plan, TEMPLATES_DIR) if 'cloudformation' in formats else {}
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except (FileNotFoundError, NotImplementedError) as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+    if len(formats) == 1 and not nested_stacks:
+        content_type, filename = format_config[formats[0]]
+        response: Response = Response(
+            content=documents[formats[0]],
+            media_type=content_type,
+            headers={'Content-Disposition': f'inline; filename="{filename}"'},
+        )
+    else:
+        content = {
+            f: {'filename': format_config[f][1], 'contentType': format_config[f][0], 'content': documents[f]}
+            for f in formats
+        }
+        if nested_stacks:
+            content['cloudformation']['nestedStacks'] = nested_stacks
+        response = JSONResponse(content=content)
+    response.headers['ETag'] = _etag(response.body)
+    return response
+
+
+def _parse_lookup_ips(raw: str) -> list[str]:
+    """Parse and validate a comma-separated list of IPv4 addresses."""
+    parts = [ip.strip() for ip in raw.split(',') if ip.strip()]
+    if not parts:
+        raise HTTPException(status_code=400, detail="'ip' must not be empty.")
+    if len(parts) > _MAX_LOOKUP_IPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many addresses: {len(parts)} provided, maximum is {_MAX_LOOKUP_IPS}.",
+        )
+    for i, ip in enumerate(parts):
+        try:
+            ipaddress.IPv4Address(ip)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"'ip[{i}]' value '{ip}' is not a valid IPv4 address, e.g. 10.0.1.4.",
+            )
+    return parts
+
+
 # ---------------------------------------------------------------------------
 # Application
 # ---------------------------------------------------------------------------
@@ -209,12 +386,23 @@ app.add_middleware(
 )
 
 
+@app.middleware('http')
+async def conditional_get(request: Request, call_next):
+    """Answer 304 Not Modified when If-None-Match names the ETag of the response."""
+    response = await call_next(request)
+    etag = response.headers.get('ETag')
+    if etag and _etag_matches(request.headers.get('If-None-Match'), etag):
+        return Response(status_code=304, headers={'ETag': etag})
+    return response
+
+
 @app.middleware('http')
 async def add_security_headers(request: Request, call_next):
     response = await call_next(request)
     response.headers['X-Content-Type-Options'] = 'nosniff'
     response.headers['X-Frame-Options'] = 'DENY'
-    response.headers['Cache-Control'] = 'no-store'
+    # Documents with an ETag may be kept by clients, but must be revalidated
+    response.headers['Cache-Control'] = 'no-cache' if 'ETag' in response.headers else 'no-store'
     return response
 
 
@@ -255,20 +443,17 @@ def generate_azure(
     request: Request,
     cidr: str = Query(..., max_length=_CIDR_MAX_LEN, description='Hub VNet CIDR, e.g. 10.0.0.0/16'),
     subnets: int = Query(..., ge=1, le=256, description='Number of subnets'),
-    format: str = Query(..., description='Output format: terraform, cli, bicep, arm, powershell'),
+    format: str = Query(..., description='Output format: terraform, terraform-json, cli, bicep, arm, powershell, d2, svg, or a comma-separated list'),
     subnet_prefix: int | None = Query(None, alias='subnet-prefix', ge=1, le=32, description='Optional desired subnet prefix, e.g. 26 for /26'),
     prefix: str | None = Query(None, max_length=32, description='Prefix for resource naming, e.g. myapp'),
+    compact: bool = Query(False, description='Terraform, Bicep and ARM: subnets as one map or array parameter deployed by loops'),
+    minify: bool = Query(False, description='JSON formats: one line without whitespace'),
+    archive: str | None = Query(None, description='zip or tar.gz: stream the formats and the JSON plan as one archive'),
     spoke_cidrs: str | None = Query(None, alias='spoke-cidrs', max_length=_SPOKE_LIST_MAX_LEN, description='Comma-separated spoke VNet CIDRs'),
     spoke_subnets: str | None = Query(None, alias='spoke-subnets', max_length=64, description='Comma-separated spoke subnet counts'),
 ) -> Response:
-    if format not in AZURE_FORMAT_CONFIG:
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                f"Invalid format '{format}'. "
-                f"Supported formats: {', '.join(AZURE_FORMAT_CONFIG)}."
-            ),
-        )
+    formats = _parse_formats(format, AZURE_FORMAT_CONFIG)
+    archive = _parse_archive(archive)
 
     cidr = _validate_cidr(cidr)
     if prefix is not None:
@@ -289,68 +474,42 @@ def generate_azure(
         result = generate_hub_spoke_topology(
             cidr, subnets, spoke_cidrs_list, spoke_subnets_list, 'azure', subnet_prefix
         )
-        if 'error' in result:
-            raise HTTPException(status_code=400, detail=result['error'])
-        hub_subnets = result['hub']['subnets']
-        spoke_vnets = result['spokes']
     else:
         result = calculate_subnets(cidr, subnets, 'azure', subnet_prefix)
-        if 'error' in result:
-            raise HTTPException(status_code=400, detail=result['error'])
-        hub_subnets = result['subnets']
-        spoke_vnets = []
-
-    data = {
-        'vnetCidr': cidr,
-        'subnets': hub_subnets,
-        'peeringEnabled': len(spoke_vnets) > 0,
-        'spokeVNets': spoke_vnets,
-        **(({'namePrefix': prefix}) if prefix else {}),
-    }
-
-    if format in ('d2', 'svg'):
+    if 'error' in result:
+        raise HTTPException(status_code=400, detail=result['error'])
+    plan = build_plan('azure', cidr, result, prefix or 'ipcalc')
+
+    # Diagrams are not templates: render them here and the rest from the plan
+    diagrams: dict[str, str] = {}
+    if 'd2' in formats or 'svg' in formats:
         icon_base_url = f"{request.base_url}api/icons"
         generator = AzureDiagramGenerator(icon_base_url=icon_base_url)
-        d2_source = generator.generate(data)
-        if format == 'svg':
+        diagrams['d2'] = generator.generate(plan.template_data())
+        if 'svg' in formats:
             try:
-                code = generator.render_svg(d2_source)
+                diagrams['svg'] = generator.render_svg(diagrams['d2'])
             except FileNotFoundError:
                 raise HTTPException(status_code=500, detail="D2 CLI is not installed on this server.")
             except Exception as exc:
                 raise HTTPException(status_code=500, detail=f"D2 rendering failed: {exc}")
-        else:
-            code = d2_source
-    else:
-        try:
-            code = process_template('azure', format, data, TEMPLATES_DIR)
-        except (FileNotFoundError, NotImplementedError) as exc:
-            raise HTTPException(status_code=500, detail=str(exc))
-
-    content_type, filename = AZURE_FORMAT_CONFIG[format]
-    return Response(
-        content=code,
-        media_type=content_type,
-        headers={'Content-Disposition': f'inline; filename="{filename}"'},
-    )
+
+    return _render_response(plan, formats, AZURE_FORMAT_CONFIG, diagrams, compact, minify, archive)
 
 
 @app.get('/api/aws', summary='Generate AWS IaC code')
 def generate_aws(
     cidr: str = Query(..., max_length=_CIDR_MAX_LEN, description='VPC CIDR, e.g. 10.0.0.0/16'),
     subnets: int = Query(..., ge=1, le=256, description='Number of subnets'),
-    format: str = Query(..., description='Output format: terraform, cli, cloudformation'),
+    format: str = Query(..., description='Output format: terraform, terraform-json, cli, cloudformation, cloudformation-json, or a comma-separated list'),
     subnet_prefix: int | None = Query(None, alias='subnet-prefix', ge=1, le=32, description='Optional desired subnet prefix, e.g. 24 for /24'),
     prefix: str | None = Query(None, max_length=32, description='Prefix for resource naming, e.g. myapp'),
+    compact: bool = Query(False, description='Terraform: one subnet map variable and for_each resources keyed by CIDR'),
+    minify: bool = Query(False, description='JSON formats: one line without whitespace'),
+    archive: str | None = Query(None, description='zip or tar.gz: stream the formats and the JSON plan as one archive'),
 ) -> Response:
-    if format not in AWS_FORMAT_CONFIG:
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                f"Invalid format '{format}'. "
-                f"Supported formats: {', '.join(AWS_FORMAT_CONFIG)}."
-            ),
-        )
+    formats = _parse_formats(format, AWS_FORMAT_CONFIG)
+    archive = _parse_archive(archive)
 
     cidr = _validate_cidr(cidr)
     if prefix is not None:
@@ -360,43 +519,25 @@ def generate_aws(
     if 'error' in result:
         raise HTTPException(status_code=400, detail=result['error'])
 
-    data = {
-        'vpcCidr': cidr,
-        'subnets': result['subnets'],
-        **(({'namePrefix': prefix}) if prefix else {}),
-    }
-
-    try:
-        code = process_template('aws', format, data, TEMPLATES_DIR)
-    except (FileNotFoundError, NotImplementedError) as exc:
-        raise HTTPException(status_code=500, detail=str(exc))
-
-    content_type, filename = AWS_FORMAT_CONFIG[format]
-    return Response(
-        content=code,
-        media_type=content_type,
-        headers={'Content-Disposition': f'inline; filename="{filename}"'},
-    )
+    plan = build_plan('aws', cidr, result, prefix or 'ipcalc')
+    return _render_response(plan, formats, AWS_FORMAT_CONFIG, compact=compact, minify=minify, archive=archive)
 
 
 @app.get('/api/gcp', summary='Generate GCP IaC code')
 def generate_gcp(
     cidr: str = Query(..., max_length=_CIDR_MAX_LEN, description='Hub VPC CIDR, e.g. 10.0.0.0/16'),
     subnets: int = Query(..., ge=1, le=256, description='Number of subnets'),
-    format: str = Query(..., description='Output format: terraform, gcloud'),
+    format: str = Query(..., description='Output format: terraform, terraform-json, gcloud, or a comma-separated list'),
     subnet_prefix: int | None = Query(None, alias='subnet-prefix', ge=1, le=32, description='Optional desired subnet prefix, e.g. 24 for /24'),
     prefix: str | None = Query(None, max_length=32, description='Prefix for resource naming, e.g. myapp'),
+    compact: bool = Query(False, description='Terraform: one subnet map variable and for_each resources keyed by CIDR'),
+    minify: bool = Query(False, description='JSON formats: one line without whitespace'),
+    archive: str | None = Query(None, description='zip or tar.gz: stream the formats and the JSON plan as one archive'),
     spoke_cidrs: str | None = Query(None, alias='spoke-cidrs', max_length=_SPOKE_LIST_MAX_LEN, description='Comma-separated spoke VPC CIDRs'),
     spoke_subnets: str | None = Query(None, alias='spoke-subnets', max_length=64, description='Comma-separated spoke subnet counts'),
 ) -> Response:
-    if format not in GCP_FORMAT_CONFIG:
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                f"Invalid format '{format}'. "
-                f"Supported formats: {', '.join(GCP_FORMAT_CONFIG)}."
-            ),
-        )
+    formats = _parse_formats(format, GCP_FORMAT_CONFIG)
+    archive = _parse_archive(archive)
 
     cidr = _validate_cidr(cidr)
     if prefix is not None:
@@ -417,33 +558,67 @@ def generate_gcp(
         result = generate_hub_spoke_topology(
             cidr, subnets, spoke_cidrs_list, spoke_subnets_list, 'gcp', subnet_prefix
         )
-        if 'error' in result:
-            raise HTTPException(status_code=400, detail=result['error'])
-        hub_subnets = result['hub']['subnets']
-        spoke_vpcs = result['spokes']
     else:
         result = calculate_subnets(cidr, subnets, 'gcp', subnet_prefix)
-        if 'error' in result:
-            raise HTTPException(status_code=400, detail=result['error'])
-        hub_subnets = result['subnets']
-        spoke_vpcs = []
-
-    data = {
-        'vpcCidr': cidr,
-        'subnets': hub_subnets,
-        'peeringEnabled': len(spoke_vpcs) > 0,
-        'spokeVPCs': spoke_vpcs,
-        **(({'namePrefix': prefix}) if prefix else {}),
-    }
+    if 'error' in result:
+        raise HTTPException(status_code=400, detail=result['error'])
+
+    plan = build_plan('gcp', cidr, result, prefix or 'ipcalc')
+    return _render_response(plan, formats, GCP_FORMAT_CONFIG, compact=compact, minify=minify, archive=archive)
+
 
+@app.get('/api/providers/{provider}', summary='Get provider rules from the catalogue')
+def get_provider(provider: str):
+    """Return address limits, reserved IPs, IPv6 rules, default quotas, regions and zones."""
     try:
-        code = process_template('gcp', format, data, TEMPLATES_DIR)
-    except (FileNotFoundError, NotImplementedError) as exc:
-        raise HTTPException(status_code=500, detail=str(exc))
+        return get_catalogue_entry(provider)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
 
-    content_type, filename = GCP_FORMAT_CONFIG[format]
-    return Response(
-        content=code,
-        media_type=content_type,
-        headers={'Content-Disposition': f'inline; filename="{filename}"'},
-    )
+
+@app.get('/api/lookup', summary='Resolve IPs to the subnets of a plan')
+def lookup(
+    provider: str = Query(..., description='Cloud provider, e.g. azure'),
+    cidr: str = Query(..., max_length=_CIDR_MAX_LEN, description='Hub VNet/VPC CIDR, e.g. 10.0.0.0/16'),
+    subnets: int = Query(..., ge=1, le=256, description='Number of subnets'),
+    ip: str = Query(..., max_length=_IP_LIST_MAX_LEN, description='Comma-separated IPv4 addresses to resolve'),
+    subnet_prefix: int | None = Query(None, alias='subnet-prefix', ge=1, le=32, description='Optional desired subnet prefix, e.g. 24 for /24'),
+    spoke_cidrs: str | None = Query(None, alias='spoke-cidrs', max_length=_SPOKE_LIST_MAX_LEN, description='Comma-separated spoke VNet/VPC CIDRs'),
+    spoke_subnets: str | None = Query(None, alias='spoke-subnets', max_length=64, description='Comma-separated spoke subnet counts'),
+):
+    """Return the subnet, VNet/VPC and zone owning each address."""
+    provider = provider.lower()
+    if provider not in CLOUD_PROVIDERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid provider '{provider}'. Supported providers: {', '.join(CLOUD_PROVIDERS)}.",
+        )
+
+    cidr = _validate_cidr(cidr)
+    ips = _parse_lookup_ips(ip)
+
+    if spoke_cidrs:
+        if provider not in ('azure', 'gcp'):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Hub-spoke topology is only supported for azure and gcp, not {provider}.",
+            )
+        spoke_cidrs_list = _parse_spoke_cidrs(spoke_cidrs)
+        spoke_subnets_list = (
+            _parse_spoke_subnets(spoke_subnets, len(spoke_cidrs_list))
+            if spoke_subnets
+            else [2] * len(spoke_cidrs_list)
+        )
+        result = generate_hub_spoke_topology(
+            cidr, subnets, spoke_cidrs_list, spoke_subnets_list, provider, subnet_prefix
+        )
+    else:
+        result = calculate_subnets(cidr, subnets, provider, subnet_prefix)
+    if 'error' in result:
+        raise HTTPException(status_code=400, detail=result['error'])
+
+    try:
+        index = SubnetLookup(result, cidr)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {'results': [index.lookup(address) for address in ips]}
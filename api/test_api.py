@@ -6,6 +6,11 @@ Run with:
   cd api && python -m pytest test_api.py -v
 """
 
+import io
+import json
+import tarfile
+import zipfile
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -269,6 +274,13 @@ class TestAws:
         assert resp.status_code == 200
         assert 'AWS::EC2::VPC' in resp.text
 
+    def test_cloudformation_nested_stacks(self):
+        resp = client.get('/api/aws', params={'cidr': '10.0.0.0/8', 'subnets': 256, 'format': 'cloudformation'})
+        assert resp.status_code == 200
+        entry = resp.json()['cloudformation']
+        assert entry['content'].count('AWS::CloudFormation::Stack') == 3
+        assert list(entry['nestedStacks']) == ['stacks/subnets-1.yaml', 'stacks/subnets-2.yaml', 'stacks/subnets-3.yaml']
+
     def test_cli(self):
         resp = client.get('/api/aws', params={'cidr': '10.0.0.0/16', 'subnets': 2, 'format': 'cli'})
         assert resp.status_code == 200
@@ -295,6 +307,163 @@ class TestAws:
         assert 'prefix' in body['detail']
 
 
+# ---------------------------------------------------------------------------
+# Several formats from one calculation
+# ---------------------------------------------------------------------------
+
+class TestMultiFormat:
+    def test_formats_match_single_requests(self):
+        params = {'cidr': '10.0.0.0/16', 'subnets': 3, 'spoke-cidrs': '10.1.0.0/16', 'format': 'terraform,gcloud'}
+        resp = client.get('/api/gcp', params=params)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert list(body) == ['terraform', 'gcloud']
+        assert body['gcloud']['filename'] == 'deploy.sh'
+        assert body['gcloud']['contentType'] == 'text/x-shellscript'
+        single = client.get('/api/gcp', params=dict(params, format='terraform'))
+        assert body['terraform']['content'] == single.text
+
+    def test_azure_templates_and_diagram(self):
+        resp = client.get('/api/azure', params={'cidr': '10.0.0.0/16', 'subnets': 2, 'format': 'bicep,d2'})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert 'Microsoft.Network/virtualNetworks' in body['bicep']['content']
+        assert 'direction' in body['d2']['content']
+
+    def test_invalid_format_in_list(self):
+        resp = client.get('/api/aws', params={'cidr': '10.0.0.0/16', 'subnets': 2, 'format': 'terraform,bicep'})
+        body = assert_problem(resp, 400)
+        assert "'bicep'" in body['detail']
+
+    def test_duplicate_format(self):
+        resp = client.get('/api/aws', params={'cidr': '10.0.0.0/16', 'subnets': 2, 'format': 'cli,cli'})
+        assert_problem(resp, 400)
+
+
+class TestCompactTerraform:
+    def test_for_each_over_subnet_map(self):
+        resp = client.get('/api/aws', params={'cidr': '10.0.0.0/16', 'subnets': 64, 'format': 'terraform', 'compact': 'true'})
+        assert resp.status_code == 200
+        assert resp.text.count('resource "aws_subnet"') == 1
+        assert 'for_each = var.subnets' in resp.text
+        assert '"10-0-252-0-22" = { cidr = "10.0.252.0/22", zone = 63 }' in resp.text
+
+    def test_spokes(self):
+        resp = client.get('/api/azure', params={'cidr': '10.0.0.0/16', 'subnets': 2, 'format': 'terraform',
+                                                'spoke-cidrs': '10.1.0.0/16', 'compact': 'true'})
+        assert resp.status_code == 200
+        assert 'azurerm_virtual_network.spoke[each.key].id' in resp.text
+
+    def test_arm_copy_loops(self):
+        resp = client.get('/api/azure', params={'cidr': '10.0.0.0/16', 'subnets': 64, 'format': 'arm', 'compact': 'true'})
+        assert resp.status_code == 200
+        template = resp.json()
+        assert len(template['resources']) == 1
+        assert len(template['parameters']['subnets']['defaultValue']) == 64
+
+
+class TestTerraformJson:
+    def test_resource_graph(self):
+        resp = client.get('/api/gcp', params={'cidr': '10.0.0.0/16', 'subnets': 2, 'format': 'terraform-json',
+                                              'spoke-cidrs': '10.1.0.0/16,10.2.0.0/16'})
+        assert resp.status_code == 200
+        assert resp.headers['content-type'].startswith('application/json')
+        resources = resp.json()['resource']
+        assert list(resources['google_compute_subnetwork'])[:2] == ['subnet1', 'subnet2']
+        assert resources['google_compute_network_peering']['hub_to_spoke2']['depends_on'] == [
+            'google_compute_network_peering.spoke1_to_hub'
+        ]
+
+
+class TestJsonDocuments:
+    def test_minified_arm(self):
+        params = {'cidr': '10.0.0.0/16', 'subnets': 4, 'format': 'arm'}
+        pretty = client.get('/api/azure', params=params)
+        minified = client.get('/api/azure', params=dict(params, minify='true'))
+        assert minified.status_code == 200
+        assert '\n' not in minified.text and len(minified.text) < len(pretty.text)
+        assert minified.json() == pretty.json()
+
+    def test_cloudformation_json(self):
+        resp = client.get('/api/aws', params={'cidr': '10.0.0.0/16', 'subnets': 4, 'format': 'cloudformation-json'})
+        assert resp.status_code == 200
+        template = resp.json()
+        assert template['Resources']['Subnet4']['Properties']['CidrBlock'] == {'Ref': 'Subnet4Cidr'}
+        assert template['Parameters']['Prefix']['Default'] == 'ipcalc'
+
+    def test_cloudformation_json_over_quotas(self):
+        resp = client.get('/api/aws', params={'cidr': '10.0.0.0/16', 'subnets': 256, 'format': 'cloudformation-json'})
+        assert resp.status_code == 400
+        assert 'nested stacks' in resp.json()['detail']
+
+
+class TestArchive:
+    def test_zip(self):
+        resp = client.get('/api/azure', params={'cidr': '10.0.0.0/16', 'subnets': 2, 'format': 'terraform,cli,arm',
+                                                'spoke-cidrs': '10.1.0.0/16', 'archive': 'zip'})
+        assert resp.status_code == 200
+        assert resp.headers['content-type'] == 'application/zip'
+        assert 'filename="ipcalc-azure.zip"' in resp.headers['content-disposition']
+        archive = zipfile.ZipFile(io.BytesIO(resp.content))
+        assert archive.namelist() == ['main.tf', 'deploy.sh', 'azuredeploy.json', 'plan.json']
+        assert json.loads(archive.read('plan.json'))['provider'] == 'azure'
+
+    def test_tar_gz_with_nested_stacks(self):
+        resp = client.get('/api/aws', params={'cidr': '10.0.0.0/16', 'subnets': 256, 'format': 'cloudformation',
+                                              'archive': 'tar.gz'})
+        assert resp.status_code == 200
+        assert resp.headers['content-type'] == 'application/gzip'
+        names = tarfile.open(fileobj=io.BytesIO(resp.content)).getnames()
+        assert names[0] == 'template.yaml' and names[-1] == 'plan.json'
+        assert 'stacks/subnets-1.yaml' in names
+
+    def test_invalid_archive(self):
+        resp = client.get('/api/gcp', params={'cidr': '10.0.0.0/16', 'subnets': 2, 'format': 'terraform', 'archive': 'rar'})
+        assert resp.status_code == 400
+
+    def test_render_error(self):
+        resp = client.get('/api/aws', params={'cidr': '10.0.0.0/16', 'subnets': 256, 'format': 'cloudformation-json',
+                                              'archive': 'zip'})
+        assert resp.status_code == 400
+
+    def test_later_format_error_before_streaming(self):
+        resp = client.get('/api/aws', params={'cidr': '10.0.0.0/12', 'subnets': 250,
+                                              'format': 'terraform,cloudformation-json', 'archive': 'zip'})
+        assert resp.status_code == 400
+        assert resp.headers['content-type'] == 'application/problem+json'
+        assert 'nested stacks' in resp.json()['detail']
+
+
+class TestConditionalGet:
+    PARAMS = {'cidr': '10.0.0.0/16', 'subnets': 2, 'format': 'terraform'}
+
+    def test_etag_and_not_modified(self):
+        resp = client.get('/api/gcp', params=self.PARAMS)
+        etag = resp.headers['etag']
+        assert resp.headers['cache-control'] == 'no-cache'
+        again = client.get('/api/gcp', params=self.PARAMS, headers={'If-None-Match': f'"other", W/{etag}'})
+        assert again.status_code == 304
+        assert again.content == b''
+        assert again.headers['etag'] == etag
+
+    def test_etag_follows_content(self):
+        etag = client.get('/api/gcp', params=self.PARAMS).headers['etag']
+        resp = client.get('/api/gcp', params=dict(self.PARAMS, subnets=3), headers={'If-None-Match': etag})
+        assert resp.status_code == 200
+        assert resp.headers['etag'] != etag
+
+    def test_multi_format_etag(self):
+        params = dict(self.PARAMS, format='terraform,gcloud')
+        etag = client.get('/api/gcp', params=params).headers['etag']
+        assert client.get('/api/gcp', params=params, headers={'If-None-Match': etag}).status_code == 304
+
+    def test_no_etag_on_archives_and_errors(self):
+        assert 'etag' not in client.get('/api/gcp', params=dict(self.PARAMS, archive='zip')).headers
+        resp = client.get('/api/gcp', params=dict(self.PARAMS, format='bicep'))
+        assert 'etag' not in resp.headers
+        assert resp.headers['cache-control'] == 'no-store'
+
+
 # ---------------------------------------------------------------------------
 # Azure – sanity checks (existing endpoint)
 # ---------------------------------------------------------------------------
@@ -402,3 +571,61 @@ class TestAzureD2:
             'spoke-subnets': '2',
         })
         assert '10.1.0.0/16' in resp.text
+
+
+# ---------------------------------------------------------------------------
+# Provider catalogue
+# ---------------------------------------------------------------------------
+
+class TestProviders:
+    def test_provider_rules(self):
+        resp = client.get('/api/providers/aws')
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body['min_cidr_prefix'] == 28
+        assert body['quotas']['subnets_per_network'] == 200
+        assert body['regions']['eu-west-1'] == ['eu-west-1a', 'eu-west-1b', 'eu-west-1c']
+        assert 'catalogueVersion' in body
+
+    def test_unknown_provider(self):
+        resp = client.get('/api/providers/mars')
+        body = assert_problem(resp, 404)
+        assert 'mars' in body['detail']
+
+
+class TestLookup:
+    def test_hub_spoke_lookup(self):
+        resp = client.get('/api/lookup', params={
+            'provider': 'azure', 'cidr': '10.0.0.0/16', 'subnets': 3,
+            'spoke-cidrs': '10.1.0.0/16', 'ip': '10.1.200.1,10.0.250.1,8.8.8.8',
+        })
+        assert resp.status_code == 200
+        spoke, hub_gap, outside = resp.json()['results']
+        assert spoke['subnet'] == '10.1.128.0/17'
+        assert spoke['network'] == 'spoke1'
+        assert spoke['zone'] == '2'
+        assert hub_gap == {'ip': '10.0.250.1', 'matched': False, 'network': 'hub', 'networkCidr': '10.0.0.0/16'}
+        assert outside == {'ip': '8.8.8.8', 'matched': False}
+
+    def test_single_network_lookup(self):
+        resp = client.get('/api/lookup', params={
+            'provider': 'aws', 'cidr': '10.0.0.0/16', 'subnets': 4, 'ip': '10.0.64.10',
+        })
+        assert resp.status_code == 200
+        result = resp.json()['results'][0]
+        assert result['subnet'] == '10.0.64.0/18'
+        assert result['zone'] == 'us-east-1b'
+
+    def test_invalid_ip(self):
+        resp = client.get('/api/lookup', params={
+            'provider': 'aws', 'cidr': '10.0.0.0/16', 'subnets': 4, 'ip': '10.0.0.300',
+        })
+        body = assert_problem(resp, 400)
+        assert '10.0.0.300' in body['detail']
+
+    def test_invalid_provider(self):
+        resp = client.get('/api/lookup', params={
+            'provider': 'mars', 'cidr': '10.0.0.0/16', 'subnets': 4, 'ip': '10.0.0.1',
+        })
+        assert_problem(resp, 400)
+
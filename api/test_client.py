@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for the async API client, run against the app in-process.
+
+Run with:
+  cd api && python -m pytest test_client.py -v
+"""
+
+import asyncio
+import os
+import zipfile
+
+import httpx
+import pytest
+
+from client import APIError, IpcalcClient
+from main import app
+
+PARAMS = {'cidr': '10.0.0.0/16', 'subnets': 2, 'format': 'terraform'}
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forward requests to the app and record the status of each response."""
+
+    def __init__(self):
+        self.transport = httpx.ASGITransport(app=app)
+        self.statuses = []
+
+    async def handle_async_request(self, request):
+        response = await self.transport.handle_async_request(request)
+        self.statuses.append(response.status_code)
+        return response
+
+
+def run(coroutine_function, **options):
+    """Run coroutine_function(client) with a client of the in-process app."""
+    async def main():
+        async with IpcalcClient(transport=options.pop('transport', None) or httpx.ASGITransport(app=app),
+                                **options) as ipcalc:
+            return await coroutine_function(ipcalc)
+    return asyncio.run(main())
+
+
+class TestGenerate:
+    def test_single_format(self):
+        document = run(lambda c: c.generate('azure', **PARAMS))
+        assert 'azurerm_virtual_network' in document
+
+    def test_several_formats_and_keyword_names(self):
+        documents = run(lambda c: c.generate('gcp', cidr='10.0.0.0/16', subnets=2, format=['terraform', 'gcloud'],
+                                              spoke_cidrs=['10.1.0.0/16'], minify=False))
+        assert list(documents) == ['terraform', 'gcloud']
+        assert 'spoke1_vpc' in documents['terraform']['content']
+
+    def test_problem_details_raise(self):
+        with pytest.raises(APIError) as exc_info:
+            run(lambda c: c.generate('aws', cidr='10.0.0.0/33', subnets=2, format='terraform'))
+        assert exc_info.value.status == 400
+        assert 'cidr' in exc_info.value.detail
+
+    def test_etag_revalidation(self):
+        transport = RecordingTransport()
+
+        async def twice(c):
+            return [await c.generate('aws', **PARAMS) for _ in range(2)]
+
+        first, second = run(twice, transport=transport)
+        assert first == second
+        assert transport.statuses == [200, 304]
+
+    def test_cache_disabled(self):
+        transport = RecordingTransport()
+
+        async def twice(c):
+            return [await c.generate('aws', **PARAMS) for _ in range(2)]
+
+        run(twice, transport=transport, cache_size=0)
+        assert transport.statuses == [200, 200]
+
+    def test_lookup_and_provider_rules(self):
+        results = run(lambda c: c.lookup('aws', ['10.0.0.10'], cidr='10.0.0.0/16', subnets=2))
+        assert (results[0]['ip'], results[0]['subnet']) == ('10.0.0.10', '10.0.0.0/17')
+        assert run(lambda c: c.provider_rules('aws'))['reserved_ip_count'] == 5
+
+
+class TestGenerateMany:
+    def test_results_in_order(self):
+        specs = [dict(PARAMS, provider='aws', subnets=n) for n in range(1, 9)]
+        documents = run(lambda c: c.generate_many(specs), concurrency=3)
+        assert [d.count('resource "aws_subnet"') for d in documents] == list(range(1, 9))
+
+    def test_bounded_concurrency(self):
+        in_flight = []
+        peak = []
+
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            return httpx.Response(200, text='ok', headers={'Content-Disposition': 'inline'})
+
+        specs = [dict(PARAMS, provider='aws', subnets=n) for n in range(1, 21)]
+        documents = run(lambda c: c.generate_many(specs), transport=httpx.MockTransport(handler), concurrency=4)
+        assert documents == ['ok'] * 20
+        assert max(peak) == 4
+
+    def test_failures(self):
+        specs = [dict(PARAMS, provider='aws'), dict(PARAMS, provider='aws', cidr='bad')]
+        results = run(lambda c: c.generate_many(specs, return_exceptions=True))
+        assert 'aws_vpc' in results[0]
+        assert isinstance(results[1], APIError)
+        with pytest.raises(APIError):
+            run(lambda c: c.generate_many(specs))
+
+
+class TestRetries:
+    def _flaky(self, failures, error=None):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) <= failures:
+                if error:
+                    raise error('connection reset', request=request)
+                return httpx.Response(503, json={'detail': 'unavailable'})
+            return httpx.Response(200, text='ok', headers={'Content-Disposition': 'inline'})
+        return calls, httpx.MockTransport(handler)
+
+    def test_retries_5xx(self):
+        calls, transport = self._flaky(2)
+        assert run(lambda c: c.generate('aws', **PARAMS), transport=transport, backoff=0) == 'ok'
+        assert len(calls) == 3
+
+    def test_retries_transport_errors(self):
+        calls, transport = self._flaky(1, httpx.ConnectError)
+        assert run(lambda c: c.generate('aws', **PARAMS), transport=transport, backoff=0) == 'ok'
+        assert len(calls) == 2
+
+    def test_gives_up(self):
+        calls, transport = self._flaky(5)
+        with pytest.raises(APIError) as exc_info:
+            run(lambda c: c.generate('aws', **PARAMS), transport=transport, backoff=0, retries=2)
+        assert exc_info.value.status == 503
+        assert len(calls) == 3
+
+    def test_4xx_is_not_retried(self):
+        transport = RecordingTransport()
+        with pytest.raises(APIError):
+            run(lambda c: c.generate('aws', cidr='bad', subnets=2, format='terraform'), transport=transport, backoff=0)
+        assert transport.statuses == [400]
+
+
+class TestDownload:
+    def test_archive(self, tmp_path):
+        path = str(tmp_path / 'aws.zip')
+        run(lambda c: c.download('aws', path, cidr='10.0.0.0/16', subnets=2, format='terraform,cli', archive='zip'))
+        assert zipfile.ZipFile(path).namelist() == ['main.tf', 'deploy.sh', 'plan.json']
+        assert os.listdir(tmp_path) == ['aws.zip']
+
+    def test_error_leaves_no_file(self, tmp_path):
+        path = str(tmp_path / 'aws.zip')
+        with pytest.raises(APIError):
+            run(lambda c: c.download('aws', path, cidr='10.0.0.0/16', subnets=2, format='bicep', archive='zip'))
+        assert os.listdir(tmp_path) == []
+
+    def test_archive_is_not_generated(self):
+        with pytest.raises(ValueError):
+            run(lambda c: c.generate('aws', **PARAMS, archive='zip'))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Arrow / Parquet Export
+
+Writes subnet plans as columnar Apache Arrow (IPC file) or Parquet data for
+loading into analytics engines such as DuckDB. One row per subnet:
+
+    provider      dictionary<string>   cloud provider
+    parent_cidr   string               VNet/VPC (or region block) holding the subnet
+    spoke_index   int32                0 for the hub / single network, n for spoke n
+    subnet_index  int32                1-based position within the parent
+    network       uint32               subnet network address as an integer
+    prefix        uint8                subnet prefix length
+    total_ips     int64
+    usable_ips    int64
+    zone          string               availability zone / region / domain ('' if none)
+
+Rows are produced by a generator and written in record batches, so memory
+stays bounded by the batch size. Requires pyarrow.
+"""
+
+import ipaddress
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from network_ir import plan_networks
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Output formats handled by this module (binary, file output only)
+EXPORT_FORMATS = ('arrow', 'parquet')
+
+# Rows per record batch
+DEFAULT_BATCH_SIZE = 65536
+
+COLUMNS = (
+    'provider', 'parent_cidr', 'spoke_index', 'subnet_index',
+    'network', 'prefix', 'total_ips', 'usable_ips', 'zone',
+)
+
+
+def plan_schema() -> 'pa.Schema':
+    """Arrow schema of exported subnet plans."""
+    return pa.schema([
+        ('provider', pa.dictionary(pa.int8(), pa.string())),
+        ('parent_cidr', pa.string()),
+        ('spoke_index', pa.int32()),
+        ('subnet_index', pa.int32()),
+        ('network', pa.uint32()),
+        ('prefix', pa.uint8()),
+        ('total_ips', pa.int64()),
+        ('usable_ips', pa.int64()),
+        ('zone', pa.string()),
+    ])
+
+
+def iter_plan_rows(output_data: Dict[str, Any], provider: str) -> Iterator[Tuple[Any, ...]]:
+    """Yield one row (in COLUMNS order) per subnet of a plan (networks as listed by network_ir.plan_networks)."""
+    for parent in plan_networks(output_data):
+        for subnet_index, subnet in enumerate(parent.subnets, 1):
+            network = ipaddress.ip_network(subnet['cidr'])
+            yield (
+                provider,
+                parent.cidr,
+                parent.position,
+                subnet_index,
+                int(network.network_address),
+                network.prefixlen,
+                subnet['total_ips'],
+                subnet['usable_ips'],
+                subnet.get('availabilityZone', '') or '',
+            )
+
+
+def iter_record_batches(rows: Iterable[Tuple[Any, ...]],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator['pa.RecordBatch']:
+    """Group rows into Arrow record batches of at most batch_size rows."""
+    schema = plan_schema()
+    columns: List[List[Any]] = [[] for _ in COLUMNS]
+
+    def flush() -> 'pa.RecordBatch':
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema
+        )
+        for values in columns:
+            values.clear()
+        return batch
+
+    for row in rows:
+        for values, value in zip(columns, row):
+            values.append(value)
+        if len(columns[0]) >= batch_size:
+            yield flush()
+    if columns[0]:
+        yield flush()
+
+
+def bulk_split_batches(split: Dict[str, Any], provider: str, parent_cidrs: Sequence[str],
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator['pa.RecordBatch']:
+    """
+    Turn a bulk_subnets split into record batches without per-subnet Python objects.
+
+    Args:
+        split: Result of bulk_split or bulk_split_many (NumPy or list columns)
+        provider: Cloud provider name
+        parent_cidrs: The split network (bulk_split) or the cidrs passed to bulk_split_many
+        batch_size: Rows per batch
+    """
+    schema = plan_schema()
+    count = split['count']
+    parents = split.get('parent')
+    provider_dictionary = pa.array([provider], type=pa.string())
+    if parents is not None:
+        parent_dictionary = pa.array(list(parent_cidrs), type=pa.string())
+        offsets = pa.array(split['offsets'], type=pa.int64())
+
+    for start in range(0, count, batch_size):
+        stop = min(start + batch_size, count)
+        rows = stop - start
+        row_numbers = pa.array(range(start + 1, stop + 1), type=pa.int64())
+        if parents is None:
+            parent_column = pa.array([parent_cidrs[0]] * rows, type=pa.string())
+            subnet_index = row_numbers
+        else:
+            parent_ids = pa.array(parents[start:stop], type=pa.int32())
+            parent_column = pc.take(parent_dictionary, parent_ids)
+            # Position within the parent network: row number minus the parent's first row
+            subnet_index = pc.subtract(row_numbers, pc.take(offsets, parent_ids))
+
+        yield pa.RecordBatch.from_arrays([
+            pa.DictionaryArray.from_arrays(pa.nulls(rows, pa.int8()).fill_null(0), provider_dictionary),
+            parent_column,
+            pa.nulls(rows, pa.int32()).fill_null(0),
+            subnet_index.cast(pa.int32()),
+            pa.array(split['network'][start:stop], type=pa.uint32()),
+            pa.nulls(rows, pa.uint8()).fill_null(split['prefix']),
+            pa.nulls(rows, pa.int64()).fill_null(split['total_ips']),
+            pa.nulls(rows, pa.int64()).fill_null(split['usable_ips']),
+            pa.nulls(rows, pa.string()).fill_null(''),
+        ], schema=schema)
+
+
+def write_batches(batches: Iterable['pa.RecordBatch'], path: str, output_format: str) -> int:
+    """
+    Stream record batches to an Arrow IPC file or a Parquet file.
+
+    Args:
+        batches: Record batches in plan_schema()
+        path: Output file path
+        output_format: 'arrow' or 'parquet'
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ImportError: If pyarrow is not installed
+        ValueError: If the format is not an export format
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for arrow/parquet output. Install it with: pip install pyarrow")
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {output_format}. Supported: {', '.join(EXPORT_FORMATS)}")
+
+    schema = plan_schema()
+    rows = 0
+    if output_format == 'parquet':
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    else:
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    return rows
+
+
+def write_plan(output_data: Dict[str, Any], provider: str, path: str, output_format: str,
+               batch_size: Optional[int] = None) -> int:
+    """
+    Export a plan (CLI/API output data) to Arrow or Parquet.
+
+    Returns:
+        Number of subnet rows written
+    """
+    rows = iter_plan_rows(output_data, provider)
+    return write_batches(iter_record_batches(rows, batch_size or DEFAULT_BATCH_SIZE), path, output_format)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Bulk Subnet Computation
+
+Columnar alternative to calculate_subnets for analytics over very large
+numbers of subnets. A split is returned as parallel arrays (network,
+broadcast, first/last usable address as integers) instead of one dict per
+subnet, and addresses are only formatted as dotted quads on request.
+
+Uses NumPy uint32 arrays when NumPy is installed and plain Python lists
+otherwise; both backends return the same columns and values.
+"""
+
+import ipaddress
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+from cloud_provider_config import get_cloud_provider_config
+from ipcalc import PREFIX_SIZES, RESERVED_OFFSETS
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Largest split computed in one call (a /8 into /32s)
+MAX_BULK_SUBNETS = 2 ** 24
+
+if NUMPY_AVAILABLE:
+    _OCTET_STRINGS = np.array([str(octet) for octet in range(256)])
+
+
+def bulk_split(
+    cidr: str,
+    provider: str,
+    subnet_prefix: Optional[int] = None,
+    num_subnets: Optional[int] = None,
+    use_numpy: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Split a network into equal subnets and compute per-subnet address columns.
+
+    Args:
+        cidr: Network CIDR (e.g., "10.0.0.0/8")
+        provider: Cloud provider name
+        subnet_prefix: Subnet prefix; defaults to the smallest prefix holding num_subnets
+        num_subnets: Number of subnets; defaults to every subnet of subnet_prefix
+        use_numpy: Force (True) or disable (False) the NumPy backend; default: use it if installed
+
+    Returns:
+        Dictionary with the split parameters (prefix, count, total_ips, usable_ips,
+        reserved_first, reserved_last, backend) and the columns network, broadcast,
+        first_usable and last_usable as uint32 arrays (NumPy) or int lists, or an error message
+    """
+    config = get_cloud_provider_config(provider)
+
+    try:
+        base_network = ipaddress.ip_network(cidr, strict=False)
+    except ValueError as e:
+        return {"error": f"Invalid CIDR notation. Use format: 10.0.0.0/16. Error: {e}"}
+    if base_network.version != 4:
+        return {"error": "Only IPv4 networks are supported"}
+
+    base_prefix = base_network.prefixlen
+    if subnet_prefix is None:
+        if not num_subnets or num_subnets < 1:
+            return {"error": "Either a subnet prefix or a number of subnets is required"}
+        subnet_prefix = base_prefix + math.ceil(math.log2(num_subnets))
+
+    if subnet_prefix < base_prefix or subnet_prefix > 32:
+        return {"error": f"Subnet prefix /{subnet_prefix} does not fit in /{base_prefix}"}
+    if subnet_prefix > config['min_cidr_prefix']:
+        return {"error": f"Subnet prefix /{subnet_prefix} is smaller than cloud provider minimum "
+                         f"/{config['min_cidr_prefix']}."}
+    if subnet_prefix < config['max_cidr_prefix']:
+        return {"error": f"Subnet prefix /{subnet_prefix} is larger than cloud provider maximum "
+                         f"/{config['max_cidr_prefix']}."}
+
+    capacity = 2 ** (subnet_prefix - base_prefix)
+    count = capacity if num_subnets is None else num_subnets
+    if count > capacity:
+        return {"error": f"Cannot create {count} /{subnet_prefix} subnets in a /{base_prefix} network. "
+                         f"Maximum possible: {capacity} subnet(s)."}
+    if count > MAX_BULK_SUBNETS:
+        return {"error": f"Split of {count} subnets exceeds the bulk limit of {MAX_BULK_SUBNETS}"}
+
+    if use_numpy is None:
+        use_numpy = NUMPY_AVAILABLE
+    elif use_numpy and not NUMPY_AVAILABLE:
+        return {"error": "NumPy is not installed"}
+
+    reserved_first, reserved_last = RESERVED_OFFSETS[provider.lower()]
+    size = PREFIX_SIZES[subnet_prefix]
+    usable_ips = size - config['reserved_ip_count'] if subnet_prefix < 31 else size
+    start = int(base_network.network_address)
+    # /31 and /32 subnets have no reserved addresses
+    first_offset, last_offset = (reserved_first, reserved_last) if subnet_prefix < 31 else (0, 0)
+
+    if use_numpy:
+        network = np.arange(count, dtype=np.uint32) * np.uint32(size) + np.uint32(start)
+        broadcast = network + np.uint32(size - 1)
+        first_usable = network + np.uint32(first_offset)
+        last_usable = broadcast - np.uint32(last_offset)
+    else:
+        network = list(range(start, start + count * size, size))
+        broadcast = [address + size - 1 for address in network]
+        first_usable = [address + first_offset for address in network]
+        last_usable = [address - last_offset for address in broadcast]
+
+    return {
+        "prefix": subnet_prefix,
+        "count": count,
+        "total_ips": size,
+        "usable_ips": usable_ips,
+        "reserved_first": reserved_first,
+        "reserved_last": reserved_last,
+        "backend": "numpy" if use_numpy else "python",
+        "network": network,
+        "broadcast": broadcast,
+        "first_usable": first_usable,
+        "last_usable": last_usable,
+    }
+
+
+def bulk_split_many(
+    cidrs: Sequence[str],
+    provider: str,
+    subnet_prefix: int,
+    use_numpy: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Split many networks at the same subnet prefix into one set of columns.
+
+    Args:
+        cidrs: Network CIDRs (e.g., every VNet in the estate)
+        provider: Cloud provider name
+        subnet_prefix: Subnet prefix for every network
+        use_numpy: Backend selection as for bulk_split
+
+    Returns:
+        Columns as bulk_split, concatenated, plus 'parent' (index into cidrs) per subnet
+        and 'offsets' (first row of each network), or an error message naming the failing network
+    """
+    splits = []
+    for idx, cidr in enumerate(cidrs):
+        split = bulk_split(cidr, provider, subnet_prefix, use_numpy=use_numpy)
+        if "error" in split:
+            return {"error": f"Network {idx + 1} ({cidr}): {split['error']}"}
+        splits.append(split)
+
+    if not splits:
+        return {"error": "At least one network is required"}
+
+    columns = ("network", "broadcast", "first_usable", "last_usable")
+    result = {key: splits[0][key] for key in ("prefix", "total_ips", "usable_ips",
+                                              "reserved_first", "reserved_last", "backend")}
+    result["count"] = sum(split["count"] for split in splits)
+    result["offsets"] = [0]
+    for split in splits[:-1]:
+        result["offsets"].append(result["offsets"][-1] + split["count"])
+
+    if result["backend"] == "numpy":
+        for column in columns:
+            result[column] = np.concatenate([split[column] for split in splits])
+        result["parent"] = np.repeat(
+            np.arange(len(splits), dtype=np.uint32), [split["count"] for split in splits]
+        )
+    else:
+        for column in columns:
+            result[column] = [address for split in splits for address in split[column]]
+        result["parent"] = [idx for idx, split in enumerate(splits) for _ in range(split["count"])]
+
+    return result
+
+
+def format_ipv4(addresses: Any) -> Any:
+    """
+    Format integer IPv4 addresses as dotted quads.
+
+    Args:
+        addresses: uint32 NumPy array or list of ints
+
+    Returns:
+        NumPy string array for array input (vectorized), list of str otherwise
+    """
+    if NUMPY_AVAILABLE and isinstance(addresses, np.ndarray):
+        values = addresses.astype(np.uint32, copy=False)
+        formatted = _OCTET_STRINGS[values >> 24]
+        for shift in (16, 8, 0):
+            formatted = np.char.add(np.char.add(formatted, '.'), _OCTET_STRINGS[(values >> shift) & 255])
+        return formatted
+    return [
+        f'{address >> 24}.{(address >> 16) & 255}.{(address >> 8) & 255}.{address & 255}'
+        for address in addresses
+    ]
+
+
+def format_cidrs(split: Dict[str, Any]) -> Any:
+    """Format the network column of a bulk split as CIDR strings."""
+    networks = format_ipv4(split["network"])
+    suffix = f'/{split["prefix"]}'
+    if NUMPY_AVAILABLE and isinstance(networks, np.ndarray):
+        return np.char.add(networks, suffix)
+    return [network + suffix for network in networks]
+
+
+def to_subnet_records(split: Dict[str, Any], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Expand (the first limit rows of) a bulk split into calculate_subnets-style dicts.
+
+    Intended for spot checks and small outputs; keep the columns for analytics.
+    """
+    count = split["count"] if limit is None else min(limit, split["count"])
+    network = format_ipv4(split["network"][:count])
+    broadcast = format_ipv4(split["broadcast"][:count])
+    first_usable = format_ipv4(split["first_usable"][:count])
+    last_usable = format_ipv4(split["last_usable"][:count])
+
+    records = []
+    for idx in range(count):
+        usable_range = f"{first_usable[idx]} - {last_usable[idx]}"
+        records.append({
+            "cidr": f"{network[idx]}/{split['prefix']}",
+            "network": str(network[idx]),
+            "broadcast_address": str(broadcast[idx]),
+            "prefix_length": split["prefix"],
+            "total_ips": split["total_ips"],
+            "usable_ips": split["usable_ips"],
+            "first_usable": str(first_usable[idx]),
+            "last_usable": str(last_usable[idx]),
+            "usable_range": usable_range,
+        })
+    return records
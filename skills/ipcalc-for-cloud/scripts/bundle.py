@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Archive Bundles
+
+Streams generated files as a ZIP or tar.gz archive. Files are taken from an
+iterator and each one is compressed and handed out as soon as it is added,
+so neither the file set nor the archive is held in memory: a caller that
+renders files lazily renders them as the archive is sent.
+
+Entries carry a fixed timestamp, so the same files give the same ZIP
+archive byte for byte.
+"""
+
+import io
+import tarfile
+import zipfile
+from typing import Iterable, Iterator, List, Tuple
+
+# Archive format -> content type
+ARCHIVE_FORMATS = {
+    'zip': 'application/zip',
+    'tar.gz': 'application/gzip',
+}
+
+# Entry timestamp (the earliest a ZIP archive can store) and permissions
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+_FILE_MODE = 0o644
+_SCRIPT_MODE = 0o755
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, unseekable stream collecting the bytes written since the last drain."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _mode(name: str) -> int:
+    """Permissions of an entry: deployment scripts are executable."""
+    return _SCRIPT_MODE if name.endswith('.sh') else _FILE_MODE
+
+
+def stream_archive(files: Iterable[Tuple[str, str]], archive_format: str) -> Iterator[bytes]:
+    """
+    Stream files as an archive.
+
+    Args:
+        files: (path inside the archive, text content) pairs, consumed one at a time
+        archive_format: zip or tar.gz (ARCHIVE_FORMATS)
+
+    Yields:
+        Archive bytes, in order, as they are produced
+
+    Raises:
+        ValueError: If archive_format is not supported
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unsupported archive format: {archive_format}. Supported: {', '.join(ARCHIVE_FORMATS)}")
+    buffer = _ChunkBuffer()
+    if archive_format == 'zip':
+        # An unseekable stream makes zipfile write sizes after each entry (data descriptors)
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name, content in files:
+                info = zipfile.ZipInfo(name, date_time=_ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = _mode(name) << 16
+                archive.writestr(info, content)
+                chunk = buffer.drain()
+                if chunk:
+                    yield chunk
+    else:
+        with tarfile.open(fileobj=buffer, mode='w|gz') as archive:
+            for name, content in files:
+                data = content.encode()
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mode = _mode(name)
+                archive.addfile(info, io.BytesIO(data))
+                chunk = buffer.drain()
+                if chunk:
+                    yield chunk
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+CIDR Set Algebra
+
+IPv4 address sets as sorted lists of disjoint, non-adjacent integer
+intervals (first, last), inclusive. Union, intersection, difference and
+complement are linear merges over already-normalized sets, so building a set
+from n CIDRs costs one sort, O(n log n), and nothing calls
+ipaddress.collapse_addresses per element. Intervals convert back to the
+minimal CIDR list covering them.
+
+Entries may be CIDRs ("10.0.0.0/8", host bits ignored), single addresses
+("10.0.0.1") or ranges ("10.0.0.10-10.0.0.20").
+"""
+
+import heapq
+import socket
+from typing import Iterable, Iterator, List, Tuple
+
+Interval = Tuple[int, int]
+
+# Highest IPv4 address
+MAX_ADDRESS = 2 ** 32 - 1
+
+# The whole IPv4 space, the default universe for complement()
+FULL_SPACE: List[Interval] = [(0, MAX_ADDRESS)]
+
+
+def _address(text: str) -> int:
+    """Integer value of a dotted-quad address."""
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, text.strip()), 'big')
+    except OSError:
+        raise ValueError(f"Invalid IPv4 address: {text.strip()}")
+
+
+def _dotted(address: int) -> str:
+    """Dotted-quad form of an integer address."""
+    return socket.inet_ntoa(address.to_bytes(4, 'big'))
+
+
+def parse_interval(text: str) -> Interval:
+    """
+    Parse a CIDR, address or "first-last" range into an interval.
+
+    Raises:
+        ValueError: If the entry is not valid IPv4
+    """
+    text = text.strip()
+    if '-' in text:
+        first, last = (_address(part) for part in text.split('-', 1))
+        if first > last:
+            raise ValueError(f"Invalid range (first address after last): {text}")
+        return first, last
+    if '/' in text:
+        address, prefix_text = text.split('/', 1)
+        if not prefix_text.isdigit() or int(prefix_text) > 32:
+            raise ValueError(f"Invalid prefix length in: {text}")
+        size = 1 << (32 - int(prefix_text))
+        first = _address(address) & ~(size - 1)
+        return first, first + size - 1
+    address = _address(text)
+    return address, address
+
+
+def normalize(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort intervals and merge overlapping or adjacent ones."""
+    merged: List[Interval] = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def parse_set(entries: Iterable[str]) -> List[Interval]:
+    """
+    Build a normalized set from CIDR/address/range strings.
+
+    Blank entries and '#' comments are skipped, so a file can be passed directly.
+    """
+    intervals = []
+    for entry in entries:
+        entry = entry.split('#', 1)[0].strip()
+        if entry:
+            intervals.append(parse_interval(entry))
+    return normalize(intervals)
+
+
+def union(a: List[Interval], b: List[Interval]) -> List[Interval]:
+    """Addresses in a or b."""
+    merged: List[Interval] = []
+    for first, last in heapq.merge(a, b):
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def intersect(a: List[Interval], b: List[Interval]) -> List[Interval]:
+    """Addresses in both a and b."""
+    result: List[Interval] = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        first = max(a[i][0], b[j][0])
+        last = min(a[i][1], b[j][1])
+        if first <= last:
+            result.append((first, last))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def subtract(a: List[Interval], b: List[Interval]) -> List[Interval]:
+    """Addresses in a but not in b."""
+    result: List[Interval] = []
+    j = 0
+    for first, last in a:
+        # Skip exclusions wholly below this interval
+        while j < len(b) and b[j][1] < first:
+            j += 1
+        k = j
+        while k < len(b) and b[k][0] <= last:
+            if b[k][0] > first:
+                result.append((first, b[k][0] - 1))
+            first = max(first, b[k][1] + 1)
+            if b[k][1] > last:
+                break
+            k += 1
+        if first <= last:
+            result.append((first, last))
+        j = k
+    return result
+
+
+def complement(a: List[Interval], within: List[Interval] = FULL_SPACE) -> List[Interval]:
+    """Addresses of within (default: all of IPv4) not in a."""
+    return subtract(within, a)
+
+
+def address_count(intervals: Iterable[Interval]) -> int:
+    """Number of addresses in a set."""
+    return sum(last - first + 1 for first, last in intervals)
+
+
+def range_to_cidrs(first: int, last: int) -> List[Tuple[int, int]]:
+    """
+    Minimal list of CIDR blocks covering first..last exactly.
+
+    Returns:
+        (network address, prefix length) pairs in address order
+    """
+    blocks = []
+    while first <= last:
+        # Largest block aligned at first that does not run past last
+        size = first & -first if first else 1 << 32
+        while size > last - first + 1:
+            size >>= 1
+        blocks.append((first, 33 - size.bit_length()))
+        first += size
+    return blocks
+
+
+def to_cidrs(intervals: Iterable[Interval]) -> List[str]:
+    """Minimal CIDR strings covering a set."""
+    return [
+        f"{_dotted(network)}/{prefix}"
+        for first, last in intervals
+        for network, prefix in range_to_cidrs(first, last)
+    ]
+
+
+def aligned_blocks(intervals: Iterable[Interval], prefix: int) -> Iterator[int]:
+    """
+    Yield, in address order, the start of every /prefix block lying wholly inside a set.
+
+    Used to carve equal-sized subnets out of free address space.
+    """
+    size = 1 << (32 - prefix)
+    for first, last in intervals:
+        start = -(-first // size) * size
+        while start + size - 1 <= last:
+            yield start
+            start += size
+
+
+def count_aligned_blocks(intervals: Iterable[Interval], prefix: int) -> int:
+    """Number of /prefix blocks lying wholly inside a set."""
+    size = 1 << (32 - prefix)
+    return sum(
+        max(0, (last + 1) // size - -(-first // size))
+        for first, last in intervals
+    )
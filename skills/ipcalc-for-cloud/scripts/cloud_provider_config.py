@@ -1,79 +1,92 @@
 #!/usr/bin/env python3
 """
 Cloud Provider Configuration
-Defines provider-specific settings for IP calculations and template generation
+Defines provider-specific settings for IP calculations and template generation.
+
+Settings are read once from the versioned catalogue in data/provider_catalogue.json
+(address limits, reserved IPs, IPv6 rules, default quotas, regions and zones) and
+exposed as read-only lookup tables.
 """
 
-from typing import Dict, List, TypedDict
+import json
+import os
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TypedDict
+
+# Versioned provider catalogue shipped with the skill; IPCALC_PROVIDER_CATALOGUE
+# points at a replacement file, e.g. one with raised quotas
+CATALOGUE_PATH = os.environ.get(
+    'IPCALC_PROVIDER_CATALOGUE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'provider_catalogue.json')
+)
+
+# Catalogue schema versions this module can read
+SUPPORTED_CATALOGUE_SCHEMAS = (1,)
 
 
 class CloudProviderConfig(TypedDict):
     """Cloud provider configuration structure"""
+    name: str
     reserved_ip_count: int
     max_cidr_prefix: int
     min_cidr_prefix: int
-    availability_zones: List[str]
-    supported_outputs: List[str]
-
-
-# Cloud Provider Configurations
-CLOUD_PROVIDERS: Dict[str, CloudProviderConfig] = {
-    'azure': {
-        'reserved_ip_count': 5,  # Azure reserves first 3 IPs + last IP + broadcast
-        'max_cidr_prefix': 8,
-        'min_cidr_prefix': 29,
-        'availability_zones': ['1', '2', '3'],  # Azure availability zones
-        'supported_outputs': ['info', 'json', 'cli', 'terraform', 'bicep', 'arm', 'powershell']
-    },
-    'aws': {
-        'reserved_ip_count': 5,  # AWS reserves first 4 IPs + broadcast
-        'max_cidr_prefix': 16,
-        'min_cidr_prefix': 28,
-        'availability_zones': [
-            'us-east-1a', 'us-east-1b', 'us-east-1c',
-            'us-east-1d', 'us-east-1e', 'us-east-1f'
-        ],
-        'supported_outputs': ['info', 'json', 'cli', 'terraform', 'cloudformation']
-    },
-    'gcp': {
-        'reserved_ip_count': 4,
-        'max_cidr_prefix': 8,
-        'min_cidr_prefix': 29,
-        'availability_zones': [
-            'us-central1',
-            'us-east1',
-            'us-west1',
-            'europe-west1',
-            'asia-east1',
-            'asia-southeast1'
-        ],
-        'supported_outputs': ['info', 'json', 'gcloud', 'terraform']
-    },
-    'oracle': {
-        'reserved_ip_count': 3,
-        'max_cidr_prefix': 16,
-        'min_cidr_prefix': 30,
-        'availability_zones': ['AD-1', 'AD-2', 'AD-3'],
-        'supported_outputs': ['info', 'json', 'oci', 'terraform']
-    },
-    'alicloud': {
-        'reserved_ip_count': 4,  # Network address + last 3 IPs reserved
-        'max_cidr_prefix': 8,
-        'min_cidr_prefix': 29,
-        'availability_zones': [
-            'cn-hangzhou-a', 'cn-hangzhou-b', 'cn-hangzhou-c',
-            'cn-hangzhou-d', 'cn-hangzhou-e', 'cn-hangzhou-f'
-        ],
-        'supported_outputs': ['info', 'json', 'aliyun', 'terraform']
-    },
-    'onpremises': {
-        'reserved_ip_count': 2,
-        'max_cidr_prefix': 1,
-        'min_cidr_prefix': 32,
-        'availability_zones': [],
-        'supported_outputs': ['info', 'json']
-    }
-}
+    availability_zones: Sequence[str]
+    supported_outputs: Sequence[str]
+    ipv6: Mapping[str, Any]
+    quotas: Mapping[str, int]
+    regions: Mapping[str, Sequence[str]]
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def load_provider_catalogue(path: str = CATALOGUE_PATH) -> Dict[str, Any]:
+    """
+    Read and check a provider catalogue file.
+
+    Args:
+        path: Path to the catalogue JSON file
+
+    Returns:
+        Parsed catalogue with 'schema', 'version' and 'providers'
+
+    Raises:
+        ValueError: If the file uses an unsupported schema or lacks a provider field
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        catalogue = json.load(f)
+
+    schema = catalogue.get('schema')
+    if schema not in SUPPORTED_CATALOGUE_SCHEMAS:
+        raise ValueError(f"Unsupported provider catalogue schema: {schema} ({path})")
+
+    required = CloudProviderConfig.__annotations__.keys()
+    for provider, entry in catalogue['providers'].items():
+        missing = [key for key in required if key not in entry]
+        if missing:
+            raise ValueError(f"Provider catalogue entry '{provider}' is missing: {', '.join(missing)}")
+
+    return catalogue
+
+
+_CATALOGUE = load_provider_catalogue()
+
+# Catalogue version, e.g. for reporting which rules a result was computed with
+CATALOGUE_VERSION: str = _CATALOGUE['version']
+
+# Cloud Provider Configurations (read-only, built once at import)
+CLOUD_PROVIDERS: Mapping[str, CloudProviderConfig] = _freeze(_CATALOGUE['providers'])
+
+# Precomputed output format sets for O(1) validation
+_OUTPUT_FORMATS: Mapping[str, frozenset] = MappingProxyType(
+    {name: frozenset(config['supported_outputs']) for name, config in CLOUD_PROVIDERS.items()}
+)
 
 
 def get_cloud_provider_config(provider: str) -> CloudProviderConfig:
@@ -89,16 +102,16 @@ def get_cloud_provider_config(provider: str) -> CloudProviderConfig:
     Raises:
         ValueError: If provider is not supported
     """
-    provider_lower = provider.lower()
+    config = CLOUD_PROVIDERS.get(provider) or CLOUD_PROVIDERS.get(provider.lower())
 
-    if provider_lower not in CLOUD_PROVIDERS:
+    if config is None:
         available = ', '.join(CLOUD_PROVIDERS.keys())
         raise ValueError(
             f"Unsupported cloud provider: {provider}. "
             f"Available providers: {available}"
         )
 
-    return CLOUD_PROVIDERS[provider_lower]
+    return config
 
 
 def validate_output_format(provider: str, output_format: str) -> bool:
@@ -112,11 +125,8 @@ def validate_output_format(provider: str, output_format: str) -> bool:
     Returns:
         True if supported, False otherwise
     """
-    try:
-        config = get_cloud_provider_config(provider)
-        return output_format in config['supported_outputs']
-    except ValueError:
-        return False
+    formats = _OUTPUT_FORMATS.get(provider) or _OUTPUT_FORMATS.get(provider.lower())
+    return formats is not None and output_format in formats
 
 
 def get_availability_zone(provider: str, index: int) -> str:
@@ -137,3 +147,65 @@ def get_availability_zone(provider: str, index: int) -> str:
         return ''
 
     return zones[index % len(zones)]
+
+
+def list_regions(provider: str) -> List[str]:
+    """Return the catalogued regions for a provider (empty if none are catalogued)."""
+    return list(get_cloud_provider_config(provider)['regions'])
+
+
+def get_region_zones(provider: str, region: str) -> List[str]:
+    """
+    Get the availability zones of a region.
+
+    Args:
+        provider: Cloud provider name
+        region: Provider region name (e.g., 'us-east-1', 'westeurope')
+
+    Returns:
+        Zone names in catalogue order
+
+    Raises:
+        ValueError: If the provider or region is not in the catalogue
+    """
+    regions = get_cloud_provider_config(provider)['regions']
+    if not regions:
+        raise ValueError(f"No region catalogue available for provider: {provider}")
+    if region not in regions:
+        raise ValueError(
+            f"Unknown {provider} region: {region}. Available regions: {', '.join(regions)}"
+        )
+    return list(regions[region])
+
+
+def get_catalogue_entry(provider: str) -> Dict[str, Any]:
+    """
+    Get a provider's catalogue entry as plain, JSON-serializable data.
+
+    Args:
+        provider: Cloud provider name
+
+    Returns:
+        Copy of the provider entry with the catalogue version added
+
+    Raises:
+        ValueError: If provider is not supported
+    """
+    get_cloud_provider_config(provider)
+    entry = json.loads(json.dumps(_CATALOGUE['providers'][provider.lower()]))
+    entry['catalogueVersion'] = CATALOGUE_VERSION
+    return entry
+
+
+def get_provider_quota(provider: str, quota: str) -> Optional[int]:
+    """
+    Get a default service quota for a provider.
+
+    Args:
+        provider: Cloud provider name
+        quota: Quota key (e.g., 'subnets_per_network', 'peerings_per_network')
+
+    Returns:
+        Quota value, or None if the catalogue does not define it for the provider
+    """
+    return get_cloud_provider_config(provider)['quotas'].get(quota)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+CloudFormation JSON Output
+
+Builds the CloudFormation template of an AWS plan as dicts in CloudFormation's
+JSON syntax (template.json) and serializes it once (json_output.dumps).
+Intrinsic functions use their full form ({"Ref": ...}, {"Fn::Sub": ...}).
+
+The template mirrors cloudformation.template.yaml: the same parameters,
+logical IDs and outputs. Plans over the per-template quotas and the transit
+gateway are only rendered as YAML (nested stacks, --output cloudformation).
+"""
+
+from typing import Any, Dict, List
+
+from json_output import dumps
+from template_processor import _CFN_AZ_SELECTORS, _name_prefix, cloudformation_stack_ranges
+
+
+def _ref(name: str) -> Dict[str, str]:
+    return {"Ref": name}
+
+
+def _sub(text: str) -> Dict[str, str]:
+    return {"Fn::Sub": text}
+
+
+def _tags(name: str) -> List[Dict[str, Any]]:
+    """Name, Environment and ManagedBy tags; name is a Fn::Sub string."""
+    return [
+        {"Key": "Name", "Value": _sub(name)},
+        {"Key": "Environment", "Value": "Production"},
+        {"Key": "ManagedBy", "Value": "CloudFormation"},
+    ]
+
+
+def _availability_zone(subnet: Dict[str, Any], idx: int) -> Dict[str, Any]:
+    """AvailabilityZone of subnet idx: pinned by a region layout, else round-robin over the default zones."""
+    zone = subnet.get('zoneIndex', (idx - 1) % len(_CFN_AZ_SELECTORS))
+    return {"Fn::Select": [zone, {"Fn::GetAZs": ""}]}
+
+
+def check_cloudformation_json(data: Dict[str, Any]) -> None:
+    """
+    Check that an AWS plan can be rendered as CloudFormation JSON.
+
+    Raises:
+        ValueError: For transit gateways, or plans over the per-template quotas
+    """
+    if data.get('transitGateway'):
+        raise ValueError("CloudFormation JSON output does not support transit gateways; "
+                         "they are only rendered as CloudFormation YAML")
+    if cloudformation_stack_ranges(data):
+        raise ValueError(f"{len(data['subnets'])} subnets exceed the quotas of one CloudFormation template; "
+                         "plans split into nested stacks are only rendered as CloudFormation YAML")
+
+
+def build_cloudformation_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the CloudFormation template of an AWS plan.
+
+    Args:
+        data: Template data (NetworkPlan.template_data)
+
+    Returns:
+        Template with Parameters, Rules (for a planned region), Resources and Outputs
+
+    Raises:
+        ValueError: See check_cloudformation_json
+    """
+    check_cloudformation_json(data)
+
+    parameters: Dict[str, Any] = {
+        "Prefix": {"Type": "String", "Default": _name_prefix(data), "Description": "Prefix for resource naming"},
+        "VpcCidr": {
+            "Type": "String",
+            "Default": data.get('vpcCidr', data.get('vnetCidr', '')),
+            "Description": "CIDR block for the VPC",
+        },
+    }
+    resources: Dict[str, Any] = {"VPC": {
+        "Type": "AWS::EC2::VPC",
+        "Properties": {
+            "CidrBlock": _ref("VpcCidr"),
+            "EnableDnsHostnames": True,
+            "EnableDnsSupport": True,
+            "Tags": _tags("${Prefix}-vpc"),
+        },
+    }}
+    outputs: Dict[str, Any] = {"VpcId": {
+        "Description": "ID of the VPC",
+        "Value": _ref("VPC"),
+        "Export": {"Name": _sub("${AWS::StackName}-VpcId")},
+    }}
+
+    for idx, subnet in enumerate(data['subnets'], 1):
+        parameters[f"Subnet{idx}Cidr"] = {
+            "Type": "String",
+            "Default": subnet['cidr'],
+            "Description": f"CIDR block for Subnet {idx}",
+        }
+        resources[f"Subnet{idx}"] = {
+            "Type": "AWS::EC2::Subnet",
+            "Properties": {
+                "VpcId": _ref("VPC"),
+                "CidrBlock": _ref(f"Subnet{idx}Cidr"),
+                "AvailabilityZone": _availability_zone(subnet, idx),
+                "Tags": _tags(f"${{Prefix}}-subnet{idx}"),
+            },
+        }
+        outputs[f"Subnet{idx}Id"] = {
+            "Description": f"ID of Subnet {idx}",
+            "Value": _ref(f"Subnet{idx}"),
+            "Export": {"Name": _sub(f"${{AWS::StackName}}-Subnet{idx}Id")},
+        }
+
+    template: Dict[str, Any] = {
+        "AWSTemplateFormatVersion": "2010-09-09",
+        "Description": "VPC with subnets across multiple AZs",
+        "Parameters": parameters,
+    }
+    # A stack deploys to the region it is created in: only a planned region is asserted
+    if data.get('region'):
+        template["Rules"] = {"PlannedRegion": {"Assertions": [{
+            "Assert": {"Fn::Equals": [_ref("AWS::Region"), data['region']]},
+            "AssertDescription": f"The network plan is for {data['region']}",
+        }]}}
+    template["Resources"] = resources
+    template["Outputs"] = outputs
+    return template
+
+
+def process_cloudformation_json(data: Dict[str, Any], minify: bool = False) -> str:
+    """Render an AWS plan as template.json (build_cloudformation_json, then json_output.dumps)."""
+    return dumps(build_cloudformation_json(data), minify)
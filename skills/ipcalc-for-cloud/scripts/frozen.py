@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Read-only Plan Containers
+
+FrozenDict and FrozenList are dict and list subclasses that refuse in-place
+changes, so memoized plans can be handed to every caller without defensive
+copies. Being real dicts and lists they still serialize with json.dumps,
+pickle, and pass isinstance checks; use thaw() to get an editable copy.
+"""
+
+from typing import Any, NoReturn
+
+
+def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError(f"'{type(self).__name__}' object is read-only; use thaw() for an editable copy")
+
+
+class FrozenDict(dict):
+    """A dict that cannot be modified after construction."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def __copy__(self) -> 'FrozenDict':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'FrozenDict':
+        return self
+
+
+class FrozenList(list):
+    """A list that cannot be modified after construction."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+    def __copy__(self) -> 'FrozenList':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'FrozenList':
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists/tuples to FrozenList."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively convert frozen containers back to plain, editable dicts and lists."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
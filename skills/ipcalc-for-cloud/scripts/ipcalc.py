@@ -9,25 +9,144 @@ Matches TypeScript CLI implementation.
 
 import argparse
 import ipaddress
+import itertools
 import json
 import sys
 import os
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Mapping, Optional, Tuple
 import math
+import re
+from functools import lru_cache
 
 from cloud_provider_config import (
     get_cloud_provider_config,
     validate_output_format,
-    get_availability_zone,
     CLOUD_PROVIDERS
 )
 
+from topology import (
+    TOPOLOGIES,
+    validate_topology,
+    hub_spoke_pairs,
+    full_mesh_pairs,
+    multi_hub_pairs,
+    assign_spokes_to_hubs
+)
+
+import cidr_sets
+from frozen import freeze
+from json_output import JSON_FORMATS, dumps, minify as minify_json
+
+from plan_limits import LIMIT_CHECKS, validate_plans
+
+from arrow_export import EXPORT_FORMATS, PYARROW_AVAILABLE, write_plan
+from network_ir import NetworkPlan, build_plan
+from output_dir import write_directory
+from plan_diff import diff_files
+from route_tables import ROUTE_OUTPUTS, build_route_tables
+from subnet_lookup import SubnetLookup, parse_ipv4_addresses
+from region_layout import (
+    select_zones,
+    split_blocks,
+    layout_grid
+)
+
 try:
-    from template_processor import process_template
+    from template_processor import (
+        check_template, process_cloudformation_nested_stacks, process_template, process_terraform_module,
+        process_terraform_roots, terraform_tfvars
+    )
+    from cloudformation_json import check_cloudformation_json, process_cloudformation_json
+    from terraform_json import check_terraform_json, process_terraform_json
     TEMPLATE_PROCESSOR_AVAILABLE = True
 except ImportError:
     TEMPLATE_PROCESSOR_AVAILABLE = False
 
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+
+# File name per output format when several formats are written to a directory
+OUTPUT_FILES: Dict[str, str] = {
+    'info': 'plan.txt',
+    'json': 'plan.json',
+    'terraform': 'main.tf',
+    'terraform-json': 'main.tf.json',
+    'bicep': 'main.bicep',
+    'arm': 'azuredeploy.json',
+    'powershell': 'deploy.ps1',
+    'cli': 'deploy.sh',
+    'cloudformation': 'template.yaml',
+    'cloudformation-json': 'template.json',
+    'gcloud': 'deploy.sh',
+    'oci': 'deploy.sh',
+    'aliyun': 'deploy.sh',
+}
+
+# Environment names of --environments: they name the tfvars files and resources
+_ENVIRONMENT_NAME = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]*$')
+
+
+def _reserved_split(reserved_count: int) -> Tuple[int, int]:
+    """Split a reserved IP count into (addresses at the start, addresses at the end)."""
+    return math.ceil(reserved_count / 2), math.floor(reserved_count / 2)
+
+
+# Lookup tables indexed by prefix length (0-32), built once at import
+PREFIX_NETMASKS: Tuple[str, ...] = tuple(
+    str(ipaddress.IPv4Address((0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF)) for prefix in range(33)
+)
+PREFIX_SIZES: Tuple[int, ...] = tuple(2 ** (32 - prefix) for prefix in range(33))
+
+# Provider -> (reserved addresses at the start, reserved addresses at the end)
+RESERVED_OFFSETS: Mapping[str, Tuple[int, int]] = MappingProxyType({
+    provider: _reserved_split(config['reserved_ip_count']) for provider, config in CLOUD_PROVIDERS.items()
+})
+
+# Reserved IP count -> (start/end offsets, usable IPs per prefix length);
+# keyed by count because calculate_network_info only receives the provider config
+_RESERVED_TABLES: Dict[int, Tuple[Tuple[int, int], Tuple[int, ...]]] = {
+    count: (
+        _reserved_split(count),
+        tuple(size - count if prefix < 31 else size for prefix, size in enumerate(PREFIX_SIZES))
+    )
+    for count in {config['reserved_ip_count'] for config in CLOUD_PROVIDERS.values()}
+}
+
+
+def _reserved_table(reserved_count: int) -> Tuple[Tuple[int, int], Tuple[int, ...]]:
+    """Return the offsets/usable table for a reserved count, adding it for custom configs."""
+    table = _RESERVED_TABLES.get(reserved_count)
+    if table is None:
+        table = (
+            _reserved_split(reserved_count),
+            tuple(size - reserved_count if prefix < 31 else size for prefix, size in enumerate(PREFIX_SIZES))
+        )
+        _RESERVED_TABLES[reserved_count] = table
+    return table
+
+
+# Plans kept by the calculate_subnets / generate_hub_spoke_topology memo (LRU)
+PLAN_CACHE_SIZE = 1024
+
+
+def clear_plan_cache() -> None:
+    """Drop all memoized plans."""
+    _cached_subnets.cache_clear()
+    _cached_hub_spoke_topology.cache_clear()
+
+
+def plan_cache_info() -> Dict[str, Any]:
+    """Hit/miss statistics of the plan memo."""
+    return {
+        "subnets": _cached_subnets.cache_info()._asdict(),
+        "hubSpoke": _cached_hub_spoke_topology.cache_info()._asdict(),
+    }
+
+
+def _ip_str(address: int) -> str:
+    """Dotted-quad string of an integer IPv4 address."""
+    return f'{address >> 24}.{(address >> 16) & 255}.{(address >> 8) & 255}.{address & 255}'
+
 
 def calculate_prefix_length(base_network: ipaddress.IPv4Network, num_divisions: int) -> int:
     """
@@ -83,41 +202,53 @@ def calculate_network_info(network: ipaddress.IPv4Network, provider_config: Dict
     Returns:
         Dictionary with network information
     """
-    reserved_count = provider_config['reserved_ip_count']
-    total_ips = network.num_addresses
+    return _network_info(int(network.network_address), network.prefixlen, provider_config['reserved_ip_count'])
 
-    # Calculate usable IPs based on provider-specific reserved IPs
-    if network.prefixlen < 31:
-        usable_ips = total_ips - reserved_count
-    else:
-        usable_ips = total_ips
-
-    # Calculate first and last usable IPs
-    if network.prefixlen < 31:
-        reserved_first = math.ceil(reserved_count / 2)
-        reserved_last = math.floor(reserved_count / 2)
-        first_usable = str(network.network_address + reserved_first)
-        last_usable = str(network.broadcast_address - reserved_last)
+
+def _network_info(network_int: int, prefix: int, reserved_count: int) -> Dict[str, Any]:
+    """
+    Build network information from an integer network address using the prefix tables.
+
+    Args:
+        network_int: Network address as an integer
+        prefix: Prefix length
+        reserved_count: Provider reserved IP count
+
+    Returns:
+        Dictionary with network information
+    """
+    (reserved_first, reserved_last), usable_table = _reserved_table(reserved_count)
+    total_ips = PREFIX_SIZES[prefix]
+    usable_ips = usable_table[prefix]
+    broadcast_int = network_int + total_ips - 1
+    network_address = _ip_str(network_int)
+    broadcast_address = _ip_str(broadcast_int)
+    mask = PREFIX_NETMASKS[prefix]
+
+    # First and last usable IPs based on provider-specific reserved IPs
+    if prefix < 31:
+        first_usable = _ip_str(network_int + reserved_first)
+        last_usable = _ip_str(broadcast_int - reserved_last)
     else:
-        first_usable = str(network.network_address)
-        last_usable = str(network.broadcast_address)
+        first_usable = network_address
+        last_usable = broadcast_address
 
     return {
-        "cidr": str(network),
-        "network": str(network.network_address),
-        "network_address": str(network.network_address),
-        "broadcast_address": str(network.broadcast_address),
-        "netmask": str(network.netmask),
-        "mask": str(network.netmask),
-        "prefix_length": network.prefixlen,
+        "cidr": f"{network_address}/{prefix}",
+        "network": network_address,
+        "network_address": network_address,
+        "broadcast_address": broadcast_address,
+        "netmask": mask,
+        "mask": mask,
+        "prefix_length": prefix,
         "total_ips": total_ips,
         "totalIPs": total_ips,  # Alias for compatibility
         "usable_ips": usable_ips,
         "usableIPs": usable_ips,  # Alias for compatibility
         "first_usable": first_usable,
-        "firstIP": str(network.network_address),
+        "firstIP": network_address,
         "last_usable": last_usable,
-        "lastIP": str(network.broadcast_address),
+        "lastIP": broadcast_address,
         "usable_range": f"{first_usable} - {last_usable}",
         "usableRange": f"{first_usable} - {last_usable}",  # Alias for compatibility
     }
@@ -133,6 +264,10 @@ def calculate_subnets(
     Calculate subnets for a given network CIDR.
     Matches TypeScript calculateSubnets function.
 
+    Results are memoized on the normalized CIDR, count, provider and prefix
+    and returned read-only (FrozenDict/FrozenList), so repeated calls share
+    one plan. Use frozen.thaw() for an editable copy.
+
     Args:
         cidr: Network CIDR (e.g., "10.0.0.0/16")
         num_subnets: Number of subnets to create
@@ -142,6 +277,29 @@ def calculate_subnets(
     Returns:
         Dictionary with subnets array and optional error message
     """
+    try:
+        key_cidr = str(ipaddress.ip_network(cidr, strict=False))
+    except ValueError:
+        # Invalid CIDRs are reported by the calculation and not worth caching
+        return freeze(_calculate_subnets(cidr, num_subnets, provider, desired_subnet_prefix))
+
+    key_prefix = desired_subnet_prefix if desired_subnet_prefix and desired_subnet_prefix > 0 else None
+    return _cached_subnets(key_cidr, num_subnets, provider.lower(), key_prefix)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _cached_subnets(cidr: str, num_subnets: int, provider: str, desired_subnet_prefix: Optional[int]) -> Dict[str, Any]:
+    """Memoized, frozen calculate_subnets keyed on normalized arguments."""
+    return freeze(_calculate_subnets(cidr, num_subnets, provider, desired_subnet_prefix))
+
+
+def _calculate_subnets(
+    cidr: str,
+    num_subnets: int,
+    provider: str,
+    desired_subnet_prefix: Optional[int] = None
+) -> Dict[str, Any]:
+    """Uncached subnet calculation behind calculate_subnets."""
     config = get_cloud_provider_config(provider)
 
     # Parse base network
@@ -188,8 +346,8 @@ def calculate_subnets(
             }
 
         # Check capacity
-        total_ips = base_network.num_addresses
-        subnet_size = 2 ** (32 - subnet_prefix)
+        total_ips = PREFIX_SIZES[base_prefix]
+        subnet_size = PREFIX_SIZES[subnet_prefix]
         max_possible_subnets = total_ips // subnet_size
 
         if max_possible_subnets < num_subnets:
@@ -218,57 +376,244 @@ def calculate_subnets(
                 "error": f"Cannot divide /{base_prefix} into {num_subnets} subnets. Not enough address space."
             }
 
-    # Calculate subnets
-    try:
-        subnet_networks = split_network(base_network, num_subnets)
-    except ValueError as e:
-        # If desired prefix was specified, create subnets manually
-        if desired_subnet_prefix:
-            subnet_networks = []
-            subnet_size = 2 ** (32 - subnet_prefix)
-            network_num = int(base_network.network_address)
-
-            for i in range(num_subnets):
-                subnet_network_num = network_num + (i * subnet_size)
-                subnet_cidr = f"{ipaddress.IPv4Address(subnet_network_num)}/{subnet_prefix}"
-                subnet_networks.append(ipaddress.ip_network(subnet_cidr))
-        else:
-            return {"subnets": [], "error": str(e)}
+    # Subnets are laid out at the automatic prefix while it fits in /32,
+    # otherwise at the desired prefix
+    layout_prefix = base_prefix + math.ceil(math.log2(num_subnets))
+    if layout_prefix > 32:
+        layout_prefix = subnet_prefix
+    subnet_size = PREFIX_SIZES[layout_prefix]
+    network_num = int(base_network.network_address)
+    starts = range(network_num, network_num + num_subnets * subnet_size, subnet_size)
+    return {"subnets": _subnet_records(starts, layout_prefix, config)}
+
+
+def _subnet_records(starts: Iterable[int], prefix: int, config: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Build the subnet info list for integer subnet addresses of one prefix."""
+    subnet_size = PREFIX_SIZES[prefix]
+    reserved_count = config['reserved_ip_count']
+    reserved_first, reserved_last = _reserved_table(reserved_count)[0]
+    zones = config['availability_zones']
 
-    # Build subnet info list
     subnets = []
-    for idx, subnet_network in enumerate(subnet_networks):
-        subnet_info = calculate_network_info(subnet_network, config)
+    for idx, subnet_num in enumerate(starts):
+        subnet_info = _network_info(subnet_num, prefix, reserved_count)
         subnet_info["name"] = f"subnet{idx + 1}"
         subnet_info["index"] = idx + 1
 
-        # Add availability zone
-        az = get_availability_zone(provider, idx)
+        # Add availability zone (round-robin, as get_availability_zone)
+        az = zones[idx % len(zones)] if zones else ''
         subnet_info["availabilityZone"] = az
         subnet_info["availability_zone"] = az
         subnet_info["zone"] = az
         subnet_info["region"] = az
         subnet_info["availabilityDomain"] = az
 
-        # Calculate reserved IPs
-        reserved = []
-        reserved_count = config['reserved_ip_count']
-        reserved_first = math.ceil(reserved_count / 2)
-        reserved_last = math.floor(reserved_count / 2)
+        subnet_info["reserved"] = _reserved_list(subnet_num, subnet_size, reserved_first, reserved_last)
 
-        # First reserved IPs
-        for j in range(reserved_first):
-            reserved.append(str(subnet_network.network_address + j))
+        subnets.append(subnet_info)
 
-        # Last reserved IPs
-        for j in range(reserved_last, 0, -1):
-            reserved.append(str(subnet_network.broadcast_address - j + 1))
+    return subnets
 
-        subnet_info["reserved"] = reserved
 
-        subnets.append(subnet_info)
+def calculate_subnets_excluding(
+    cidr: str,
+    num_subnets: int,
+    provider: str,
+    exclude: List[Tuple[int, int]],
+    desired_subnet_prefix: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Calculate subnets from the free space of a network after removing excluded ranges.
+
+    Subnets are the lowest aligned blocks of free space. Without a desired prefix
+    the largest subnets are used of which num_subnets still fit, starting from
+    the prefix calculate_subnets would pick.
+
+    Args:
+        cidr: Network CIDR (e.g., "10.0.0.0/16")
+        num_subnets: Number of subnets to create
+        provider: Cloud provider name
+        exclude: Normalized address set to keep free (cidr_sets intervals)
+        desired_subnet_prefix: Optional custom subnet prefix (e.g., 26 for /26)
+
+    Returns:
+        Dictionary with subnets array and the free space ('free', as CIDRs) they were
+        carved from, or an error message
+    """
+    config = get_cloud_provider_config(provider)
+
+    try:
+        base_network = ipaddress.ip_network(cidr, strict=False)
+    except ValueError as e:
+        return {
+            "subnets": [],
+            "error": f"Invalid CIDR notation. Use format: 10.0.0.0/16. Error: {e}"
+        }
+
+    if num_subnets < 1 or num_subnets > 256:
+        return {
+            "subnets": [],
+            "error": "Number of subnets must be between 1 and 256"
+        }
+
+    base_prefix = base_network.prefixlen
+    network_num = int(base_network.network_address)
+    free = cidr_sets.subtract([(network_num, network_num + PREFIX_SIZES[base_prefix] - 1)], exclude)
+
+    if desired_subnet_prefix is not None and desired_subnet_prefix > 0:
+        if not base_prefix <= desired_subnet_prefix <= 32:
+            return {
+                "subnets": [],
+                "error": f"Desired subnet prefix /{desired_subnet_prefix} does not fit in /{base_prefix}."
+            }
+        if not config['max_cidr_prefix'] <= desired_subnet_prefix <= config['min_cidr_prefix']:
+            return {
+                "subnets": [],
+                "error": f"Desired subnet prefix /{desired_subnet_prefix} is outside the cloud provider range "
+                        f"/{config['max_cidr_prefix']} - /{config['min_cidr_prefix']}."
+            }
+        candidates = [desired_subnet_prefix]
+    else:
+        first_prefix = max(base_prefix + math.ceil(math.log2(num_subnets)), config['max_cidr_prefix'])
+        candidates = list(range(first_prefix, min(config['min_cidr_prefix'], 32) + 1))
+
+    for prefix in candidates:
+        if cidr_sets.count_aligned_blocks(free, prefix) >= num_subnets:
+            starts = itertools.islice(cidr_sets.aligned_blocks(free, prefix), num_subnets)
+            return {"subnets": _subnet_records(starts, prefix, config), "free": cidr_sets.to_cidrs(free)}
+
+    smallest = candidates[-1] if candidates else config['min_cidr_prefix']
+    return {
+        "subnets": [],
+        "error": f"Cannot fit {num_subnets} subnets of /{smallest} or larger in the free space of {cidr} "
+                f"({cidr_sets.address_count(free):,} addresses after exclusions)."
+    }
+
+
+def reserved_ips(network: ipaddress.IPv4Network, provider_config: Dict[str, Any]) -> List[str]:
+    """
+    List the addresses a provider reserves in a subnet.
+
+    Args:
+        network: The subnet
+        provider_config: Cloud provider configuration
+
+    Returns:
+        Reserved addresses, lowest first
+    """
+    reserved_first, reserved_last = _reserved_table(provider_config['reserved_ip_count'])[0]
+    return _reserved_list(int(network.network_address), network.num_addresses, reserved_first, reserved_last)
+
+
+def _reserved_list(network_int: int, size: int, reserved_first: int, reserved_last: int) -> List[str]:
+    """Reserved addresses of an integer network: the first and last offsets, lowest first."""
+    last = network_int + size - reserved_last
+    return (
+        [_ip_str(network_int + j) for j in range(reserved_first)]
+        + [_ip_str(last + j) for j in range(reserved_last)]
+    )
+
+
+def calculate_region_layout(
+    cidr: str,
+    provider: str,
+    regions: List[str],
+    tiers: List[str],
+    zones_per_region: Optional[int] = None,
+    subnet_prefix: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Lay out tiers x zones subnets across one or more regions in one pass.
 
-    return {"subnets": subnets}
+    The supernet is split into one block per region, each region block into
+    one block per tier and each tier block into one subnet per zone, so the
+    same tier/zone cell sits at the same offset in every region.
+
+    Args:
+        cidr: Supernet CIDR shared by all regions (e.g., "10.0.0.0/14")
+        provider: Cloud provider name
+        regions: Region names from the zone catalogue
+        tiers: Tier names (e.g., ["public", "private", "data"])
+        zones_per_region: Zones per region (default: up to 3 per region)
+        subnet_prefix: Optional custom subnet prefix, at most the size of a tier/zone cell
+
+    Returns:
+        Dictionary with a regions array (region, cidr, zones, subnets) and optional error message
+    """
+    config = get_cloud_provider_config(provider)
+
+    try:
+        base_network = ipaddress.ip_network(cidr, strict=False)
+    except ValueError as e:
+        return {
+            "regions": [],
+            "error": f"Invalid CIDR notation. Use format: 10.0.0.0/16. Error: {e}"
+        }
+
+    if not regions:
+        return {"regions": [], "error": "At least one region is required"}
+    if len(set(regions)) != len(regions):
+        return {"regions": [], "error": "Regions must be unique"}
+    if not tiers:
+        return {"regions": [], "error": "At least one tier is required"}
+    if len(set(tiers)) != len(tiers):
+        return {"regions": [], "error": "Tier names must be unique"}
+
+    try:
+        region_zones = [select_zones(provider, region, zones_per_region) for region in regions]
+        # Every region uses the same grid so offsets line up across regions
+        num_zones = max(len(zones) for zones in region_zones)
+        region_blocks = split_blocks(base_network, len(regions))
+        grids = [
+            layout_grid(block, len(tiers), num_zones, subnet_prefix)
+            for block in region_blocks
+        ]
+    except ValueError as e:
+        return {"regions": [], "error": str(e)}
+
+    cell_prefix = grids[0][0][2].prefixlen
+    if cell_prefix > config['min_cidr_prefix']:
+        return {
+            "regions": [],
+            "error": f"Each subnet would be /{cell_prefix}, smaller than /{config['min_cidr_prefix']} "
+                    f"(cloud provider minimum). Use a larger CIDR or fewer regions, tiers or zones."
+        }
+    if cell_prefix < config['max_cidr_prefix']:
+        return {
+            "regions": [],
+            "error": f"Subnet prefix /{cell_prefix} is larger than cloud provider maximum "
+                    f"/{config['max_cidr_prefix']}."
+        }
+
+    layout = []
+    for region, zones, block, grid in zip(regions, region_zones, region_blocks, grids):
+        subnets = []
+        for tier_idx, zone_idx, subnet_network in grid:
+            if zone_idx >= len(zones):
+                # Region has fewer zones than the widest region; keep the cell free
+                continue
+            zone = zones[zone_idx]
+            subnet_info = calculate_network_info(subnet_network, config)
+            subnet_info["name"] = f"{tiers[tier_idx]}-{zone}"
+            subnet_info["index"] = len(subnets) + 1
+            subnet_info["tier"] = tiers[tier_idx]
+            subnet_info["zoneIndex"] = zone_idx
+            subnet_info["availabilityZone"] = zone
+            subnet_info["availability_zone"] = zone
+            subnet_info["zone"] = zone
+            subnet_info["region"] = region
+            subnet_info["availabilityDomain"] = zone
+            subnet_info["reserved"] = reserved_ips(subnet_network, config)
+            subnets.append(subnet_info)
+
+        layout.append({
+            "region": region,
+            "cidr": str(block),
+            "zones": zones,
+            "subnets": subnets
+        })
+
+    return {"regions": layout}
 
 
 def generate_hub_spoke_topology(
@@ -291,8 +636,23 @@ def generate_hub_spoke_topology(
         hub_prefix: Optional custom subnet prefix for hub
 
     Returns:
-        Dictionary with hub and spokes information
+        Dictionary with hub and spokes information (read-only, memoized)
     """
+    return _cached_hub_spoke_topology(
+        hub_cidr, hub_subnets, tuple(spoke_cidrs), tuple(spoke_subnets_list), provider.lower(), hub_prefix
+    )
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _cached_hub_spoke_topology(
+    hub_cidr: str,
+    hub_subnets: int,
+    spoke_cidrs: Tuple[str, ...],
+    spoke_subnets_list: Tuple[int, ...],
+    provider: str,
+    hub_prefix: Optional[int]
+) -> Dict[str, Any]:
+    """Memoized, frozen generate_hub_spoke_topology; the CIDRs are echoed in the result, so keys keep them as given."""
     # Calculate hub network
     hub_result = calculate_subnets(hub_cidr, hub_subnets, provider, hub_prefix)
     if "error" in hub_result:
@@ -329,11 +689,120 @@ def generate_hub_spoke_topology(
             "index": idx + 1
         })
 
-    return {
+    return freeze({
         "hub": hub,
         "spokes": spokes,
         "peeringEnabled": len(spokes) > 0
+    })
+
+
+def generate_topology(
+    topology: str,
+    hub_cidr: str,
+    hub_subnets: int,
+    spoke_cidrs: List[str],
+    spoke_subnets_list: List[int],
+    provider: str,
+    hub_prefix: Optional[int] = None,
+    hub_cidrs: Optional[List[str]] = None,
+    spoke_hubs: Optional[List[int]] = None,
+    hub_locations: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Generate a multi-network topology with its peering graph.
+
+    Spokes keep their positions (spoke1..spokeN). Additional hubs for the
+    multi-hub topology are appended after the spokes and reuse the primary
+    hub's subnet count and prefix.
+
+    Args:
+        topology: Topology name (hub-spoke, mesh, multi-hub, transit-gateway)
+        hub_cidr: Primary hub VNet/VPC CIDR
+        hub_subnets: Number of subnets in each hub
+        spoke_cidrs: List of spoke VNet/VPC CIDRs
+        spoke_subnets_list: List of subnet counts for each spoke
+        provider: Cloud provider name
+        hub_prefix: Optional custom subnet prefix for hubs
+        hub_cidrs: Additional hub CIDRs (multi-hub only)
+        spoke_hubs: Optional 1-based hub number per spoke (multi-hub only)
+        hub_locations: Optional region per additional hub (multi-hub only);
+            spokes inherit the location of their hub
+
+    Returns:
+        Dictionary with hub, spokes, topology, peerings (pairs of network
+        indices, 0 = primary hub) and, for transit-gateway, the attachments
+    """
+    try:
+        validate_topology(topology, provider)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    hub_cidrs = hub_cidrs or []
+    if topology != 'multi-hub' and (hub_cidrs or spoke_hubs or hub_locations):
+        return {"error": "Additional hubs and spoke hub assignments require the multi-hub topology"}
+    if hub_locations and len(hub_locations) != len(hub_cidrs):
+        return {"error": "Number of hub locations must match number of additional hub CIDRs"}
+
+    result = generate_hub_spoke_topology(
+        hub_cidr, hub_subnets, spoke_cidrs, spoke_subnets_list, provider, hub_prefix
+    )
+    if "error" in result:
+        return result
+
+    config = get_cloud_provider_config(provider)
+    networks = [dict(spoke, role="spoke") for spoke in result["spokes"]]
+
+    for hub_number, cidr in enumerate(hub_cidrs, 2):
+        hub_result = calculate_subnets(cidr, hub_subnets, provider, hub_prefix)
+        if "error" in hub_result:
+            return {"error": f"Hub {hub_number} network error: {hub_result['error']}"}
+
+        hub_network = {
+            "cidr": cidr,
+            "numberOfSubnets": hub_subnets,
+            "vnetInfo": calculate_network_info(ipaddress.ip_network(cidr, strict=False), config),
+            "subnets": hub_result["subnets"],
+            "index": len(networks) + 1,
+            "role": "hub"
+        }
+        if hub_locations:
+            hub_network["location"] = hub_locations[hub_number - 2]
+        networks.append(hub_network)
+
+    num_spokes = len(spoke_cidrs)
+    if topology == 'mesh':
+        pairs = full_mesh_pairs(len(networks) + 1)
+    elif topology == 'multi-hub':
+        hub_indices = [0] + list(range(num_spokes + 1, len(networks) + 1))
+        try:
+            hub_of = assign_spokes_to_hubs(num_spokes, hub_indices, spoke_hubs)
+        except ValueError as e:
+            return {"error": str(e)}
+
+        for spoke, hub_idx in zip(networks, hub_of):
+            spoke["hubIndex"] = hub_idx
+            if hub_idx and "location" in networks[hub_idx - 1]:
+                spoke["location"] = networks[hub_idx - 1]["location"]
+
+        pairs = multi_hub_pairs(hub_of + [None] * len(hub_cidrs))
+    elif topology == 'transit-gateway':
+        pairs = []
+    else:
+        pairs = hub_spoke_pairs(num_spokes)
+
+    topology_result = {
+        "hub": result["hub"],
+        "spokes": networks,
+        "topology": topology,
+        "peerings": [list(pair) for pair in pairs],
+        "peeringEnabled": len(pairs) > 0
     }
+    if topology == 'transit-gateway':
+        topology_result["transitGateway"] = {
+            "attachments": list(range(len(networks) + 1))
+        }
+
+    return topology_result
 
 
 def format_network_info(cidr: str, subnets: List[Dict[str, Any]], provider: str) -> str:
@@ -358,6 +827,8 @@ def format_network_info(cidr: str, subnets: List[Dict[str, Any]], provider: str)
 
     for subnet in subnets:
         output += f'  Subnet {subnet["index"]}:\n'
+        if "tier" in subnet:
+            output += f'    Tier:           {subnet["tier"]}\n'
         output += f'    CIDR:           {subnet["cidr"]}\n'
         output += f'    Network:        {subnet["network"]}\n'
         output += f'    Mask:           {subnet["mask"]}\n'
@@ -382,6 +853,442 @@ def format_network_info(cidr: str, subnets: List[Dict[str, Any]], provider: str)
     return output
 
 
+def format_region_layout(cidr: str, regions: List[Dict[str, Any]], provider: str) -> str:
+    """Format a multi-region layout as human-readable text, one network block per region."""
+    output = '\n'
+    output += '═══════════════════════════════════════════════════════════\n'
+    output += f'  Region Layout - {provider.upper()}\n'
+    output += '═══════════════════════════════════════════════════════════\n\n'
+    output += f'  Supernet:         {cidr}\n'
+    output += f'  Regions:          {len(regions)}\n'
+    for region in regions:
+        output += f'    {region["region"]:<24}{region["cidr"]:<20}{", ".join(region["zones"])}\n'
+    output += '\n'
+
+    for region in regions:
+        output += f'  Region: {region["region"]}\n'
+        output += format_network_info(region["cidr"], region["subnets"], provider)
+
+    return output
+
+
+def format_lookup_results(results: List[Dict[str, Any]]) -> str:
+    """Format single-address lookups as human-readable text."""
+    output = '\n'
+    output += '═══════════════════════════════════════════════════════════\n'
+    output += '  Address Lookup\n'
+    output += '═══════════════════════════════════════════════════════════\n\n'
+    for result in results:
+        output += f'  IP:               {result["ip"]}\n'
+        if result["matched"]:
+            output += f'    Subnet:         {result["subnet"]} ({result["name"]})\n'
+        else:
+            output += '    Subnet:         (none)\n'
+        if result.get("network"):
+            output += f'    Network:        {result["network"]} ({result["networkCidr"]})\n'
+        if result.get("zone"):
+            output += f'    Zone:           {result["zone"]}\n'
+        output += '\n'
+    return output
+
+
+def format_lookup_summary(summary: Dict[str, Any], provider: str) -> str:
+    """Format bulk classification counts per subnet as human-readable text."""
+    output = '\n'
+    output += '═══════════════════════════════════════════════════════════\n'
+    output += f'  Address Classification - {provider.upper()}\n'
+    output += '═══════════════════════════════════════════════════════════\n\n'
+    output += f'  Addresses:        {summary["total"]:,}\n'
+    output += f'  Unmatched:        {summary["unmatched"]:,}\n'
+    output += f'  Rejected:         {summary["rejected"]:,}\n\n'
+    for record in summary["subnets"]:
+        output += f'    {record["subnet"]:<20}{record["network"]:<12}{record["zone"]:<16}{record["count"]:>12,}\n'
+    output += '\n'
+    return output
+
+
+def _run_lookup(plan: Dict[str, Any], cidr: str, target: str, provider: str,
+                output_format: str, file_path: Optional[str]) -> None:
+    """Resolve the addresses given to --lookup (IPs or a file of IPs) against a plan."""
+    index = SubnetLookup(plan, cidr)
+    if os.path.isfile(target):
+        with open(target) as f:
+            addresses, rejected = parse_ipv4_addresses(f)
+        summary = index.summarize(index.classify(addresses))
+        summary["rejected"] = len(rejected)
+        if output_format == "json":
+            _write_output(json.dumps(summary, indent=2), file_path)
+        else:
+            _write_output(format_lookup_summary(summary, provider), file_path)
+        return
+
+    results = [index.lookup(ip) for ip in _split_list(target)]
+    if output_format == "json":
+        _write_output(json.dumps(results, indent=2), file_path)
+    else:
+        _write_output(format_lookup_results(results), file_path)
+
+
+def format_plan_diff(diff: Dict[str, Any]) -> str:
+    """Format a plan diff as human-readable text."""
+    output = '\n'
+    output += '═══════════════════════════════════════════════════════════\n'
+    output += '  Plan Diff\n'
+    output += '═══════════════════════════════════════════════════════════\n\n'
+    for kind in ('added', 'removed', 'resized', 'renumbered'):
+        output += f'  {kind.capitalize() + ":":<18}{len(diff[kind])}\n'
+    output += f'  {"Unchanged:":<18}{diff["unchanged"]}\n\n'
+
+    for network in diff["networks"]:
+        output += f'  {network["network"]:<18}{network["old"] or "(none)"} -> {network["new"] or "(none)"}\n'
+    if diff["networks"]:
+        output += '\n'
+    for kind, sign in (('added', '+'), ('removed', '-')):
+        for subnet in diff[kind]:
+            output += f'  {sign} {subnet["network"] + "/" + subnet["name"]:<28}{subnet["cidr"]}\n'
+    for kind, sign in (('resized', '~'), ('renumbered', '>')):
+        for subnet in diff[kind]:
+            output += f'  {sign} {subnet["network"] + "/" + subnet["name"]:<28}{subnet["old"]} -> {subnet["new"]}\n'
+
+    if diff["released"] or diff["allocated"]:
+        output += '\n'
+        output += f'  Released:         {", ".join(diff["released"]) or "(none)"}\n'
+        output += f'  Allocated:        {", ".join(diff["allocated"]) or "(none)"}\n'
+    if diff["conflicts"]:
+        output += '\n  Remove before create (new range overlaps another old subnet):\n'
+        for conflict in diff["conflicts"]:
+            overlaps = ', '.join(conflict["overlaps"])
+            output += f'    {conflict["network"] + "/" + conflict["name"]:<28}{conflict["cidr"]} overlaps {overlaps}\n'
+    output += '\n'
+    return output
+
+
+def format_route_tables(route_tables: Dict[str, Any]) -> str:
+    """Format summarized route tables as human-readable text."""
+    output = '───────────────────────────────────────────────────────────\n'
+    output += '  Route Tables\n'
+    output += '───────────────────────────────────────────────────────────\n\n'
+    output += f'  Next Hop:         {route_tables["nextHop"]}\n\n'
+    for idx, network in enumerate(route_tables["networks"]):
+        name = 'Hub' if idx == 0 else f'Spoke {idx}'
+        routes = ', '.join(network["routes"]) or '(none)'
+        output += f'  {name + ":":<18}{routes}\n'
+    output += '\n'
+    return output
+
+
+def render_outputs(
+    plan: NetworkPlan,
+    formats: List[str],
+    templates_dir: str = TEMPLATES_DIR,
+    compact: bool = False,
+    minify: bool = False
+) -> Dict[str, str]:
+    """
+    Render one plan in several output formats.
+
+    The template data is built once and shared by every template format.
+
+    Args:
+        plan: Plan IR (network_ir.build_plan)
+        formats: Output formats: info, json or template formats of the provider
+        templates_dir: Directory containing templates
+        compact: Render Terraform, Bicep and ARM in the compact loop-based layout
+            (template_processor.COMPACT_TEMPLATES)
+        minify: Render JSON formats (json_output.JSON_FORMATS) on one line without whitespace
+
+    Returns:
+        Rendered text per format, in the order given. A CloudFormation plan over the
+        per-template quotas renders as the parent stack of render_nested_stacks.
+
+    Raises:
+        ValueError: If a format is not supported, or the compact layout cannot render the plan
+        FileNotFoundError, NotImplementedError: If a template is missing
+    """
+    outputs = {}
+    template_data = None
+    for output_format in formats:
+        if output_format == 'info':
+            output = format_network_info(plan.cidr, plan.subnet_records(), plan.provider)
+            if plan.next_hop is not None:
+                output += format_route_tables(plan.route_tables())
+        elif output_format == 'json':
+            output = dumps(plan.json_data(), minify=True) if minify else json.dumps(plan.json_data(), indent=2)
+        else:
+            if not TEMPLATE_PROCESSOR_AVAILABLE:
+                raise ValueError("Template processor not available. Install required dependencies.")
+            if template_data is None:
+                template_data = plan.template_data()
+                if compact:
+                    template_data["compact"] = True
+            if output_format == 'terraform-json':
+                output = process_terraform_json(plan.provider, template_data, minify)
+            elif output_format == 'cloudformation-json':
+                output = process_cloudformation_json(template_data, minify)
+            else:
+                output = process_template(plan.provider, output_format, template_data, templates_dir)
+                if minify and output_format == 'arm':
+                    output = minify_json(output)
+        outputs[output_format] = output
+    return outputs
+
+
+def check_outputs(plan: NetworkPlan, formats: List[str], compact: bool = False) -> None:
+    """
+    Check that render_outputs can render a plan in formats, without rendering them.
+
+    Lets callers that render formats one at a time (streamed archives) reject
+    a plan before producing any output.
+
+    Args:
+        plan: Plan IR (network_ir.build_plan)
+        formats: Output formats, as for render_outputs
+        compact: As for render_outputs
+
+    Raises:
+        ValueError: If a format cannot render the plan
+    """
+    template_formats = [f for f in formats if f not in ('info', 'json')]
+    if not template_formats:
+        return
+    if not TEMPLATE_PROCESSOR_AVAILABLE:
+        raise ValueError("Template processor not available. Install required dependencies.")
+    template_data = plan.template_data()
+    if compact:
+        template_data["compact"] = True
+    for output_format in template_formats:
+        if output_format == 'terraform-json':
+            check_terraform_json(plan.provider, template_data)
+        elif output_format == 'cloudformation-json':
+            check_cloudformation_json(template_data)
+        else:
+            check_template(plan.provider, output_format, template_data)
+
+
+def render_nested_stacks(plan: NetworkPlan, templates_dir: str = TEMPLATES_DIR) -> Dict[str, str]:
+    """
+    Render the nested subnet stacks of a CloudFormation plan over the per-template quotas.
+
+    render_outputs then renders the cloudformation format as their parent stack.
+
+    Args:
+        plan: Plan IR (network_ir.build_plan)
+        templates_dir: Directory containing templates
+
+    Returns:
+        Nested stack templates keyed by path relative to the parent template;
+        empty when the plan fits one template or is not an AWS plan
+    """
+    if plan.provider != 'aws' or not TEMPLATE_PROCESSOR_AVAILABLE:
+        return {}
+    return process_cloudformation_nested_stacks(plan.template_data(), templates_dir)
+
+
+def render_terraform_roots(plan: NetworkPlan, templates_dir: str = TEMPLATES_DIR) -> Dict[str, str]:
+    """
+    Render a hub-spoke plan as a Terraform root for the hub and one per spoke.
+
+    Each root keeps its own state; spoke roots find the hub by name and can be
+    applied in parallel once the hub root is applied.
+
+    Args:
+        plan: Plan IR (network_ir.build_plan)
+        templates_dir: Directory containing templates
+
+    Returns:
+        Terraform code keyed by relative path: hub/main.tf and spokes/spoke<n>/main.tf
+
+    Raises:
+        ValueError: If the plan is not an Azure or GCP hub-spoke plan with spokes, or has route tables
+    """
+    if not TEMPLATE_PROCESSOR_AVAILABLE:
+        raise ValueError("Template processor not available. Install required dependencies.")
+    return process_terraform_roots(plan.provider, plan.template_data(), templates_dir)
+
+
+def render_environments(
+    provider: str,
+    plans: Mapping[str, NetworkPlan],
+    name_prefix: str = 'ipcalc',
+    templates_dir: str = TEMPLATES_DIR
+) -> Dict[str, str]:
+    """
+    Render one shared Terraform module and the variable values of every environment.
+
+    The module is the compact Terraform layout without network defaults; each
+    environment is a .tfvars.json holding only its name, CIDR and subnet map.
+
+    Args:
+        provider: Cloud provider of every plan
+        plans: Plan IR per environment name
+        name_prefix: Resource name prefix; environments are named <prefix>-<environment>
+        templates_dir: Directory containing templates
+
+    Returns:
+        File contents keyed by relative path: main.tf and environments/<name>.tfvars.json
+
+    Raises:
+        ValueError: If a plan has spokes or route tables, or the provider has no compact Terraform
+    """
+    if not TEMPLATE_PROCESSOR_AVAILABLE:
+        raise ValueError("Template processor not available. Install required dependencies.")
+    files = {'main.tf': process_terraform_module(provider, templates_dir, name_prefix)}
+    for name, plan in plans.items():
+        tfvars = terraform_tfvars(provider, plan.template_data(), f'{name_prefix}-{name}')
+        files[f'environments/{name}.tfvars.json'] = json.dumps(tfvars, indent=2) + '\n'
+    return files
+
+
+def _parse_environments(value: str) -> Dict[str, str]:
+    """Parse --environments "name=cidr,..." (or a file with one name=cidr per line) into CIDRs by name."""
+    if os.path.isfile(value):
+        with open(value) as f:
+            items = [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+    else:
+        items = _split_list(value)
+    environments = {}
+    for item in items:
+        name, sep, cidr = item.partition('=')
+        name = name.strip()
+        if not sep or not _ENVIRONMENT_NAME.match(name) or not cidr.strip():
+            raise ValueError(f"Invalid environment '{item}'. Expected name=CIDR, e.g. dev=10.0.0.0/16; "
+                             f"names use letters, digits, '-' and '_'")
+        if name in environments:
+            raise ValueError(f"Environment '{name}' is listed more than once")
+        environments[name] = cidr.strip()
+    if not environments:
+        raise ValueError("--environments lists no environments")
+    return environments
+
+
+def _run_environments(args: argparse.Namespace) -> None:
+    """Calculate every --environments network and write the shared module and tfvars files."""
+    environments = _parse_environments(args.environments)
+    plans = {}
+    for name, cidr in environments.items():
+        result = calculate_subnets(cidr, args.subnets, args.provider, args.subnet_prefix)
+        if "error" in result:
+            raise ValueError(f"Environment '{name}': {result['error']}")
+        plans[name] = build_plan(args.provider, cidr, result, args.prefix)
+    files = render_environments(args.provider, plans, args.prefix)
+    if args.output_dir:
+        _write_directory(files, args.output_dir)
+        return
+    _write_files(files, args.file)
+    print(f"Output written to: {args.file} (main.tf and {len(plans)} environment tfvars files)")
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    """Split a comma-separated CLI value into stripped, non-empty items."""
+    if not value:
+        return []
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _parse_spoke_hubs(value: Optional[str], num_hubs: int) -> Optional[List[int]]:
+    """Parse --spoke-hubs "1,2,..." into 1-based hub numbers (1 = primary hub); None when not given."""
+    items = _split_list(value)
+    if not items:
+        return None
+    for item in items:
+        if not item.isdigit() or not 1 <= int(item) <= num_hubs:
+            raise ValueError(f"Invalid --spoke-hubs value '{item}'. Expected a comma-separated hub number per "
+                             f"spoke, from 1 (primary hub) to {num_hubs} (the last --hub-cidrs hub)")
+    return [int(item) for item in items]
+
+
+def _parse_quotas(value: Optional[str]) -> Dict[str, int]:
+    """Parse --quotas "name=value,..." into quota overrides."""
+    quotas = {}
+    for item in _split_list(value):
+        name, sep, number = item.partition('=')
+        name = name.strip()
+        if not sep or name not in LIMIT_CHECKS or not number.strip().isdigit():
+            raise ValueError(
+                f"Invalid quota override '{item}'. Use name=value with one of: {', '.join(LIMIT_CHECKS)}"
+            )
+        quotas[name] = int(number)
+    return quotas
+
+
+def _check_limits(plans: List[Dict[str, Any]], provider: str, quotas: Dict[str, int], strict: bool) -> None:
+    """Report quota violations on stderr; exit when strict."""
+    violations = validate_plans(plans, provider, quotas)
+    label = "Error" if strict else "Warning"
+    for violation in violations:
+        print(f"{label}: {violation['message']}", file=sys.stderr)
+    if violations and strict:
+        sys.exit(1)
+
+
+def _write_output(output: str, file_path: Optional[str]) -> None:
+    """Write CLI output to a file, or to stdout when no file is given."""
+    if file_path:
+        with open(file_path, 'w') as f:
+            f.write(output)
+        print(f"Output written to: {file_path}")
+    else:
+        print(output)
+
+
+def _write_outputs(
+    outputs: Dict[str, str],
+    file_path: Optional[str],
+    nested_stacks: Optional[Dict[str, str]] = None,
+    output_dir: Optional[str] = None
+) -> None:
+    """
+    Write one output like _write_output, or several into the directory file_path (one file per format).
+
+    nested_stacks (render_nested_stacks) are written next to the CloudFormation template.
+    With output_dir, every output is a file in that directory, written by _write_directory.
+    """
+    if output_dir:
+        files = {OUTPUT_FILES[f]: output for f, output in outputs.items()}
+        files.update(nested_stacks or {})
+        _write_directory(files, output_dir)
+        return
+    if nested_stacks and not file_path:
+        raise ValueError(f"The CloudFormation template exceeds the per-template quotas and is split into "
+                         f"{len(nested_stacks)} nested stacks; use --file to write them")
+    if len(outputs) == 1:
+        _write_output(next(iter(outputs.values())), file_path)
+        base_dir = os.path.dirname(file_path or '')
+    else:
+        paths = _write_files({OUTPUT_FILES[f]: output for f, output in outputs.items()}, file_path)
+        for path in paths:
+            print(f"Output written to: {path}")
+        base_dir = file_path
+    for path in _write_files(nested_stacks or {}, base_dir):
+        print(f"Output written to: {path}")
+
+
+def _write_directory(files: Dict[str, str], directory: str) -> None:
+    """Write files into directory, only those whose content changed (output_dir.write_directory)."""
+    written, unchanged = write_directory(files, directory)
+    for relative_path in written:
+        print(f"Output written to: {os.path.join(directory, relative_path)}")
+    print(f"{directory}: {len(written)} written, {len(unchanged)} unchanged")
+
+
+def _write_files(files: Dict[str, str], directory: str) -> List[str]:
+    """Write files keyed by path relative to directory, creating directories as needed; returns the paths."""
+    paths = []
+    for relative_path, content in files.items():
+        path = os.path.join(directory, relative_path)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        paths.append(path)
+    return paths
+
+
+def _export_plan(output_data: Dict[str, Any], provider: str, output_format: str, file_path: str) -> None:
+    """Write a plan as Arrow or Parquet to file_path."""
+    rows = write_plan(output_data, provider, file_path, output_format)
+    print(f"Output written to: {file_path} ({rows} subnets)")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="IP Calculator for Cloud Network Generation",
@@ -405,26 +1312,71 @@ Examples:
   # Custom resource name prefix
   %(prog)s --provider azure --cidr 10.0.0.0/16 --subnets 4 \\
     --prefix myapp --output terraform
+
+  # Full-mesh peering between hub and spokes
+  %(prog)s --provider azure --cidr 10.0.0.0/16 --subnets 2 \\
+    --spoke-cidrs "10.1.0.0/16,10.2.0.0/16,10.3.0.0/16" --topology mesh \\
+    --output terraform
+
+  # Two regional hubs peered with each other, spokes split between them
+  %(prog)s --provider azure --cidr 10.0.0.0/16 --subnets 2 \\
+    --hub-cidrs "10.100.0.0/16" --hub-locations "westeurope" \\
+    --spoke-cidrs "10.1.0.0/16,10.2.0.0/16" --topology multi-hub \\
+    --output terraform
+
+  # AWS VPCs attached to a Transit Gateway
+  %(prog)s --provider aws --cidr 10.0.0.0/16 --subnets 3 \\
+    --spoke-cidrs "10.1.0.0/16,10.2.0.0/16" --topology transit-gateway \\
+    --output terraform
+
+  # Public/private/data tiers in 3 AZs of two regions
+  %(prog)s --provider aws --cidr 10.0.0.0/15 \\
+    --regions "us-east-1,eu-west-1" --tiers "public,private,data" --zones-per-region 3
+
+  # Terraform, CLI script and JSON plan from one calculation, written to ./out
+  %(prog)s --provider azure --cidr 10.0.0.0/16 --subnets 4 \\
+    --output terraform,cli,json --file out
+
+  # Terraform with one subnet map and for_each resources keyed by CIDR
+  %(prog)s --provider aws --cidr 10.0.0.0/16 --subnets 64 \\
+    --output terraform --compact
+
+  # ARM template with copy loops over subnet and spoke arrays
+  %(prog)s --provider azure --cidr 10.0.0.0/16 --subnets 64 \\
+    --spoke-cidrs "10.1.0.0/16,10.2.0.0/16" --output arm --compact
+
+  # Minified CloudFormation template in JSON
+  %(prog)s --provider aws --cidr 10.0.0.0/16 --subnets 4 \\
+    --output cloudformation-json --minify
+
+  # One shared Terraform module plus a .tfvars.json per environment, written to ./envs
+  %(prog)s --provider aws --subnets 4 --output terraform --file envs \\
+    --environments "dev=10.0.0.0/16,test=10.1.0.0/16,prod=10.2.0.0/16"
+
+  # Hub root plus one Terraform root (and state) per spoke, written to ./roots
+  %(prog)s --provider azure --cidr 10.0.0.0/16 --subnets 2 \\
+    --spoke-cidrs "10.1.0.0/16,10.2.0.0/16" --output terraform --split-roots --file roots
+
+  # Regenerate into a GitOps checkout, rewriting only files whose content changed
+  %(prog)s --provider aws --cidr 10.0.0.0/16 --subnets 4 \\
+    --output terraform,cloudformation,json --output-dir network
         """
     )
 
     # Required arguments
     parser.add_argument(
         "--provider",
-        required=True,
         choices=list(CLOUD_PROVIDERS.keys()),
         help="Cloud provider"
     )
     parser.add_argument(
         "--cidr",
-        required=True,
         help="Network CIDR (e.g., 10.0.0.0/16)"
     )
     parser.add_argument(
         "--subnets",
         type=int,
-        required=True,
-        help="Number of subnets to create (1-256)"
+        help="Number of subnets to create (1-256); not used with --regions"
     )
 
     # Optional arguments
@@ -441,11 +1393,38 @@ Examples:
     parser.add_argument(
         "--output",
         default="info",
-        help="Output type (default: info)"
+        help="Output type, or a comma-separated list of types rendered from one calculation (default: info)"
     )
     parser.add_argument(
         "--file",
-        help="Write output to file instead of stdout"
+        help="Write output to file instead of stdout (a directory when --output lists several types)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Write every output as a file in this directory, rewriting only files whose content changed "
+             "(content hash manifest, atomic renames)"
+    )
+    parser.add_argument(
+        "--environments",
+        help="Comma-separated name=CIDR pairs, or a file with one per line: write one shared Terraform module "
+             "and a .tfvars.json per environment into the --file directory (no --cidr needed)"
+    )
+    parser.add_argument(
+        "--split-roots",
+        action="store_true",
+        help="Terraform hub-spoke output: a hub root and one root per spoke (hub/, spokes/spoke<n>/), each with "
+             "its own state, written into the --file or --output-dir directory"
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Terraform, Bicep and ARM output: subnets as one map/array parameter with CIDR-derived names, "
+             "deployed by for_each, for-expressions or copy loops"
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="JSON output (json, arm, terraform-json, cloudformation-json): one line without whitespace"
     )
 
     # Hub-spoke topology options
@@ -457,6 +1436,82 @@ Examples:
         "--spoke-subnets",
         help="Comma-separated list of subnet counts per spoke"
     )
+    parser.add_argument(
+        "--topology",
+        default="hub-spoke",
+        choices=list(TOPOLOGIES.keys()),
+        help="Peering topology between hub and spokes (default: hub-spoke)"
+    )
+    parser.add_argument(
+        "--hub-cidrs",
+        help="Comma-separated list of additional hub CIDRs (multi-hub topology)"
+    )
+    parser.add_argument(
+        "--hub-locations",
+        help="Comma-separated list of regions for the additional hubs (multi-hub topology)"
+    )
+    parser.add_argument(
+        "--spoke-hubs",
+        help="Comma-separated hub number per spoke, 1 = primary hub (multi-hub topology)"
+    )
+
+    # Region layout options
+    parser.add_argument(
+        "--regions",
+        help="Comma-separated list of regions to lay out tiers x zones subnets in"
+    )
+    parser.add_argument(
+        "--tiers",
+        default="public,private",
+        help="Comma-separated list of subnet tiers per zone (default: public,private)"
+    )
+    parser.add_argument(
+        "--zones-per-region",
+        type=int,
+        help="Availability zones per region (default: up to 3)"
+    )
+
+    # Route table options
+    parser.add_argument(
+        "--routes",
+        action="store_true",
+        help="Add route tables with summarized spoke routes (hub-spoke and transit-gateway)"
+    )
+    parser.add_argument(
+        "--next-hop",
+        help="Appliance IP in the hub for hub-spoke routes (default: first usable IP of hub subnet 1)"
+    )
+
+    # Exclusion options
+    parser.add_argument(
+        "--exclude",
+        help="Comma-separated CIDRs/ranges, or a file with one per line, to keep out of the subnets"
+    )
+
+    # Lookup options
+    parser.add_argument(
+        "--lookup",
+        help="Comma-separated IPs, or a file with one IP per line, to resolve to subnets of the plan"
+    )
+
+    # Plan diff options
+    parser.add_argument(
+        "--diff",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Compare two plans written with --output json (no --provider/--cidr needed)"
+    )
+
+    # Limits validation options
+    parser.add_argument(
+        "--strict-limits",
+        action="store_true",
+        help="Fail instead of warning when the plan exceeds provider quotas"
+    )
+    parser.add_argument(
+        "--quotas",
+        help="Comma-separated quota overrides, e.g. subnets_per_network=400"
+    )
 
     # Legacy compatibility
     parser.add_argument(
@@ -469,19 +1524,141 @@ Examples:
     if args.base_cidr and not args.cidr:
         args.cidr = args.base_cidr
 
-    # Validate output format for provider
-    if not validate_output_format(args.provider, args.output):
-        config = get_cloud_provider_config(args.provider)
-        supported = ', '.join(config['supported_outputs'])
-        print(f"Error: Invalid output type for {args.provider}. Supported: {supported}", file=sys.stderr)
+    if args.output_dir and (args.file or args.diff or args.lookup or args.output in EXPORT_FORMATS):
+        print("Error: --output-dir cannot be combined with --file, --diff, --lookup or --output "
+              f"{'/'.join(EXPORT_FORMATS)}", file=sys.stderr)
         sys.exit(1)
 
+    if args.diff:
+        if args.output not in ("info", "json"):
+            print("Error: --diff supports --output info or json", file=sys.stderr)
+            sys.exit(1)
+        try:
+            diff = diff_files(*args.diff)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        output = json.dumps(diff, indent=2) if args.output == "json" else format_plan_diff(diff)
+        _write_output(output, args.file)
+        return
+
+    if args.environments:
+        if not args.provider or args.subnets is None:
+            parser.error("--environments requires --provider and --subnets")
+        if args.output != "terraform" or not (args.file or args.output_dir):
+            print("Error: --environments requires --output terraform and --file or --output-dir "
+                  "(the directory to write to)", file=sys.stderr)
+            sys.exit(1)
+        if args.cidr or args.spoke_cidrs or args.regions or args.routes or args.exclude or args.lookup \
+                or args.topology != 'hub-spoke':
+            print("Error: --environments renders single networks; it cannot be combined with --cidr, spoke, "
+                  "region, route, exclude or lookup options", file=sys.stderr)
+            sys.exit(1)
+        try:
+            _run_environments(args)
+        except (ValueError, FileNotFoundError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    missing = [option for option, value in (("--provider", args.provider), ("--cidr", args.cidr)) if not value]
+    if missing:
+        parser.error(f"the following arguments are required: {', '.join(missing)}")
+
+    if args.subnets is None and not args.regions:
+        parser.error("the following arguments are required: --subnets")
+
+    # Several formats are rendered from one calculation into a directory
+    formats = _split_list(args.output) or [args.output]
+    if len(formats) == 1:
+        args.output = formats[0]
+    elif not (args.file or args.output_dir):
+        print("Error: several --output types require --file or --output-dir (the directory to write them to)",
+              file=sys.stderr)
+        sys.exit(1)
+    elif len(set(formats)) != len(formats):
+        print("Error: --output lists a type more than once", file=sys.stderr)
+        sys.exit(1)
+
+    # Validate output format for provider
+    for output_format in formats:
+        if output_format in EXPORT_FORMATS:
+            # Columnar exports are binary and available for every provider
+            if len(formats) > 1:
+                print(f"Error: --output {output_format} cannot be combined with other types", file=sys.stderr)
+                sys.exit(1)
+            if not args.file:
+                print(f"Error: --output {output_format} requires --file", file=sys.stderr)
+                sys.exit(1)
+            if not PYARROW_AVAILABLE:
+                print(f"Error: --output {output_format} requires pyarrow. Install it with: pip install pyarrow",
+                      file=sys.stderr)
+                sys.exit(1)
+        elif not validate_output_format(args.provider, output_format):
+            config = get_cloud_provider_config(args.provider)
+            supported = ', '.join(config['supported_outputs'])
+            print(f"Error: Invalid output type for {args.provider}. Supported: {supported}", file=sys.stderr)
+            sys.exit(1)
+
     # Validate hub-spoke options
     spoke_cidrs = []
     spoke_subnets_list = []
 
+    if (args.hub_cidrs or args.hub_locations or args.spoke_hubs) and args.topology != 'multi-hub':
+        print("Error: --hub-cidrs, --hub-locations and --spoke-hubs require --topology multi-hub", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        spoke_hubs = _parse_spoke_hubs(args.spoke_hubs, 1 + len(_split_list(args.hub_cidrs)))
+        quotas = _parse_quotas(args.quotas)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.lookup and args.output not in ("info", "json"):
+        print("Error: --lookup supports --output info or json", file=sys.stderr)
+        sys.exit(1)
+
+    if args.next_hop and not args.routes:
+        print("Error: --next-hop requires --routes", file=sys.stderr)
+        sys.exit(1)
+
+    if args.routes and any(f not in ("info", "json") + ROUTE_OUTPUTS.get(args.provider, ()) for f in formats):
+        supported = ', '.join(("info", "json") + ROUTE_OUTPUTS.get(args.provider, ()))
+        print(f"Error: --routes for {args.provider} supports --output {supported}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.compact and not any(f in ("terraform", "bicep", "arm") for f in formats):
+        print("Error: --compact applies to --output terraform, bicep or arm", file=sys.stderr)
+        sys.exit(1)
+
+    if args.split_roots and (formats != ["terraform"] or args.compact or not (args.file or args.output_dir)):
+        print("Error: --split-roots requires --output terraform (without --compact) and --file or --output-dir "
+              "(the directory to write the roots to)", file=sys.stderr)
+        sys.exit(1)
+
+    if args.minify and not any(f in JSON_FORMATS for f in formats):
+        print(f"Error: --minify applies to --output {', '.join(JSON_FORMATS)}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.exclude and (args.regions or args.spoke_cidrs or args.topology != 'hub-spoke'):
+        print("Error: --exclude applies to a single VNet/VPC", file=sys.stderr)
+        sys.exit(1)
+
+    if args.regions and (args.spoke_cidrs or args.topology != 'hub-spoke' or args.routes):
+        print("Error: --regions cannot be combined with spoke, topology or route options", file=sys.stderr)
+        sys.exit(1)
+
+    if args.topology != 'hub-spoke':
+        try:
+            for output_format in formats:
+                validate_topology(args.topology, args.provider, output_format)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
     if args.spoke_cidrs:
-        if args.provider not in ['azure', 'gcp']:
+        if args.topology == 'hub-spoke' and args.provider not in ['azure', 'gcp']:
             print(
                 f"Error: Hub-spoke topology is only supported for Azure and GCP, not {args.provider}",
                 file=sys.stderr
@@ -498,9 +1675,100 @@ Examples:
         else:
             spoke_subnets_list = [2] * len(spoke_cidrs)
 
+    # Rendered outputs by format
+    outputs: Dict[str, str] = {}
+
     try:
         # Calculate network
-        if spoke_cidrs:
+        if args.regions:
+            # Tiers x zones layout across one or more regions
+            layout = calculate_region_layout(
+                args.cidr,
+                args.provider,
+                _split_list(args.regions),
+                _split_list(args.tiers),
+                args.zones_per_region,
+                args.subnet_prefix
+            )
+
+            if "error" in layout:
+                print(f"Error: {layout['error']}", file=sys.stderr)
+                sys.exit(1)
+
+            _check_limits(
+                [{"subnets": region["subnets"], "location": region["region"]} for region in layout["regions"]],
+                args.provider, quotas, args.strict_limits
+            )
+
+            if args.lookup:
+                _run_lookup(layout, args.cidr, args.lookup, args.provider, args.output, args.file)
+                return
+            # info and json describe the whole layout
+            for output_format in formats:
+                if output_format == "info":
+                    outputs["info"] = format_region_layout(args.cidr, layout["regions"], args.provider)
+                elif output_format == "json" or output_format in EXPORT_FORMATS:
+                    output_data = {
+                        "cidr": args.cidr,
+                        "provider": args.provider,
+                        "tiers": _split_list(args.tiers),
+                        "regions": layout["regions"]
+                    }
+                    if output_format in EXPORT_FORMATS:
+                        _export_plan(output_data, args.provider, output_format, args.file)
+                        return
+                    outputs["json"] = (
+                        dumps(output_data, minify=True) if args.minify else json.dumps(output_data, indent=2)
+                    )
+            if len(outputs) == len(formats):
+                _write_outputs(outputs, args.file, output_dir=args.output_dir)
+                return
+
+            # Templates render a single network: one region, or for GCP one
+            # global VPC whose subnets sit in their own regions
+            region = None
+            if len(layout["regions"]) == 1:
+                args.cidr = layout["regions"][0]["cidr"]
+                subnets = layout["regions"][0]["subnets"]
+                region = layout["regions"][0]["region"]
+            elif args.provider == 'gcp':
+                subnets = [
+                    dict(subnet, index=idx)
+                    for idx, subnet in enumerate(
+                        (s for region in layout["regions"] for s in region["subnets"]), 1
+                    )
+                ]
+            else:
+                template_format = next(f for f in formats if f not in outputs)
+                print(
+                    f"Error: {template_format} output covers one region for {args.provider}. "
+                    f"Use --output json or info for multiple regions",
+                    file=sys.stderr
+                )
+                sys.exit(1)
+            result = {"subnets": subnets}
+            if region:
+                # Deployment region of the templates (provider variable, location parameter, CLI region)
+                result["region"] = region
+        elif args.topology != 'hub-spoke':
+            # Mesh, multi-hub or transit-gateway topology
+            result = generate_topology(
+                args.topology,
+                args.cidr,
+                args.subnets,
+                spoke_cidrs,
+                spoke_subnets_list,
+                args.provider,
+                args.subnet_prefix,
+                hub_cidrs=_split_list(args.hub_cidrs),
+                spoke_hubs=spoke_hubs,
+                hub_locations=_split_list(args.hub_locations) or None
+            )
+
+            if "error" in result:
+                print(f"Error: {result['error']}", file=sys.stderr)
+                sys.exit(1)
+        elif spoke_cidrs:
             # Hub-spoke topology
             result = generate_hub_spoke_topology(
                 args.cidr,
@@ -514,9 +1782,20 @@ Examples:
             if "error" in result:
                 print(f"Error: {result['error']}", file=sys.stderr)
                 sys.exit(1)
+        elif args.exclude:
+            # Single VNet/VPC carved around excluded ranges
+            if os.path.isfile(args.exclude):
+                with open(args.exclude) as f:
+                    exclude = cidr_sets.parse_set(f)
+            else:
+                exclude = cidr_sets.parse_set(args.exclude.split(','))
+            result = calculate_subnets_excluding(
+                args.cidr, args.subnets, args.provider, exclude, args.subnet_prefix
+            )
 
-            subnets = result["hub"]["subnets"]
-            spoke_vnets = result["spokes"]
+            if "error" in result:
+                print(f"Error: {result['error']}", file=sys.stderr)
+                sys.exit(1)
         else:
             # Single VNet/VPC
             result = calculate_subnets(args.cidr, args.subnets, args.provider, args.subnet_prefix)
@@ -525,73 +1804,39 @@ Examples:
                 print(f"Error: {result['error']}", file=sys.stderr)
                 sys.exit(1)
 
-            subnets = result["subnets"]
-            spoke_vnets = []
-
-        # Generate output
-        if args.output == "info":
-            output = format_network_info(args.cidr, subnets, args.provider)
-        elif args.output == "json":
-            # JSON output
-            output_data = {
-                "vnetCidr": args.cidr,
-                "provider": args.provider,
-                "subnets": subnets,
-                "peeringEnabled": len(spoke_vnets) > 0
-            }
-            if spoke_vnets:
-                if args.provider == 'azure':
-                    output_data["spokeVNets"] = spoke_vnets
-                elif args.provider == 'gcp':
-                    output_data["spokeVPCs"] = spoke_vnets
-            output = json.dumps(output_data, indent=2)
-        elif args.output in ['terraform', 'bicep', 'arm', 'powershell', 'cli', 'cloudformation', 'gcloud', 'oci', 'aliyun']:
-            # Template-based output formats
-            if not TEMPLATE_PROCESSOR_AVAILABLE:
-                print("Error: Template processor not available. Install required dependencies.", file=sys.stderr)
-                sys.exit(1)
-
-            # Prepare data for template
-            output_data = {
-                "vnetCidr": args.cidr,
-                "vpcCidr": args.cidr,  # AWS uses vpcCidr
-                "subnets": subnets,
-                "peeringEnabled": len(spoke_vnets) > 0,
-                "namePrefix": args.prefix,
-            }
-            if spoke_vnets:
-                if args.provider == 'azure':
-                    output_data["spokeVNets"] = spoke_vnets
-                elif args.provider == 'gcp':
-                    output_data["spokeVPCs"] = spoke_vnets
-
-            # Get templates directory
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            templates_dir = os.path.join(os.path.dirname(script_dir), 'templates')
-
-            try:
-                output = process_template(args.provider, args.output, output_data, templates_dir)
-            except (FileNotFoundError, NotImplementedError) as e:
-                print(f"Error: {e}", file=sys.stderr)
-                print(f"Template not available for {args.provider}/{args.output}", file=sys.stderr)
-                sys.exit(1)
-        else:
-            output = f"# Output format '{args.output}' not supported\n"
-            output += "# Showing JSON data instead:\n"
-            output_data = {
-                "vnetCidr": args.cidr,
-                "provider": args.provider,
-                "subnets": subnets
-            }
-            output += json.dumps(output_data, indent=2)
+        if args.routes:
+            result = dict(result, routeTables=build_route_tables(result, args.next_hop))
+
+        if not args.regions:
+            _check_limits([result], args.provider, quotas, args.strict_limits)
+
+        if args.lookup:
+            _run_lookup(result, args.cidr, args.lookup, args.provider, args.output, args.file)
+            return
+
+        # Build the plan once and render every requested format from it
+        plan = build_plan(args.provider, args.cidr, result, args.prefix)
+        if args.output in EXPORT_FORMATS:
+            _export_plan(plan.json_data(), args.provider, args.output, args.file)
+            return
+        if args.split_roots:
+            roots = render_terraform_roots(plan)
+            if args.output_dir:
+                _write_directory(roots, args.output_dir)
+            else:
+                _write_files(roots, args.file)
+                print(f"Output written to: {args.file} (hub root and {len(roots) - 1} spoke roots)")
+            return
+        pending = [f for f in formats if f not in outputs]
+        try:
+            outputs.update(render_outputs(plan, pending, compact=args.compact, minify=args.minify))
+        except (FileNotFoundError, NotImplementedError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            print(f"Template not available for {args.provider}/{', '.join(pending)}", file=sys.stderr)
+            sys.exit(1)
+        nested_stacks = render_nested_stacks(plan) if "cloudformation" in pending else {}
 
-        # Write output
-        if args.file:
-            with open(args.file, 'w') as f:
-                f.write(output)
-            print(f"Output written to: {args.file}")
-        else:
-            print(output)
+        _write_outputs({f: outputs[f] for f in formats}, args.file, nested_stacks, args.output_dir)
 
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+JSON Output
+
+Serializes generated JSON documents (Terraform JSON, CloudFormation JSON, ARM
+templates, plans) in one pass: pretty-printed with two-space indentation, or
+minified without whitespace for API and CDN transfer. Uses orjson when it is
+installed and the json module otherwise; both give the same text.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Output formats that are JSON documents and can be minified
+JSON_FORMATS = ('json', 'arm', 'terraform-json', 'cloudformation-json')
+
+
+def dumps(document: Any, minify: bool = False) -> str:
+    """
+    Serialize a JSON document.
+
+    Args:
+        document: Dicts, lists and scalars
+        minify: One line without whitespace instead of two-space indentation
+
+    Returns:
+        JSON text; pretty-printed text ends with a newline
+    """
+    if ORJSON_AVAILABLE:
+        if minify:
+            return orjson.dumps(document).decode()
+        return orjson.dumps(document, option=orjson.OPT_INDENT_2).decode() + '\n'
+    if minify:
+        return json.dumps(document, separators=(',', ':'), ensure_ascii=False)
+    return json.dumps(document, indent=2, ensure_ascii=False) + '\n'
+
+
+def minify(text: str) -> str:
+    """
+    Minify rendered JSON text (e.g. an ARM template).
+
+    Raises:
+        ValueError: If text is not valid JSON
+    """
+    return dumps(json.loads(text), minify=True)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Network Plan IR
+
+Provider-neutral representation of a calculated plan: its networks (the
+primary hub or single network at position 0, spokes and additional hubs at
+1..n, as in topology.py), their subnets, the peerings between them, the
+transit gateway attachments and the summarized route tables.
+
+A plan is built once from a calculation result and handed to every output
+backend, so rendering several formats costs one calculation:
+
+- template_data():  context of the IaC template processors
+- json_data():      the document written by --output json
+
+Subnets and spokes keep the calculation record they were built from
+(attributes), which the backends serialize unchanged.
+
+plan_networks lists the networks of any plan shape (calculation results,
+plan documents, region layouts) for the modules that walk a plan without
+building the IR: limits validation, lookup, diff and Arrow export.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from topology import hub_spoke_pairs
+
+# Provider -> data key the template processors read the spoke list from
+SPOKE_KEYS: Dict[str, str] = {
+    'azure': 'spokeVNets',
+    'gcp': 'spokeVPCs',
+    'aws': 'spokeVPCs',
+}
+
+
+@dataclass(frozen=True)
+class Subnet:
+    """A subnet of a network; attributes is its calculation record (usable range, zone, tier, ...)."""
+
+    index: int
+    cidr: str
+    name: str
+    attributes: Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class RouteTable:
+    """Summarized routes of a network and the 1-based indices of the subnets associated with them."""
+
+    routes: Tuple[str, ...]
+    subnets: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class Network:
+    """A VNet/VPC at a position of the plan."""
+
+    position: int
+    cidr: str
+    role: str
+    subnets: Tuple[Subnet, ...]
+    location: Optional[str] = None
+    route_table: Optional[RouteTable] = None
+    # Spoke record from the topology calculation; empty for the primary hub
+    attributes: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Peering:
+    """Peering between two network positions (a < b); backends emit both directions."""
+
+    a: int
+    b: int
+
+
+@dataclass(frozen=True)
+class NetworkPlan:
+    """A calculated plan ready for the output backends."""
+
+    provider: str
+    networks: Tuple[Network, ...]
+    peerings: Tuple[Peering, ...] = ()
+    topology: str = 'hub-spoke'
+    # Appliance address (or transit-gateway) of the route tables; None without route tables
+    next_hop: Optional[str] = None
+    # Network positions attached to the transit gateway; None without one
+    transit_gateway: Optional[Tuple[int, ...]] = None
+    name_prefix: str = 'ipcalc'
+
+    @property
+    def hub(self) -> Network:
+        """The primary hub, or the only network of a single-network plan."""
+        return self.networks[0]
+
+    @property
+    def spokes(self) -> Tuple[Network, ...]:
+        """Networks at positions 1..n."""
+        return self.networks[1:]
+
+    @property
+    def cidr(self) -> str:
+        return self.hub.cidr
+
+    def subnet_records(self, position: int = 0) -> List[Mapping[str, Any]]:
+        """Calculation records of the subnets of a network."""
+        return [subnet.attributes for subnet in self.networks[position].subnets]
+
+    def route_tables(self) -> Optional[Dict[str, Any]]:
+        """Route tables in the shape of route_tables.build_route_tables, or None."""
+        if self.next_hop is None:
+            return None
+        return {
+            "nextHop": self.next_hop,
+            "networks": [
+                {"routes": list(network.route_table.routes), "subnets": list(network.route_table.subnets)}
+                if network.route_table else {"routes": [], "subnets": []}
+                for network in self.networks
+            ],
+        }
+
+    def _network_fields(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Add spokes, topology and route tables to template or JSON data."""
+        if self.spokes and self.provider in SPOKE_KEYS:
+            data[SPOKE_KEYS[self.provider]] = [network.attributes for network in self.spokes]
+        if self.topology != 'hub-spoke':
+            data["topology"] = self.topology
+            data["peerings"] = [[peering.a, peering.b] for peering in self.peerings]
+            data["peeringEnabled"] = bool(self.peerings)
+            if self.transit_gateway is not None:
+                data["transitGateway"] = {"attachments": list(self.transit_gateway)}
+        route_tables = self.route_tables()
+        if route_tables is not None:
+            data["routeTables"] = route_tables
+        return data
+
+    def template_data(self) -> Dict[str, Any]:
+        """Data for template_processor.process_template."""
+        data = self._network_fields({
+            "vnetCidr": self.cidr,
+            "vpcCidr": self.cidr,  # AWS uses vpcCidr
+            "subnets": self.subnet_records(),
+            "peeringEnabled": bool(self.peerings),
+            "namePrefix": self.name_prefix,
+        })
+        if self.hub.location:
+            data["region"] = self.hub.location
+        return data
+
+    def json_data(self) -> Dict[str, Any]:
+        """The plan document of --output json."""
+        return self._network_fields({
+            "vnetCidr": self.cidr,
+            "provider": self.provider,
+            "subnets": self.subnet_records(),
+            "peeringEnabled": bool(self.peerings),
+        })
+
+
+def _subnets(records: List[Mapping[str, Any]]) -> Tuple[Subnet, ...]:
+    return tuple(
+        Subnet(record.get("index", position), record["cidr"], record.get("name") or f"subnet{position}", record)
+        for position, record in enumerate(records, 1)
+    )
+
+
+def network_label(position: int) -> str:
+    """Name of the network at a position in labels and resource names: 'hub' or 'spoke{n}'."""
+    return 'hub' if position == 0 else f'spoke{position}'
+
+
+class PlanNetwork(NamedTuple):
+    """A network of a plan as listed by plan_networks."""
+
+    position: int
+    label: str
+    cidr: str
+    subnets: Sequence[Mapping[str, Any]]
+    location: Optional[str] = None
+
+
+def plan_networks(plan: Mapping[str, Any], cidr: Optional[str] = None) -> List[PlanNetwork]:
+    """
+    List the networks of a plan in position order.
+
+    Args:
+        plan: Result of calculate_subnets, generate_hub_spoke_topology,
+            generate_topology or calculate_region_layout, or a plan document
+            (NetworkPlan.json_data: vnetCidr/vpcCidr, subnets, spokeVNets/spokeVPCs)
+        cidr: Network CIDR of a calculate_subnets result (which does not carry it)
+
+    Returns:
+        The hub ('hub') and spokes ('spoke{n}') of a topology, or the single
+        network ('network'). Each region of a region layout is the single
+        network of its own plan: position 0, labelled with the region name.
+    """
+    if "regions" in plan:
+        return [PlanNetwork(0, region["region"], region["cidr"], region["subnets"], region["region"])
+                for region in plan["regions"]]
+
+    if "hub" in plan:
+        hub, spokes = plan["hub"], plan.get("spokes") or []
+        hub_cidr = hub["cidr"]
+    else:
+        hub, spokes = plan, plan.get("spokeVNets", plan.get("spokeVPCs")) or []
+        hub_cidr = plan.get("vnetCidr", plan.get("vpcCidr", cidr or ""))
+
+    topology = "hub" in plan or bool(spokes)
+    networks = [PlanNetwork(0, network_label(0) if topology else "network", hub_cidr,
+                            hub.get("subnets", []), hub.get("location"))]
+    for idx, spoke in enumerate(spokes, 1):
+        position = spoke.get("index", idx)
+        networks.append(PlanNetwork(position, network_label(position), spoke["cidr"], spoke["subnets"],
+                                    spoke.get("location")))
+    return networks
+
+
+def build_plan(provider: str, cidr: str, result: Mapping[str, Any], name_prefix: str = 'ipcalc') -> NetworkPlan:
+    """
+    Build the IR of a calculation result.
+
+    Args:
+        provider: Cloud provider name
+        cidr: CIDR of the primary (or only) network
+        result: calculate_subnets, generate_hub_spoke_topology or generate_topology
+            result, optionally with routeTables (route_tables.build_route_tables) and
+            the region of a single-region plan (region)
+        name_prefix: Resource name prefix for the generated IaC
+
+    Raises:
+        ValueError: If the result is a calculation error
+    """
+    if "error" in result:
+        raise ValueError(result["error"])
+
+    if "hub" in result:
+        hub_subnets = result["hub"]["subnets"]
+        spokes = result.get("spokes") or []
+    else:
+        hub_subnets = result["subnets"]
+        spokes = []
+
+    route_tables = result.get("routeTables")
+    tables = [
+        RouteTable(tuple(network["routes"]), tuple(network["subnets"]))
+        for network in route_tables["networks"]
+    ] if route_tables else []
+
+    networks = [Network(0, cidr, 'hub', _subnets(hub_subnets), location=result.get("region"),
+                        route_table=tables[0] if tables else None)]
+    for position, spoke in enumerate(spokes, 1):
+        networks.append(Network(
+            position, spoke["cidr"], spoke.get("role", "spoke"), _subnets(spoke["subnets"]),
+            location=spoke.get("location"),
+            route_table=tables[position] if tables else None,
+            attributes=spoke,
+        ))
+
+    pairs = result.get("peerings")
+    if pairs is None:
+        pairs = hub_spoke_pairs(len(spokes))
+    transit_gateway = result.get("transitGateway")
+
+    return NetworkPlan(
+        provider=provider,
+        networks=tuple(networks),
+        peerings=tuple(Peering(a, b) for a, b in pairs),
+        topology=result.get("topology", 'hub-spoke'),
+        next_hop=route_tables["nextHop"] if route_tables else None,
+        transit_gateway=tuple(transit_gateway["attachments"]) if transit_gateway else None,
+        name_prefix=name_prefix,
+    )
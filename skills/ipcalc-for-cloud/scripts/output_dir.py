@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Incremental Output Directory
+
+Writes generated files into a directory, rewriting a file only when its
+rendered bytes change. A manifest in the directory records the SHA-256 of
+every file written; an unchanged file costs one hash comparison and a stat,
+with no write. Changed files are written to a temporary file next to the
+target and renamed over it, so readers never see a partial file.
+
+The manifest is trusted: a file edited by hand since the last run keeps its
+edits until its rendered content changes. Delete the manifest to rewrite
+every file. Files that are no longer generated are left in place.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Mapping, Tuple
+
+# Manifest file, at the top of the output directory
+MANIFEST_NAME = '.ipcalc-manifest.json'
+_MANIFEST_ALGORITHM = 'sha256'
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest of a file's bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(directory: str) -> Dict[str, str]:
+    """
+    Read the content hashes recorded in a directory.
+
+    Returns:
+        Hash per path relative to directory; empty when there is no manifest,
+        or it is unreadable or uses another algorithm
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('algorithm') != _MANIFEST_ALGORITHM:
+        return {}
+    files = manifest.get('files')
+    return dict(files) if isinstance(files, dict) else {}
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write data to a temporary file next to path and rename it over path."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = os.path.join(os.path.dirname(path), f'.{os.path.basename(path)}.{os.getpid()}.tmp')
+    # os.open honours the umask, unlike tempfile's private 0600 files
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_directory(files: Mapping[str, str], directory: str) -> Tuple[List[str], List[str]]:
+    """
+    Write files into directory, skipping those whose content hash is unchanged.
+
+    Args:
+        files: Text content per path relative to directory ('/'-separated)
+        directory: Output directory, created if needed
+
+    Returns:
+        (written, unchanged) - relative paths, in the order of files
+    """
+    manifest = load_manifest(directory)
+    written, unchanged = [], []
+    for relative_path, content in files.items():
+        data = content.encode()
+        digest = content_hash(data)
+        path = os.path.join(directory, *relative_path.split('/'))
+        if manifest.get(relative_path) == digest and os.path.exists(path):
+            unchanged.append(relative_path)
+            continue
+        _atomic_write(path, data)
+        manifest[relative_path] = digest
+        written.append(relative_path)
+
+    if written:
+        document = {'algorithm': _MANIFEST_ALGORITHM, 'files': dict(sorted(manifest.items()))}
+        _atomic_write(os.path.join(directory, MANIFEST_NAME), (json.dumps(document, indent=2) + '\n').encode())
+    return written, unchanged
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Plan Diff
+
+Compares two subnet plans (the JSON written by ipcalc.py --output json) and
+reports the change set instead of diffing rendered templates:
+
+- added / removed:  subnets present in only one plan
+- resized:          same subnet, different prefix length
+- renumbered:       same subnet and size at a different address
+- unchanged:        counted only
+
+A subnet is identified by its network (hub / spoke position or region name)
+and its name, which is what the templates derive resource names from.
+Address-level effects come from one sorted merge over the integer ranges of
+both plans: the address space released and newly allocated, and every new or
+moved subnet that overlaps a different old subnet (that one has to be removed
+before the new one can be created). Plans are emitted in address order, so
+the sorts are linear in practice and the whole diff is O(n).
+"""
+
+import ipaddress
+import json
+from typing import Any, Dict, Hashable, List, Tuple
+
+import cidr_sets
+from network_ir import PlanNetwork, plan_networks
+
+# Change categories in report order
+CHANGE_KINDS = ('added', 'removed', 'resized', 'renumbered')
+
+
+def load_plan(path: str) -> Dict[str, Any]:
+    """
+    Read a plan written by ipcalc.py --output json.
+
+    Raises:
+        ValueError: If the file is not JSON or holds no subnets
+    """
+    try:
+        with open(path) as f:
+            plan = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path} is not a JSON plan: {e}")
+    if not isinstance(plan, dict) or ("subnets" not in plan and "regions" not in plan):
+        raise ValueError(f"{path} is not a JSON plan (no subnets or regions)")
+    return plan
+
+
+def _networks(plan: Dict[str, Any]) -> List[Tuple[Hashable, PlanNetwork]]:
+    """
+    The networks of a JSON plan (network_ir.plan_networks) with their key.
+
+    Keys are the network position or the region name for region layouts, so a
+    plan that gains spokes still matches its first network.
+    """
+    by_region = "regions" in plan
+    return [(network.label if by_region else network.position, network) for network in plan_networks(plan)]
+
+
+def _range(cidr: str) -> cidr_sets.Interval:
+    network = ipaddress.ip_network(cidr, strict=False)
+    first = int(network.network_address)
+    return first, first + network.num_addresses - 1
+
+
+def _subnet_index(plan: Dict[str, Any]) -> Dict[Tuple[Hashable, str], Dict[str, Any]]:
+    """Subnets of a plan by (network key, subnet name), with their integer range."""
+    subnets = {}
+    for key, network in _networks(plan):
+        label = network.label
+        for position, subnet in enumerate(network.subnets, 1):
+            name = subnet.get("name") or f"subnet{subnet.get('index', position)}"
+            first, last = _range(subnet["cidr"])
+            subnets[(key, name)] = {"key": (key, name), "network": label, "name": name,
+                                    "cidr": subnet["cidr"], "first": first, "last": last}
+    return subnets
+
+
+def _overlaps(changed: List[Dict[str, Any]], old: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Sorted merge of changed new subnets against all old subnets.
+
+    Returns every changed subnet whose range overlaps an old subnet with a different identity.
+    """
+    changed = sorted(changed, key=lambda subnet: subnet["first"])
+    old = sorted(old, key=lambda subnet: subnet["first"])
+    conflicts = []
+    j = 0
+    for subnet in changed:
+        # Old subnets ending below this one cannot overlap it or any later one
+        while j < len(old) and old[j]["last"] < subnet["first"]:
+            j += 1
+        k = j
+        blocking = []
+        while k < len(old) and old[k]["first"] <= subnet["last"]:
+            if old[k]["key"] != subnet["key"]:
+                blocking.append(f'{old[k]["network"]}/{old[k]["name"]} ({old[k]["cidr"]})')
+            k += 1
+        if blocking:
+            conflicts.append({"network": subnet["network"], "name": subnet["name"],
+                              "cidr": subnet["cidr"], "overlaps": blocking})
+    return conflicts
+
+
+def diff_plans(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute the change set between two JSON plans.
+
+    Args:
+        old: Plan before the change (ipcalc.py --output json)
+        new: Plan after the change
+
+    Returns:
+        {"networks": [{"network", "old", "new"}, ...] (networks added, removed or re-addressed),
+         "added", "removed": [{"network", "name", "cidr"}, ...],
+         "resized", "renumbered": [{"network", "name", "old", "new"}, ...],
+         "unchanged": count,
+         "released", "allocated": minimal CIDR lists of address space no longer / newly used,
+         "conflicts": [{"network", "name", "cidr", "overlaps": [old subnets]}, ...]}
+    """
+    old_networks = {key: (network.label, network.cidr) for key, network in _networks(old)}
+    new_networks = {key: (network.label, network.cidr) for key, network in _networks(new)}
+    networks = []
+    for key in list(old_networks) + [key for key in new_networks if key not in old_networks]:
+        old_cidr = old_networks.get(key, (None, None))[1]
+        new_cidr = new_networks.get(key, (None, None))[1]
+        if old_cidr != new_cidr:
+            label = (new_networks.get(key) or old_networks[key])[0]
+            networks.append({"network": label, "old": old_cidr, "new": new_cidr})
+
+    old_subnets = _subnet_index(old)
+    new_subnets = _subnet_index(new)
+    diff: Dict[str, Any] = {"networks": networks}
+    for kind in CHANGE_KINDS:
+        diff[kind] = []
+    unchanged = 0
+    changed = []
+
+    for key, subnet in new_subnets.items():
+        before = old_subnets.get(key)
+        if before is None:
+            diff["added"].append({"network": subnet["network"], "name": subnet["name"], "cidr": subnet["cidr"]})
+            changed.append(subnet)
+        elif before["cidr"] == subnet["cidr"]:
+            unchanged += 1
+        else:
+            same_size = before["last"] - before["first"] == subnet["last"] - subnet["first"]
+            diff["renumbered" if same_size else "resized"].append(
+                {"network": subnet["network"], "name": subnet["name"], "old": before["cidr"], "new": subnet["cidr"]}
+            )
+            changed.append(subnet)
+    for key, subnet in old_subnets.items():
+        if key not in new_subnets:
+            diff["removed"].append({"network": subnet["network"], "name": subnet["name"], "cidr": subnet["cidr"]})
+    diff["unchanged"] = unchanged
+
+    old_space = cidr_sets.normalize((subnet["first"], subnet["last"]) for subnet in old_subnets.values())
+    new_space = cidr_sets.normalize((subnet["first"], subnet["last"]) for subnet in new_subnets.values())
+    diff["released"] = cidr_sets.to_cidrs(cidr_sets.subtract(old_space, new_space))
+    diff["allocated"] = cidr_sets.to_cidrs(cidr_sets.subtract(new_space, old_space))
+
+    diff["conflicts"] = _overlaps(changed, list(old_subnets.values()))
+    return diff
+
+
+def has_changes(diff: Dict[str, Any]) -> bool:
+    """True if a diff contains any network or subnet change."""
+    return bool(diff["networks"]) or any(diff[kind] for kind in CHANGE_KINDS)
+
+
+def diff_files(old_path: str, new_path: str) -> Dict[str, Any]:
+    """Diff two JSON plan files (see diff_plans)."""
+    return diff_plans(load_plan(old_path), load_plan(new_path))
+
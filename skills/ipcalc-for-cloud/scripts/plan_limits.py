@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Provider Limits Validation
+
+Checks a calculated plan against the provider's default quotas before any
+infrastructure code is applied. Accepts the results of calculate_subnets,
+generate_hub_spoke_topology and generate_topology, and reports every
+violation found in a single pass:
+
+- subnets_per_network:          subnets in each VNet/VPC
+- peerings_per_network:         peerings touching each VNet/VPC
+- networks:                     VNets/VPCs per region (per project for GCP)
+- routes_per_route_table:       routes in each route table (transit gateway, or summarized
+                                route tables from route_tables.py)
+- routes_per_network:           subnet routes visible to each VPC, own plus peered (GCP)
+- transit_gateway_attachments:  attachments on the transit gateway
+
+Limits come from the quotas of the provider catalogue and are tabulated
+once at import. Quotas raised on an account can be passed as overrides.
+"""
+
+from collections import Counter
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from cloud_provider_config import CLOUD_PROVIDERS
+from network_ir import plan_networks
+from topology import hub_spoke_pairs
+
+# Quotas this module knows how to check
+LIMIT_CHECKS = (
+    'subnets_per_network',
+    'peerings_per_network',
+    'networks',
+    'routes_per_route_table',
+    'routes_per_network',
+    'transit_gateway_attachments',
+)
+
+# Provider -> limit -> default quota, restricted to the checks above
+LIMIT_TABLES: Mapping[str, Mapping[str, int]] = MappingProxyType({
+    provider: MappingProxyType({
+        limit: config['quotas'][limit] for limit in LIMIT_CHECKS if limit in config['quotas']
+    })
+    for provider, config in CLOUD_PROVIDERS.items()
+})
+
+
+def _violation(limit: str, network: str, value: int, maximum: int, message: str) -> Dict[str, Any]:
+    """Build one violation record."""
+    return {
+        "limit": limit,
+        "network": network,
+        "value": value,
+        "max": maximum,
+        "message": message,
+    }
+
+
+def validate_plan_limits(
+    plan: Dict[str, Any],
+    provider: str,
+    quotas: Optional[Mapping[str, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Check a calculated plan against provider quotas.
+
+    Args:
+        plan: Result of calculate_subnets, generate_hub_spoke_topology or generate_topology
+        provider: Cloud provider name
+        quotas: Optional quota overrides, e.g. {"subnets_per_network": 400}
+
+    Returns:
+        All violations found (empty if the plan fits), each with limit, network,
+        value, max and message
+    """
+    limits = dict(LIMIT_TABLES.get(provider.lower(), {}))
+    if quotas:
+        limits.update(quotas)
+    if not limits or "error" in plan:
+        return []
+
+    violations = []
+    networks = plan_networks(plan)
+    labels = [network.label for network in networks]
+    subnet_counts = [len(network.subnets) for network in networks]
+
+    max_subnets = limits.get("subnets_per_network")
+    if max_subnets is not None:
+        for label, count in zip(labels, subnet_counts):
+            if count > max_subnets:
+                violations.append(_violation(
+                    "subnets_per_network", label, count, max_subnets,
+                    f"{label} has {count} subnets; {provider} allows {max_subnets} per network"
+                ))
+
+    max_networks = limits.get("networks")
+    if max_networks is not None:
+        # GCP networks are global, so the quota applies across all locations
+        per_location = Counter(
+            None if provider.lower() == 'gcp' else network.location for network in networks
+        )
+        for location, count in per_location.items():
+            if count > max_networks:
+                where = location or "the deployment region"
+                violations.append(_violation(
+                    "networks", location or "", count, max_networks,
+                    f"{count} networks in {where}; {provider} allows {max_networks}"
+                ))
+
+    route_tables = plan.get("routeTables")
+    max_routes = limits.get("routes_per_route_table")
+    if route_tables and max_routes is not None:
+        # VPC route tables also hold their local route
+        local_routes = 1 if "transitGateway" in plan else 0
+        for label, network in zip(labels, route_tables["networks"]):
+            count = len(network["routes"]) + local_routes
+            if network["routes"] and count > max_routes:
+                violations.append(_violation(
+                    "routes_per_route_table", label, count, max_routes,
+                    f"{label} route table needs {count} routes; {provider} allows {max_routes}"
+                ))
+
+    if "transitGateway" in plan:
+        attachments = len(plan["transitGateway"]["attachments"])
+        max_attachments = limits.get("transit_gateway_attachments")
+        if max_attachments is not None and attachments > max_attachments:
+            violations.append(_violation(
+                "transit_gateway_attachments", "transit-gateway", attachments, max_attachments,
+                f"Transit gateway has {attachments} attachments; {provider} allows {max_attachments}"
+            ))
+
+        # Without summarized tables each VPC route table holds its local route
+        # plus one route per other attached VPC
+        if not route_tables and max_routes is not None and attachments > max_routes:
+            for label in labels:
+                violations.append(_violation(
+                    "routes_per_route_table", label, attachments, max_routes,
+                    f"{label} route table needs {attachments} routes; {provider} allows {max_routes}"
+                ))
+        return violations
+
+    pairs = plan.get("peerings")
+    if pairs is None:
+        pairs = hub_spoke_pairs(len(networks) - 1) if "hub" in plan else []
+
+    max_peerings = limits.get("peerings_per_network")
+    max_network_routes = limits.get("routes_per_network")
+    if pairs and (max_peerings is not None or max_network_routes is not None):
+        peer_counts = [0] * len(networks)
+        routes = list(subnet_counts)
+        for a, b in pairs:
+            peer_counts[a] += 1
+            peer_counts[b] += 1
+            routes[a] += subnet_counts[b]
+            routes[b] += subnet_counts[a]
+
+        for idx, label in enumerate(labels):
+            if max_peerings is not None and peer_counts[idx] > max_peerings:
+                violations.append(_violation(
+                    "peerings_per_network", label, peer_counts[idx], max_peerings,
+                    f"{label} has {peer_counts[idx]} peerings; {provider} allows {max_peerings} per network"
+                ))
+            if max_network_routes is not None and routes[idx] > max_network_routes:
+                violations.append(_violation(
+                    "routes_per_network", label, routes[idx], max_network_routes,
+                    f"{label} sees {routes[idx]} subnet routes including peers; "
+                    f"{provider} allows {max_network_routes} per network"
+                ))
+
+    return violations
+
+
+def validate_plans(
+    plans: Iterable[Dict[str, Any]],
+    provider: str,
+    quotas: Optional[Mapping[str, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Check a batch of plans, e.g. one per environment or region.
+
+    Args:
+        plans: Calculated plans for the same provider
+        provider: Cloud provider name
+        quotas: Optional quota overrides applied to every plan
+
+    Returns:
+        All violations across the batch, each tagged with the 0-based 'plan' index
+    """
+    violations = []
+    for idx, plan in enumerate(plans):
+        for violation in validate_plan_limits(plan, provider, quotas):
+            violation["plan"] = idx
+            violations.append(violation)
+    return violations
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Region Layout Planner
+
+Lays out subnets as a tiers x zones matrix inside one or more regions:
+
+    10.0.0.0/16, regions us-east-1 + eu-west-1, tiers public/private/data, 3 zones
+
+    us-east-1  10.0.0.0/17     public  10.0.0.0/21   10.0.8.0/21   10.0.16.0/21
+                               private 10.0.32.0/21  10.0.40.0/21  10.0.48.0/21
+                               data    10.0.64.0/21  ...
+    eu-west-1  10.0.128.0/17   ...
+
+Every region gets an equal block of the supernet, every tier an equal block
+of its region and every zone an equal block of its tier, so a subnet's offset
+is the same in every region and tier. Block counts are rounded up to a power
+of two, leaving the spare blocks free for later growth.
+
+Zone names come from the regions table of the provider catalogue
+(cloud_provider_config).
+"""
+
+import ipaddress
+import math
+from typing import List, Optional, Tuple
+
+from cloud_provider_config import get_region_zones
+
+# Zones used per region when the caller does not ask for a specific count
+DEFAULT_ZONE_COUNT = 3
+
+
+def select_zones(provider: str, region: str, zone_count: Optional[int] = None) -> List[str]:
+    """
+    Pick the zones a region layout spreads across.
+
+    Args:
+        provider: Cloud provider name
+        region: Provider region name
+        zone_count: Number of zones to use (default: up to DEFAULT_ZONE_COUNT)
+
+    Returns:
+        The first zone_count zones of the region
+
+    Raises:
+        ValueError: If the region has no zones or fewer than zone_count
+    """
+    zones = get_region_zones(provider, region)
+    if not zones:
+        raise ValueError(f"Region {region} has no availability zones")
+
+    if zone_count is None:
+        return zones[:DEFAULT_ZONE_COUNT]
+    if zone_count < 1:
+        raise ValueError("Number of zones per region must be at least 1")
+    if zone_count > len(zones):
+        raise ValueError(
+            f"Region {region} has {len(zones)} availability zone(s), cannot spread across {zone_count}"
+        )
+    return zones[:zone_count]
+
+
+def _bits(count: int) -> int:
+    """Prefix bits needed to address count equal blocks."""
+    return math.ceil(math.log2(count)) if count > 1 else 0
+
+
+def split_blocks(network: ipaddress.IPv4Network, count: int) -> List[ipaddress.IPv4Network]:
+    """
+    Split a network into count aligned, equal blocks (rounded up to a power of two).
+
+    Raises:
+        ValueError: If the network is too small to split that many ways
+    """
+    new_prefix = network.prefixlen + _bits(count)
+    if new_prefix > 32:
+        raise ValueError(f"Cannot split {network} into {count} blocks")
+    size = 2 ** (32 - new_prefix)
+    base = int(network.network_address)
+    return [ipaddress.IPv4Network((base + idx * size, new_prefix)) for idx in range(count)]
+
+
+def layout_grid(region_network: ipaddress.IPv4Network, num_tiers: int, num_zones: int,
+                subnet_prefix: Optional[int] = None) -> List[Tuple[int, int, ipaddress.IPv4Network]]:
+    """
+    Compute the tiers x zones subnet grid of one region in a single pass.
+
+    Args:
+        region_network: Address block of the region
+        num_tiers: Number of tiers
+        num_zones: Number of zones per tier
+        subnet_prefix: Optional subnet prefix; must fit inside a tier/zone cell
+
+    Returns:
+        (tier index, zone index, subnet) tuples, tier-major
+
+    Raises:
+        ValueError: If the grid does not fit in the region block
+    """
+    zone_bits = _bits(num_zones)
+    cell_prefix = region_network.prefixlen + _bits(num_tiers) + zone_bits
+    if cell_prefix > 32:
+        raise ValueError(
+            f"Cannot fit {num_tiers} tier(s) x {num_zones} zone(s) in {region_network}"
+        )
+    if subnet_prefix is None:
+        subnet_prefix = cell_prefix
+    elif subnet_prefix < cell_prefix:
+        raise ValueError(
+            f"Subnet prefix /{subnet_prefix} is larger than the /{cell_prefix} available per "
+            f"tier and zone in {region_network}"
+        )
+
+    cell_size = 2 ** (32 - cell_prefix)
+    tier_size = cell_size << zone_bits
+    base = int(region_network.network_address)
+
+    return [
+        (tier, zone, ipaddress.IPv4Network((base + tier * tier_size + zone * cell_size, subnet_prefix)))
+        for tier in range(num_tiers)
+        for zone in range(num_zones)
+    ]
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Route Table Models
+
+Builds summarized route tables for hub-spoke and transit-gateway plans.
+Destinations are the minimal CIDR cover of the spoke (or attached VPC)
+address space, computed with cidr_sets, so a table holds one route per
+summary prefix instead of one per spoke or per subnet:
+
+- hub-spoke:        traffic between spokes is steered through a network
+                    appliance in the hub. The hub table routes the spoke
+                    summaries to the appliance; each spoke table routes the
+                    other spokes' summaries to it. The appliance subnet
+                    (hub subnet 1) is left without a table.
+- transit-gateway:  each VPC routes the summaries of the other attached VPCs
+                    to the transit gateway.
+
+Networks are addressed by position (0 = hub, n = spoke n) as in topology.py.
+"""
+
+import ipaddress
+from typing import Any, Dict, List, Optional, Tuple
+
+import cidr_sets
+
+# Next hop of transit-gateway route tables
+TRANSIT_GATEWAY_HOP = 'transit-gateway'
+
+# Provider -> template outputs that render route tables (json and info always do)
+ROUTE_OUTPUTS: Dict[str, Tuple[str, ...]] = {
+    'azure': ('terraform', 'bicep', 'arm', 'cli'),
+    'gcp': ('terraform',),
+    'aws': ('terraform',),
+}
+
+
+def summarize_prefixes(cidrs: List[str]) -> List[str]:
+    """Minimal list of CIDRs covering exactly the union of cidrs."""
+    return cidr_sets.to_cidrs(cidr_sets.parse_set(cidrs))
+
+
+def _summaries_excluding_each(cidrs: List[str]) -> List[List[str]]:
+    """For each CIDR, the summary of all the others."""
+    combined = cidr_sets.parse_set(cidrs)
+    return [
+        cidr_sets.to_cidrs(cidr_sets.subtract(combined, [cidr_sets.parse_interval(cidr)]))
+        for cidr in cidrs
+    ]
+
+
+def build_route_tables(plan: Dict[str, Any], next_hop: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build summarized route tables for a topology plan.
+
+    Args:
+        plan: Result of generate_hub_spoke_topology or generate_topology
+            ('hub-spoke' or 'transit-gateway') with at least one spoke
+        next_hop: Appliance address in the hub (hub-spoke only); defaults to the
+            first usable address of hub subnet 1
+
+    Returns:
+        {"nextHop": address or TRANSIT_GATEWAY_HOP,
+         "networks": [{"routes": [prefix, ...], "subnets": [1-based subnet index, ...]}, ...]}
+        with one entry per network position; networks without routes have empty lists
+
+    Raises:
+        ValueError: If the plan has no spokes, uses another topology, or the next
+            hop is not an address inside the hub
+    """
+    spokes = plan.get("spokes") or []
+    if "hub" not in plan or not spokes:
+        raise ValueError("Route tables need a hub with at least one spoke")
+
+    hub = plan["hub"]
+    spoke_cidrs = [spoke["cidr"] for spoke in spokes]
+    subnet_counts = [len(hub["subnets"])] + [len(spoke["subnets"]) for spoke in spokes]
+
+    if "transitGateway" in plan:
+        if next_hop is not None:
+            raise ValueError("Transit gateway routes always point at the transit gateway; omit the next hop")
+        routes = _summaries_excluding_each([hub["cidr"]] + spoke_cidrs)
+        return {
+            "nextHop": TRANSIT_GATEWAY_HOP,
+            "networks": [
+                {"routes": network_routes, "subnets": list(range(1, count + 1))}
+                for network_routes, count in zip(routes, subnet_counts)
+            ],
+        }
+
+    if plan.get("peerings") is not None:
+        raise ValueError("Route tables are generated for hub-spoke and transit-gateway topologies")
+
+    if next_hop is None:
+        next_hop = hub["subnets"][0]["first_usable"]
+    try:
+        inside_hub = ipaddress.ip_address(next_hop) in ipaddress.ip_network(hub["cidr"])
+    except ValueError:
+        inside_hub = False
+    if not inside_hub:
+        raise ValueError(f"Next hop {next_hop} must be an address inside the hub network {hub['cidr']}")
+
+    networks = [{"routes": summarize_prefixes(spoke_cidrs), "subnets": list(range(2, subnet_counts[0] + 1))}]
+    for spoke_routes, count in zip(_summaries_excluding_each(spoke_cidrs), subnet_counts[1:]):
+        networks.append({"routes": spoke_routes, "subnets": list(range(1, count + 1)) if spoke_routes else []})
+    return {"nextHop": next_hop, "networks": networks}
+
+
+def route_table_entries(route_tables: Dict[str, Any]) -> List[Tuple[int, List[str], List[int]]]:
+    """(network position, routes, associated subnets) for every network with routes."""
+    return [
+        (idx, network["routes"], network["subnets"])
+        for idx, network in enumerate(route_tables["networks"])
+        if network["routes"]
+    ]
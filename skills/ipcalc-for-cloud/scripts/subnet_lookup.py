@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+IP-to-Subnet Lookup
+
+Answers "which subnet, VNet/VPC and zone owns this IP" for a calculated plan.
+The subnets of a plan are disjoint address ranges, so the index is simply
+their integer start addresses in sorted order: a lookup is one bisect over
+the starts plus a bounds check, O(log n). Addresses that fall inside a
+network but outside every subnet still resolve to their network.
+
+Bulk classification (e.g. flow logs with millions of source addresses) packs
+the addresses into an integer array and resolves them all with one vectorized
+searchsorted when NumPy is installed, falling back to bisect per address.
+"""
+
+import ipaddress
+import socket
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from network_ir import plan_networks
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Index value for addresses that no subnet (or network) owns
+NO_MATCH = -1
+
+
+def _ranges(cidrs: Iterable[str]) -> List[Tuple[int, int]]:
+    """Integer (first, last) address of each CIDR."""
+    ranges = []
+    for cidr in cidrs:
+        network = ipaddress.ip_network(cidr, strict=False)
+        first = int(network.network_address)
+        ranges.append((first, first + network.num_addresses - 1))
+    return ranges
+
+
+def _sorted_ranges(ranges: Sequence[Tuple[int, int]], what: str) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Sort ranges by start, returning (starts, ends, original positions).
+
+    Raises:
+        ValueError: If two ranges overlap (the owner of an address would be ambiguous)
+    """
+    order = sorted(range(len(ranges)), key=lambda idx: ranges[idx][0])
+    starts = [ranges[idx][0] for idx in order]
+    ends = [ranges[idx][1] for idx in order]
+    for pos in range(1, len(order)):
+        if starts[pos] <= ends[pos - 1]:
+            raise ValueError(f"Overlapping {what} in plan; lookups would be ambiguous")
+    return starts, ends, order
+
+
+def parse_ipv4_addresses(lines: Iterable[str]) -> Tuple[List[int], List[str]]:
+    """
+    Parse dotted-quad addresses, skipping blank lines.
+
+    Returns:
+        (integer addresses, rejected lines)
+    """
+    addresses = []
+    rejected = []
+    for line in lines:
+        text = line.strip()
+        if not text:
+            continue
+        try:
+            addresses.append(int.from_bytes(socket.inet_pton(socket.AF_INET, text), 'big'))
+        except OSError:
+            rejected.append(text)
+    return addresses, rejected
+
+
+class SubnetLookup:
+    """Sorted-interval index over the subnets and networks of a plan."""
+
+    __slots__ = ('records', 'networks', '_starts', '_ends', '_order',
+                 '_network_starts', '_network_ends', '_network_order', '_arrays')
+
+    def __init__(self, plan: Dict[str, Any], cidr: Optional[str] = None):
+        """
+        Build the index.
+
+        Args:
+            plan: Result of calculate_subnets, generate_hub_spoke_topology,
+                generate_topology or calculate_region_layout
+            cidr: Network CIDR of a calculate_subnets result
+
+        Raises:
+            ValueError: If subnets or networks of the plan overlap
+        """
+        self.networks: List[Dict[str, str]] = []
+        self.records: List[Dict[str, Any]] = []
+        for network in plan_networks(plan, cidr):
+            label, network_cidr = network.label, network.cidr
+            self.networks.append({"network": label, "networkCidr": network_cidr})
+            for subnet in network.subnets:
+                self.records.append({
+                    "subnet": subnet["cidr"],
+                    "name": subnet.get("name", ""),
+                    "index": subnet.get("index"),
+                    "network": label,
+                    "networkCidr": network_cidr,
+                    "zone": subnet.get("availabilityZone", ""),
+                })
+
+        self._starts, self._ends, self._order = _sorted_ranges(
+            _ranges(record["subnet"] for record in self.records), "subnets"
+        )
+        with_cidr = [idx for idx, network in enumerate(self.networks) if network["networkCidr"]]
+        self._network_starts, self._network_ends, order = _sorted_ranges(
+            _ranges(self.networks[idx]["networkCidr"] for idx in with_cidr), "networks"
+        )
+        self._network_order = [with_cidr[pos] for pos in order]
+        self._arrays = None
+
+    @staticmethod
+    def _find(starts: List[int], ends: List[int], address: int) -> int:
+        pos = bisect_right(starts, address) - 1
+        if pos >= 0 and address <= ends[pos]:
+            return pos
+        return NO_MATCH
+
+    def find(self, address: int) -> int:
+        """Record index of the subnet holding an integer address, or NO_MATCH."""
+        pos = self._find(self._starts, self._ends, address)
+        return self._order[pos] if pos != NO_MATCH else NO_MATCH
+
+    def lookup(self, ip: str) -> Dict[str, Any]:
+        """
+        Resolve one IPv4 address.
+
+        Returns:
+            {"ip", "matched", ...}: the owning subnet record when matched, else the
+            owning network (without a subnet) or just the address
+        """
+        address = int(ipaddress.IPv4Address(ip.strip()))
+        idx = self.find(address)
+        if idx != NO_MATCH:
+            return {"ip": ip.strip(), "matched": True, **self.records[idx]}
+
+        result: Dict[str, Any] = {"ip": ip.strip(), "matched": False}
+        pos = self._find(self._network_starts, self._network_ends, address)
+        if pos != NO_MATCH:
+            result.update(self.networks[self._network_order[pos]])
+        return result
+
+    def classify(self, addresses: Any) -> Any:
+        """
+        Resolve many integer addresses at once.
+
+        Args:
+            addresses: Integer addresses (list or uint32 NumPy array)
+
+        Returns:
+            Record index per address (NO_MATCH if unowned): an int64 NumPy array
+            when NumPy is installed, a list otherwise
+        """
+        if not NUMPY_AVAILABLE:
+            return [self.find(address) for address in addresses]
+
+        if self._arrays is None:
+            self._arrays = (
+                np.asarray(self._starts, dtype=np.int64),
+                np.asarray(self._ends, dtype=np.int64),
+                np.asarray(self._order, dtype=np.int64),
+            )
+        starts, ends, order = self._arrays
+        values = np.asarray(addresses, dtype=np.int64)
+        if not len(starts):
+            return np.full(len(values), NO_MATCH, dtype=np.int64)
+
+        pos = np.searchsorted(starts, values, side='right') - 1
+        safe = np.clip(pos, 0, None)
+        matched = (pos >= 0) & (values <= ends[safe])
+        return np.where(matched, order[safe], NO_MATCH)
+
+    def summarize(self, indices: Any) -> Dict[str, Any]:
+        """
+        Count classified addresses per subnet.
+
+        Returns:
+            {"total", "unmatched", "subnets": [record + "count", ...]} in record order
+        """
+        if NUMPY_AVAILABLE and isinstance(indices, np.ndarray):
+            counts = np.bincount(indices + 1, minlength=len(self.records) + 1).tolist()
+        else:
+            counts = [0] * (len(self.records) + 1)
+            for idx in indices:
+                counts[idx + 1] += 1
+        return {
+            "total": sum(counts),
+            "unmatched": counts[0],
+            "subnets": [dict(record, count=count) for record, count in zip(self.records, counts[1:])],
+        }
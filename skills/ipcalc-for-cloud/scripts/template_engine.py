@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Template Engine
+
+Compiles the .template.* files into Python render functions. Each template is
+translated once into Python source (literal runs and expressions become
+%-format appends, loops become Python loops) and compiled; the result is
+cached by template text, so every later render is a plain function call.
+
+Syntax:
+
+    {{ expr }}                          Python expression, inserted as str(expr)
+    {% for a, b in expr %} ... {% endfor %}
+    {% if expr %} ... {% elif expr %} ... {% else %} ... {% endif %}
+    {% fragment a, b=expr %} ... {% endfragment %}
+
+A line holding nothing but one {% %} tag is dropped entirely, indentation and
+newline included, so tags can sit on their own lines without leaving blank
+lines in the output.
+
+Expressions see the render context and a few builtins (enumerate, len, range,
+...), nothing else. A fragment is a block whose text depends only on the
+names it lists: its body may not use anything else, and its rendered text is
+kept in the fragment cache keyed by the template, the fragment and the values
+of those names. A loop whose body is a single fragment looks up all
+iterations in one batch.
+"""
+
+import ast
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Rendered fragments kept across calls
+FRAGMENT_CACHE_SIZE = 65536
+
+# Compiled templates kept across calls
+TEMPLATE_CACHE_SIZE = 64
+
+# Builtins available to template expressions
+TEMPLATE_BUILTINS: Dict[str, Any] = {
+    'enumerate': enumerate, 'len': len, 'range': range, 'min': min, 'max': max, 'zip': zip,
+    'str': str, 'int': int, 'sorted': sorted, 'any': any, 'all': all, 'sum': sum,
+    'True': True, 'False': False, 'None': None,
+}
+
+_fragment_cache: 'OrderedDict[Tuple[Hashable, Tuple[Any, ...]], str]' = OrderedDict()
+_fragment_lock = threading.Lock()
+_fragment_stats = {"hits": 0, "misses": 0}
+
+_TAG = re.compile(r'\{\{(.*?)\}\}|\{%(.*?)%\}', re.DOTALL)
+
+
+# ---------------------------------------------------------------------------
+# Fragment cache
+# ---------------------------------------------------------------------------
+
+def render_fragments(block: Hashable, args: Sequence[Tuple[Any, ...]], render: Callable[..., str]) -> List[str]:
+    """
+    Rendered text of a block for each argument tuple, reused from the fragment cache when possible.
+
+    The cache is consulted once per batch; only the misses are rendered.
+
+    Args:
+        block: Identifies the block renderer
+        args: One tuple per rendering - everything the text depends on
+        render: Called as render(*args) on a miss; must use only its arguments
+    """
+    cache = _fragment_cache
+    keys = [(block, values) for values in args]
+    with _fragment_lock:
+        texts = [cache.get(key) for key in keys]
+        misses = [i for i, text in enumerate(texts) if text is None]
+        for i, key in enumerate(keys):
+            if texts[i] is not None:
+                cache.move_to_end(key)
+        _fragment_stats["hits"] += len(keys) - len(misses)
+        _fragment_stats["misses"] += len(misses)
+    if misses:
+        for i in misses:
+            texts[i] = render(*args[i])
+        with _fragment_lock:
+            for i in misses:
+                cache[keys[i]] = texts[i]
+            while len(cache) > FRAGMENT_CACHE_SIZE:
+                cache.popitem(last=False)
+    return texts
+
+
+def render_fragment(block: Hashable, values: Tuple[Any, ...], render: Callable[..., str]) -> str:
+    """Single-block form of render_fragments."""
+    return render_fragments(block, [values], render)[0]
+
+
+def clear_fragment_cache() -> None:
+    """Drop all cached fragments and reset the statistics."""
+    with _fragment_lock:
+        _fragment_cache.clear()
+        _fragment_stats["hits"] = _fragment_stats["misses"] = 0
+
+
+def fragment_cache_info() -> Dict[str, int]:
+    """Hit/miss statistics and size of the fragment cache."""
+    with _fragment_lock:
+        return dict(_fragment_stats, size=len(_fragment_cache), maxsize=FRAGMENT_CACHE_SIZE)
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+class _Node:
+    """Parsed template element: kind is text, expr, for, if or fragment."""
+
+    def __init__(self, kind: str, value: Any = None, line: int = 0):
+        self.kind = kind
+        self.value = value
+        self.line = line
+        self.body: List['_Node'] = []
+        # if: [(condition, body), ...], last condition None for else
+        self.branches: List[Tuple[Optional[str], List['_Node']]] = []
+
+
+def _parse(source: str, name: str) -> List[_Node]:
+    """Parse template text into a node tree."""
+    root = _Node('root')
+    stack = [root]
+    body = root.body
+    position = 0
+
+    for match in _TAG.finditer(source):
+        start, end = match.span()
+        line = source.count('\n', 0, start) + 1
+        if match.group(2) is not None:
+            # A statement alone on its line takes the whole line with it
+            line_start = source.rfind('\n', 0, start) + 1
+            line_end = source.find('\n', end)
+            line_end = len(source) if line_end < 0 else line_end
+            if (line_start >= position and not source[line_start:start].strip(' \t')
+                    and not source[end:line_end].strip(' \t')):
+                start, end = line_start, min(line_end + 1, len(source))
+        if start > position:
+            body.append(_Node('text', source[position:start]))
+        position = end
+
+        if match.group(1) is not None:
+            body.append(_Node('expr', _expression(match.group(1), name, line), line))
+            continue
+
+        statement = match.group(2).strip()
+        keyword, _, rest = statement.partition(' ')
+        rest = rest.strip()
+        top = stack[-1]
+
+        if keyword == 'for':
+            target, separator, iterable = rest.partition(' in ')
+            if not separator:
+                raise ValueError(f"{name}:{line}: expected 'for <names> in <expr>', got {statement!r}")
+            node = _Node('for', (_target(target, name, line), _expression(iterable, name, line)), line)
+            body.append(node)
+            stack.append(node)
+            body = node.body
+        elif keyword == 'if':
+            node = _Node('if', None, line)
+            node.branches.append((_expression(rest, name, line), []))
+            body.append(node)
+            stack.append(node)
+            body = node.branches[-1][1]
+        elif keyword in ('elif', 'else'):
+            if top.kind != 'if' or top.branches[-1][0] is None:
+                raise ValueError(f"{name}:{line}: unexpected {keyword}")
+            condition = _expression(rest, name, line) if keyword == 'elif' else None
+            top.branches.append((condition, []))
+            body = top.branches[-1][1]
+        elif keyword == 'fragment':
+            node = _Node('fragment', _fragment_params(rest, name, line), line)
+            body.append(node)
+            stack.append(node)
+            body = node.body
+        elif keyword in ('endfor', 'endif', 'endfragment'):
+            if top.kind != keyword[3:]:
+                raise ValueError(f"{name}:{line}: unexpected {keyword}")
+            stack.pop()
+            parent = stack[-1]
+            body = parent.branches[-1][1] if parent.kind == 'if' else parent.body
+        else:
+            raise ValueError(f"{name}:{line}: unknown tag {statement!r}")
+
+    if len(stack) > 1:
+        raise ValueError(f"{name}:{stack[-1].line}: unclosed {stack[-1].kind}")
+    if position < len(source):
+        body.append(_Node('text', source[position:]))
+    return root.body
+
+
+def _expression(text: str, name: str, line: int) -> str:
+    text = text.strip()
+    try:
+        ast.parse(text, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"{name}:{line}: invalid expression {text!r}: {e.msg}")
+    return text
+
+
+def _target(text: str, name: str, line: int) -> str:
+    text = text.strip()
+    try:
+        statement = ast.parse(f'for {text} in ():\n    pass').body[0]
+    except SyntaxError:
+        statement = None
+    if not isinstance(statement, ast.For) or not all(
+            isinstance(node, (ast.Name, ast.Tuple, ast.Store)) for node in ast.walk(statement.target)):
+        raise ValueError(f"{name}:{line}: invalid loop target {text!r}")
+    return text
+
+
+def _fragment_params(text: str, name: str, line: int) -> List[Tuple[str, str]]:
+    """Parse 'a, b=expr' into [(name, source expression), ...]."""
+    try:
+        call = ast.parse(f'_({text})', mode='eval').body
+    except SyntaxError as e:
+        raise ValueError(f"{name}:{line}: invalid fragment parameters {text!r}: {e.msg}")
+    params = []
+    for arg in call.args:
+        if not isinstance(arg, ast.Name):
+            raise ValueError(f"{name}:{line}: fragment parameter must be a name or name=expr")
+        params.append((arg.id, arg.id))
+    for keyword in call.keywords:
+        if keyword.arg is None:
+            raise ValueError(f"{name}:{line}: fragment parameter must be a name or name=expr")
+        params.append((keyword.arg, ast.unparse(keyword.value)))
+    if not params:
+        raise ValueError(f"{name}:{line}: fragment needs at least one parameter")
+    return params
+
+
+def _names(expression: str) -> set:
+    """Names an expression reads from its surroundings (comprehension and lambda variables excluded)."""
+    loaded, local = set(), set()
+    for node in ast.walk(ast.parse(expression, mode='eval')):
+        if isinstance(node, ast.Name):
+            (loaded if isinstance(node.ctx, ast.Load) else local).add(node.id)
+        elif isinstance(node, ast.arg):
+            local.add(node.arg)
+    return loaded - local
+
+
+def _target_names(target: str) -> set:
+    statement = ast.parse(f'for {target} in ():\n    pass').body[0]
+    return {node.id for node in ast.walk(statement.target) if isinstance(node, ast.Name)}
+
+
+def _free_names(nodes: List[_Node], bound: set) -> set:
+    """Names read by nodes that are not bound by an enclosing loop or fragment."""
+    free = set()
+    for node in nodes:
+        if node.kind == 'expr':
+            free |= _names(node.value) - bound
+        elif node.kind == 'for':
+            target, iterable = node.value
+            free |= _names(iterable) - bound
+            free |= _free_names(node.body, bound | _target_names(target))
+        elif node.kind == 'if':
+            for condition, branch in node.branches:
+                if condition is not None:
+                    free |= _names(condition) - bound
+                free |= _free_names(branch, bound)
+        elif node.kind == 'fragment':
+            for _, expression in node.value:
+                free |= _names(expression) - bound
+    return free
+
+
+# ---------------------------------------------------------------------------
+# Code generation
+# ---------------------------------------------------------------------------
+
+class _Generator:
+    """Translates a node tree into the source of a Python module with render(ctx)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.functions: List[List[str]] = []
+        self.fragment_count = 0
+
+    def module(self, nodes: List[_Node], context_names: List[str]) -> str:
+        lines = ['def render(_ctx):']
+        lines += [f'    {name} = _ctx[{name!r}]' for name in context_names]
+        lines += self.body(nodes, 1)
+        functions = [line for function in self.functions for line in function]
+        return '\n'.join(functions + lines) + '\n'
+
+    def body(self, nodes: List[_Node], depth: int) -> List[str]:
+        """Function body rendering nodes into a list and returning the joined text."""
+        indent = '    ' * depth
+        return ([f'{indent}_out = []', f'{indent}_append = _out.append']
+                + self.statements(nodes, depth)
+                + [f"{indent}return ''.join(_out)"])
+
+    def statements(self, nodes: List[_Node], depth: int) -> List[str]:
+        indent = '    ' * depth
+        lines: List[str] = []
+        run: List[_Node] = []
+
+        def flush() -> None:
+            if run:
+                lines.append(f'{indent}_append({self.format(run)})')
+                run.clear()
+
+        for node in nodes:
+            if node.kind in ('text', 'expr'):
+                run.append(node)
+                continue
+            flush()
+            if node.kind == 'for':
+                target, iterable = node.value
+                body = [child for child in node.body if not (child.kind == 'text' and child.value == '')]
+                if len(body) == 1 and body[0].kind == 'fragment':
+                    block, function, params = self.fragment(body[0])
+                    values = ', '.join(expression for _, expression in params)
+                    lines.append(f'{indent}_out.extend(_render_fragments({block}, '
+                                 f'[({values},) for {target} in {iterable}], {function}))')
+                    continue
+                lines.append(f'{indent}for {target} in {iterable}:')
+                lines += self.statements(node.body, depth + 1) or [f'{indent}    pass']
+            elif node.kind == 'if':
+                for position, (condition, branch) in enumerate(node.branches):
+                    if condition is None:
+                        lines.append(f'{indent}else:')
+                    else:
+                        lines.append(f"{indent}{'if' if position == 0 else 'elif'} {condition}:")
+                    lines += self.statements(branch, depth + 1) or [f'{indent}    pass']
+            elif node.kind == 'fragment':
+                block, function, params = self.fragment(node)
+                values = ', '.join(expression for _, expression in params)
+                lines.append(f'{indent}_append(_render_fragment({block}, ({values},), {function}))')
+        flush()
+        return lines
+
+    def fragment(self, node: _Node) -> Tuple[str, str, List[Tuple[str, str]]]:
+        """Emit the render function of a fragment; returns (block id source, function name, params)."""
+        params = node.value
+        names = {name for name, _ in params}
+        stray = _free_names(node.body, names) - set(TEMPLATE_BUILTINS)
+        if stray:
+            raise ValueError(f"{self.name}:{node.line}: fragment uses {', '.join(sorted(stray))} "
+                             f"which is not one of its parameters")
+        number = self.fragment_count
+        self.fragment_count += 1
+        function = f'_fragment{number}'
+        lines = [f"def {function}({', '.join(name for name, _ in params)}):"]
+        if all(child.kind in ('text', 'expr') for child in node.body):
+            lines.append(f'    return {self.format(node.body) if node.body else repr("")}')
+        else:
+            lines += self.body(node.body, 1)
+        self.functions.append(lines + [''])
+        return f'(_TEMPLATE, {number})', function, params
+
+    @staticmethod
+    def format(run: List[_Node]) -> str:
+        """A %-format expression rendering a run of text and expression nodes."""
+        if len(run) == 1 and run[0].kind == 'text':
+            return repr(run[0].value)
+        pattern = ''.join(node.value.replace('%', '%%') if node.kind == 'text' else '%s' for node in run)
+        values = ''.join(f'({node.value}),' for node in run if node.kind == 'expr')
+        return f'{pattern!r} % ({values})'
+
+
+class Template:
+    """A compiled template: call render(context) to produce text."""
+
+    def __init__(self, source: str, name: str = '<template>'):
+        nodes = _parse(source, name)
+        self.name = name
+        self.digest = hashlib.sha1(source.encode()).hexdigest()[:16]
+        self.names = sorted(_free_names(nodes, set()) - set(TEMPLATE_BUILTINS))
+        self.code = _Generator(name).module(nodes, self.names)
+        namespace: Dict[str, Any] = dict(TEMPLATE_BUILTINS, __builtins__={},
+                                         _TEMPLATE=self.digest,
+                                         _render_fragment=render_fragment,
+                                         _render_fragments=render_fragments)
+        exec(compile(self.code, f'<{name}>', 'exec'), namespace)
+        self._render = namespace['render']
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """
+        Render the template.
+
+        Raises:
+            ValueError: If the context lacks a name the template uses
+        """
+        missing = [name for name in self.names if name not in context]
+        if missing:
+            raise ValueError(f"{self.name}: missing template values: {', '.join(missing)}")
+        return self._render(context)
+
+
+_template_cache: 'OrderedDict[Tuple[str, str], Template]' = OrderedDict()
+_template_lock = threading.Lock()
+
+
+def compile_template(source: str, name: str = '<template>') -> Template:
+    """
+    Compiled form of a template, built once per distinct template text.
+
+    Raises:
+        ValueError: If the template has a syntax error
+    """
+    key = (name, source)
+    with _template_lock:
+        template = _template_cache.get(key)
+        if template is not None:
+            _template_cache.move_to_end(key)
+            return template
+    template = Template(source, name)
+    with _template_lock:
+        _template_cache[key] = template
+        while len(_template_cache) > TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+    return template
+
+
+def render_template(source: str, context: Dict[str, Any], name: str = '<template>') -> str:
+    """Compile (cached) and render a template."""
+    return compile_template(source, name).render(context)
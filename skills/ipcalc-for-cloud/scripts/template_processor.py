@@ -2,13 +2,189 @@
 """
 Template Processor for Cloud IaC Generation
 
-Processes templates with placeholder replacement to generate IaC code.
+Renders the provider templates (see template_engine.py) to generate IaC code.
 Matches TypeScript CLI implementation.
+
+Each processor builds the template context from the plan data. Per-subnet
+blocks are template fragments rendered through a cache keyed by everything
+the block text depends on, so re-rendering a slightly changed plan only
+builds the blocks of the subnets that changed before reassembly. Sections
+that span networks (route tables, transit gateways, GCP peering chains) are
+built here and inserted as values.
+
+Terraform, Bicep and ARM also have a compact layout (data['compact']):
+subnets become one map or array parameter named after their CIDR, deployed by
+a single for_each resource, for-expression or copy loop.
+
+The compact Terraform templates also render as a module shared by many
+environments (process_terraform_module), each environment reduced to its
+variable values (terraform_tfvars).
+
+Azure and GCP hub-spoke Terraform also renders as separate roots, one for the
+hub and one per spoke (process_terraform_roots), so each has its own state.
+
+CloudFormation plans over the per-template quotas are split into a parent
+stack and nested subnet stacks (cloudformation_stack_ranges).
 """
 
-from typing import Dict, List, Any
+from functools import partial
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import os
 
+from json_output import dumps
+from network_ir import network_label
+from route_tables import route_table_entries
+from template_engine import render_fragments, render_template
+
+
+def _subnet_fragments(
+    provider: str,
+    output_format: str,
+    block: str,
+    subnets: List[Dict[str, Any]],
+    render: Callable[..., str],
+    network: int = 0,
+    zone: Optional[Callable[[Dict[str, Any], int], Any]] = None
+) -> str:
+    """
+    Concatenate one cached block per subnet, for sections built outside a template.
+
+    Args:
+        provider, output_format, block: Identify the block renderer
+        subnets: Subnets of one network
+        render: render(index, cidr, zone, network) -> block text
+        network: Position of the network holding the subnets (0 = hub, n = spoke n)
+        zone: (subnet, index) -> per-subnet attribute the block uses besides index and CIDR
+            (zone index, region, route table association); omit if none
+    """
+    args = [
+        (idx, subnet['cidr'], zone(subnet, idx) if zone else None, network)
+        for idx, subnet in enumerate(subnets, 1)
+    ]
+    return ''.join(render_fragments((provider, output_format, block), args, render))
+
+
+def _peering_pairs(data: Dict[str, Any], num_spokes: int) -> List[Tuple[int, int]]:
+    """
+    Return the network pairs to peer.
+
+    Networks are addressed by position (0 = hub, n = spoke n). Data without a
+    'peerings' list (see topology.py) is treated as hub-spoke.
+    """
+    peerings = data.get('peerings')
+    if peerings is None:
+        return [(0, idx) for idx in range(1, num_spokes + 1)]
+    return [(a, b) for a, b in peerings]
+
+
+# Name fragment for a network in peering names: 'hub' or 'spoke{n}'
+_network_label = network_label
+
+
+def _network_title(idx: int) -> str:
+    """Human-readable network name for comments and messages: 'Hub' or 'Spoke {n}'."""
+    return 'Hub' if idx == 0 else f'Spoke {idx}'
+
+
+def _network_role(spoke: Dict[str, Any]) -> str:
+    """Role tag value for a spoke-list network ('Spoke', or 'Hub' for multi-hub regional hubs)."""
+    return spoke.get('role', 'spoke').capitalize()
+
+
+def _zone_index(subnet: Dict[str, Any], idx: int) -> int:
+    """0-based zone position for subnet idx: pinned by a region layout, else round-robin."""
+    return subnet.get('zoneIndex', idx - 1)
+
+
+def _gcp_region(subnet: Dict[str, Any], idx: int) -> str:
+    """Region a GCP subnet is created in."""
+    return subnet.get('region', subnet.get('availabilityZone', 'us-central1'))
+
+
+# Deployment region of the templates when the plan does not pin one (Oracle takes it from its CLI configuration)
+DEFAULT_REGIONS: Dict[str, str] = {'aws': 'us-east-1', 'azure': 'eastus', 'alicloud': 'cn-hangzhou'}
+
+
+def _region(data: Dict[str, Any], provider: str) -> str:
+    """Region the templates deploy to: the planned region (data['region']), else the provider default."""
+    return data.get('region') or DEFAULT_REGIONS.get(provider, '')
+
+
+def _spokes(data: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    """Spoke networks to render: data[key] when peering is enabled, else none."""
+    return data[key] if data.get('peeringEnabled') and data.get(key) else []
+
+
+# Helpers available to every template
+_TEMPLATE_HELPERS: Dict[str, Any] = {
+    'network_label': _network_label,
+    'network_title': _network_title,
+    'network_role': _network_role,
+    'zone_index': _zone_index,
+    'gcp_region': _gcp_region,
+}
+
+
+def _route_tables(data: Dict[str, Any]) -> List[Tuple[int, List[str], List[int]]]:
+    """(network position, summarized routes, associated subnets) per routed network, if data has routeTables."""
+    if not data.get('routeTables'):
+        return []
+    return route_table_entries(data['routeTables'])
+
+
+def _network_location(data: Dict[str, Any], idx: int) -> str:
+    """Explicit location of network idx, or '' when it follows the deployment location."""
+    spokes = data.get('spokeVNets', data.get('spokeVPCs', []))
+    return spokes[idx - 1].get('location', '') if idx else ''
+
+
+def _azure_terraform_route_tables(data: Dict[str, Any]) -> str:
+    """Route tables, summarized routes and subnet associations for the Azure Terraform template."""
+    tables = _route_tables(data)
+    if not tables:
+        return ''
+
+    next_hop = data['routeTables']['nextHop']
+    blocks = ['# ========================================\n'
+              '# Route Tables\n'
+              '# ========================================\n\n']
+    for network_idx, routes, subnet_indices in tables:
+        label = _network_label(network_idx)
+        location = _network_location(data, network_idx)
+        location = f'"{location}"' if location else 'azurerm_resource_group.rg.location'
+        block = (
+            f'resource "azurerm_route_table" "{label}_rt" {{\n'
+            f'  name                = "${{var.prefix}}-{label}-rt"\n'
+            f'  location            = {location}\n'
+            f'  resource_group_name = azurerm_resource_group.rg.name\n'
+        )
+        for route_idx, prefix in enumerate(routes, 1):
+            block += (
+                f'\n  route {{\n'
+                f'    name                   = "route{route_idx}"\n'
+                f'    address_prefix         = "{prefix}"\n'
+                f'    next_hop_type          = "VirtualAppliance"\n'
+                f'    next_hop_in_ip_address = "{next_hop}"\n'
+                f'  }}\n'
+            )
+        blocks.append(block + '}\n\n')
+
+        subnet_ref = 'azurerm_subnet.subnet{}' if network_idx == 0 else f'azurerm_subnet.spoke{network_idx}_subnet{{}}'
+        subnet_label = 'subnet{}' if network_idx == 0 else f'spoke{network_idx}_subnet{{}}'
+        for subnet_idx in subnet_indices:
+            blocks.append(
+                f'resource "azurerm_subnet_route_table_association" "{subnet_label.format(subnet_idx)}" {{\n'
+                f'  subnet_id      = {subnet_ref.format(subnet_idx)}.id\n'
+                f'  route_table_id = azurerm_route_table.{label}_rt.id\n'
+                f'}}\n\n'
+            )
+    return ''.join(blocks)
+
+
+def _azure_routed_subnets(data: Dict[str, Any]) -> Dict[int, List[int]]:
+    """Network position -> subnets associated with its route table."""
+    return {network_idx: subnet_indices for network_idx, _, subnet_indices in _route_tables(data)}
+
 
 def process_azure_terraform_template(template_content: str, data: Dict[str, Any]) -> str:
     """
@@ -21,119 +197,21 @@ def process_azure_terraform_template(template_content: str, data: Dict[str, Any]
     Returns:
         Processed Terraform code
     """
-    content = template_content
-
-    # Generate subnet variables
-    subnet_variables = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_variables += f'\nvariable "subnet{idx}_cidr" {{\n'
-        subnet_variables += f'  description = "CIDR block for Subnet {idx}"\n'
-        subnet_variables += f'  type        = string\n'
-        subnet_variables += f'  default     = "{subnet["cidr"]}"\n'
-        subnet_variables += '}\n'
-
-    # Generate subnet resources
-    subnet_resources = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_resources += f'resource "azurerm_subnet" "subnet{idx}" {{\n'
-        subnet_resources += f'  name                 = "${{var.prefix}}-subnet{idx}"\n'
-        subnet_resources += f'  resource_group_name  = azurerm_resource_group.rg.name\n'
-        subnet_resources += f'  virtual_network_name = azurerm_virtual_network.vnet.name\n'
-        subnet_resources += f'  address_prefixes     = [var.subnet{idx}_cidr]\n'
-        subnet_resources += '}\n\n'
-
-    # Generate subnet outputs
-    subnet_outputs = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_outputs += f'\noutput "subnet{idx}_id" {{\n'
-        subnet_outputs += f'  description = "ID of Subnet {idx}"\n'
-        subnet_outputs += f'  value       = azurerm_subnet.subnet{idx}.id\n'
-        subnet_outputs += '}\n'
-
-    # Generate spoke VNET resources
-    spoke_vnet_resources = ''
-    vnet_peering_resources = ''
-    spoke_vnet_outputs = ''
-
-    if data.get('peeringEnabled') and data.get('spokeVNets'):
-        spoke_vnets = data['spokeVNets']
-
-        spoke_vnet_resources += '\n# ========================================\n'
-        spoke_vnet_resources += '# Spoke VNets\n'
-        spoke_vnet_resources += '# ========================================\n\n'
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            # Spoke VNET resource
-            spoke_vnet_resources += f'resource "azurerm_virtual_network" "spoke{spoke_idx}_vnet" {{\n'
-            spoke_vnet_resources += f'  name                = "${{var.prefix}}-spoke{spoke_idx}-vnet"\n'
-            spoke_vnet_resources += f'  address_space       = ["{spoke["cidr"]}"]\n'
-            spoke_vnet_resources += f'  location            = azurerm_resource_group.rg.location\n'
-            spoke_vnet_resources += f'  resource_group_name = azurerm_resource_group.rg.name\n\n'
-            spoke_vnet_resources += f'  tags = {{\n'
-            spoke_vnet_resources += f'    Environment = "Production"\n'
-            spoke_vnet_resources += f'    ManagedBy   = "Terraform"\n'
-            spoke_vnet_resources += f'    Role        = "Spoke"\n'
-            spoke_vnet_resources += f'  }}\n'
-            spoke_vnet_resources += '}\n\n'
-
-            # Spoke subnets
-            for subnet_idx, subnet in enumerate(spoke['subnets'], 1):
-                spoke_vnet_resources += f'resource "azurerm_subnet" "spoke{spoke_idx}_subnet{subnet_idx}" {{\n'
-                spoke_vnet_resources += f'  name                 = "${{var.prefix}}-spoke{spoke_idx}-subnet{subnet_idx}"\n'
-                spoke_vnet_resources += f'  resource_group_name  = azurerm_resource_group.rg.name\n'
-                spoke_vnet_resources += f'  virtual_network_name = azurerm_virtual_network.spoke{spoke_idx}_vnet.name\n'
-                spoke_vnet_resources += f'  address_prefixes     = ["{subnet["cidr"]}"]\n'
-                spoke_vnet_resources += '}\n\n'
-
-        # VNET Peering resources
-        vnet_peering_resources += '# ========================================\n'
-        vnet_peering_resources += '# VNET Peering\n'
-        vnet_peering_resources += '# ========================================\n\n'
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            # Hub to Spoke peering
-            vnet_peering_resources += f'resource "azurerm_virtual_network_peering" "hub_to_spoke{spoke_idx}" {{\n'
-            vnet_peering_resources += f'  name                      = "hub-to-spoke{spoke_idx}"\n'
-            vnet_peering_resources += f'  resource_group_name       = azurerm_resource_group.rg.name\n'
-            vnet_peering_resources += f'  virtual_network_name      = azurerm_virtual_network.vnet.name\n'
-            vnet_peering_resources += f'  remote_virtual_network_id = azurerm_virtual_network.spoke{spoke_idx}_vnet.id\n'
-            vnet_peering_resources += f'  allow_virtual_network_access = true\n'
-            vnet_peering_resources += f'  allow_forwarded_traffic      = true\n'
-            vnet_peering_resources += f'  allow_gateway_transit        = false\n'
-            vnet_peering_resources += '}\n\n'
-
-            # Spoke to Hub peering
-            vnet_peering_resources += f'resource "azurerm_virtual_network_peering" "spoke{spoke_idx}_to_hub" {{\n'
-            vnet_peering_resources += f'  name                      = "spoke{spoke_idx}-to-hub"\n'
-            vnet_peering_resources += f'  resource_group_name       = azurerm_resource_group.rg.name\n'
-            vnet_peering_resources += f'  virtual_network_name      = azurerm_virtual_network.spoke{spoke_idx}_vnet.name\n'
-            vnet_peering_resources += f'  remote_virtual_network_id = azurerm_virtual_network.vnet.id\n'
-            vnet_peering_resources += f'  allow_virtual_network_access = true\n'
-            vnet_peering_resources += f'  allow_forwarded_traffic      = true\n'
-            vnet_peering_resources += f'  use_remote_gateways          = false\n'
-            vnet_peering_resources += '}\n\n'
-
-        # Spoke VNET outputs
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            spoke_vnet_outputs += f'\noutput "spoke{spoke_idx}_vnet_id" {{\n'
-            spoke_vnet_outputs += f'  description = "ID of Spoke {spoke_idx} Virtual Network"\n'
-            spoke_vnet_outputs += f'  value       = azurerm_virtual_network.spoke{spoke_idx}_vnet.id\n'
-            spoke_vnet_outputs += '}\n'
-            spoke_vnet_outputs += f'\noutput "spoke{spoke_idx}_vnet_name" {{\n'
-            spoke_vnet_outputs += f'  description = "Name of Spoke {spoke_idx} Virtual Network"\n'
-            spoke_vnet_outputs += f'  value       = azurerm_virtual_network.spoke{spoke_idx}_vnet.name\n'
-            spoke_vnet_outputs += '}\n'
-
-    # Replace placeholders
-    content = content.replace('{{vnetCidr}}', data['vnetCidr'])
-    content = content.replace('{{subnetVariables}}', subnet_variables)
-    content = content.replace('{{subnetResources}}', subnet_resources)
-    content = content.replace('{{subnetOutputs}}', subnet_outputs)
-    content = content.replace('{{spokeVnetResources}}', spoke_vnet_resources)
-    content = content.replace('{{vnetPeeringResources}}', vnet_peering_resources)
-    content = content.replace('{{spokeVnetOutputs}}', spoke_vnet_outputs)
-
-    return content
+    spoke_vnets = _spokes(data, 'spokeVNets')
+
+    def vnet_ref(idx: int) -> str:
+        return 'azurerm_virtual_network.vnet' if idx == 0 else f'azurerm_virtual_network.spoke{idx}_vnet'
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'azure'),
+        vnetCidr=data['vnetCidr'],
+        subnets=data['subnets'],
+        spokes=spoke_vnets,
+        peerings=_peering_pairs(data, len(spoke_vnets)) if spoke_vnets else [],
+        vnet_ref=vnet_ref,
+        routeTables=_azure_terraform_route_tables(data),
+    ), 'azure/terraform')
 
 
 def process_aws_terraform_template(template_content: str, data: Dict[str, Any]) -> str:
@@ -147,55 +225,390 @@ def process_aws_terraform_template(template_content: str, data: Dict[str, Any])
     Returns:
         Processed Terraform code
     """
-    content = template_content
-
-    # AWS uses vpcCidr, but data might have vnetCidr
-    vpc_cidr = data.get('vpcCidr', data.get('vnetCidr', ''))
-
-    # Generate subnet variables
-    subnet_variables = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_variables += f'\nvariable "subnet{idx}_cidr" {{\n'
-        subnet_variables += f'  description = "CIDR block for Subnet {idx}"\n'
-        subnet_variables += f'  type        = string\n'
-        subnet_variables += f'  default     = "{subnet["cidr"]}"\n'
-        subnet_variables += '}\n'
-
-    # Generate subnet resources with AZ distribution
-    subnet_resources = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        az_index = idx - 1  # 0-based for modulo
-        subnet_resources += f'resource "aws_subnet" "subnet{idx}" {{\n'
-        subnet_resources += f'  vpc_id            = aws_vpc.vpc.id\n'
-        subnet_resources += f'  cidr_block        = var.subnet{idx}_cidr\n'
-        subnet_resources += f'  availability_zone = data.aws_availability_zones.available.names[{az_index} % length(data.aws_availability_zones.available.names)]\n\n'
-        subnet_resources += f'  tags = {{\n'
-        subnet_resources += f'    Name        = "${{var.prefix}}-subnet{idx}"\n'
-        subnet_resources += f'    Environment = "Production"\n'
-        subnet_resources += f'    ManagedBy   = "Terraform"\n'
-        subnet_resources += f'  }}\n'
-        subnet_resources += '}\n\n'
-
-    # Generate subnet outputs
-    subnet_outputs = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_outputs += f'\noutput "subnet{idx}_id" {{\n'
-        subnet_outputs += f'  description = "ID of Subnet {idx}"\n'
-        subnet_outputs += f'  value       = aws_subnet.subnet{idx}.id\n'
-        subnet_outputs += '}\n'
-
-        subnet_outputs += f'\noutput "subnet{idx}_az" {{\n'
-        subnet_outputs += f'  description = "Availability Zone of Subnet {idx}"\n'
-        subnet_outputs += f'  value       = aws_subnet.subnet{idx}.availability_zone\n'
-        subnet_outputs += '}\n'
-
-    # Replace placeholders
-    content = content.replace('{{vpcCidr}}', vpc_cidr)
-    content = content.replace('{{subnetVariables}}', subnet_variables)
-    content = content.replace('{{subnetResources}}', subnet_resources)
-    content = content.replace('{{subnetOutputs}}', subnet_outputs)
-
-    return content
+    transit_gateway_resources, transit_gateway_outputs = _aws_terraform_transit_gateway(data)
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'aws'),
+        # AWS uses vpcCidr, but data might have vnetCidr
+        vpcCidr=data.get('vpcCidr', data.get('vnetCidr', '')),
+        subnets=data['subnets'],
+        transitGatewayResources=transit_gateway_resources,
+        transitGatewayOutputs=transit_gateway_outputs,
+    ), 'aws/terraform')
+
+
+def _aws_terraform_spoke_subnet(idx: int, cidr: str, zone: Any, network: int) -> str:
+    """Subnet resource of a spoke VPC attached to the transit gateway."""
+    azs = 'data.aws_availability_zones.available.names'
+    return (
+        f'resource "aws_subnet" "spoke{network}_subnet{idx}" {{\n'
+        f'  vpc_id            = aws_vpc.spoke{network}_vpc.id\n'
+        f'  cidr_block        = "{cidr}"\n'
+        f'  availability_zone = {azs}[{idx - 1} % length({azs})]\n\n'
+        f'  tags = {{\n'
+        f'    Name        = "${{var.prefix}}-spoke{network}-subnet{idx}"\n'
+        f'    Environment = "Production"\n'
+        f'    ManagedBy   = "Terraform"\n'
+        f'  }}\n'
+        f'}}\n\n'
+    )
+
+
+def _aws_terraform_transit_gateway(data: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Build Transit Gateway, spoke VPC and attachment blocks for the AWS Terraform template.
+
+    Each VPC attaches with its first (up to three) subnets, which the
+    round-robin AZ assignment places in distinct availability zones.
+
+    Returns:
+        (resources, outputs) - both empty unless data has a transitGateway
+    """
+    if not data.get('transitGateway'):
+        return '', ''
+
+    spoke_vpcs = data.get('spokeVPCs', [])
+    azs = 'data.aws_availability_zones.available.names'
+
+    resources = ['# ========================================\n'
+                 '# Transit Gateway\n'
+                 '# ========================================\n\n'
+                 'resource "aws_ec2_transit_gateway" "tgw" {\n'
+                 '  description                     = "${var.prefix} transit gateway"\n'
+                 '  default_route_table_association = "enable"\n'
+                 '  default_route_table_propagation = "enable"\n\n'
+                 '  tags = {\n'
+                 '    Name        = "${var.prefix}-tgw"\n'
+                 '    Environment = "Production"\n'
+                 '    ManagedBy   = "Terraform"\n'
+                 '  }\n'
+                 '}\n\n']
+
+    for spoke_idx, spoke in enumerate(spoke_vpcs, 1):
+        resources.append(
+            f'resource "aws_vpc" "spoke{spoke_idx}_vpc" {{\n'
+            f'  cidr_block           = "{spoke["cidr"]}"\n'
+            f'  enable_dns_hostnames = true\n'
+            f'  enable_dns_support   = true\n\n'
+            f'  tags = {{\n'
+            f'    Name        = "${{var.prefix}}-spoke{spoke_idx}-vpc"\n'
+            f'    Environment = "Production"\n'
+            f'    ManagedBy   = "Terraform"\n'
+            f'    Role        = "{_network_role(spoke)}"\n'
+            f'  }}\n'
+            f'}}\n\n'
+        )
+        resources.append(_subnet_fragments(
+            'aws', 'terraform', 'spoke_subnet_resource', spoke['subnets'], _aws_terraform_spoke_subnet, spoke_idx
+        ))
+
+    for network_idx in data['transitGateway']['attachments']:
+        if network_idx == 0:
+            vpc, subnet_names, subnet_count = 'aws_vpc.vpc', 'aws_subnet.subnet{}.id', len(data['subnets'])
+        else:
+            subnet_names = f'aws_subnet.spoke{network_idx}_subnet{{}}.id'
+            vpc, subnet_count = f'aws_vpc.spoke{network_idx}_vpc', len(spoke_vpcs[network_idx - 1]['subnets'])
+        attach_count = min(subnet_count, 3)
+        subnet_ids = ', '.join(subnet_names.format(idx) for idx in range(1, attach_count + 1))
+        label = _network_label(network_idx)
+        resources.append(
+            f'resource "aws_ec2_transit_gateway_vpc_attachment" "{label}" {{\n'
+            f'  transit_gateway_id = aws_ec2_transit_gateway.tgw.id\n'
+            f'  vpc_id             = {vpc}.id\n'
+            f'  subnet_ids         = slice([{subnet_ids}], 0, min({attach_count}, length({azs})))\n\n'
+            f'  tags = {{\n'
+            f'    Name = "${{var.prefix}}-{label}-tgw-attachment"\n'
+            f'  }}\n'
+            f'}}\n\n'
+        )
+
+    for network_idx, routes, _ in _route_tables(data):
+        label = _network_label(network_idx)
+        vpc = 'aws_vpc.vpc' if network_idx == 0 else f'aws_vpc.spoke{network_idx}_vpc'
+        for route_idx, prefix in enumerate(routes, 1):
+            resources.append(
+                f'resource "aws_route" "{label}_tgw_route{route_idx}" {{\n'
+                f'  route_table_id         = {vpc}.main_route_table_id\n'
+                f'  destination_cidr_block = "{prefix}"\n'
+                f'  transit_gateway_id     = aws_ec2_transit_gateway.tgw.id\n'
+                f'  depends_on             = [aws_ec2_transit_gateway_vpc_attachment.{label}]\n'
+                f'}}\n\n'
+            )
+
+    outputs = ['\noutput "transit_gateway_id" {\n'
+               '  description = "ID of the Transit Gateway"\n'
+               '  value       = aws_ec2_transit_gateway.tgw.id\n'
+               '}\n']
+    for spoke_idx, spoke in enumerate(spoke_vpcs, 1):
+        outputs.append(
+            f'\noutput "spoke{spoke_idx}_vpc_id" {{\n'
+            f'  description = "ID of Spoke {spoke_idx} VPC"\n'
+            f'  value       = aws_vpc.spoke{spoke_idx}_vpc.id\n'
+            f'}}\n'
+        )
+
+    return ''.join(resources), ''.join(outputs)
+
+
+# Output format -> template of the compact layout
+COMPACT_TEMPLATES: Dict[str, str] = {
+    'terraform': 'terraform-compact.template.tf',
+    'bicep': 'bicep-compact.template.bicep',
+    'arm': 'arm-compact.template.json',
+}
+
+
+def subnet_key(cidr: str) -> str:
+    """Stable Terraform map key of a subnet or network, derived from its CIDR: 10.0.1.0/24 -> 10-0-1-0-24."""
+    return cidr.replace('.', '-').replace('/', '-')
+
+
+def _compact_entries(
+    subnets: List[Dict[str, Any]],
+    zone: Optional[Callable[[Dict[str, Any], int], Any]] = None
+) -> List[Tuple[str, str, Any]]:
+    """(quoted key padded to a common width, cidr, zone) per subnet, for the map variables of compact templates."""
+    keys = [f'"{subnet_key(subnet["cidr"])}"' for subnet in subnets]
+    width = max((len(key) for key in keys), default=0)
+    return [
+        (key.ljust(width), subnet['cidr'], zone(subnet, idx) if zone else None)
+        for idx, (key, subnet) in enumerate(zip(keys, subnets), 1)
+    ]
+
+
+# Per-subnet attribute the compact templates put in the subnet map besides the CIDR
+_COMPACT_ZONES: Dict[str, Callable[[Dict[str, Any], int], Any]] = {
+    'aws': _zone_index,
+    'alicloud': _zone_index,
+    'gcp': _gcp_region,
+}
+
+
+def _check_compact(output_format: str, data: Dict[str, Any]) -> None:
+    """Reject plans the compact templates cannot express."""
+    if data.get('routeTables') or data.get('topology', 'hub-spoke') != 'hub-spoke':
+        raise ValueError(f"Compact {output_format} output supports single networks and hub-spoke topologies "
+                         f"without route tables")
+
+
+def process_terraform_compact_template(provider: str, template_content: str, data: Dict[str, Any]) -> str:
+    """
+    Process a compact Terraform template.
+
+    Subnets are one map variable keyed by subnet_key and one for_each
+    resource, so the number of blocks does not grow with the subnet count.
+    Keys come from the CIDR rather than the position: inserting a subnet adds
+    one map entry and leaves the other resource addresses alone. Azure and
+    GCP spokes are keyed the same way.
+
+    Args:
+        provider: Cloud provider of the template
+        template_content: Template file content with placeholders
+        data: Dictionary with vnetCidr/vpcCidr, subnets, peeringEnabled, spokeVNets/spokeVPCs
+
+    Returns:
+        Processed Terraform code
+
+    Raises:
+        ValueError: For route tables or topologies other than hub-spoke
+    """
+    _check_compact('Terraform', data)
+
+    zone = _COMPACT_ZONES.get(provider)
+    spokes = _spokes(data, 'spokeVNets') or _spokes(data, 'spokeVPCs')
+
+    def spoke_label(idx: int) -> str:
+        return 'hub' if idx == 0 else f'spoke-{subnet_key(spokes[idx - 1]["cidr"])}'
+
+    def gcp_vpc(idx: int) -> str:
+        return 'google_compute_network.vpc' if idx == 0 else \
+            f'google_compute_network.spoke["{subnet_key(spokes[idx - 1]["cidr"])}"]'
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, provider),
+        networkCidr=data.get('vnetCidr', data.get('vpcCidr', '')),
+        subnets=_compact_entries(data['subnets'], zone),
+        spokes=[
+            (f'"{subnet_key(spoke["cidr"])}"', spoke['cidr'], _compact_entries(spoke['subnets'], zone))
+            for spoke in spokes
+        ],
+        # GCP peerings stay one block per spoke: they must be created one at a time
+        spokePeeringResources=_gcp_terraform_peerings(data, gcp_vpc, spoke_label) if provider == 'gcp' else '',
+        module=False,
+    ), f'{provider}/terraform-compact')
+
+
+# Per provider: network CIDR variable (None if the template has none), subnet map
+# variable and naming variable with its value format, of the compact Terraform templates
+_TFVARS_VARIABLES: Dict[str, Tuple[Optional[str], str, str, str]] = {
+    'azure': ('vnet_cidr', 'subnets', 'prefix', '{}'),
+    'aws': ('vpc_cidr', 'subnets', 'prefix', '{}'),
+    'gcp': (None, 'subnets', 'vpc_name', '{}-vpc'),
+    'oracle': ('vcn_cidr', 'subnets', 'vcn_name', '{}-vcn'),
+    'alicloud': ('vpc_cidr', 'vswitches', 'vpc_name', '{}-vpc'),
+}
+
+
+def process_terraform_module(provider: str, templates_dir: str, name_prefix: str = 'ipcalc') -> str:
+    """
+    Render the compact Terraform template of a provider as a module shared by several environments.
+
+    The network CIDR and the subnet map have no defaults: each environment
+    passes them in its .tfvars.json (terraform_tfvars).
+
+    Args:
+        provider: Cloud provider of the template
+        templates_dir: Directory containing templates
+        name_prefix: Default of the naming variable
+
+    Returns:
+        Terraform code of the shared module
+    """
+    if provider not in _TFVARS_VARIABLES:
+        raise ValueError(f"Shared Terraform modules are not supported for {provider}")
+    template_path = os.path.join(templates_dir, provider, COMPACT_TEMPLATES['terraform'])
+    if not os.path.exists(template_path):
+        raise FileNotFoundError(f"Template not found: {template_path}")
+
+    return _apply_name_prefix(render_template(load_template(template_path), dict(
+        _TEMPLATE_HELPERS,
+        region=_region({}, provider),
+        networkCidr='',
+        subnets=[],
+        spokes=[],
+        spokePeeringResources='',
+        module=True,
+    ), f'{provider}/terraform-module'), {'namePrefix': name_prefix})
+
+
+def terraform_tfvars(provider: str, data: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """
+    Variable values of one environment for the shared Terraform module (process_terraform_module).
+
+    Args:
+        provider: Cloud provider of the module
+        data: Dictionary with vnetCidr/vpcCidr and subnets of the environment
+        name: Resource name prefix of the environment
+
+    Returns:
+        JSON-serializable variable values: naming variable, network CIDR and subnet map keyed by subnet_key
+
+    Raises:
+        ValueError: For spokes, route tables or unsupported providers
+    """
+    if provider not in _TFVARS_VARIABLES:
+        raise ValueError(f"Shared Terraform modules are not supported for {provider}")
+    if data.get('routeTables') or data.get('transitGateway') or _spokes(data, 'spokeVNets') or _spokes(data, 'spokeVPCs'):
+        raise ValueError("Shared Terraform modules support single networks without route tables")
+    cidr_variable, subnets_variable, name_variable, name_format = _TFVARS_VARIABLES[provider]
+    zone = _COMPACT_ZONES.get(provider)
+    zone_attribute = 'region' if provider == 'gcp' else 'zone'
+
+    tfvars: Dict[str, Any] = {name_variable: name_format.format(name)}
+    if cidr_variable:
+        tfvars[cidr_variable] = data.get('vnetCidr', data.get('vpcCidr', ''))
+    tfvars[subnets_variable] = {
+        subnet_key(subnet['cidr']): (
+            {'cidr': subnet['cidr'], zone_attribute: zone(subnet, idx)} if zone else subnet['cidr']
+        )
+        for idx, subnet in enumerate(data['subnets'], 1)
+    }
+    return tfvars
+
+
+# Per provider: spoke list key of the template data and template of a spoke root
+SPOKE_ROOT_TEMPLATES: Dict[str, Tuple[str, str]] = {
+    'azure': ('spokeVNets', 'terraform-spoke.template.tf'),
+    'gcp': ('spokeVPCs', 'terraform-spoke.template.tf'),
+}
+
+
+def process_terraform_roots(provider: str, data: Dict[str, Any], templates_dir: str) -> Dict[str, str]:
+    """
+    Render a hub-spoke plan as separate Terraform roots: one for the hub and one per spoke.
+
+    The hub root is the regular Terraform template of the hub alone. A spoke
+    root holds the spoke network, its subnets and both directions of its
+    peering, and finds the hub through data sources by name, so each root has
+    its own state and the spoke roots can be applied in parallel once the hub
+    exists. Resource addresses are those of the single-root template.
+
+    Args:
+        provider: Cloud provider of the plan
+        data: Data to populate templates
+        templates_dir: Directory containing templates
+
+    Returns:
+        Terraform code keyed by relative path: hub/main.tf and spokes/spoke<n>/main.tf
+
+    Raises:
+        ValueError: For unsupported providers, plans without spokes, other topologies or route tables
+    """
+    if provider not in SPOKE_ROOT_TEMPLATES:
+        raise ValueError(f"Split Terraform roots are not supported for {provider}")
+    spokes_key, template_file = SPOKE_ROOT_TEMPLATES[provider]
+    spokes = _spokes(data, spokes_key)
+    if not spokes:
+        raise ValueError("Split Terraform roots need a hub-spoke plan with spokes")
+    if 'topology' in data:
+        raise ValueError(f"Split Terraform roots support the hub-spoke topology, not {data['topology']}")
+    if data.get('routeTables'):
+        raise ValueError("Split Terraform roots do not support route tables")
+    template_path = os.path.join(templates_dir, provider, template_file)
+    if not os.path.exists(template_path):
+        raise FileNotFoundError(f"Template not found: {template_path}")
+
+    hub_data = {key: value for key, value in data.items() if key not in (spokes_key, 'compact')}
+    hub_data['peeringEnabled'] = False
+    roots = {'hub/main.tf': process_template(provider, 'terraform', hub_data, templates_dir)}
+    template_content = load_template(template_path)
+    for spoke_idx, spoke in enumerate(spokes, 1):
+        roots[f'spokes/spoke{spoke_idx}/main.tf'] = _apply_name_prefix(render_template(template_content, dict(
+            _TEMPLATE_HELPERS,
+            spoke_idx=spoke_idx,
+            spoke=spoke,
+        ), f'{provider}/terraform-spoke'), data)
+    return roots
+
+
+def process_azure_compact_template(output_format: str, template_content: str, data: Dict[str, Any]) -> str:
+    """
+    Process a compact Azure Bicep or ARM template.
+
+    Subnets and spoke VNets are array parameters of {name, addressPrefix}
+    entries, names derived from the CIDR with subnet_key. Bicep deploys them
+    with for-expressions and ARM with copy loops (spoke subnets are a property
+    copy inside the spoke VNet copy), so the template body is the same size for
+    any number of subnets and spokes.
+
+    Args:
+        output_format: 'bicep' or 'arm'
+        template_content: Template file content with placeholders
+        data: Dictionary with vnetCidr, subnets, peeringEnabled, spokeVNets
+
+    Returns:
+        Processed Bicep or ARM JSON code
+
+    Raises:
+        ValueError: For route tables or topologies other than hub-spoke
+    """
+    _check_compact({'bicep': 'Bicep', 'arm': 'ARM'}[output_format], data)
+
+    def entries(subnets: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        return [(subnet_key(subnet['cidr']), subnet['cidr']) for subnet in subnets]
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'azure'),
+        networkCidr=data['vnetCidr'],
+        subnets=entries(data['subnets']),
+        spokes=[
+            (subnet_key(spoke['cidr']), spoke['cidr'], entries(spoke['subnets']))
+            for spoke in _spokes(data, 'spokeVNets')
+        ],
+    ), f'azure/{output_format}-compact')
 
 
 def load_template(template_path: str) -> str:
@@ -223,92 +636,64 @@ def process_azure_cli_template(template_content: str, data: Dict[str, Any]) -> s
     Returns:
         Processed Azure CLI script
     """
-    content = template_content
-
-    # Generate subnet variables
-    subnet_variables = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_variables += f'SUBNET{idx}_NAME="${{PREFIX}}-subnet{idx}"\n'
-        subnet_variables += f'SUBNET{idx}_CIDR="{subnet["cidr"]}"\n'
-
-    # Generate subnet creation commands
-    subnet_creation = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_creation += f'echo "Creating Subnet {idx}: ${{SUBNET{idx}_NAME}}"\n'
-        subnet_creation += f'az network vnet subnet create \\\n'
-        subnet_creation += f'  --resource-group "${{RESOURCE_GROUP}}" \\\n'
-        subnet_creation += f'  --vnet-name "${{VNET_NAME}}" \\\n'
-        subnet_creation += f'  --name "${{SUBNET{idx}_NAME}}" \\\n'
-        subnet_creation += f'  --address-prefix "${{SUBNET{idx}_CIDR}}"\n\n'
-
-    # Generate spoke VNET variables, creation, and peering
-    spoke_vnet_variables = ''
-    spoke_vnet_creation = ''
-    vnet_peering = ''
-
-    if data.get('peeringEnabled') and data.get('spokeVNets'):
-        spoke_vnets = data['spokeVNets']
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            spoke_name = f'${{PREFIX}}-spoke{spoke_idx}-vnet'
-            spoke_vnet_variables += f'SPOKE{spoke_idx}_VNET_NAME="{spoke_name}"\n'
-            spoke_vnet_variables += f'SPOKE{spoke_idx}_VNET_CIDR="{spoke["cidr"]}"\n'
-
-            for subnet_idx, subnet in enumerate(spoke['subnets'], 1):
-                spoke_vnet_variables += f'SPOKE{spoke_idx}_SUBNET{subnet_idx}_NAME="{spoke_name}-subnet{subnet_idx}"\n'
-                spoke_vnet_variables += f'SPOKE{spoke_idx}_SUBNET{subnet_idx}_CIDR="{subnet["cidr"]}"\n'
-            spoke_vnet_variables += '\n'
-
-        spoke_vnet_creation += '\n# ========================================\n'
-        spoke_vnet_creation += '# Create Spoke VNets\n'
-        spoke_vnet_creation += '# ========================================\n'
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            spoke_vnet_creation += f'\necho "Creating Spoke VNET {spoke_idx}: ${{SPOKE{spoke_idx}_VNET_NAME}}"\n'
-            spoke_vnet_creation += f'az network vnet create \\\n'
-            spoke_vnet_creation += f'  --resource-group "${{RESOURCE_GROUP}}" \\\n'
-            spoke_vnet_creation += f'  --name "${{SPOKE{spoke_idx}_VNET_NAME}}" \\\n'
-            spoke_vnet_creation += f'  --address-prefix "${{SPOKE{spoke_idx}_VNET_CIDR}}" \\\n'
-            spoke_vnet_creation += f'  --location "${{LOCATION}}"\n\n'
-
-            for subnet_idx, subnet in enumerate(spoke['subnets'], 1):
-                spoke_vnet_creation += f'echo "Creating Spoke {spoke_idx} Subnet {subnet_idx}: ${{SPOKE{spoke_idx}_SUBNET{subnet_idx}_NAME}}"\n'
-                spoke_vnet_creation += f'az network vnet subnet create \\\n'
-                spoke_vnet_creation += f'  --resource-group "${{RESOURCE_GROUP}}" \\\n'
-                spoke_vnet_creation += f'  --vnet-name "${{SPOKE{spoke_idx}_VNET_NAME}}" \\\n'
-                spoke_vnet_creation += f'  --name "${{SPOKE{spoke_idx}_SUBNET{subnet_idx}_NAME}}" \\\n'
-                spoke_vnet_creation += f'  --address-prefix "${{SPOKE{spoke_idx}_SUBNET{subnet_idx}_CIDR}}"\n\n'
-
-        vnet_peering += '\n# ========================================\n'
-        vnet_peering += '# Create VNET Peering\n'
-        vnet_peering += '# ========================================\n'
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            vnet_peering += f'\necho "Creating peering from Hub to Spoke {spoke_idx}"\n'
-            vnet_peering += f'az network vnet peering create \\\n'
-            vnet_peering += f'  --resource-group "${{RESOURCE_GROUP}}" \\\n'
-            vnet_peering += f'  --name "hub-to-spoke{spoke_idx}" \\\n'
-            vnet_peering += f'  --vnet-name "${{VNET_NAME}}" \\\n'
-            vnet_peering += f'  --remote-vnet "${{SPOKE{spoke_idx}_VNET_NAME}}" \\\n'
-            vnet_peering += f'  --allow-vnet-access\n\n'
-
-            vnet_peering += f'echo "Creating peering from Spoke {spoke_idx} to Hub"\n'
-            vnet_peering += f'az network vnet peering create \\\n'
-            vnet_peering += f'  --resource-group "${{RESOURCE_GROUP}}" \\\n'
-            vnet_peering += f'  --name "spoke{spoke_idx}-to-hub" \\\n'
-            vnet_peering += f'  --vnet-name "${{SPOKE{spoke_idx}_VNET_NAME}}" \\\n'
-            vnet_peering += f'  --remote-vnet "${{VNET_NAME}}" \\\n'
-            vnet_peering += f'  --allow-vnet-access\n\n'
-
-    # Replace placeholders
-    content = content.replace('{{vnetCidr}}', data['vnetCidr'])
-    content = content.replace('{{subnetVariables}}', subnet_variables)
-    content = content.replace('{{subnetCreation}}', subnet_creation)
-    content = content.replace('{{spokeVnetVariables}}', spoke_vnet_variables)
-    content = content.replace('{{spokeVnetCreation}}', spoke_vnet_creation)
-    content = content.replace('{{vnetPeering}}', vnet_peering)
-
-    return content
+    spoke_vnets = _spokes(data, 'spokeVNets')
+
+    def vnet_var(idx: int) -> str:
+        return '${VNET_NAME}' if idx == 0 else f'${{SPOKE{idx}_VNET_NAME}}'
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'azure'),
+        vnetCidr=data['vnetCidr'],
+        subnets=data['subnets'],
+        spokes=spoke_vnets,
+        peerings=_peering_pairs(data, len(spoke_vnets)) if spoke_vnets else [],
+        vnet_var=vnet_var,
+        route_tables=_route_tables(data),
+        next_hop=(data.get('routeTables') or {}).get('nextHop'),
+        network_location=lambda idx: _network_location(data, idx),
+    ), 'azure/cli')
+
+
+def _bicep_route_table_symbol(idx: int) -> str:
+    """Bicep symbolic name of the route table of network idx."""
+    return f'{_network_label(idx)}RouteTable'
+
+
+def _bicep_route_tables(data: Dict[str, Any]) -> str:
+    """Route table resources with summarized routes for the Azure Bicep template."""
+    tables = _route_tables(data)
+    if not tables:
+        return ''
+
+    next_hop = data['routeTables']['nextHop']
+    blocks = ['// ========================================\n'
+              '// Route Tables\n'
+              '// ========================================\n\n']
+    for network_idx, routes, _ in tables:
+        location = _network_location(data, network_idx)
+        location = f"'{location}'" if location else 'location'
+        block = (
+            f"resource {_bicep_route_table_symbol(network_idx)} 'Microsoft.Network/routeTables@2023-05-01' = {{\n"
+            f"  name: '${{prefix}}-{_network_label(network_idx)}-rt'\n"
+            f'  location: {location}\n'
+            f'  tags: tags\n'
+            f'  properties: {{\n'
+            f'    routes: [\n'
+        )
+        for route_idx, prefix in enumerate(routes, 1):
+            block += (
+                f'      {{\n'
+                f"        name: 'route{route_idx}'\n"
+                f'        properties: {{\n'
+                f"          addressPrefix: '{prefix}'\n"
+                f"          nextHopType: 'VirtualAppliance'\n"
+                f"          nextHopIpAddress: '{next_hop}'\n"
+                f'        }}\n'
+                f'      }}\n'
+            )
+        blocks.append(block + '    ]\n  }\n}\n\n')
+    return ''.join(blocks)
 
 
 def process_azure_bicep_template(template_content: str, data: Dict[str, Any]) -> str:
@@ -322,117 +707,74 @@ def process_azure_bicep_template(template_content: str, data: Dict[str, Any]) ->
     Returns:
         Processed Bicep code
     """
-    content = template_content
-
-    # Generate subnet parameters
-    subnet_parameters = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_parameters += f"\n@description('CIDR block for Subnet {idx}')\n"
-        subnet_parameters += f"param subnet{idx}Cidr string = '{subnet['cidr']}'\n"
-
-    # Generate subnet definitions
-    subnet_definitions = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_definitions += f'      {{\n'
-        subnet_definitions += f"        name: '${{prefix}}-subnet{idx}'\n"
-        subnet_definitions += f'        properties: {{\n'
-        subnet_definitions += f'          addressPrefix: subnet{idx}Cidr\n'
-        subnet_definitions += f'        }}\n'
-        subnet_definitions += f'      }}\n'
-
-    # Generate subnet outputs
-    subnet_outputs = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_outputs += f"\n@description('ID of Subnet {idx}')\n"
-        subnet_outputs += f'output subnet{idx}Id string = vnet.properties.subnets[{idx - 1}].id\n'
-
-    # Generate spoke VNET resources
-    spoke_vnet_resources = ''
-    vnet_peering_resources = ''
-    spoke_vnet_outputs = ''
-
-    if data.get('peeringEnabled') and data.get('spokeVNets'):
-        spoke_vnets = data['spokeVNets']
-
-        spoke_vnet_resources += '\n// ========================================\n'
-        spoke_vnet_resources += '// Spoke VNets\n'
-        spoke_vnet_resources += '// ========================================\n\n'
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            spoke_vnet_resources += f"resource spoke{spoke_idx}Vnet 'Microsoft.Network/virtualNetworks@2023-05-01' = {{\n"
-            spoke_vnet_resources += f"  name: '${{prefix}}-spoke{spoke_idx}-vnet'\n"
-            spoke_vnet_resources += f'  location: location\n'
-            spoke_vnet_resources += f'  tags: tags\n'
-            spoke_vnet_resources += f'  properties: {{\n'
-            spoke_vnet_resources += f'    addressSpace: {{\n'
-            spoke_vnet_resources += f'      addressPrefixes: [\n'
-            spoke_vnet_resources += f"        '{spoke['cidr']}'\n"
-            spoke_vnet_resources += f'      ]\n'
-            spoke_vnet_resources += f'    }}\n'
-            spoke_vnet_resources += f'    subnets: [\n'
-
-            for subnet_idx, subnet in enumerate(spoke['subnets'], 1):
-                spoke_vnet_resources += f'      {{\n'
-                spoke_vnet_resources += f"        name: '${{prefix}}-spoke{spoke_idx}-subnet{subnet_idx}'\n"
-                spoke_vnet_resources += f'        properties: {{\n'
-                spoke_vnet_resources += f"          addressPrefix: '{subnet['cidr']}'\n"
-                spoke_vnet_resources += f'        }}\n'
-                spoke_vnet_resources += f'      }}\n'
-
-            spoke_vnet_resources += f'    ]\n'
-            spoke_vnet_resources += f'  }}\n'
-            spoke_vnet_resources += f'}}\n\n'
-
-        vnet_peering_resources += '// ========================================\n'
-        vnet_peering_resources += '// VNET Peering\n'
-        vnet_peering_resources += '// ========================================\n\n'
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            vnet_peering_resources += f"resource hubToSpoke{spoke_idx}Peering 'Microsoft.Network/virtualNetworks/virtualNetworkPeerings@2023-05-01' = {{\n"
-            vnet_peering_resources += f'  parent: vnet\n'
-            vnet_peering_resources += f"  name: 'hub-to-spoke{spoke_idx}'\n"
-            vnet_peering_resources += f'  properties: {{\n'
-            vnet_peering_resources += f'    allowVirtualNetworkAccess: true\n'
-            vnet_peering_resources += f'    allowForwardedTraffic: true\n'
-            vnet_peering_resources += f'    allowGatewayTransit: false\n'
-            vnet_peering_resources += f'    useRemoteGateways: false\n'
-            vnet_peering_resources += f'    remoteVirtualNetwork: {{\n'
-            vnet_peering_resources += f'      id: spoke{spoke_idx}Vnet.id\n'
-            vnet_peering_resources += f'    }}\n'
-            vnet_peering_resources += f'  }}\n'
-            vnet_peering_resources += f'}}\n\n'
-
-            vnet_peering_resources += f"resource spoke{spoke_idx}ToHubPeering 'Microsoft.Network/virtualNetworks/virtualNetworkPeerings@2023-05-01' = {{\n"
-            vnet_peering_resources += f'  parent: spoke{spoke_idx}Vnet\n'
-            vnet_peering_resources += f"  name: 'spoke{spoke_idx}-to-hub'\n"
-            vnet_peering_resources += f'  properties: {{\n'
-            vnet_peering_resources += f'    allowVirtualNetworkAccess: true\n'
-            vnet_peering_resources += f'    allowForwardedTraffic: true\n'
-            vnet_peering_resources += f'    allowGatewayTransit: false\n'
-            vnet_peering_resources += f'    useRemoteGateways: false\n'
-            vnet_peering_resources += f'    remoteVirtualNetwork: {{\n'
-            vnet_peering_resources += f'      id: vnet.id\n'
-            vnet_peering_resources += f'    }}\n'
-            vnet_peering_resources += f'  }}\n'
-            vnet_peering_resources += f'}}\n\n'
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            spoke_vnet_outputs += f"\n@description('ID of Spoke {spoke_idx} Virtual Network')\n"
-            spoke_vnet_outputs += f'output spoke{spoke_idx}VnetId string = spoke{spoke_idx}Vnet.id\n'
-
-            spoke_vnet_outputs += f"\n@description('Name of Spoke {spoke_idx} Virtual Network')\n"
-            spoke_vnet_outputs += f'output spoke{spoke_idx}VnetName string = spoke{spoke_idx}Vnet.name\n'
-
-    # Replace placeholders
-    content = content.replace('{{vnetCidr}}', data['vnetCidr'])
-    content = content.replace('{{subnetParameters}}', subnet_parameters)
-    content = content.replace('{{subnetDefinitions}}', subnet_definitions)
-    content = content.replace('{{subnetOutputs}}', subnet_outputs)
-    content = content.replace('{{spokeVnetResources}}', spoke_vnet_resources)
-    content = content.replace('{{vnetPeeringResources}}', vnet_peering_resources)
-    content = content.replace('{{spokeVnetOutputs}}', spoke_vnet_outputs)
-
-    return content
+    spoke_vnets = _spokes(data, 'spokeVNets')
+    routed_subnets = _azure_routed_subnets(data)
+
+    def route_table(network: int, idx: int) -> str:
+        """Symbol of the route table subnet idx of a network is associated with, or ''."""
+        return _bicep_route_table_symbol(network) if idx in routed_subnets.get(network, ()) else ''
+
+    def vnet_symbol(idx: int) -> str:
+        return 'vnet' if idx == 0 else f'spoke{idx}Vnet'
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'azure'),
+        vnetCidr=data['vnetCidr'],
+        subnets=data['subnets'],
+        spokes=spoke_vnets,
+        peerings=_peering_pairs(data, len(spoke_vnets)) if spoke_vnets else [],
+        route_table=route_table,
+        vnet_symbol=vnet_symbol,
+        routeTables=_bicep_route_tables(data),
+    ), 'azure/bicep')
+
+
+def _json_block(document: Dict[str, Any], indent: int) -> str:
+    """Pretty-printed JSON object to insert into a template at the given indentation."""
+    return dumps(document).rstrip('\n').replace('\n', '\n' + ' ' * indent)
+
+
+def _arm_route_table_id(idx: int) -> str:
+    """ARM resourceId expression of the route table of network idx."""
+    return f"[resourceId('Microsoft.Network/routeTables', variables('{_network_label(idx)}RouteTableName'))]"
+
+
+def _arm_route_tables(data: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Route table variables and resources with summarized routes for the Azure ARM template.
+
+    Returns:
+        (variables, resources) - both empty unless data has routeTables
+    """
+    tables = _route_tables(data)
+    if not tables:
+        return '', ''
+
+    next_hop = data['routeTables']['nextHop']
+    variables = ''
+    resources = ''
+    for network_idx, routes, _ in tables:
+        label = _network_label(network_idx)
+        variables += f',\n    "{label}RouteTableName": "[concat(parameters(\'prefix\'), \'-{label}-rt\')]"'
+        resources += ',\n    ' + _json_block({
+            "type": "Microsoft.Network/routeTables",
+            "apiVersion": "2025-01-01",
+            "name": f"[variables('{label}RouteTableName')]",
+            "location": _network_location(data, network_idx) or "[parameters('location')]",
+            "properties": {"routes": [
+                {
+                    "name": f"route{route_idx}",
+                    "properties": {
+                        "addressPrefix": prefix,
+                        "nextHopType": "VirtualAppliance",
+                        "nextHopIpAddress": next_hop,
+                    },
+                }
+                for route_idx, prefix in enumerate(routes, 1)
+            ]},
+        }, 4)
+    return variables, resources
 
 
 def process_azure_arm_template(template_content: str, data: Dict[str, Any]) -> str:
@@ -446,152 +788,36 @@ def process_azure_arm_template(template_content: str, data: Dict[str, Any]) -> s
     Returns:
         Processed ARM JSON code
     """
-    content = template_content
-
-    # Generate subnet parameters
-    subnet_parameters = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_parameters += f',\n    "subnet{idx}Cidr": {{\n'
-        subnet_parameters += f'      "type": "string",\n'
-        subnet_parameters += f'      "defaultValue": "{subnet["cidr"]}",\n'
-        subnet_parameters += f'      "metadata": {{\n'
-        subnet_parameters += f'        "description": "CIDR block for Subnet {idx}"\n'
-        subnet_parameters += f'      }}\n'
-        subnet_parameters += f'    }}'
-
-    # Generate subnet variables
-    subnet_variables = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_variables += f',\n    "subnet{idx}Name": "[concat(parameters(\'prefix\'), \'-subnet{idx}\')]"'
-
-    # Generate subnet definitions
-    subnet_definitions = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        if idx > 1:
-            subnet_definitions += ','
-        subnet_definitions += f'\n          {{\n'
-        subnet_definitions += f'            "name": "[variables(\'subnet{idx}Name\')]",\n'
-        subnet_definitions += f'            "properties": {{\n'
-        subnet_definitions += f'              "addressPrefix": "[parameters(\'subnet{idx}Cidr\')]"\n'
-        subnet_definitions += f'            }}\n'
-        subnet_definitions += f'          }}'
-
-    # Generate subnet outputs
-    subnet_outputs = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_outputs += f',\n    "subnet{idx}Id": {{\n'
-        subnet_outputs += f'      "type": "string",\n'
-        subnet_outputs += f'      "value": "[resourceId(\'Microsoft.Network/virtualNetworks/subnets\', variables(\'vnetName\'), variables(\'subnet{idx}Name\'))]",\n'
-        subnet_outputs += f'      "metadata": {{\n'
-        subnet_outputs += f'        "description": "Resource ID of Subnet {idx}"\n'
-        subnet_outputs += f'      }}\n'
-        subnet_outputs += f'    }}'
-
-    # Generate spoke VNET resources
-    spoke_vnet_variables = ''
-    spoke_vnet_resources = ''
-    vnet_peering_resources = ''
-    spoke_vnet_outputs = ''
-
-    if data.get('peeringEnabled') and data.get('spokeVNets'):
-        spoke_vnets = data['spokeVNets']
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            spoke_vnet_variables += f',\n    "spoke{spoke_idx}VnetName": "[concat(parameters(\'prefix\'), \'-spoke{spoke_idx}-vnet\')]"'
-
-            spoke_vnet_resources += f',\n    {{\n'
-            spoke_vnet_resources += f'      "type": "Microsoft.Network/virtualNetworks",\n'
-            spoke_vnet_resources += f'      "apiVersion": "2025-01-01",\n'
-            spoke_vnet_resources += f'      "name": "[variables(\'spoke{spoke_idx}VnetName\')]",\n'
-            spoke_vnet_resources += f'      "location": "[parameters(\'location\')]",\n'
-            spoke_vnet_resources += f'      "tags": {{\n'
-            spoke_vnet_resources += f'        "Environment": "Production",\n'
-            spoke_vnet_resources += f'        "ManagedBy": "ARM Template",\n'
-            spoke_vnet_resources += f'        "Role": "Spoke"\n'
-            spoke_vnet_resources += f'      }},\n'
-            spoke_vnet_resources += f'      "properties": {{\n'
-            spoke_vnet_resources += f'        "addressSpace": {{\n'
-            spoke_vnet_resources += f'          "addressPrefixes": [\n'
-            spoke_vnet_resources += f'            "{spoke["cidr"]}"\n'
-            spoke_vnet_resources += f'          ]\n'
-            spoke_vnet_resources += f'        }},\n'
-            spoke_vnet_resources += f'        "subnets": [\n'
-
-            for subnet_idx, subnet in enumerate(spoke['subnets'], 1):
-                if subnet_idx > 1:
-                    spoke_vnet_resources += ','
-                spoke_vnet_resources += f'\n          {{\n'
-                spoke_vnet_resources += f'            "name": "[concat(variables(\'spoke{spoke_idx}VnetName\'), \'-subnet{subnet_idx}\')]",\n'
-                spoke_vnet_resources += f'            "properties": {{\n'
-                spoke_vnet_resources += f'              "addressPrefix": "{subnet["cidr"]}"\n'
-                spoke_vnet_resources += f'            }}\n'
-                spoke_vnet_resources += f'          }}'
-
-            spoke_vnet_resources += f'\n        ]\n'
-            spoke_vnet_resources += f'      }}\n'
-            spoke_vnet_resources += f'    }}'
-
-            # Hub to Spoke peering
-            vnet_peering_resources += f',\n    {{\n'
-            vnet_peering_resources += f'      "type": "Microsoft.Network/virtualNetworks/virtualNetworkPeerings",\n'
-            vnet_peering_resources += f'      "apiVersion": "2025-01-01",\n'
-            vnet_peering_resources += f'      "name": "[concat(variables(\'vnetName\'), \'/hub-to-spoke{spoke_idx}\')]",\n'
-            vnet_peering_resources += f'      "dependsOn": [\n'
-            vnet_peering_resources += f'        "[resourceId(\'Microsoft.Network/virtualNetworks\', variables(\'vnetName\'))]",\n'
-            vnet_peering_resources += f'        "[resourceId(\'Microsoft.Network/virtualNetworks\', variables(\'spoke{spoke_idx}VnetName\'))]"\n'
-            vnet_peering_resources += f'      ],\n'
-            vnet_peering_resources += f'      "properties": {{\n'
-            vnet_peering_resources += f'        "allowVirtualNetworkAccess": true,\n'
-            vnet_peering_resources += f'        "allowForwardedTraffic": true,\n'
-            vnet_peering_resources += f'        "allowGatewayTransit": false,\n'
-            vnet_peering_resources += f'        "useRemoteGateways": false,\n'
-            vnet_peering_resources += f'        "remoteVirtualNetwork": {{\n'
-            vnet_peering_resources += f'          "id": "[resourceId(\'Microsoft.Network/virtualNetworks\', variables(\'spoke{spoke_idx}VnetName\'))]"\n'
-            vnet_peering_resources += f'        }}\n'
-            vnet_peering_resources += f'      }}\n'
-            vnet_peering_resources += f'    }}'
-
-            # Spoke to Hub peering
-            vnet_peering_resources += f',\n    {{\n'
-            vnet_peering_resources += f'      "type": "Microsoft.Network/virtualNetworks/virtualNetworkPeerings",\n'
-            vnet_peering_resources += f'      "apiVersion": "2025-01-01",\n'
-            vnet_peering_resources += f'      "name": "[concat(variables(\'spoke{spoke_idx}VnetName\'), \'/spoke{spoke_idx}-to-hub\')]",\n'
-            vnet_peering_resources += f'      "dependsOn": [\n'
-            vnet_peering_resources += f'        "[resourceId(\'Microsoft.Network/virtualNetworks\', variables(\'vnetName\'))]",\n'
-            vnet_peering_resources += f'        "[resourceId(\'Microsoft.Network/virtualNetworks\', variables(\'spoke{spoke_idx}VnetName\'))]"\n'
-            vnet_peering_resources += f'      ],\n'
-            vnet_peering_resources += f'      "properties": {{\n'
-            vnet_peering_resources += f'        "allowVirtualNetworkAccess": true,\n'
-            vnet_peering_resources += f'        "allowForwardedTraffic": true,\n'
-            vnet_peering_resources += f'        "allowGatewayTransit": false,\n'
-            vnet_peering_resources += f'        "useRemoteGateways": false,\n'
-            vnet_peering_resources += f'        "remoteVirtualNetwork": {{\n'
-            vnet_peering_resources += f'          "id": "[resourceId(\'Microsoft.Network/virtualNetworks\', variables(\'vnetName\'))]"\n'
-            vnet_peering_resources += f'        }}\n'
-            vnet_peering_resources += f'      }}\n'
-            vnet_peering_resources += f'    }}'
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            spoke_vnet_outputs += f',\n    "spoke{spoke_idx}VnetId": {{\n'
-            spoke_vnet_outputs += f'      "type": "string",\n'
-            spoke_vnet_outputs += f'      "value": "[resourceId(\'Microsoft.Network/virtualNetworks\', variables(\'spoke{spoke_idx}VnetName\'))]",\n'
-            spoke_vnet_outputs += f'      "metadata": {{\n'
-            spoke_vnet_outputs += f'        "description": "Resource ID of Spoke {spoke_idx} Virtual Network"\n'
-            spoke_vnet_outputs += f'      }}\n'
-            spoke_vnet_outputs += f'    }}'
-
-    # Replace placeholders
-    content = content.replace('{{vnetCidr}}', data['vnetCidr'])
-    content = content.replace('{{subnetParameters}}', subnet_parameters)
-    content = content.replace('{{subnetVariables}}', subnet_variables)
-    content = content.replace('{{subnetDefinitions}}', subnet_definitions)
-    content = content.replace('{{subnetOutputs}}', subnet_outputs)
-    content = content.replace('{{spokeVnetVariables}}', spoke_vnet_variables)
-    content = content.replace('{{spokeVnetResources}}', spoke_vnet_resources)
-    content = content.replace('{{vnetPeeringResources}}', vnet_peering_resources)
-    content = content.replace('{{spokeVnetOutputs}}', spoke_vnet_outputs)
-
-    return content
+    spoke_vnets = _spokes(data, 'spokeVNets')
+    routed_subnets = _azure_routed_subnets(data)
+    route_table_variables, route_table_resources = _arm_route_tables(data) if spoke_vnets else ('', '')
+
+    def route_table(network: int, idx: int) -> str:
+        """Route table id expression for subnet idx of a network, or '' if it has none."""
+        return _arm_route_table_id(network) if idx in routed_subnets.get(network, ()) else ''
+
+    def vnet_name(idx: int) -> str:
+        return 'vnetName' if idx == 0 else f'spoke{idx}VnetName'
+
+    def vnet_id(idx: int) -> str:
+        return f"[resourceId('Microsoft.Network/virtualNetworks', variables('{vnet_name(idx)}'))]"
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'azure'),
+        vnetCidr=data['vnetCidr'],
+        subnets=data['subnets'],
+        spokes=spoke_vnets,
+        peerings=_peering_pairs(data, len(spoke_vnets)) if spoke_vnets else [],
+        routed_subnets=routed_subnets,
+        route_table=route_table,
+        route_table_id=_arm_route_table_id,
+        vnet_name=vnet_name,
+        vnet_id=vnet_id,
+        default_location="[parameters('location')]",
+        routeTableVariables=route_table_variables,
+        routeTableResources=route_table_resources,
+    ), 'azure/arm')
 
 
 def process_azure_powershell_template(template_content: str, data: Dict[str, Any]) -> str:
@@ -605,112 +831,20 @@ def process_azure_powershell_template(template_content: str, data: Dict[str, Any
     Returns:
         Processed PowerShell script
     """
-    content = template_content
-
-    # Generate subnet variables
-    subnet_variables = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_variables += f'$Subnet{idx}Name = "${{Prefix}}-subnet{idx}"\n'
-        subnet_variables += f'$Subnet{idx}Cidr = "{subnet["cidr"]}"\n'
-
-    # Generate subnet configurations
-    subnet_configurations = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_configurations += f'$SubnetConfig{idx} = New-AzVirtualNetworkSubnetConfig `\n'
-        subnet_configurations += f'    -Name $Subnet{idx}Name `\n'
-        subnet_configurations += f'    -AddressPrefix $Subnet{idx}Cidr\n'
-        subnet_configurations += f'Write-Host "  - Subnet {idx}: $Subnet{idx}Name ($Subnet{idx}Cidr)" -ForegroundColor Gray\n\n'
-
-    # Generate subnet config list
-    subnet_config_list = ', '.join([f'$SubnetConfig{idx}' for idx in range(1, len(data['subnets']) + 1)])
-
-    # Generate spoke VNET resources
-    spoke_vnet_variables = ''
-    spoke_vnet_creation = ''
-    vnet_peering = ''
-
-    if data.get('peeringEnabled') and data.get('spokeVNets'):
-        spoke_vnets = data['spokeVNets']
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            spoke_name = f'${{Prefix}}-spoke{spoke_idx}-vnet'
-            spoke_vnet_variables += f'$Spoke{spoke_idx}VNetName = "{spoke_name}"\n'
-            spoke_vnet_variables += f'$Spoke{spoke_idx}VNetCidr = "{spoke["cidr"]}"\n'
-
-            for subnet_idx, subnet in enumerate(spoke['subnets'], 1):
-                spoke_vnet_variables += f'$Spoke{spoke_idx}Subnet{subnet_idx}Name = "{spoke_name}-subnet{subnet_idx}"\n'
-                spoke_vnet_variables += f'$Spoke{spoke_idx}Subnet{subnet_idx}Cidr = "{subnet["cidr"]}"\n'
-            spoke_vnet_variables += '\n'
-
-        spoke_vnet_creation += '\n# ========================================\n'
-        spoke_vnet_creation += '# Create Spoke VNets\n'
-        spoke_vnet_creation += '# ========================================\n\n'
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            spoke_vnet_creation += f'Write-Host "Creating Spoke {spoke_idx} subnet configurations..." -ForegroundColor Cyan\n'
-            for subnet_idx, subnet in enumerate(spoke['subnets'], 1):
-                spoke_vnet_creation += f'$Spoke{spoke_idx}SubnetConfig{subnet_idx} = New-AzVirtualNetworkSubnetConfig `\n'
-                spoke_vnet_creation += f'    -Name $Spoke{spoke_idx}Subnet{subnet_idx}Name `\n'
-                spoke_vnet_creation += f'    -AddressPrefix $Spoke{spoke_idx}Subnet{subnet_idx}Cidr\n'
-                spoke_vnet_creation += f'Write-Host "  - Spoke {spoke_idx} Subnet {subnet_idx}: $Spoke{spoke_idx}Subnet{subnet_idx}Name ($Spoke{spoke_idx}Subnet{subnet_idx}Cidr)" -ForegroundColor Gray\n\n'
-
-            spoke_subnet_config_list = ', '.join([f'$Spoke{spoke_idx}SubnetConfig{si}' for si in range(1, len(spoke['subnets']) + 1)])
-
-            spoke_vnet_creation += f'Write-Host "Creating Spoke {spoke_idx} Virtual Network: $Spoke{spoke_idx}VNetName" -ForegroundColor Cyan\n'
-            spoke_vnet_creation += f'try {{\n'
-            spoke_vnet_creation += f'    $spoke{spoke_idx}Vnet = New-AzVirtualNetwork `\n'
-            spoke_vnet_creation += f'        -Name $Spoke{spoke_idx}VNetName `\n'
-            spoke_vnet_creation += f'        -ResourceGroupName $ResourceGroupName `\n'
-            spoke_vnet_creation += f'        -Location $Location `\n'
-            spoke_vnet_creation += f'        -AddressPrefix $Spoke{spoke_idx}VNetCidr `\n'
-            spoke_vnet_creation += f'        -Subnet {spoke_subnet_config_list} `\n'
-            spoke_vnet_creation += f'        -Tag $Tags\n'
-            spoke_vnet_creation += f'    Write-Host "✓ Spoke {spoke_idx} Virtual Network created successfully" -ForegroundColor Green\n'
-            spoke_vnet_creation += f'}}\n'
-            spoke_vnet_creation += f'catch {{\n'
-            spoke_vnet_creation += f'    Write-Error "Failed to create Spoke {spoke_idx} Virtual Network: $_"\n'
-            spoke_vnet_creation += f'    exit 1\n'
-            spoke_vnet_creation += f'}}\n\n'
-
-        vnet_peering += '\n# ========================================\n'
-        vnet_peering += '# Create VNET Peering\n'
-        vnet_peering += '# ========================================\n\n'
-
-        for spoke_idx, spoke in enumerate(spoke_vnets, 1):
-            vnet_peering += f'Write-Host "Creating peering from Hub to Spoke {spoke_idx}" -ForegroundColor Cyan\n'
-            vnet_peering += f'try {{\n'
-            vnet_peering += f'    Add-AzVirtualNetworkPeering `\n'
-            vnet_peering += f'        -Name "hub-to-spoke{spoke_idx}" `\n'
-            vnet_peering += f'        -VirtualNetwork $vnet `\n'
-            vnet_peering += f'        -RemoteVirtualNetworkId $spoke{spoke_idx}Vnet.Id\n'
-            vnet_peering += f'    Write-Host "✓ Peering from Hub to Spoke {spoke_idx} created" -ForegroundColor Green\n'
-            vnet_peering += f'}}\n'
-            vnet_peering += f'catch {{\n'
-            vnet_peering += f'    Write-Error "Failed to create peering from Hub to Spoke {spoke_idx}: $_"\n'
-            vnet_peering += f'}}\n\n'
-
-            vnet_peering += f'Write-Host "Creating peering from Spoke {spoke_idx} to Hub" -ForegroundColor Cyan\n'
-            vnet_peering += f'try {{\n'
-            vnet_peering += f'    Add-AzVirtualNetworkPeering `\n'
-            vnet_peering += f'        -Name "spoke{spoke_idx}-to-hub" `\n'
-            vnet_peering += f'        -VirtualNetwork $spoke{spoke_idx}Vnet `\n'
-            vnet_peering += f'        -RemoteVirtualNetworkId $vnet.Id\n'
-            vnet_peering += f'    Write-Host "✓ Peering from Spoke {spoke_idx} to Hub created" -ForegroundColor Green\n'
-            vnet_peering += f'}}\n'
-            vnet_peering += f'catch {{\n'
-            vnet_peering += f'    Write-Error "Failed to create peering from Spoke {spoke_idx} to Hub: $_"\n'
-            vnet_peering += f'}}\n\n'
-
-    # Replace placeholders
-    content = content.replace('{{vnetCidr}}', data['vnetCidr'])
-    content = content.replace('{{subnetVariables}}', subnet_variables)
-    content = content.replace('{{subnetConfigurations}}', subnet_configurations)
-    content = content.replace('{{subnetConfigList}}', subnet_config_list)
-    content = content.replace('{{spokeVnetVariables}}', spoke_vnet_variables)
-    content = content.replace('{{spokeVnetCreation}}', spoke_vnet_creation)
-    content = content.replace('{{vnetPeering}}', vnet_peering)
-
-    return content
+    spoke_vnets = _spokes(data, 'spokeVNets')
+
+    def ps_vnet(idx: int) -> str:
+        return '$vnet' if idx == 0 else f'$spoke{idx}Vnet'
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'azure'),
+        vnetCidr=data['vnetCidr'],
+        subnets=data['subnets'],
+        spokes=spoke_vnets,
+        peerings=_peering_pairs(data, len(spoke_vnets)) if spoke_vnets else [],
+        ps_vnet=ps_vnet,
+    ), 'azure/powershell')
 
 
 def process_aws_cli_template(template_content: str, data: Dict[str, Any]) -> str:
@@ -724,39 +858,93 @@ def process_aws_cli_template(template_content: str, data: Dict[str, Any]) -> str
     Returns:
         Processed AWS CLI script
     """
-    content = template_content
-
-    # AWS uses vpcCidr, but data might have vnetCidr
-    vpc_cidr = data.get('vpcCidr', data.get('vnetCidr', ''))
-
-    # Generate subnet variables
-    subnet_variables = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_variables += f'SUBNET{idx}_CIDR="{subnet["cidr"]}"\n'
-
-    # Generate subnet creation commands
-    subnet_creation = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        az_index = idx - 1
-        subnet_creation += f'# Determine AZ for Subnet {idx}\n'
-        subnet_creation += f'SUBNET{idx}_AZ="${{AVAILABILITY_ZONES[{az_index} % ${{AZ_COUNT}}]}}"\n'
-        subnet_creation += f'echo "Creating Subnet {idx} in ${{SUBNET{idx}_AZ}}..."\n'
-        subnet_creation += f'SUBNET{idx}_ID=$(aws ec2 create-subnet \\\n'
-        subnet_creation += f'  --vpc-id "${{VPC_ID}}" \\\n'
-        subnet_creation += f'  --cidr-block "${{SUBNET{idx}_CIDR}}" \\\n'
-        subnet_creation += f'  --availability-zone "${{SUBNET{idx}_AZ}}" \\\n'
-        subnet_creation += f'  --region "${{REGION}}" \\\n'
-        subnet_creation += f'  --tag-specifications "ResourceType=subnet,Tags=[{{Key=Name,Value=${{PREFIX}}-subnet{idx}}}]" \\\n'
-        subnet_creation += f'  --query \'Subnet.SubnetId\' \\\n'
-        subnet_creation += f'  --output text)\n\n'
-        subnet_creation += f'echo "Subnet {idx} ID: ${{SUBNET{idx}_ID}}"\n\n'
-
-    # Replace placeholders
-    content = content.replace('{{vpcCidr}}', vpc_cidr)
-    content = content.replace('{{subnetVariables}}', subnet_variables)
-    content = content.replace('{{subnetCreation}}', subnet_creation)
-
-    return content
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'aws'),
+        # AWS uses vpcCidr, but data might have vnetCidr
+        vpcCidr=data.get('vpcCidr', data.get('vnetCidr', '')),
+        subnets=data['subnets'],
+    ), 'aws/cli')
+
+
+# Availability zones the CloudFormation templates spread subnets over by default
+_CFN_AZ_SELECTORS = [
+    '!Select [0, !GetAZs ""]',
+    '!Select [1, !GetAZs ""]',
+    '!Select [2, !GetAZs ""]',
+]
+
+# CloudFormation quotas per template; the body limit is for templates uploaded to S3
+CFN_MAX_PARAMETERS = 200
+CFN_MAX_RESOURCES = 500
+CFN_MAX_OUTPUTS = 200
+CFN_MAX_TEMPLATE_BYTES = 1024 * 1024
+
+# Subnets per nested stack; CloudFormation creates sibling stacks in parallel
+CFN_STACK_SUBNETS = 100
+
+# Upper bounds of the template body: fixed sections, and what each subnet adds
+# (parameter, resource and output)
+_CFN_BASE_BYTES = 2048
+_CFN_SUBNET_BYTES = 700
+
+# Parent and nested stack templates of a split CloudFormation plan
+CFN_STACKS_TEMPLATE = 'cloudformation-stacks.template.yaml'
+CFN_SUBNETS_TEMPLATE = 'cloudformation-subnets.template.yaml'
+
+
+def _cfn_az_selector(subnet: Dict[str, Any], idx: int) -> str:
+    """AvailabilityZone of a CloudFormation subnet."""
+    if 'zoneIndex' in subnet:
+        # Pinned by a region layout; may address more zones than the default selectors
+        return f'!Select [{subnet["zoneIndex"]}, !GetAZs ""]'
+    return _CFN_AZ_SELECTORS[(idx - 1) % len(_CFN_AZ_SELECTORS)]
+
+
+def cloudformation_stack_ranges(data: Dict[str, Any], max_subnets: int = CFN_STACK_SUBNETS) -> List[Tuple[int, int]]:
+    """
+    Split the subnets of a CloudFormation plan into nested stacks when one template would exceed the quotas.
+
+    Parameter, resource and output counts and the body size are estimated from
+    the plan before anything is rendered.
+
+    Args:
+        data: Dictionary with vpcCidr/vnetCidr, subnets and optional transitGateway
+        max_subnets: Most subnets per nested stack
+
+    Returns:
+        (first, last) 1-based subnet numbers per nested stack; empty when the plan fits one template
+
+    Raises:
+        ValueError: If the parent stack itself would exceed the quotas
+    """
+    count = len(data['subnets'])
+    tgw_resources, tgw_outputs = _aws_cloudformation_transit_gateway(data, _CFN_AZ_SELECTORS)
+    extra_resources = tgw_resources.count('\n    Type: ')
+    extra_outputs = tgw_outputs.count('\n    Value: ')
+    extra_bytes = len(tgw_resources) + len(tgw_outputs)
+
+    if (2 + count <= CFN_MAX_PARAMETERS
+            and 1 + count + extra_resources <= CFN_MAX_RESOURCES
+            and 1 + count + extra_outputs <= CFN_MAX_OUTPUTS
+            and _CFN_BASE_BYTES + count * _CFN_SUBNET_BYTES + extra_bytes <= CFN_MAX_TEMPLATE_BYTES):
+        return []
+
+    # A nested stack has three parameters (Prefix, VpcId, ParentStackName) besides one per subnet
+    size = max(1, min(
+        max_subnets,
+        CFN_MAX_PARAMETERS - 3,
+        CFN_MAX_OUTPUTS,
+        CFN_MAX_RESOURCES,
+        (CFN_MAX_TEMPLATE_BYTES - _CFN_BASE_BYTES) // _CFN_SUBNET_BYTES,
+    ))
+    ranges = [(first, min(first + size - 1, count)) for first in range(1, count + 1, size)]
+    if (1 + len(ranges) + extra_resources > CFN_MAX_RESOURCES
+            or 1 + len(ranges) + extra_outputs > CFN_MAX_OUTPUTS
+            or _CFN_BASE_BYTES * (1 + len(ranges)) + extra_bytes > CFN_MAX_TEMPLATE_BYTES):
+        raise ValueError("CloudFormation plan exceeds the per-template quotas even with nested subnet stacks; "
+                         "reduce the number of spoke subnets")
+    return ranges
 
 
 def process_aws_cloudformation_template(template_content: str, data: Dict[str, Any]) -> str:
@@ -770,65 +958,202 @@ def process_aws_cloudformation_template(template_content: str, data: Dict[str, A
     Returns:
         Processed CloudFormation YAML code
     """
-    content = template_content
+    transit_gateway_resources, transit_gateway_outputs = _aws_cloudformation_transit_gateway(data, _CFN_AZ_SELECTORS)
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        # A stack deploys to the region it is created in: only a planned region is asserted
+        region=data.get('region', ''),
+        # AWS uses vpcCidr, but data might have vnetCidr
+        vpcCidr=data.get('vpcCidr', data.get('vnetCidr', '')),
+        subnets=data['subnets'],
+        az_selector=_cfn_az_selector,
+        transitGatewayResources=transit_gateway_resources,
+        transitGatewayOutputs=transit_gateway_outputs,
+    ), 'aws/cloudformation')
+
+
+def process_aws_cloudformation_stacks_template(
+    template_content: str,
+    data: Dict[str, Any],
+    ranges: List[Tuple[int, int]]
+) -> str:
+    """
+    Process the parent template of a CloudFormation plan split into nested subnet stacks.
 
-    # AWS uses vpcCidr, but data might have vnetCidr
-    vpc_cidr = data.get('vpcCidr', data.get('vnetCidr', ''))
+    Args:
+        template_content: Template file content with placeholders
+        data: Dictionary with vpcCidr/vnetCidr, subnets
+        ranges: Subnet ranges of the nested stacks (cloudformation_stack_ranges)
 
-    az_selectors = [
-        '!Select [0, !GetAZs ""]',
-        '!Select [1, !GetAZs ""]',
-        '!Select [2, !GetAZs ""]',
-    ]
+    Returns:
+        Processed CloudFormation YAML code of the parent stack
+    """
+    size = ranges[0][1] - ranges[0][0] + 1
+
+    def hub_subnet_ref(idx: int) -> str:
+        return f'!GetAtt SubnetStack{(idx - 1) // size + 1}.Outputs.Subnet{idx}Id'
+
+    transit_gateway_resources, transit_gateway_outputs = _aws_cloudformation_transit_gateway(
+        data, _CFN_AZ_SELECTORS, hub_subnet_ref
+    )
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=data.get('region', ''),
+        vpcCidr=data.get('vpcCidr', data.get('vnetCidr', '')),
+        stacks=ranges,
+        transitGatewayResources=transit_gateway_resources,
+        transitGatewayOutputs=transit_gateway_outputs,
+    ), 'aws/cloudformation-stacks')
+
+
+def process_cloudformation_nested_stacks(
+    data: Dict[str, Any],
+    templates_dir: str,
+    max_subnets: int = CFN_STACK_SUBNETS
+) -> Dict[str, str]:
+    """
+    Render the nested subnet stacks of a CloudFormation plan over the per-template quotas.
 
-    # Generate subnet parameters
-    subnet_parameters = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_parameters += f'\n  Subnet{idx}Cidr:\n'
-        subnet_parameters += f'    Type: String\n'
-        subnet_parameters += f'    Default: \'{subnet["cidr"]}\'\n'
-        subnet_parameters += f'    Description: CIDR block for Subnet {idx}\n'
-
-    # Generate subnet resources with dynamic AZ selection
-    subnet_resources = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        az_selector = az_selectors[(idx - 1) % len(az_selectors)]
-        subnet_resources += f'\n  Subnet{idx}:\n'
-        subnet_resources += f'    Type: AWS::EC2::Subnet\n'
-        subnet_resources += f'    Properties:\n'
-        subnet_resources += f'      VpcId: !Ref VPC\n'
-        subnet_resources += f'      CidrBlock: !Ref Subnet{idx}Cidr\n'
-        subnet_resources += f'      AvailabilityZone: {az_selector}\n'
-        subnet_resources += f'      Tags:\n'
-        subnet_resources += f'        - Key: Name\n'
-        subnet_resources += f"          Value: !Sub '${{Prefix}}-subnet{idx}'\n"
-        subnet_resources += f'        - Key: Environment\n'
-        subnet_resources += f'          Value: Production\n'
-        subnet_resources += f'        - Key: ManagedBy\n'
-        subnet_resources += f'          Value: CloudFormation\n'
-
-    # Generate subnet outputs
-    subnet_outputs = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_outputs += f'\n  Subnet{idx}Id:\n'
-        subnet_outputs += f'    Description: ID of Subnet {idx}\n'
-        subnet_outputs += f'    Value: !Ref Subnet{idx}\n'
-        subnet_outputs += f'    Export:\n'
-        subnet_outputs += f"      Name: !Sub '${{AWS::StackName}}-Subnet{idx}Id'\n"
-
-    # Replace placeholders
-    content = content.replace('{{vpcCidr}}', vpc_cidr)
-    content = content.replace('{{subnetParameters}}', subnet_parameters)
-    content = content.replace('{{subnetResources}}', subnet_resources)
-    content = content.replace('{{subnetOutputs}}', subnet_outputs)
-
-    return content
+    Args:
+        data: Data to populate template
+        templates_dir: Directory containing templates
+        max_subnets: Most subnets per nested stack
+
+    Returns:
+        Nested stack templates keyed by their path relative to the parent template
+        (stacks/subnets-N.yaml); empty when the plan fits one template
+    """
+    ranges = cloudformation_stack_ranges(data, max_subnets)
+    if not ranges:
+        return {}
+    template_content = load_template(os.path.join(templates_dir, 'aws', CFN_SUBNETS_TEMPLATE))
+
+    stacks = {}
+    for stack, (first, last) in enumerate(ranges, 1):
+        stacks[f'stacks/subnets-{stack}.yaml'] = _apply_name_prefix(render_template(template_content, dict(
+            _TEMPLATE_HELPERS,
+            subnets=data['subnets'][first - 1:last],
+            first=first,
+            last=last,
+            az_selector=_cfn_az_selector,
+        ), 'aws/cloudformation-subnets'), data)
+    return stacks
+
+
+def _aws_cloudformation_transit_gateway(
+    data: Dict[str, Any],
+    az_selectors: List[str],
+    hub_subnet_ref: Optional[Callable[[int], str]] = None
+) -> Tuple[str, str]:
+    """
+    Build Transit Gateway, spoke VPC and attachment resources for the CloudFormation template.
+
+    Attachments use the first subnet in each of the template's availability zones;
+    hub_subnet_ref gives the reference to a hub subnet by number.
+
+    Returns:
+        (resources, outputs) - both empty unless data has a transitGateway
+    """
+    if not data.get('transitGateway'):
+        return '', ''
+
+    spoke_vpcs = data.get('spokeVPCs', [])
+    if hub_subnet_ref is None:
+        def hub_subnet_ref(idx: int) -> str:
+            return f'!Ref Subnet{idx}'
+
+    def spoke_subnet_resource(idx: int, cidr: str, selector: str, network: int) -> str:
+        return (
+            f'\n  Spoke{network}Subnet{idx}:\n'
+            f'    Type: AWS::EC2::Subnet\n'
+            f'    Properties:\n'
+            f'      VpcId: !Ref Spoke{network}VPC\n'
+            f"      CidrBlock: '{cidr}'\n"
+            f'      AvailabilityZone: {selector}\n'
+            f'      Tags:\n'
+            f'        - Key: Name\n'
+            f"          Value: !Sub '${{Prefix}}-spoke{network}-subnet{idx}'\n"
+            f'        - Key: ManagedBy\n'
+            f'          Value: CloudFormation\n'
+        )
+
+    resources = ['\n  TransitGateway:\n'
+                 '    Type: AWS::EC2::TransitGateway\n'
+                 '    Properties:\n'
+                 "      Description: !Sub '${Prefix} transit gateway'\n"
+                 '      DefaultRouteTableAssociation: enable\n'
+                 '      DefaultRouteTablePropagation: enable\n'
+                 '      Tags:\n'
+                 '        - Key: Name\n'
+                 "          Value: !Sub '${Prefix}-tgw'\n"
+                 '        - Key: ManagedBy\n'
+                 '          Value: CloudFormation\n']
+
+    for spoke_idx, spoke in enumerate(spoke_vpcs, 1):
+        resources.append(
+            f'\n  Spoke{spoke_idx}VPC:\n'
+            f'    Type: AWS::EC2::VPC\n'
+            f'    Properties:\n'
+            f"      CidrBlock: '{spoke['cidr']}'\n"
+            f'      EnableDnsHostnames: true\n'
+            f'      EnableDnsSupport: true\n'
+            f'      Tags:\n'
+            f'        - Key: Name\n'
+            f"          Value: !Sub '${{Prefix}}-spoke{spoke_idx}-vpc'\n"
+            f'        - Key: Role\n'
+            f'          Value: {_network_role(spoke)}\n'
+            f'        - Key: ManagedBy\n'
+            f'          Value: CloudFormation\n'
+        )
+        resources.append(_subnet_fragments(
+            'aws', 'cloudformation', 'spoke_subnet_resource', spoke['subnets'], spoke_subnet_resource,
+            spoke_idx, lambda subnet, idx: az_selectors[(idx - 1) % len(az_selectors)]
+        ))
+
+    for network_idx in data['transitGateway']['attachments']:
+        if network_idx == 0:
+            vpc, subnet_ref, subnet_count = 'VPC', hub_subnet_ref, len(data['subnets'])
+        else:
+            vpc, subnet_count = f'Spoke{network_idx}VPC', len(spoke_vpcs[network_idx - 1]['subnets'])
+            subnet_ref = partial('!Ref Spoke{}Subnet{}'.format, network_idx)
+        label = _network_label(network_idx).capitalize()
+        resources.append(
+            f'\n  {label}TransitGatewayAttachment:\n'
+            f'    Type: AWS::EC2::TransitGatewayAttachment\n'
+            f'    Properties:\n'
+            f'      TransitGatewayId: !Ref TransitGateway\n'
+            f'      VpcId: !Ref {vpc}\n'
+            f'      SubnetIds:\n'
+        )
+        for subnet_idx in range(1, min(subnet_count, len(az_selectors)) + 1):
+            resources.append(f'        - {subnet_ref(subnet_idx)}\n')
+
+    outputs = ['\n  TransitGatewayId:\n'
+               '    Description: ID of the Transit Gateway\n'
+               '    Value: !Ref TransitGateway\n'
+               '    Export:\n'
+               "      Name: !Sub '${AWS::StackName}-TransitGatewayId'\n"]
+    for spoke_idx, spoke in enumerate(spoke_vpcs, 1):
+        outputs.append(
+            f'\n  Spoke{spoke_idx}VpcId:\n'
+            f'    Description: ID of Spoke {spoke_idx} VPC\n'
+            f'    Value: !Ref Spoke{spoke_idx}VPC\n'
+            f'    Export:\n'
+            f"      Name: !Sub '${{AWS::StackName}}-Spoke{spoke_idx}VpcId'\n"
+        )
+
+    return ''.join(resources), ''.join(outputs)
 
 
 def process_gcp_gcloud_template(template_content: str, data: Dict[str, Any]) -> str:
     """
     Process GCP gcloud CLI template.
 
+    The template waits between peering pairs: GCP route propagation after each
+    pair must complete before the next peering can be created on the same network.
+
     Args:
         template_content: Template file content with placeholders
         data: Dictionary with vpcCidr/vnetCidr, subnets
@@ -836,76 +1161,18 @@ def process_gcp_gcloud_template(template_content: str, data: Dict[str, Any]) ->
     Returns:
         Processed gcloud CLI script
     """
-    content = template_content
-
-    # Generate subnet creation commands
-    subnet_creation = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        region = subnet.get('region', subnet.get('availabilityZone', 'us-central1'))
-        subnet_creation += f'echo "Creating Subnet {idx} in {region}..."\n'
-        subnet_creation += f'gcloud compute networks subnets create "${{VPC_NAME}}-subnet{idx}" \\\n'
-        subnet_creation += f'  --network="${{VPC_NAME}}" \\\n'
-        subnet_creation += f'  --region="{region}" \\\n'
-        subnet_creation += f'  --range="{subnet["cidr"]}" \\\n'
-        subnet_creation += f'  --enable-private-ip-google-access\n\n'
-
-    # Generate spoke VPC variables and creation commands if peering is enabled
-    spoke_vpc_variables = ''
-    spoke_vpc_creation = ''
-    spoke_peering_creation = ''
-
-    if data.get('peeringEnabled') and data.get('spokeVPCs'):
-        for spoke_idx, spoke in enumerate(data['spokeVPCs'], 1):
-            # Add spoke VPC variables
-            spoke_vpc_variables += f'SPOKE{spoke_idx}_VPC_NAME="${{VPC_NAME}}-spoke{spoke_idx}"\n'
-            spoke_vpc_variables += f'SPOKE{spoke_idx}_CIDR="{spoke["cidr"]}"\n'
-
-            # Add spoke VPC creation
-            spoke_vpc_creation += f'\necho "Creating Spoke VPC {spoke_idx}..."\n'
-            spoke_vpc_creation += f'gcloud compute networks create "${{SPOKE{spoke_idx}_VPC_NAME}}" \\\n'
-            spoke_vpc_creation += f'  --subnet-mode=custom \\\n'
-            spoke_vpc_creation += f'  --bgp-routing-mode=regional\n\n'
-
-            # Add spoke subnets
-            if spoke.get('subnets'):
-                for subnet_idx, subnet in enumerate(spoke['subnets'], 1):
-                    region = subnet.get('region', subnet.get('availabilityZone', 'us-central1'))
-                    spoke_vpc_creation += f'echo "Creating Subnet {subnet_idx} in Spoke VPC {spoke_idx}..."\n'
-                    spoke_vpc_creation += f'gcloud compute networks subnets create "${{SPOKE{spoke_idx}_VPC_NAME}}-subnet{subnet_idx}" \\\n'
-                    spoke_vpc_creation += f'  --network="${{SPOKE{spoke_idx}_VPC_NAME}}" \\\n'
-                    spoke_vpc_creation += f'  --region="{region}" \\\n'
-                    spoke_vpc_creation += f'  --range="{subnet["cidr"]}" \\\n'
-                    spoke_vpc_creation += f'  --enable-private-ip-google-access\n\n'
-
-            # Add peering from hub to spoke
-            spoke_peering_creation += f'\necho "Creating peering from Hub to Spoke {spoke_idx}..."\n'
-            spoke_peering_creation += f'gcloud compute networks peerings create "hub-to-spoke{spoke_idx}" \\\n'
-            spoke_peering_creation += f'  --network="${{VPC_NAME}}" \\\n'
-            spoke_peering_creation += f'  --peer-project="$(gcloud config get-value project)" \\\n'
-            spoke_peering_creation += f'  --peer-network="${{SPOKE{spoke_idx}_VPC_NAME}}" \\\n'
-            spoke_peering_creation += f'  --auto-create-routes\n\n'
-
-            # Add peering from spoke to hub
-            spoke_peering_creation += f'echo "Creating peering from Spoke {spoke_idx} to Hub..."\n'
-            spoke_peering_creation += f'gcloud compute networks peerings create "spoke{spoke_idx}-to-hub" \\\n'
-            spoke_peering_creation += f'  --network="${{SPOKE{spoke_idx}_VPC_NAME}}" \\\n'
-            spoke_peering_creation += f'  --peer-project="$(gcloud config get-value project)" \\\n'
-            spoke_peering_creation += f'  --peer-network="${{VPC_NAME}}" \\\n'
-            spoke_peering_creation += f'  --auto-create-routes\n\n'
-
-            # GCP route propagation after each peering pair must complete before the
-            # next spoke's hub-side peering can be created on the same hub network.
-            if spoke_idx < len(data['spokeVPCs']):
-                spoke_peering_creation += f'echo "Waiting for peering to stabilize before next spoke..."\n'
-                spoke_peering_creation += f'sleep 10\n\n'
-
-    # Replace placeholders
-    content = content.replace('{{spokeVPCVariables}}', spoke_vpc_variables)
-    content = content.replace('{{subnetCreation}}', subnet_creation)
-    content = content.replace('{{spokeVPCCreation}}', spoke_vpc_creation)
-    content = content.replace('{{spokePeeringCreation}}', spoke_peering_creation)
-
-    return content
+    spoke_vpcs = _spokes(data, 'spokeVPCs')
+
+    def gcloud_vpc(idx: int) -> str:
+        return '${VPC_NAME}' if idx == 0 else f'${{SPOKE{idx}_VPC_NAME}}'
+
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        subnets=data['subnets'],
+        spokes=spoke_vpcs,
+        peerings=_peering_pairs(data, len(spoke_vpcs)) if spoke_vpcs else [],
+        gcloud_vpc=gcloud_vpc,
+    ), 'gcp/gcloud')
 
 
 def process_oracle_oci_template(template_content: str, data: Dict[str, Any]) -> str:
@@ -919,32 +1186,72 @@ def process_oracle_oci_template(template_content: str, data: Dict[str, Any]) ->
     Returns:
         Processed OCI CLI bash script
     """
-    content = template_content
-
-    # Oracle uses vcnCidr; data may carry vnetCidr
-    vcn_cidr = data.get('vcnCidr', data.get('vnetCidr', ''))
-
-    # Generate subnet creation commands
-    subnet_creation = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_creation += f'echo "Creating Subnet {idx}..."\n'
-        subnet_creation += f'SUBNET{idx}_ID=$(oci network subnet create \\\n'
-        subnet_creation += f'  --compartment-id "${{COMPARTMENT_ID}}" \\\n'
-        subnet_creation += f'  --vcn-id "${{VCN_ID}}" \\\n'
-        subnet_creation += f'  --cidr-block "{subnet["cidr"]}" \\\n'
-        subnet_creation += f'  --display-name "${{VCN_NAME}}-subnet{idx}" \\\n'
-        subnet_creation += f'  --dns-label "subnet{idx}" \\\n'
-        subnet_creation += f'  --route-table-id "${{RT_ID}}" \\\n'
-        subnet_creation += f'  --security-list-ids "[\\\"${{SL_ID}}\\\"]" \\\n'
-        subnet_creation += f'  --query \'data.id\' \\\n'
-        subnet_creation += f'  --raw-output)\n\n'
-        subnet_creation += f'echo "Subnet {idx} created with ID: ${{SUBNET{idx}_ID}}"\n\n'
-
-    # Replace placeholders — vcnCidr appears twice in the template (VCN and security list)
-    content = content.replace('{{vcnCidr}}', vcn_cidr)
-    content = content.replace('{{subnetCreation}}', subnet_creation)
-
-    return content
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'oracle'),
+        # Oracle uses vcnCidr; data may carry vnetCidr
+        vcnCidr=data.get('vcnCidr', data.get('vnetCidr', '')),
+        subnets=data['subnets'],
+    ), 'oracle/oci')
+
+
+def _gcp_hub_routes(data: Dict[str, Any]) -> List[str]:
+    """Summary routes of the GCP hub, which spokes learn over their peering with it."""
+    if not _spokes(data, 'spokeVPCs'):
+        return []
+    hub_routes = [routes for network_idx, routes, _ in _route_tables(data) if network_idx == 0]
+    return hub_routes[0] if hub_routes else []
+
+
+def _gcp_terraform_peerings(
+    data: Dict[str, Any],
+    tf_vpc: Optional[Callable[[int], str]] = None,
+    network_label: Callable[[int], str] = _network_label
+) -> str:
+    """
+    Network peering resources for the GCP Terraform template.
+
+    GCP only allows one peering operation per network at a time, so each
+    peering resource depends on the previous to force sequential creation.
+
+    Args:
+        data: Template data
+        tf_vpc: Network position -> Terraform address of its VPC (default: the spoke{n}_vpc resources)
+        network_label: Network position -> name fragment of its peerings
+    """
+    spoke_vpcs = _spokes(data, 'spokeVPCs')
+    if not spoke_vpcs:
+        return ''
+
+    if tf_vpc is None:
+        def tf_vpc(idx: int) -> str:
+            return 'google_compute_network.vpc' if idx == 0 else f'google_compute_network.spoke{idx}_vpc'
+
+    hub_routes = _gcp_hub_routes(data)
+
+    prev_peering_resource = None
+    peerings = []
+    for a, b in _peering_pairs(data, len(spoke_vpcs)):
+        for local, remote in ((a, b), (b, a)):
+            resource_name = f'{network_label(local)}_to_{network_label(remote)}'
+            attributes = [
+                ('name', f'"{network_label(local)}-to-{network_label(remote)}"'),
+                ('network', f'{tf_vpc(local)}.self_link'),
+                ('peer_network', f'{tf_vpc(remote)}.self_link'),
+            ]
+            if hub_routes and local == 0:
+                attributes.append(('export_custom_routes', 'true'))
+            elif hub_routes and remote == 0:
+                attributes.append(('import_custom_routes', 'true'))
+            if prev_peering_resource:
+                attributes.append(('depends_on', f'[{prev_peering_resource}]'))
+            width = max(len(key) for key, _ in attributes)
+            block = f'\nresource "google_compute_network_peering" "{resource_name}" {{\n'
+            block += ''.join(f'  {key:<{width}} = {value}\n' for key, value in attributes)
+            block += '}\n'
+            peerings.append(block)
+            prev_peering_resource = f'google_compute_network_peering.{resource_name}'
+    return ''.join(peerings)
 
 
 def process_gcp_terraform_template(template_content: str, data: Dict[str, Any]) -> str:
@@ -958,163 +1265,16 @@ def process_gcp_terraform_template(template_content: str, data: Dict[str, Any])
     Returns:
         Processed Terraform code
     """
-    content = template_content
-
-    # GCP uses vpcCidr, but data might have vnetCidr
-    vpc_cidr = data.get('vpcCidr', data.get('vnetCidr', ''))
-
-    # Generate subnet variables
-    subnet_variables = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        region = subnet.get('region', subnet.get('availabilityZone', 'us-central1'))
-        subnet_variables += f'\nvariable "subnet{idx}_cidr" {{\n'
-        subnet_variables += f'  description = "CIDR block for Subnet {idx}"\n'
-        subnet_variables += f'  type        = string\n'
-        subnet_variables += f'  default     = "{subnet["cidr"]}"\n'
-        subnet_variables += f'}}\n'
-
-        subnet_variables += f'\nvariable "subnet{idx}_region" {{\n'
-        subnet_variables += f'  description = "Region for Subnet {idx}"\n'
-        subnet_variables += f'  type        = string\n'
-        subnet_variables += f'  default     = "{region}"\n'
-        subnet_variables += f'}}\n'
-
-    # Generate subnet resources
-    subnet_resources = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_resources += f'\nresource "google_compute_subnetwork" "subnet{idx}" {{\n'
-        subnet_resources += f'  name          = "${{var.vpc_name}}-subnet{idx}"\n'
-        subnet_resources += f'  ip_cidr_range = var.subnet{idx}_cidr\n'
-        subnet_resources += f'  region        = var.subnet{idx}_region\n'
-        subnet_resources += f'  network       = google_compute_network.vpc.id\n'
-        subnet_resources += f'  project       = var.project_id\n\n'
-        subnet_resources += f'  private_ip_google_access = true\n\n'
-        subnet_resources += f'  log_config {{\n'
-        subnet_resources += f'    aggregation_interval = "INTERVAL_10_MIN"\n'
-        subnet_resources += f'    flow_sampling        = 0.5\n'
-        subnet_resources += f'    metadata             = "INCLUDE_ALL_METADATA"\n'
-        subnet_resources += f'  }}\n'
-        subnet_resources += f'}}\n'
-
-    # Generate subnet outputs
-    subnet_outputs = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_outputs += f'\noutput "subnet{idx}_name" {{\n'
-        subnet_outputs += f'  description = "Name of Subnet {idx}"\n'
-        subnet_outputs += f'  value       = google_compute_subnetwork.subnet{idx}.name\n'
-        subnet_outputs += f'}}\n'
-
-        subnet_outputs += f'\noutput "subnet{idx}_id" {{\n'
-        subnet_outputs += f'  description = "ID of Subnet {idx}"\n'
-        subnet_outputs += f'  value       = google_compute_subnetwork.subnet{idx}.id\n'
-        subnet_outputs += f'}}\n'
-
-        subnet_outputs += f'\noutput "subnet{idx}_self_link" {{\n'
-        subnet_outputs += f'  description = "Self link of Subnet {idx}"\n'
-        subnet_outputs += f'  value       = google_compute_subnetwork.subnet{idx}.self_link\n'
-        subnet_outputs += f'}}\n'
-
-    # Generate spoke VPC variables, resources, and peering if peering is enabled
-    spoke_vpc_variables = ''
-    spoke_vpc_resources = ''
-    spoke_peering_resources = ''
-    spoke_outputs = ''
-
-    if data.get('peeringEnabled') and data.get('spokeVPCs'):
-        prev_peering_resource = None
-        for spoke_idx, spoke in enumerate(data['spokeVPCs'], 1):
-            # Add spoke VPC variables
-            spoke_vpc_variables += f'\nvariable "spoke{spoke_idx}_cidr" {{\n'
-            spoke_vpc_variables += f'  description = "CIDR block for Spoke VPC {spoke_idx}"\n'
-            spoke_vpc_variables += f'  type        = string\n'
-            spoke_vpc_variables += f'  default     = "{spoke["cidr"]}"\n'
-            spoke_vpc_variables += f'}}\n'
-
-            # Add spoke subnet variables
-            if spoke.get('subnets'):
-                for subnet_idx, subnet in enumerate(spoke['subnets'], 1):
-                    region = subnet.get('region', subnet.get('availabilityZone', 'us-central1'))
-                    spoke_vpc_variables += f'\nvariable "spoke{spoke_idx}_subnet{subnet_idx}_cidr" {{\n'
-                    spoke_vpc_variables += f'  description = "CIDR block for Spoke {spoke_idx} Subnet {subnet_idx}"\n'
-                    spoke_vpc_variables += f'  type        = string\n'
-                    spoke_vpc_variables += f'  default     = "{subnet["cidr"]}"\n'
-                    spoke_vpc_variables += f'}}\n'
-
-                    spoke_vpc_variables += f'\nvariable "spoke{spoke_idx}_subnet{subnet_idx}_region" {{\n'
-                    spoke_vpc_variables += f'  description = "Region for Spoke {spoke_idx} Subnet {subnet_idx}"\n'
-                    spoke_vpc_variables += f'  type        = string\n'
-                    spoke_vpc_variables += f'  default     = "{region}"\n'
-                    spoke_vpc_variables += f'}}\n'
-
-            # Add spoke VPC resource
-            spoke_vpc_resources += f'\nresource "google_compute_network" "spoke{spoke_idx}_vpc" {{\n'
-            spoke_vpc_resources += f'  name                    = "${{var.vpc_name}}-spoke{spoke_idx}"\n'
-            spoke_vpc_resources += f'  auto_create_subnetworks = false\n'
-            spoke_vpc_resources += f'  routing_mode            = "REGIONAL"\n'
-            spoke_vpc_resources += f'  project                 = var.project_id\n\n'
-            spoke_vpc_resources += f'  description = "Spoke VPC {spoke_idx}"\n'
-            spoke_vpc_resources += f'}}\n'
-
-            # Add spoke subnets
-            if spoke.get('subnets'):
-                for subnet_idx, subnet in enumerate(spoke['subnets'], 1):
-                    spoke_vpc_resources += f'\nresource "google_compute_subnetwork" "spoke{spoke_idx}_subnet{subnet_idx}" {{\n'
-                    spoke_vpc_resources += f'  name          = "${{var.vpc_name}}-spoke{spoke_idx}-subnet{subnet_idx}"\n'
-                    spoke_vpc_resources += f'  ip_cidr_range = var.spoke{spoke_idx}_subnet{subnet_idx}_cidr\n'
-                    spoke_vpc_resources += f'  region        = var.spoke{spoke_idx}_subnet{subnet_idx}_region\n'
-                    spoke_vpc_resources += f'  network       = google_compute_network.spoke{spoke_idx}_vpc.id\n'
-                    spoke_vpc_resources += f'  project       = var.project_id\n\n'
-                    spoke_vpc_resources += f'  private_ip_google_access = true\n\n'
-                    spoke_vpc_resources += f'  log_config {{\n'
-                    spoke_vpc_resources += f'    aggregation_interval = "INTERVAL_10_MIN"\n'
-                    spoke_vpc_resources += f'    flow_sampling        = 0.5\n'
-                    spoke_vpc_resources += f'    metadata             = "INCLUDE_ALL_METADATA"\n'
-                    spoke_vpc_resources += f'  }}\n'
-                    spoke_vpc_resources += f'}}\n'
-
-            # Add peering from hub to spoke.
-            # GCP only allows one peering operation per network at a time, so each
-            # peering resource depends on the previous to force sequential creation.
-            spoke_peering_resources += f'\nresource "google_compute_network_peering" "hub_to_spoke{spoke_idx}" {{\n'
-            spoke_peering_resources += f'  name         = "hub-to-spoke{spoke_idx}"\n'
-            spoke_peering_resources += f'  network      = google_compute_network.vpc.self_link\n'
-            spoke_peering_resources += f'  peer_network = google_compute_network.spoke{spoke_idx}_vpc.self_link\n'
-            if prev_peering_resource:
-                spoke_peering_resources += f'  depends_on   = [{prev_peering_resource}]\n'
-            spoke_peering_resources += f'}}\n'
-
-            # Add peering from spoke to hub
-            spoke_peering_resources += f'\nresource "google_compute_network_peering" "spoke{spoke_idx}_to_hub" {{\n'
-            spoke_peering_resources += f'  name         = "spoke{spoke_idx}-to-hub"\n'
-            spoke_peering_resources += f'  network      = google_compute_network.spoke{spoke_idx}_vpc.self_link\n'
-            spoke_peering_resources += f'  peer_network = google_compute_network.vpc.self_link\n'
-            spoke_peering_resources += f'  depends_on   = [google_compute_network_peering.hub_to_spoke{spoke_idx}]\n'
-            spoke_peering_resources += f'}}\n'
-
-            prev_peering_resource = f'google_compute_network_peering.spoke{spoke_idx}_to_hub'
-
-            # Add spoke outputs
-            spoke_outputs += f'\noutput "spoke{spoke_idx}_vpc_name" {{\n'
-            spoke_outputs += f'  description = "Name of Spoke {spoke_idx} VPC"\n'
-            spoke_outputs += f'  value       = google_compute_network.spoke{spoke_idx}_vpc.name\n'
-            spoke_outputs += f'}}\n'
-
-            spoke_outputs += f'\noutput "spoke{spoke_idx}_vpc_id" {{\n'
-            spoke_outputs += f'  description = "ID of Spoke {spoke_idx} VPC"\n'
-            spoke_outputs += f'  value       = google_compute_network.spoke{spoke_idx}_vpc.id\n'
-            spoke_outputs += f'}}\n'
-
-    # Replace placeholders
-    content = content.replace('{{vpcCidr}}', vpc_cidr)
-    content = content.replace('{{subnetVariables}}', subnet_variables)
-    content = content.replace('{{subnetResources}}', subnet_resources)
-    content = content.replace('{{subnetOutputs}}', subnet_outputs)
-    content = content.replace('{{spokeVPCVariables}}', spoke_vpc_variables)
-    content = content.replace('{{spokeVPCResources}}', spoke_vpc_resources)
-    content = content.replace('{{spokePeeringResources}}', spoke_peering_resources)
-    content = content.replace('{{spokeOutputs}}', spoke_outputs)
-
-    return content
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        # GCP uses vpcCidr, but data might have vnetCidr
+        vpcCidr=data.get('vpcCidr', data.get('vnetCidr', '')),
+        subnets=data['subnets'],
+        spokes=_spokes(data, 'spokeVPCs'),
+        spokePeeringResources=_gcp_terraform_peerings(data),
+        hubRoutes=_gcp_hub_routes(data),
+        nextHop=data['routeTables']['nextHop'] if data.get('routeTables') else '',
+    ), 'gcp/terraform')
 
 
 def process_oracle_terraform_template(template_content: str, data: Dict[str, Any]) -> str:
@@ -1128,64 +1288,22 @@ def process_oracle_terraform_template(template_content: str, data: Dict[str, Any
     Returns:
         Processed Terraform HCL code
     """
-    content = template_content
-
-    # Oracle uses vcnCidr; data may carry vnetCidr
-    vcn_cidr = data.get('vcnCidr', data.get('vnetCidr', ''))
-
-    # Generate subnet variables
-    subnet_variables = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_variables += f'\nvariable "subnet{idx}_cidr" {{\n'
-        subnet_variables += f'  description = "CIDR block for Subnet {idx}"\n'
-        subnet_variables += f'  type        = string\n'
-        subnet_variables += f'  default     = "{subnet["cidr"]}"\n'
-        subnet_variables += '}\n'
-
-    # Generate subnet resources
-    subnet_resources = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_resources += f'resource "oci_core_subnet" "subnet{idx}" {{\n'
-        subnet_resources += f'  compartment_id             = var.compartment_id\n'
-        subnet_resources += f'  vcn_id                     = oci_core_vcn.vcn.id\n'
-        subnet_resources += f'  cidr_block                 = var.subnet{idx}_cidr\n'
-        subnet_resources += f'  display_name               = "${{var.vcn_name}}-subnet{idx}"\n'
-        subnet_resources += f'  dns_label                  = "subnet{idx}"\n'
-        subnet_resources += f'  route_table_id             = oci_core_route_table.rt.id\n'
-        subnet_resources += f'  security_list_ids          = [oci_core_security_list.sl.id]\n'
-        subnet_resources += f'  prohibit_public_ip_on_vnic = false\n\n'
-        subnet_resources += f'  freeform_tags = {{\n'
-        subnet_resources += f'    "Environment" = "Production"\n'
-        subnet_resources += f'    "ManagedBy"   = "Terraform"\n'
-        subnet_resources += f'  }}\n'
-        subnet_resources += '}\n\n'
-
-    # Generate subnet outputs
-    subnet_outputs = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        subnet_outputs += f'\noutput "subnet{idx}_id" {{\n'
-        subnet_outputs += f'  description = "OCID of Subnet {idx}"\n'
-        subnet_outputs += f'  value       = oci_core_subnet.subnet{idx}.id\n'
-        subnet_outputs += '}\n'
-
-        subnet_outputs += f'\noutput "subnet{idx}_name" {{\n'
-        subnet_outputs += f'  description = "Name of Subnet {idx}"\n'
-        subnet_outputs += f'  value       = oci_core_subnet.subnet{idx}.display_name\n'
-        subnet_outputs += '}\n'
-
-    # Replace placeholders
-    content = content.replace('{{vcnCidr}}', vcn_cidr)
-    content = content.replace('{{subnetVariables}}', subnet_variables)
-    content = content.replace('{{subnetResources}}', subnet_resources)
-    content = content.replace('{{subnetOutputs}}', subnet_outputs)
-
-    return content
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'oracle'),
+        # Oracle uses vcnCidr; data may carry vnetCidr
+        vcnCidr=data.get('vcnCidr', data.get('vnetCidr', '')),
+        subnets=data['subnets'],
+    ), 'oracle/terraform')
 
 
 def process_alicloud_aliyun_template(template_content: str, data: Dict[str, Any]) -> str:
     """
     Process AliCloud Aliyun CLI template.
 
+    The script discovers the available zones at run time, so it works in any
+    region; vSwitches are spread over them round-robin.
+
     Args:
         template_content: Template file content with placeholders
         data: Dictionary with vnetCidr/vpcCidr, subnets
@@ -1193,77 +1311,21 @@ def process_alicloud_aliyun_template(template_content: str, data: Dict[str, Any]
     Returns:
         Processed Aliyun CLI shell script
     """
-    content = template_content
-
-    # Discover available zones dynamically so the script works in any region.
-    # Try VPC DescribeZones first (AvailableZones.AvailableZone), fall back to ECS (Zones.Zone).
-    # python3 JSON parsing is used for reliability instead of --output cols= which is fragile.
-    vswitch_creation = '# Discover available zones dynamically\n'
-    vswitch_creation += "ZONE_LIST=$(aliyun vpc DescribeZones \\\n"
-    vswitch_creation += "  --RegionId \"${REGION}\" 2>/dev/null | python3 -c '\n"
-    vswitch_creation += "import json,sys\n"
-    vswitch_creation += "try:\n"
-    vswitch_creation += "  d=json.load(sys.stdin)\n"
-    vswitch_creation += "  zones=d.get(\"AvailableZones\",{}).get(\"AvailableZone\",[])\n"
-    vswitch_creation += "  print(\"\\n\".join(z[\"ZoneId\"] for z in zones))\n"
-    vswitch_creation += "except: pass\n"
-    vswitch_creation += "' 2>/dev/null)\n"
-    vswitch_creation += 'if [ -z "$ZONE_LIST" ]; then\n'
-    vswitch_creation += "  ZONE_LIST=$(aliyun ecs DescribeZones \\\n"
-    vswitch_creation += "    --RegionId \"${REGION}\" 2>/dev/null | python3 -c '\n"
-    vswitch_creation += "import json,sys\n"
-    vswitch_creation += "try:\n"
-    vswitch_creation += "  d=json.load(sys.stdin)\n"
-    vswitch_creation += "  zones=d.get(\"Zones\",{}).get(\"Zone\",[])\n"
-    vswitch_creation += "  print(\"\\n\".join(z[\"ZoneId\"] for z in zones))\n"
-    vswitch_creation += "except: pass\n"
-    vswitch_creation += "' 2>/dev/null)\n"
-    vswitch_creation += 'fi\n'
-    vswitch_creation += 'mapfile -t AZ_ARRAY < <(echo "$ZONE_LIST" | grep -v \'^$\')\n'
-    vswitch_creation += 'AZ_COUNT=${#AZ_ARRAY[@]}\n'
-    vswitch_creation += 'if [ "$AZ_COUNT" -eq 0 ]; then\n'
-    vswitch_creation += '  echo "Error: No available zones found in region ${REGION}"\n'
-    vswitch_creation += '  exit 1\n'
-    vswitch_creation += 'fi\n'
-    vswitch_creation += 'echo "Available zones (${AZ_COUNT}): ${AZ_ARRAY[*]}"\n\n'
-
-    # Generate vSwitch creation commands using dynamic zone selection
-    for idx, subnet in enumerate(data['subnets'], 1):
-        az_index = idx - 1
-        vswitch_creation += f'ZONE="${{AZ_ARRAY[$(( {az_index} % AZ_COUNT ))]}}"  # round-robin zone selection\n'
-        vswitch_creation += f'echo "Creating vSwitch {idx} in ${{ZONE}}..."\n'
-        vswitch_creation += f'VSWITCH{idx}_ID=$(aliyun vpc CreateVSwitch \\\n'
-        vswitch_creation += f'  --RegionId "${{REGION}}" \\\n'
-        vswitch_creation += f'  --VpcId "${{VPC_ID}}" \\\n'
-        vswitch_creation += f'  --ZoneId "${{ZONE}}" \\\n'
-        vswitch_creation += f'  --CidrBlock "{subnet["cidr"]}" \\\n'
-        vswitch_creation += f'  --VSwitchName "${{VPC_NAME}}-vswitch{idx}" \\\n'
-        vswitch_creation += f'  --Description "vSwitch {idx}" \\\n'
-        vswitch_creation += f'  2>/dev/null | python3 -c "\n'
-        vswitch_creation += f'import json,sys\n'
-        vswitch_creation += f'try:\n'
-        vswitch_creation += f'  s=sys.stdin.read(); print(json.loads(s).get(\'VSwitchId\',\'\') if s.strip() else \'\')\n'
-        vswitch_creation += f'except: print(\'\')\n'
-        vswitch_creation += f'")\n\n'
-        vswitch_creation += f'if [ -z "${{VSWITCH{idx}_ID}}" ]; then\n'
-        vswitch_creation += f'  echo "Error: Failed to create vSwitch {idx}"\n'
-        vswitch_creation += f'  exit 1\n'
-        vswitch_creation += f'fi\n'
-        vswitch_creation += f'echo "vSwitch {idx} created with ID: ${{VSWITCH{idx}_ID}}"\n'
-        vswitch_creation += f'sleep 2\n\n'
-
-    # Replace placeholders
-    vpc_cidr = data.get('vpcCidr', data.get('vnetCidr', ''))
-    content = content.replace('{{vpcCidr}}', vpc_cidr)
-    content = content.replace('{{vSwitchCreation}}', vswitch_creation)
-
-    return content
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'alicloud'),
+        vpcCidr=data.get('vpcCidr', data.get('vnetCidr', '')),
+        subnets=data['subnets'],
+    ), 'alicloud/aliyun')
 
 
 def process_alicloud_terraform_template(template_content: str, data: Dict[str, Any]) -> str:
     """
     Process AliCloud Terraform template.
 
+    Zones are looked up with a data source at apply time, so only the vSwitch
+    CIDRs become variables.
+
     Args:
         template_content: Template file content with placeholders
         data: Dictionary with vnetCidr/vpcCidr, subnets
@@ -1271,64 +1333,28 @@ def process_alicloud_terraform_template(template_content: str, data: Dict[str, A
     Returns:
         Processed Terraform HCL code
     """
-    content = template_content
-
-    vpc_cidr = data.get('vpcCidr', data.get('vnetCidr', ''))
-
-    # Data source for dynamic zone lookup (works across all regions)
-    vswitch_variables = '\ndata "alicloud_zones" "available" {\n'
-    vswitch_variables += '  available_resource_creation = "VSwitch"\n'
-    vswitch_variables += '}\n'
-
-    # Generate vSwitch CIDR variables only (zones resolved dynamically at apply time)
-    for idx, subnet in enumerate(data['subnets'], 1):
-        vswitch_variables += f'\nvariable "vswitch{idx}_cidr" {{\n'
-        vswitch_variables += f'  description = "CIDR block for vSwitch {idx}"\n'
-        vswitch_variables += f'  type        = string\n'
-        vswitch_variables += f'  default     = "{subnet["cidr"]}"\n'
-        vswitch_variables += '}\n'
-
-    # Generate vSwitch resources using dynamic zone lookup
-    vswitch_resources = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        az_index = idx - 1
-        vswitch_resources += f'resource "alicloud_vswitch" "vswitch{idx}" {{\n'
-        vswitch_resources += f'  vpc_id       = alicloud_vpc.vpc.id\n'
-        vswitch_resources += f'  cidr_block   = var.vswitch{idx}_cidr\n'
-        vswitch_resources += f'  zone_id      = data.alicloud_zones.available.zones[{az_index} % length(data.alicloud_zones.available.zones)].id\n'
-        vswitch_resources += f'  vswitch_name = "${{var.vpc_name}}-vswitch{idx}"\n'
-        vswitch_resources += f'  description  = "vSwitch {idx}"\n\n'
-        vswitch_resources += f'  tags = {{\n'
-        vswitch_resources += f'    Environment = "Production"\n'
-        vswitch_resources += f'    ManagedBy   = "Terraform"\n'
-        vswitch_resources += f'  }}\n'
-        vswitch_resources += '}\n\n'
-
-    # Generate vSwitch outputs
-    vswitch_outputs = ''
-    for idx, subnet in enumerate(data['subnets'], 1):
-        vswitch_outputs += f'\noutput "vswitch{idx}_id" {{\n'
-        vswitch_outputs += f'  description = "ID of vSwitch {idx}"\n'
-        vswitch_outputs += f'  value       = alicloud_vswitch.vswitch{idx}.id\n'
-        vswitch_outputs += '}\n'
-
-        vswitch_outputs += f'\noutput "vswitch{idx}_name" {{\n'
-        vswitch_outputs += f'  description = "Name of vSwitch {idx}"\n'
-        vswitch_outputs += f'  value       = alicloud_vswitch.vswitch{idx}.vswitch_name\n'
-        vswitch_outputs += '}\n'
-
-        vswitch_outputs += f'\noutput "vswitch{idx}_zone" {{\n'
-        vswitch_outputs += f'  description = "Zone of vSwitch {idx}"\n'
-        vswitch_outputs += f'  value       = alicloud_vswitch.vswitch{idx}.zone_id\n'
-        vswitch_outputs += '}\n'
-
-    # Replace placeholders
-    content = content.replace('{{vpcCidr}}', vpc_cidr)
-    content = content.replace('{{vSwitchVariables}}', vswitch_variables)
-    content = content.replace('{{vSwitchResources}}', vswitch_resources)
-    content = content.replace('{{vSwitchOutputs}}', vswitch_outputs)
-
-    return content
+    return render_template(template_content, dict(
+        _TEMPLATE_HELPERS,
+        region=_region(data, 'alicloud'),
+        vpcCidr=data.get('vpcCidr', data.get('vnetCidr', '')),
+        subnets=data['subnets'],
+    ), 'alicloud/terraform')
+
+
+def check_template(provider: str, output_format: str, data: Dict[str, Any]) -> None:
+    """
+    Check a plan against the constraints of a template format without rendering it.
+
+    Raises the ValueError process_template would raise for the plan: compact
+    layouts of other topologies or with route tables, and CloudFormation plans
+    over the quotas even with nested stacks.
+    """
+    if data.get('compact') and output_format == 'terraform':
+        _check_compact('Terraform', data)
+    elif data.get('compact') and provider == 'azure' and output_format in ('bicep', 'arm'):
+        _check_compact({'bicep': 'Bicep', 'arm': 'ARM'}[output_format], data)
+    if provider == 'aws' and output_format == 'cloudformation':
+        cloudformation_stack_ranges(data)
 
 
 def process_template(provider: str, output_format: str, data: Dict[str, Any], templates_dir: str) -> str:
@@ -1338,11 +1364,12 @@ def process_template(provider: str, output_format: str, data: Dict[str, Any], te
     Args:
         provider: Cloud provider (azure, aws, gcp, etc.)
         output_format: Output format (terraform, bicep, arm, etc.)
-        data: Data to populate template
+        data: Data to populate template; data['compact'] selects the compact Terraform, Bicep or ARM layout
         templates_dir: Directory containing templates
 
     Returns:
-        Processed template content
+        Processed template content. A CloudFormation plan over the per-template quotas
+        renders as the parent of its nested stacks (process_cloudformation_nested_stacks).
     """
     # Map output format to template file
     template_map = {
@@ -1360,6 +1387,14 @@ def process_template(provider: str, output_format: str, data: Dict[str, Any], te
     template_file = template_map.get(output_format)
     if not template_file:
         raise ValueError(f"Unsupported output format: {output_format}")
+    compact = output_format in COMPACT_TEMPLATES and data.get('compact')
+    if compact:
+        template_file = COMPACT_TEMPLATES[output_format]
+    stack_ranges = []
+    if provider == 'aws' and output_format == 'cloudformation':
+        stack_ranges = cloudformation_stack_ranges(data)
+        if stack_ranges:
+            template_file = CFN_STACKS_TEMPLATE
 
     template_path = os.path.join(templates_dir, provider, template_file)
 
@@ -1370,7 +1405,11 @@ def process_template(provider: str, output_format: str, data: Dict[str, Any], te
 
     # Process template based on provider and format
     result: str | None = None
-    if provider == 'azure':
+    if compact and output_format == 'terraform':
+        result = process_terraform_compact_template(provider, template_content, data)
+    elif compact and provider == 'azure':
+        result = process_azure_compact_template(output_format, template_content, data)
+    elif provider == 'azure':
         if output_format == 'terraform':
             result = process_azure_terraform_template(template_content, data)
         elif output_format == 'cli':
@@ -1386,6 +1425,8 @@ def process_template(provider: str, output_format: str, data: Dict[str, Any], te
             result = process_aws_terraform_template(template_content, data)
         elif output_format == 'cli':
             result = process_aws_cli_template(template_content, data)
+        elif output_format == 'cloudformation' and stack_ranges:
+            result = process_aws_cloudformation_stacks_template(template_content, data, stack_ranges)
         elif output_format == 'cloudformation':
             result = process_aws_cloudformation_template(template_content, data)
     elif provider == 'gcp':
@@ -1410,7 +1451,11 @@ def process_template(provider: str, output_format: str, data: Dict[str, Any], te
     return _apply_name_prefix(result, data)
 
 
+def _name_prefix(data: Dict[str, Any]) -> str:
+    """The caller-supplied name prefix of the plan, defaulting to 'ipcalc'."""
+    return data.get('namePrefix') or 'ipcalc'
+
+
 def _apply_name_prefix(content: str, data: Dict[str, Any]) -> str:
-    """Replace the 'myproject' placeholder with the caller-supplied name prefix (defaulting to 'ipcalc')."""
-    name_prefix = data.get('namePrefix') or 'ipcalc'
-    return content.replace('myproject', name_prefix)
+    """Replace the 'myproject' placeholder with the plan's name prefix (_name_prefix)."""
+    return content.replace('myproject', _name_prefix(data))
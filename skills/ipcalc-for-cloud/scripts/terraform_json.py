@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Terraform JSON Output
+
+Builds the Terraform configuration of a plan as dicts in Terraform's JSON
+syntax (main.tf.json) and serializes it once (json_output.dumps). The result
+is well-formed by construction and parses with any JSON parser.
+
+The configuration mirrors the HCL templates (terraform.template.tf): the
+same variables, resource addresses, attributes and outputs. Hub-spoke, mesh
+and multi-hub peerings are supported; route tables and the AWS transit
+gateway are only rendered by the HCL templates.
+"""
+
+from typing import Any, Callable, Dict
+
+from json_output import dumps
+from template_processor import (
+    _gcp_region, _name_prefix, _network_label, _network_role, _peering_pairs, _region, _spokes, _zone_index
+)
+
+# Tags on every resource that supports them
+_TAGS = {"Environment": "Production", "ManagedBy": "Terraform"}
+
+
+def _variable(description: str, var_type: str = "string", default: Any = None) -> Dict[str, Any]:
+    """Variable declaration; variables without a default must be set by the caller."""
+    variable = {"description": description, "type": var_type}
+    if default is not None:
+        variable["default"] = default
+    return variable
+
+
+def _output(description: str, value: str) -> Dict[str, str]:
+    """Output declaration; value is a Terraform expression without the ${} wrapper."""
+    return {"description": description, "value": f"${{{value}}}"}
+
+
+def _config(
+    provider: str,
+    source: str,
+    version: str,
+    provider_config: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Top-level configuration with the required provider and empty sections in Terraform's order."""
+    return {
+        "//": "Generated by ipcalc.cloud",
+        "terraform": {"required_providers": {provider: {"source": source, "version": version}}},
+        "provider": {provider: provider_config},
+        "variable": {},
+        "data": {},
+        "resource": {},
+        "output": {},
+    }
+
+
+def _azure(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Azure VNet, subnets, spoke VNets and peerings."""
+    config = _config("azurerm", "hashicorp/azurerm", "~> 4.0", {"features": {}})
+    variables, outputs = config["variable"], config["output"]
+    spokes = _spokes(data, 'spokeVNets')
+
+    variables["prefix"] = _variable("Prefix for resource naming", default=_name_prefix(data))
+    variables["location"] = _variable("Azure region for resources", default=_region(data, 'azure'))
+    variables["vnet_cidr"] = _variable("CIDR block for the Virtual Network", default=data['vnetCidr'])
+    for idx, subnet in enumerate(data['subnets'], 1):
+        variables[f"subnet{idx}_cidr"] = _variable(f"CIDR block for Subnet {idx}", default=subnet['cidr'])
+
+    resource_groups: Dict[str, Any] = {"rg": {
+        "name": "${var.prefix}-rg",
+        "location": "${var.location}",
+        "tags": dict(_TAGS),
+    }}
+    vnets: Dict[str, Any] = {"vnet": {
+        "name": "${var.prefix}-vnet",
+        "address_space": ["${var.vnet_cidr}"],
+        "location": "${azurerm_resource_group.rg.location}",
+        "resource_group_name": "${azurerm_resource_group.rg.name}",
+        "tags": dict(_TAGS),
+    }}
+    subnets: Dict[str, Any] = {}
+    for idx in range(1, len(data['subnets']) + 1):
+        subnets[f"subnet{idx}"] = {
+            "name": f"${{var.prefix}}-subnet{idx}",
+            "resource_group_name": "${azurerm_resource_group.rg.name}",
+            "virtual_network_name": "${azurerm_virtual_network.vnet.name}",
+            "address_prefixes": [f"${{var.subnet{idx}_cidr}}"],
+        }
+
+    for spoke_idx, spoke in enumerate(spokes, 1):
+        vnets[f"spoke{spoke_idx}_vnet"] = {
+            "name": f"${{var.prefix}}-spoke{spoke_idx}-vnet",
+            "address_space": [spoke['cidr']],
+            "location": spoke.get('location') or "${azurerm_resource_group.rg.location}",
+            "resource_group_name": "${azurerm_resource_group.rg.name}",
+            "tags": dict(_TAGS, Role=_network_role(spoke)),
+        }
+        for idx, subnet in enumerate(spoke['subnets'], 1):
+            subnets[f"spoke{spoke_idx}_subnet{idx}"] = {
+                "name": f"${{var.prefix}}-spoke{spoke_idx}-subnet{idx}",
+                "resource_group_name": "${azurerm_resource_group.rg.name}",
+                "virtual_network_name": f"${{azurerm_virtual_network.spoke{spoke_idx}_vnet.name}}",
+                "address_prefixes": [subnet['cidr']],
+            }
+
+    def vnet_ref(idx: int) -> str:
+        return 'azurerm_virtual_network.vnet' if idx == 0 else f'azurerm_virtual_network.spoke{idx}_vnet'
+
+    peerings: Dict[str, Any] = {}
+    for a, b in (_peering_pairs(data, len(spokes)) if spokes else []):
+        for local, remote, transit in ((a, b, 'allow_gateway_transit'), (b, a, 'use_remote_gateways')):
+            peerings[f"{_network_label(local)}_to_{_network_label(remote)}"] = {
+                "name": f"{_network_label(local)}-to-{_network_label(remote)}",
+                "resource_group_name": "${azurerm_resource_group.rg.name}",
+                "virtual_network_name": f"${{{vnet_ref(local)}.name}}",
+                "remote_virtual_network_id": f"${{{vnet_ref(remote)}.id}}",
+                "allow_virtual_network_access": True,
+                "allow_forwarded_traffic": True,
+                transit: False,
+            }
+
+    config["resource"] = {
+        "azurerm_resource_group": resource_groups,
+        "azurerm_virtual_network": vnets,
+        "azurerm_subnet": subnets,
+    }
+    if peerings:
+        config["resource"]["azurerm_virtual_network_peering"] = peerings
+
+    outputs["resource_group_name"] = _output("Name of the resource group", "azurerm_resource_group.rg.name")
+    outputs["vnet_name"] = _output("Name of the virtual network", "azurerm_virtual_network.vnet.name")
+    outputs["vnet_id"] = _output("ID of the virtual network", "azurerm_virtual_network.vnet.id")
+    for idx in range(1, len(data['subnets']) + 1):
+        outputs[f"subnet{idx}_id"] = _output(f"ID of Subnet {idx}", f"azurerm_subnet.subnet{idx}.id")
+    for spoke_idx in range(1, len(spokes) + 1):
+        outputs[f"spoke{spoke_idx}_vnet_id"] = _output(
+            f"ID of Spoke {spoke_idx} Virtual Network", f"azurerm_virtual_network.spoke{spoke_idx}_vnet.id")
+        outputs[f"spoke{spoke_idx}_vnet_name"] = _output(
+            f"Name of Spoke {spoke_idx} Virtual Network", f"azurerm_virtual_network.spoke{spoke_idx}_vnet.name")
+    return config
+
+
+def _aws(data: Dict[str, Any]) -> Dict[str, Any]:
+    """AWS VPC and subnets spread over the available zones."""
+    config = _config("aws", "hashicorp/aws", "~> 5.0", {"region": "${var.region}"})
+    variables, outputs = config["variable"], config["output"]
+    azs = 'data.aws_availability_zones.available.names'
+
+    variables["prefix"] = _variable("Prefix for resource naming", default=_name_prefix(data))
+    variables["region"] = _variable("AWS region for resources", default=_region(data, 'aws'))
+    variables["vpc_cidr"] = _variable("CIDR block for the VPC", default=data.get('vpcCidr', data.get('vnetCidr', '')))
+    for idx, subnet in enumerate(data['subnets'], 1):
+        variables[f"subnet{idx}_cidr"] = _variable(f"CIDR block for Subnet {idx}", default=subnet['cidr'])
+
+    config["data"] = {"aws_availability_zones": {"available": {"state": "available"}}}
+    config["resource"] = {
+        "aws_vpc": {"vpc": {
+            "cidr_block": "${var.vpc_cidr}",
+            "enable_dns_hostnames": True,
+            "enable_dns_support": True,
+            "tags": dict(Name="${var.prefix}-vpc", **_TAGS),
+        }},
+        "aws_subnet": {
+            f"subnet{idx}": {
+                "vpc_id": "${aws_vpc.vpc.id}",
+                "cidr_block": f"${{var.subnet{idx}_cidr}}",
+                "availability_zone": f"${{{azs}[{_zone_index(subnet, idx)} % length({azs})]}}",
+                "tags": dict(Name=f"${{var.prefix}}-subnet{idx}", **_TAGS),
+            }
+            for idx, subnet in enumerate(data['subnets'], 1)
+        },
+    }
+
+    outputs["vpc_id"] = _output("ID of the VPC", "aws_vpc.vpc.id")
+    outputs["vpc_name"] = _output("Name of the VPC", 'aws_vpc.vpc.tags["Name"]')
+    for idx in range(1, len(data['subnets']) + 1):
+        outputs[f"subnet{idx}_id"] = _output(f"ID of Subnet {idx}", f"aws_subnet.subnet{idx}.id")
+        outputs[f"subnet{idx}_az"] = _output(
+            f"Availability Zone of Subnet {idx}", f"aws_subnet.subnet{idx}.availability_zone")
+    return config
+
+
+def _gcp_subnetwork(name: str, cidr_var: str, region_var: str, network: str) -> Dict[str, Any]:
+    """GCP subnetwork with private Google access and flow logs, as in the HCL template."""
+    return {
+        "name": name,
+        "ip_cidr_range": f"${{var.{cidr_var}}}",
+        "region": f"${{var.{region_var}}}",
+        "network": f"${{{network}.id}}",
+        "project": "${var.project_id}",
+        "private_ip_google_access": True,
+        "log_config": {
+            "aggregation_interval": "INTERVAL_10_MIN",
+            "flow_sampling": 0.5,
+            "metadata": "INCLUDE_ALL_METADATA",
+        },
+    }
+
+
+def _gcp(data: Dict[str, Any]) -> Dict[str, Any]:
+    """GCP VPC, regional subnets, spoke VPCs and sequential peerings."""
+    config = _config("google", "hashicorp/google", "~> 5.0", {"project": "${var.project_id}"})
+    variables, outputs = config["variable"], config["output"]
+    spokes = _spokes(data, 'spokeVPCs')
+
+    variables["project_id"] = _variable("GCP Project ID")
+    variables["vpc_name"] = _variable("Name of the VPC", default=f"{_name_prefix(data)}-vpc")
+    variables["routing_mode"] = _variable("VPC routing mode", default="REGIONAL")
+    variables["mtu"] = _variable("MTU for the VPC (1460 for standard, 1500 for Premium tier or Interconnect)",
+                                 "number", 1460)
+    for idx, subnet in enumerate(data['subnets'], 1):
+        variables[f"subnet{idx}_cidr"] = _variable(f"CIDR block for Subnet {idx}", default=subnet['cidr'])
+        variables[f"subnet{idx}_region"] = _variable(f"Region for Subnet {idx}", default=_gcp_region(subnet, idx))
+    for spoke_idx, spoke in enumerate(spokes, 1):
+        variables[f"spoke{spoke_idx}_cidr"] = _variable(f"CIDR block for Spoke VPC {spoke_idx}", default=spoke['cidr'])
+        for idx, subnet in enumerate(spoke['subnets'], 1):
+            variables[f"spoke{spoke_idx}_subnet{idx}_cidr"] = _variable(
+                f"CIDR block for Spoke {spoke_idx} Subnet {idx}", default=subnet['cidr'])
+            variables[f"spoke{spoke_idx}_subnet{idx}_region"] = _variable(
+                f"Region for Spoke {spoke_idx} Subnet {idx}", default=_gcp_region(subnet, idx))
+
+    networks: Dict[str, Any] = {"vpc": {
+        "name": "${var.vpc_name}",
+        "auto_create_subnetworks": False,
+        "routing_mode": "${var.routing_mode}",
+        "mtu": "${var.mtu}",
+        "project": "${var.project_id}",
+        "description": "Hub VPC created by Terraform",
+    }}
+    subnetworks = {
+        f"subnet{idx}": _gcp_subnetwork(f"${{var.vpc_name}}-subnet{idx}", f"subnet{idx}_cidr",
+                                        f"subnet{idx}_region", "google_compute_network.vpc")
+        for idx in range(1, len(data['subnets']) + 1)
+    }
+    for spoke_idx, spoke in enumerate(spokes, 1):
+        networks[f"spoke{spoke_idx}_vpc"] = {
+            "name": f"${{var.vpc_name}}-spoke{spoke_idx}",
+            "auto_create_subnetworks": False,
+            "routing_mode": "REGIONAL",
+            "project": "${var.project_id}",
+            "description": f"{_network_role(spoke)} VPC {spoke_idx}",
+        }
+        for idx in range(1, len(spoke['subnets']) + 1):
+            prefix = f"spoke{spoke_idx}_subnet{idx}"
+            subnetworks[prefix] = _gcp_subnetwork(
+                f"${{var.vpc_name}}-spoke{spoke_idx}-subnet{idx}", f"{prefix}_cidr", f"{prefix}_region",
+                f"google_compute_network.spoke{spoke_idx}_vpc")
+
+    def tf_vpc(idx: int) -> str:
+        return 'google_compute_network.vpc' if idx == 0 else f'google_compute_network.spoke{idx}_vpc'
+
+    # GCP allows one peering operation per network at a time: chain them
+    peerings: Dict[str, Any] = {}
+    previous = None
+    for a, b in (_peering_pairs(data, len(spokes)) if spokes else []):
+        for local, remote in ((a, b), (b, a)):
+            name = f"{_network_label(local)}_to_{_network_label(remote)}"
+            peering = {
+                "name": f"{_network_label(local)}-to-{_network_label(remote)}",
+                "network": f"${{{tf_vpc(local)}.self_link}}",
+                "peer_network": f"${{{tf_vpc(remote)}.self_link}}",
+            }
+            if previous:
+                peering["depends_on"] = [previous]
+            peerings[name] = peering
+            previous = f"google_compute_network_peering.{name}"
+
+    config["resource"] = {
+        "google_compute_network": networks,
+        "google_compute_subnetwork": subnetworks,
+    }
+    if peerings:
+        config["resource"]["google_compute_network_peering"] = peerings
+    config["resource"]["google_compute_firewall"] = {"allow_internal": {
+        "name": "${var.vpc_name}-allow-internal",
+        "network": "${google_compute_network.vpc.name}",
+        "project": "${var.project_id}",
+        "allow": {"protocol": "all"},
+        "source_ranges": [data.get('vpcCidr', data.get('vnetCidr', ''))],
+    }}
+
+    outputs["vpc_name"] = _output("Name of the VPC", "google_compute_network.vpc.name")
+    outputs["vpc_id"] = _output("ID of the VPC", "google_compute_network.vpc.id")
+    outputs["vpc_self_link"] = _output("Self link of the VPC", "google_compute_network.vpc.self_link")
+    for idx in range(1, len(data['subnets']) + 1):
+        subnet = f"google_compute_subnetwork.subnet{idx}"
+        outputs[f"subnet{idx}_name"] = _output(f"Name of Subnet {idx}", f"{subnet}.name")
+        outputs[f"subnet{idx}_id"] = _output(f"ID of Subnet {idx}", f"{subnet}.id")
+        outputs[f"subnet{idx}_self_link"] = _output(f"Self link of Subnet {idx}", f"{subnet}.self_link")
+    for spoke_idx in range(1, len(spokes) + 1):
+        network = f"google_compute_network.spoke{spoke_idx}_vpc"
+        outputs[f"spoke{spoke_idx}_vpc_name"] = _output(f"Name of Spoke {spoke_idx} VPC", f"{network}.name")
+        outputs[f"spoke{spoke_idx}_vpc_id"] = _output(f"ID of Spoke {spoke_idx} VPC", f"{network}.id")
+    return config
+
+
+def _oracle(data: Dict[str, Any]) -> Dict[str, Any]:
+    """OCI VCN with internet gateway, route table, security list and subnets."""
+    # Authentication comes from the OCI_* environment variables or the OCI config file
+    region = _region(data, 'oracle')
+    config = _config("oci", "oracle/oci", "~> 5.0", {"region": "${var.region}"} if region else {})
+    variables, outputs = config["variable"], config["output"]
+
+    variables["compartment_id"] = _variable("OCI Compartment OCID")
+    if region:
+        variables["region"] = _variable("OCI region", default=region)
+    variables["vcn_name"] = _variable("Name of the VCN", default=f"{_name_prefix(data)}-vcn")
+    variables["vcn_cidr"] = _variable("CIDR block for the VCN", default=data.get('vcnCidr', data.get('vnetCidr', '')))
+    variables["vcn_dns_label"] = _variable("DNS label for the VCN", default=f"{_name_prefix(data)}vcn")
+    for idx, subnet in enumerate(data['subnets'], 1):
+        variables[f"subnet{idx}_cidr"] = _variable(f"CIDR block for Subnet {idx}", default=subnet['cidr'])
+
+    compartment, vcn_id = "${var.compartment_id}", "${oci_core_vcn.vcn.id}"
+    config["resource"] = {
+        "oci_core_vcn": {"vcn": {
+            "compartment_id": compartment,
+            "cidr_block": "${var.vcn_cidr}",
+            "display_name": "${var.vcn_name}",
+            "dns_label": "${var.vcn_dns_label}",
+            "freeform_tags": dict(_TAGS),
+        }},
+        "oci_core_internet_gateway": {"igw": {
+            "compartment_id": compartment,
+            "vcn_id": vcn_id,
+            "display_name": "${var.vcn_name}-igw",
+            "enabled": True,
+        }},
+        "oci_core_route_table": {"rt": {
+            "compartment_id": compartment,
+            "vcn_id": vcn_id,
+            "display_name": "${var.vcn_name}-rt",
+            "route_rules": {
+                "destination": "0.0.0.0/0",
+                "destination_type": "CIDR_BLOCK",
+                "network_entity_id": "${oci_core_internet_gateway.igw.id}",
+            },
+        }},
+        "oci_core_security_list": {"sl": {
+            "compartment_id": compartment,
+            "vcn_id": vcn_id,
+            "display_name": "${var.vcn_name}-sl",
+            "egress_security_rules": {"destination": "0.0.0.0/0", "protocol": "all", "stateless": False},
+            "ingress_security_rules": {"source": "${var.vcn_cidr}", "protocol": "all", "stateless": False},
+        }},
+        "oci_core_subnet": {
+            f"subnet{idx}": {
+                "compartment_id": compartment,
+                "vcn_id": vcn_id,
+                "cidr_block": f"${{var.subnet{idx}_cidr}}",
+                "display_name": f"${{var.vcn_name}}-subnet{idx}",
+                "dns_label": f"subnet{idx}",
+                "route_table_id": "${oci_core_route_table.rt.id}",
+                "security_list_ids": ["${oci_core_security_list.sl.id}"],
+                "prohibit_public_ip_on_vnic": False,
+                "freeform_tags": dict(_TAGS),
+            }
+            for idx in range(1, len(data['subnets']) + 1)
+        },
+    }
+
+    outputs["vcn_id"] = _output("OCID of the VCN", "oci_core_vcn.vcn.id")
+    outputs["vcn_name"] = _output("Name of the VCN", "oci_core_vcn.vcn.display_name")
+    outputs["internet_gateway_id"] = _output("OCID of the Internet Gateway", "oci_core_internet_gateway.igw.id")
+    outputs["route_table_id"] = _output("OCID of the Route Table", "oci_core_route_table.rt.id")
+    outputs["security_list_id"] = _output("OCID of the Security List", "oci_core_security_list.sl.id")
+    for idx in range(1, len(data['subnets']) + 1):
+        outputs[f"subnet{idx}_id"] = _output(f"OCID of Subnet {idx}", f"oci_core_subnet.subnet{idx}.id")
+        outputs[f"subnet{idx}_name"] = _output(f"Name of Subnet {idx}", f"oci_core_subnet.subnet{idx}.display_name")
+    return config
+
+
+def _alicloud(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Alibaba Cloud VPC, vSwitches spread over the available zones, and a security group."""
+    config = _config("alicloud", "aliyun/alicloud", "~> 1.0", {"region": "${var.region}"})
+    variables, outputs = config["variable"], config["output"]
+    zones = 'data.alicloud_zones.available.zones'
+
+    variables["region"] = _variable("Alibaba Cloud Region", default=_region(data, 'alicloud'))
+    variables["vpc_name"] = _variable("Name of the VPC", default=f"{_name_prefix(data)}-vpc")
+    variables["vpc_cidr"] = _variable("CIDR block for the VPC", default=data.get('vpcCidr', data.get('vnetCidr', '')))
+    for idx, subnet in enumerate(data['subnets'], 1):
+        variables[f"vswitch{idx}_cidr"] = _variable(f"CIDR block for vSwitch {idx}", default=subnet['cidr'])
+
+    config["data"] = {"alicloud_zones": {"available": {"available_resource_creation": "VSwitch"}}}
+    config["resource"] = {
+        "alicloud_vpc": {"vpc": {
+            "vpc_name": "${var.vpc_name}",
+            "cidr_block": "${var.vpc_cidr}",
+            "description": "VPC created by Terraform",
+            "tags": dict(_TAGS),
+        }},
+        "alicloud_vswitch": {
+            f"vswitch{idx}": {
+                "vpc_id": "${alicloud_vpc.vpc.id}",
+                "cidr_block": f"${{var.vswitch{idx}_cidr}}",
+                "zone_id": f"${{{zones}[{_zone_index(subnet, idx)} % length({zones})].id}}",
+                "vswitch_name": f"${{var.vpc_name}}-vswitch{idx}",
+                "description": f"vSwitch {idx}",
+                "tags": dict(_TAGS),
+            }
+            for idx, subnet in enumerate(data['subnets'], 1)
+        },
+        "alicloud_security_group": {"sg": {
+            "security_group_name": "${var.vpc_name}-sg",
+            "description": "Security group for ${var.vpc_name}",
+            "vpc_id": "${alicloud_vpc.vpc.id}",
+            "tags": dict(_TAGS),
+        }},
+        "alicloud_security_group_rule": {"allow_internal": {
+            "type": "ingress",
+            "ip_protocol": "all",
+            "policy": "accept",
+            "port_range": "-1/-1",
+            "security_group_id": "${alicloud_security_group.sg.id}",
+            "cidr_ip": "${var.vpc_cidr}",
+        }},
+    }
+
+    outputs["vpc_id"] = _output("ID of the VPC", "alicloud_vpc.vpc.id")
+    outputs["vpc_name"] = _output("Name of the VPC", "alicloud_vpc.vpc.vpc_name")
+    outputs["vpc_cidr"] = _output("CIDR block of the VPC", "alicloud_vpc.vpc.cidr_block")
+    outputs["security_group_id"] = _output("ID of the Security Group", "alicloud_security_group.sg.id")
+    for idx in range(1, len(data['subnets']) + 1):
+        vswitch = f"alicloud_vswitch.vswitch{idx}"
+        outputs[f"vswitch{idx}_id"] = _output(f"ID of vSwitch {idx}", f"{vswitch}.id")
+        outputs[f"vswitch{idx}_name"] = _output(f"Name of vSwitch {idx}", f"{vswitch}.vswitch_name")
+        outputs[f"vswitch{idx}_zone"] = _output(f"Zone of vSwitch {idx}", f"{vswitch}.zone_id")
+    return config
+
+
+# Provider -> configuration builder
+_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    'azure': _azure,
+    'aws': _aws,
+    'gcp': _gcp,
+    'oracle': _oracle,
+    'alicloud': _alicloud,
+}
+
+
+def check_terraform_json(provider: str, data: Dict[str, Any]) -> None:
+    """
+    Check that a plan can be rendered as Terraform JSON.
+
+    Raises:
+        ValueError: For unsupported providers, route tables or transit gateways
+    """
+    if provider not in _BUILDERS:
+        raise ValueError(f"Terraform JSON output is not supported for {provider}")
+    if data.get('routeTables') or data.get('transitGateway'):
+        raise ValueError("Terraform JSON output does not support route tables or transit gateways; "
+                         "they are only rendered as Terraform HCL")
+
+
+def build_terraform_json(provider: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the Terraform configuration of a plan in Terraform's JSON syntax.
+
+    Args:
+        provider: Cloud provider
+        data: Template data (NetworkPlan.template_data)
+
+    Returns:
+        Configuration with terraform, provider, variable, data, resource and output
+        sections; empty sections are left out
+
+    Raises:
+        ValueError: See check_terraform_json
+    """
+    check_terraform_json(provider, data)
+    return {section: value for section, value in _BUILDERS[provider](data).items() if value}
+
+
+def process_terraform_json(provider: str, data: Dict[str, Any], minify: bool = False) -> str:
+    """Render a plan as main.tf.json (build_terraform_json, then json_output.dumps)."""
+    return dumps(build_terraform_json(provider, data), minify)
@@ -0,0 +1,99 @@
+"""Unit tests for the Arrow / Parquet plan export."""
+
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from arrow_export import (
+    PYARROW_AVAILABLE,
+    COLUMNS,
+    bulk_split_batches,
+    iter_plan_rows,
+    iter_record_batches,
+    write_batches,
+    write_plan,
+)
+from bulk_subnets import bulk_split_many
+from ipcalc import calculate_region_layout, generate_hub_spoke_topology
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+
+def _hub_spoke_data():
+    result = generate_hub_spoke_topology('10.0.0.0/16', 4, ['10.1.0.0/16', '10.2.0.0/16'], [2, 3], 'azure')
+    return {
+        "vnetCidr": '10.0.0.0/16',
+        "subnets": result["hub"]["subnets"],
+        "spokeVNets": result["spokes"],
+    }
+
+
+class TestPlanRows(unittest.TestCase):
+    """Row generation does not need pyarrow."""
+
+    def test_hub_spoke_rows(self):
+        rows = list(iter_plan_rows(_hub_spoke_data(), 'azure'))
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(len(rows[0]), len(COLUMNS))
+        row = dict(zip(COLUMNS, rows[4]))
+        self.assertEqual(row['parent_cidr'], '10.1.0.0/16')
+        self.assertEqual(row['spoke_index'], 1)
+        self.assertEqual(row['subnet_index'], 1)
+        self.assertEqual(row['network'], 0x0A010000)
+        self.assertEqual(row['usable_ips'], 32763)
+
+    def test_region_layout_rows(self):
+        layout = calculate_region_layout('10.0.0.0/12', 'aws', ['us-east-1', 'eu-west-1'], ['public', 'private'])
+        rows = [dict(zip(COLUMNS, row)) for row in iter_plan_rows(layout, 'aws')]
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(rows[6]['parent_cidr'], layout['regions'][1]['cidr'])
+        self.assertEqual(rows[6]['zone'], 'eu-west-1a')
+
+
+@unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow is not installed")
+class TestArrowExport(unittest.TestCase):
+    """Round trips through Arrow IPC and Parquet files."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_parquet_round_trip(self):
+        path = os.path.join(self.tmp.name, 'plan.parquet')
+        self.assertEqual(write_plan(_hub_spoke_data(), 'azure', path, 'parquet'), 9)
+        table = pq.read_table(path)
+        self.assertEqual(table.column_names, list(COLUMNS))
+        self.assertEqual(table.schema.field('network').type, pa.uint32())
+        self.assertEqual(table.column('spoke_index').to_pylist(), [0] * 4 + [1] * 2 + [2] * 3)
+
+    def test_arrow_batches(self):
+        path = os.path.join(self.tmp.name, 'plan.arrow')
+        rows = iter_plan_rows(_hub_spoke_data(), 'azure')
+        self.assertEqual(write_batches(iter_record_batches(rows, batch_size=4), path, 'arrow'), 9)
+        reader = pa.ipc.open_file(path)
+        self.assertEqual(reader.num_record_batches, 3)
+        self.assertEqual(reader.read_all().column('provider').to_pylist(), ['azure'] * 9)
+
+    def test_bulk_split_batches(self):
+        cidrs = ['10.0.0.0/16', '10.1.0.0/16']
+        for use_numpy in (None, False):
+            split = bulk_split_many(cidrs, 'azure', 20, use_numpy=use_numpy)
+            path = os.path.join(self.tmp.name, 'bulk.parquet')
+            self.assertEqual(write_batches(bulk_split_batches(split, 'azure', cidrs, 5), path, 'parquet'), 32)
+            table = pq.read_table(path)
+            self.assertEqual(table.column('subnet_index').to_pylist()[14:18], [15, 16, 1, 2])
+            self.assertEqual(table.column('parent_cidr').to_pylist()[16], '10.1.0.0/16')
+            self.assertEqual(table.column('network').to_pylist()[16], 0x0A010000)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            write_plan(_hub_spoke_data(), 'azure', os.path.join(self.tmp.name, 'plan.csv'), 'csv')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Unit tests for the bulk subnet computation backends."""
+
+import sys
+import os
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bulk_subnets import (
+    NUMPY_AVAILABLE,
+    bulk_split,
+    bulk_split_many,
+    format_cidrs,
+    format_ipv4,
+    to_subnet_records,
+)
+from ipcalc import calculate_subnets
+
+
+class TestPythonBackend(unittest.TestCase):
+    """Pure-Python backend (always available)."""
+
+    def test_matches_calculate_subnets(self):
+        for provider in ('azure', 'aws', 'gcp', 'oracle', 'alicloud'):
+            expected = calculate_subnets('10.0.0.0/16', 6, provider)['subnets']
+            split = bulk_split('10.0.0.0/16', provider, num_subnets=6, use_numpy=False)
+            records = to_subnet_records(split)
+            self.assertEqual(len(records), 6)
+            for record, subnet in zip(records, expected):
+                for key, value in record.items():
+                    self.assertEqual(value, subnet[key], f"{provider} {key}")
+
+    def test_full_split_by_prefix(self):
+        split = bulk_split('10.0.0.0/16', 'aws', 24, use_numpy=False)
+        self.assertEqual(split['count'], 256)
+        self.assertEqual(split['usable_ips'], 251)
+        self.assertEqual(format_cidrs(split)[-1], '10.0.255.0/24')
+        self.assertEqual(format_ipv4(split['last_usable'][:1]), ['10.0.0.253'])
+
+    def test_many_networks(self):
+        split = bulk_split_many(['10.0.0.0/16', '10.1.0.0/16'], 'azure', 20, use_numpy=False)
+        self.assertEqual(split['count'], 32)
+        self.assertEqual(split['parent'][15:17], [0, 1])
+        self.assertEqual(format_cidrs(split)[16], '10.1.0.0/20')
+
+    def test_errors(self):
+        self.assertIn('error', bulk_split('10.0.0.0/16', 'aws', 30))
+        self.assertIn('error', bulk_split('10.0.0.0/16', 'aws', 8))
+        self.assertIn('error', bulk_split('10.0.0.0/24', 'aws', 28, num_subnets=32))
+        self.assertIn('error', bulk_split('not-a-cidr', 'aws', 24))
+        self.assertIn('error', bulk_split_many(['10.0.0.0/16', '10.1.0.0/30'], 'aws', 24))
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy is not installed")
+class TestNumpyBackend(unittest.TestCase):
+    """NumPy backend gives the same columns as the Python backend."""
+
+    def test_columns_match_python_backend(self):
+        for provider, cidr, prefix in (('azure', '10.0.0.0/12', 24), ('oracle', '192.168.0.0/24', 30)):
+            fast = bulk_split(cidr, provider, prefix, use_numpy=True)
+            slow = bulk_split(cidr, provider, prefix, use_numpy=False)
+            self.assertEqual(fast['backend'], 'numpy')
+            for column in ('network', 'broadcast', 'first_usable', 'last_usable'):
+                self.assertEqual(fast[column].tolist(), slow[column])
+            self.assertEqual(format_cidrs(fast).tolist(), format_cidrs(slow))
+
+    def test_vectorized_formatting(self):
+        split = bulk_split('0.0.0.0/8', 'onpremises', 32, use_numpy=True)
+        self.assertEqual(split['count'], 2 ** 24)
+        formatted = format_ipv4(split['network'][-3:])
+        self.assertEqual(formatted.tolist(), ['0.255.255.253', '0.255.255.254', '0.255.255.255'])
+
+    def test_many_networks(self):
+        split = bulk_split_many(['10.0.0.0/16', '10.1.0.0/16'], 'azure', 20, use_numpy=True)
+        self.assertEqual(split['parent'][15:17].tolist(), [0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
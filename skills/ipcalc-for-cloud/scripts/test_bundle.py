@@ -0,0 +1,56 @@
+"""Unit tests for archive bundles."""
+
+import sys
+import os
+import io
+import tarfile
+import unittest
+import zipfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bundle import stream_archive
+
+FILES = [
+    ('main.tf', 'resource "aws_vpc" "vpc" {}\n' * 50),
+    ('deploy.sh', '#!/bin/bash\necho deploy\n'),
+    ('stacks/subnets-1.yaml', 'Resources: {}\n'),
+]
+
+
+class TestStreamArchive(unittest.TestCase):
+
+    def test_zip(self):
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(stream_archive(iter(FILES), 'zip'))))
+        self.assertIsNone(archive.testzip())
+        self.assertEqual([(name, archive.read(name).decode()) for name in archive.namelist()], FILES)
+        self.assertEqual(archive.getinfo('deploy.sh').external_attr >> 16, 0o755)
+        self.assertEqual(archive.getinfo('main.tf').external_attr >> 16, 0o644)
+
+    def test_zip_is_reproducible(self):
+        self.assertEqual(b''.join(stream_archive(FILES, 'zip')), b''.join(stream_archive(FILES, 'zip')))
+
+    def test_tar_gz(self):
+        archive = tarfile.open(fileobj=io.BytesIO(b''.join(stream_archive(iter(FILES), 'tar.gz'))))
+        self.assertEqual([(m.name, archive.extractfile(m).read().decode()) for m in archive.getmembers()], FILES)
+        self.assertEqual(archive.getmember('deploy.sh').mode, 0o755)
+
+    def test_files_are_consumed_as_they_stream(self):
+        consumed = []
+
+        def files():
+            for name, content in FILES:
+                consumed.append(name)
+                yield name, content
+
+        chunks = stream_archive(files(), 'zip')
+        next(chunks)
+        self.assertEqual(consumed, ['main.tf'])
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            next(stream_archive(FILES, 'rar'))
+
+
+if __name__ == '__main__':
+    unittest.main()
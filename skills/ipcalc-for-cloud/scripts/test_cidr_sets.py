@@ -0,0 +1,88 @@
+"""Unit tests for the CIDR set algebra."""
+
+import sys
+import os
+import ipaddress
+import random
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from cidr_sets import (
+    aligned_blocks,
+    complement,
+    count_aligned_blocks,
+    intersect,
+    normalize,
+    parse_interval,
+    parse_set,
+    range_to_cidrs,
+    subtract,
+    to_cidrs,
+    union,
+)
+
+
+def _addresses(intervals):
+    return {address for first, last in intervals for address in range(first, last + 1)}
+
+
+class TestParsing(unittest.TestCase):
+
+    def test_entries(self):
+        self.assertEqual(parse_interval('10.0.0.5/24'), (0x0A000000, 0x0A0000FF))
+        self.assertEqual(parse_interval('10.0.0.1'), (0x0A000001, 0x0A000001))
+        self.assertEqual(parse_interval('10.0.0.1 - 10.0.0.3'), (0x0A000001, 0x0A000003))
+        for bad in ('10.0.0.0/33', '10.0.0.256', '10.0.0.9-10.0.0.1', '10.0.0.0/x'):
+            with self.assertRaises(ValueError):
+                parse_interval(bad)
+
+    def test_parse_set_merges(self):
+        entries = ['10.0.1.0/24', '# comment', '', '10.0.0.0/24', '10.0.0.128/25  # nested']
+        self.assertEqual(parse_set(entries), [(0x0A000000, 0x0A0001FF)])
+
+
+class TestAlgebra(unittest.TestCase):
+
+    def test_operations_match_python_sets(self):
+        rng = random.Random(7)
+
+        def random_set():
+            return normalize(
+                (first, first + rng.randrange(40))
+                for first in (rng.randrange(2000) for _ in range(rng.randrange(15)))
+            )
+
+        for _ in range(200):
+            a, b = random_set(), random_set()
+            self.assertEqual(_addresses(union(a, b)), _addresses(a) | _addresses(b))
+            self.assertEqual(_addresses(intersect(a, b)), _addresses(a) & _addresses(b))
+            self.assertEqual(_addresses(subtract(a, b)), _addresses(a) - _addresses(b))
+            self.assertEqual(_addresses(complement(a, [(0, 2100)])), set(range(2101)) - _addresses(a))
+            self.assertEqual(union(a, b), normalize(a + b))
+
+    def test_complement_of_everything(self):
+        self.assertEqual(complement([]), [(0, 2 ** 32 - 1)])
+        self.assertEqual(to_cidrs(complement(parse_set(['128.0.0.0/1']))), ['0.0.0.0/1'])
+
+    def test_range_to_cidrs_is_minimal(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            first = rng.randrange(2 ** 32)
+            last = min(first + rng.randrange(2 ** rng.randrange(1, 24)), 2 ** 32 - 1)
+            expected = ipaddress.summarize_address_range(ipaddress.IPv4Address(first), ipaddress.IPv4Address(last))
+            self.assertEqual(
+                [ipaddress.ip_network(block) for block in range_to_cidrs(first, last)],
+                list(expected)
+            )
+        self.assertEqual(range_to_cidrs(0, 2 ** 32 - 1), [(0, 0)])
+
+    def test_aligned_blocks(self):
+        free = parse_set(['10.0.0.64-10.0.1.127'])
+        self.assertEqual(count_aligned_blocks(free, 25), 2)
+        self.assertEqual(list(aligned_blocks(free, 25)), [0x0A000080, 0x0A000100])
+        self.assertEqual(count_aligned_blocks(free, 26), len(list(aligned_blocks(free, 26))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Unit tests for the CloudFormation JSON output."""
+
+import sys
+import os
+import json
+import re
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from cloudformation_json import build_cloudformation_json, process_cloudformation_json
+from ipcalc import calculate_subnets, render_outputs
+from network_ir import build_plan
+
+
+class TestCloudFormationJson(unittest.TestCase):
+
+    def _data(self, subnets=4, cidr='10.0.0.0/16'):
+        return build_plan('aws', cidr, calculate_subnets(cidr, subnets, 'aws'), 'app').template_data()
+
+    def test_logical_ids_match_yaml(self):
+        plan = build_plan('aws', '10.0.0.0/16', calculate_subnets('10.0.0.0/16', 4, 'aws'), 'app')
+        outputs = render_outputs(plan, ['cloudformation', 'cloudformation-json'])
+        template = json.loads(outputs['cloudformation-json'])
+        for section in ('Parameters', 'Resources', 'Outputs'):
+            yaml_section = outputs['cloudformation'].split(f'\n{section}:\n')[1].split('\n# ')[0]
+            self.assertEqual(list(template[section]), re.findall(r'^  (\w+):$', yaml_section, re.M))
+        self.assertEqual(template['Parameters']['Prefix']['Default'], 'app')
+
+    def test_intrinsic_functions(self):
+        subnet = build_cloudformation_json(self._data())['Resources']['Subnet4']['Properties']
+        self.assertEqual(subnet['VpcId'], {'Ref': 'VPC'})
+        self.assertEqual(subnet['AvailabilityZone'], {'Fn::Select': [0, {'Fn::GetAZs': ''}]})
+        self.assertEqual(subnet['Tags'][0], {'Key': 'Name', 'Value': {'Fn::Sub': '${Prefix}-subnet4'}})
+
+    def test_pinned_zones(self):
+        data = self._data()
+        data['subnets'] = [dict(subnet, zoneIndex=5) for subnet in data['subnets']]
+        subnet = build_cloudformation_json(data)['Resources']['Subnet1']['Properties']
+        self.assertEqual(subnet['AvailabilityZone']['Fn::Select'][0], 5)
+
+    def test_over_quotas(self):
+        with self.assertRaises(ValueError) as ctx:
+            build_cloudformation_json(self._data(256))
+        # The message also reaches API callers, who have no command-line options
+        self.assertNotIn('--', str(ctx.exception))
+
+    def test_name_prefix_escaped(self):
+        data = self._data()
+        data['namePrefix'] = 'a"b\\c'
+        template = json.loads(process_cloudformation_json(data))
+        self.assertEqual(template['Parameters']['Prefix']['Default'], 'a"b\\c')
+
+    def test_minified(self):
+        minified = process_cloudformation_json(self._data(), minify=True)
+        self.assertNotIn('\n', minified)
+        self.assertLess(len(minified), len(process_cloudformation_json(self._data())))
+
+
+if __name__ == '__main__':
+    unittest.main()
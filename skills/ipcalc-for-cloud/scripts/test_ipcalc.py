@@ -5,7 +5,12 @@ Unit tests for refactored IP Calculator (ipcalc.py)
 Tests cover:
 - Cloud provider configuration
 - Subnet calculation
+- Subnets carved around excluded ranges
 - Hub-spoke topology
+- Mesh, multi-hub and transit-gateway topologies
+- Region layouts (tiers x zones across regions)
+- Provider limits validation
+- Plan memoization and read-only results
 - Network info calculation
 - Reserved IP handling
 - Availability zone distribution
@@ -13,19 +18,39 @@ Tests cover:
 """
 
 import unittest
+import copy
 import ipaddress
 import json
+import pickle
 from cloud_provider_config import (
     get_cloud_provider_config,
     validate_output_format,
     get_availability_zone,
+    get_region_zones,
+    get_provider_quota,
     CLOUD_PROVIDERS
 )
 from ipcalc import (
     calculate_subnets,
     generate_hub_spoke_topology,
-    calculate_network_info
+    generate_topology,
+    calculate_region_layout,
+    calculate_network_info,
+    calculate_subnets_excluding,
+    PREFIX_NETMASKS,
+    PREFIX_SIZES,
+    RESERVED_OFFSETS,
+    clear_plan_cache,
+    plan_cache_info,
+    render_environments,
+    check_outputs,
+    _parse_spoke_hubs
 )
+from network_ir import build_plan
+from cidr_sets import parse_set
+from frozen import thaw
+from topology import full_mesh_pairs, multi_hub_pairs
+from plan_limits import validate_plan_limits, validate_plans
 
 
 class TestCloudProviderConfig(unittest.TestCase):
@@ -58,6 +83,22 @@ class TestCloudProviderConfig(unittest.TestCase):
         with self.assertRaises(ValueError):
             get_cloud_provider_config('invalid_provider')
 
+    def test_catalogue_is_read_only(self):
+        """Test the catalogue-backed configuration cannot be modified"""
+        config = get_cloud_provider_config('aws')
+        with self.assertRaises(TypeError):
+            config['min_cidr_prefix'] = 30
+        with self.assertRaises(TypeError):
+            CLOUD_PROVIDERS['aws'] = config
+        self.assertIs(get_cloud_provider_config('AWS'), config)
+
+    def test_catalogue_rules(self):
+        """Test IPv6 rules and quotas come from the catalogue"""
+        self.assertEqual(get_cloud_provider_config('aws')['ipv6']['subnet_prefix'], 64)
+        self.assertFalse(get_cloud_provider_config('onpremises')['ipv6']['supported'])
+        self.assertEqual(get_provider_quota('aws', 'subnets_per_network'), 200)
+        self.assertIsNone(get_provider_quota('onpremises', 'subnets_per_network'))
+
     def test_validate_output_format_azure(self):
         """Test Azure output format validation"""
         self.assertTrue(validate_output_format('azure', 'terraform'))
@@ -164,6 +205,27 @@ class TestCalculateSubnets(unittest.TestCase):
         self.assertIn('error', result)
         self.assertIn('smaller than cloud provider minimum', result['error'].lower())
 
+    def test_excluded_ranges(self):
+        """Test subnets are carved from the free space left by exclusions"""
+        exclude = parse_set(['10.0.0.0/18', '10.0.100.0-10.0.110.255'])
+        result = calculate_subnets_excluding('10.0.0.0/16', 3, 'azure', exclude)
+        self.assertEqual([s['cidr'] for s in result['subnets']], ['10.0.64.0/19', '10.0.128.0/19', '10.0.160.0/19'])
+        self.assertEqual(result['subnets'][2]['availabilityZone'], '3')
+        self.assertEqual(result['free'][0], '10.0.64.0/19')
+
+        # Without exclusions the plan matches calculate_subnets
+        plain = calculate_subnets_excluding('10.0.0.0/16', 5, 'aws', [])
+        self.assertEqual(plain['subnets'], thaw(calculate_subnets('10.0.0.0/16', 5, 'aws'))['subnets'])
+
+        result = calculate_subnets_excluding('10.0.0.0/16', 4, 'aws', parse_set(['10.0.0.0/17']), 24)
+        self.assertEqual(result['subnets'][0]['cidr'], '10.0.128.0/24')
+
+    def test_excluded_everything(self):
+        """Test error when exclusions leave too little space"""
+        result = calculate_subnets_excluding('10.0.0.0/24', 2, 'aws', parse_set(['10.0.0.0-10.0.0.240']))
+        self.assertIn('error', result)
+        self.assertIn('free space', result['error'])
+
 
 class TestHubSpokeTopology(unittest.TestCase):
     """Test hub-spoke topology generation"""
@@ -219,6 +281,206 @@ class TestHubSpokeTopology(unittest.TestCase):
         self.assertTrue(result['peeringEnabled'])
 
 
+class TestTopologies(unittest.TestCase):
+    """Test mesh, multi-hub and transit-gateway topology generation"""
+
+    def test_full_mesh_pairs_unique(self):
+        """Test full mesh yields each unordered pair exactly once"""
+        pairs = full_mesh_pairs(120)
+        self.assertEqual(len(pairs), 120 * 119 // 2)
+        self.assertEqual(len(set(pairs)), len(pairs))
+        self.assertTrue(all(a < b for a, b in pairs))
+
+    def test_multi_hub_pairs(self):
+        """Test hubs are meshed and spokes peer only with their hub"""
+        # Networks 1 and 2 are spokes of hubs 0 and 3; network 3 is a hub
+        self.assertEqual(multi_hub_pairs([0, 3, None]), [(0, 1), (0, 3), (2, 3)])
+
+    def test_parse_spoke_hubs(self):
+        """Test --spoke-hubs is parsed into 1-based hub numbers and rejects other values"""
+        self.assertEqual(_parse_spoke_hubs("1, 2,2", 2), [1, 2, 2])
+        self.assertIsNone(_parse_spoke_hubs(None, 2))
+        for value in ("1,x", "0", "3", "-1"):
+            with self.assertRaisesRegex(ValueError, "--spoke-hubs"):
+                _parse_spoke_hubs(value, 2)
+
+    def test_mesh_topology(self):
+        """Test mesh topology peers every network"""
+        result = generate_topology(
+            'mesh', '10.0.0.0/16', 2, ['10.1.0.0/16', '10.2.0.0/16'], [2, 2], 'azure'
+        )
+        self.assertNotIn('error', result)
+        self.assertEqual(result['peerings'], [[0, 1], [0, 2], [1, 2]])
+        self.assertTrue(result['peeringEnabled'])
+
+    def test_multi_hub_topology(self):
+        """Test additional hubs are appended after spokes and spokes inherit hub location"""
+        result = generate_topology(
+            'multi-hub', '10.0.0.0/16', 2, ['10.1.0.0/16', '10.2.0.0/16'], [2, 2], 'azure',
+            hub_cidrs=['10.100.0.0/16'], hub_locations=['westeurope']
+        )
+        self.assertNotIn('error', result)
+        hub2 = result['spokes'][2]
+        self.assertEqual(hub2['role'], 'hub')
+        self.assertEqual(hub2['index'], 3)
+        self.assertEqual(result['spokes'][1]['hubIndex'], 3)
+        self.assertEqual(result['spokes'][1]['location'], 'westeurope')
+        self.assertEqual(result['peerings'], [[0, 1], [0, 3], [2, 3]])
+
+    def test_transit_gateway_topology(self):
+        """Test transit gateway attaches every VPC without peerings"""
+        result = generate_topology(
+            'transit-gateway', '10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'aws'
+        )
+        self.assertNotIn('error', result)
+        self.assertEqual(result['peerings'], [])
+        self.assertEqual(result['transitGateway']['attachments'], [0, 1])
+
+    def test_topology_provider_validation(self):
+        """Test unsupported provider/topology combinations return an error"""
+        result = generate_topology('transit-gateway', '10.0.0.0/16', 2, [], [], 'azure')
+        self.assertIn('error', result)
+        result = generate_topology('mesh', '10.0.0.0/16', 2, [], [], 'oracle')
+        self.assertIn('error', result)
+
+
+class TestRegionLayout(unittest.TestCase):
+    """Test tiers x zones layouts across regions"""
+
+    def test_zone_catalogue(self):
+        """Test zones come from the bundled catalogue"""
+        self.assertEqual(get_region_zones('aws', 'eu-west-1'), ['eu-west-1a', 'eu-west-1b', 'eu-west-1c'])
+        self.assertEqual(get_region_zones('azure', 'westeurope'), ['1', '2', '3'])
+        with self.assertRaises(ValueError):
+            get_region_zones('aws', 'mars-north-1')
+
+    def test_aligned_layout(self):
+        """Test every tier/zone cell sits at the same offset in every region"""
+        regions = ['us-east-1', 'us-east-2', 'eu-west-1', 'eu-central-1', 'ap-southeast-1', 'sa-east-1']
+        result = calculate_region_layout('10.0.0.0/13', 'aws', regions, ['public', 'private', 'data'], 3)
+        self.assertNotIn('error', result)
+        self.assertEqual(len(result['regions']), 6)
+
+        offsets = None
+        all_subnets = []
+        for region in result['regions']:
+            block = ipaddress.ip_network(region['cidr'])
+            self.assertEqual(block.prefixlen, 16)
+            self.assertEqual(len(region['subnets']), 9)
+            region_offsets = []
+            for subnet in region['subnets']:
+                network = ipaddress.ip_network(subnet['cidr'])
+                self.assertTrue(network.subnet_of(block))
+                self.assertTrue(subnet['availabilityZone'].startswith(region['region']))
+                region_offsets.append(int(network.network_address) - int(block.network_address))
+                all_subnets.append(network)
+            offsets = offsets or region_offsets
+            self.assertEqual(region_offsets, offsets)
+
+        for i, a in enumerate(all_subnets):
+            for b in all_subnets[i + 1:]:
+                self.assertFalse(a.overlaps(b))
+
+        first = result['regions'][0]['subnets']
+        self.assertEqual(first[0]['name'], 'public-us-east-1a')
+        self.assertEqual(first[0]['cidr'], '10.0.0.0/20')
+        self.assertEqual(first[3]['tier'], 'private')
+        self.assertEqual(first[3]['cidr'], '10.0.64.0/20')
+        self.assertEqual(first[4]['zoneIndex'], 1)
+
+    def test_layout_errors(self):
+        """Test region layout validation"""
+        self.assertIn('error', calculate_region_layout('10.0.0.0/16', 'aws', ['us-west-1'], ['app'], 3))
+        self.assertIn('error', calculate_region_layout('10.0.0.0/16', 'azure', ['westus'], ['app']))
+        self.assertIn('error', calculate_region_layout('10.0.0.0/26', 'aws', ['us-east-1'], ['a', 'b', 'c']))
+        self.assertIn('error', calculate_region_layout('10.0.0.0/16', 'aws', ['us-east-1', 'us-east-1'], ['a']))
+
+
+class TestPlanLimits(unittest.TestCase):
+    """Test plans are checked against provider quotas"""
+
+    def test_plan_within_limits(self):
+        """Test a small plan has no violations"""
+        result = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'azure')
+        self.assertEqual(validate_plan_limits(result, 'azure'), [])
+
+    def test_all_violations_reported(self):
+        """Test every violation is returned in one pass"""
+        spoke_cidrs = [f'10.{i}.0.0/16' for i in range(1, 31)]
+        result = generate_topology('mesh', '10.0.0.0/16', 2, spoke_cidrs, [2] * 30, 'gcp')
+        violations = validate_plan_limits(result, 'gcp')
+
+        by_limit = {}
+        for violation in violations:
+            by_limit.setdefault(violation['limit'], []).append(violation)
+        self.assertEqual(len(by_limit['networks']), 1)
+        self.assertEqual(by_limit['networks'][0]['value'], 31)
+        self.assertEqual(len(by_limit['peerings_per_network']), 31)
+        self.assertEqual(by_limit['peerings_per_network'][0]['network'], 'hub')
+        self.assertEqual(by_limit['peerings_per_network'][0]['max'], 25)
+
+    def test_quota_overrides_and_batches(self):
+        """Test raised quotas and batch validation"""
+        big = calculate_subnets('10.0.0.0/8', 256, 'aws')
+        small = calculate_subnets('10.0.0.0/16', 4, 'aws')
+        self.assertEqual(validate_plan_limits(big, 'aws', {'subnets_per_network': 256}), [])
+
+        violations = validate_plans([small, big, small, big], 'aws')
+        self.assertEqual([v['plan'] for v in violations], [1, 3])
+        self.assertEqual(violations[0]['limit'], 'subnets_per_network')
+
+    def test_transit_gateway_routes(self):
+        """Test transit gateway attachments count against route table size"""
+        spoke_cidrs = [f'10.{i}.0.0/16' for i in range(1, 51)]
+        result = generate_topology('transit-gateway', '10.0.0.0/16', 1, spoke_cidrs, [1] * 50, 'aws')
+        violations = validate_plan_limits(result, 'aws', {'networks': 100})
+        self.assertEqual(len(violations), 51)
+        self.assertTrue(all(v['limit'] == 'routes_per_route_table' for v in violations))
+
+
+class TestPlanCache(unittest.TestCase):
+    """Test memoized, read-only plans"""
+
+    def setUp(self):
+        clear_plan_cache()
+
+    def test_equivalent_calls_share_plan(self):
+        """Test normalized arguments hit the same cached plan"""
+        first = calculate_subnets('10.0.0.0/16', 4, 'azure')
+        self.assertIs(calculate_subnets('10.0.5.7/16', 4, 'Azure'), first)
+        self.assertIs(calculate_subnets('10.0.0.0/16', 4, 'azure', 0), first)
+        self.assertEqual(plan_cache_info()['subnets']['hits'], 2)
+
+    def test_hub_plan_shared_across_spoke_variants(self):
+        """Test the hub plan is computed once for different spoke sets"""
+        a = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'azure')
+        b = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.2.0.0/16'], [2], 'azure')
+        self.assertIs(a['hub']['subnets'], b['hub']['subnets'])
+        self.assertIs(generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'azure'), a)
+
+    def test_results_are_read_only(self):
+        """Test cached plans cannot be modified in place"""
+        result = calculate_subnets('10.0.0.0/16', 2, 'aws')
+        self.assertIsInstance(result['subnets'], list)
+        with self.assertRaises(TypeError):
+            result['subnets'].append({})
+        with self.assertRaises(TypeError):
+            result['subnets'][0]['cidr'] = '10.9.0.0/24'
+        with self.assertRaises(TypeError):
+            result.update(error='x')
+
+        editable = thaw(result)
+        editable['subnets'][0]['name'] = 'web'
+        self.assertEqual(result['subnets'][0]['name'], 'subnet1')
+
+    def test_results_copy_and_pickle(self):
+        """Test frozen plans survive deepcopy, pickle and JSON round trips"""
+        result = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'gcp')
+        self.assertIs(copy.deepcopy(result), result)
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+        self.assertEqual(json.loads(json.dumps(result)), thaw(result))
+
+
 class TestNetworkInfo(unittest.TestCase):
     """Test network info calculation"""
 
@@ -261,6 +523,16 @@ class TestNetworkInfo(unittest.TestCase):
 
         self.assertEqual(info['usable_ips'], 254)  # 256 - 2 standard reserved
 
+    def test_prefix_tables(self):
+        """Test the precomputed prefix and reserved offset tables"""
+        for prefix in range(33):
+            network = ipaddress.ip_network(f'0.0.0.0/{prefix}')
+            self.assertEqual(PREFIX_NETMASKS[prefix], str(network.netmask))
+            self.assertEqual(PREFIX_SIZES[prefix], network.num_addresses)
+        self.assertEqual(RESERVED_OFFSETS['azure'], (3, 2))
+        self.assertEqual(RESERVED_OFFSETS['oracle'], (2, 1))
+        self.assertEqual(RESERVED_OFFSETS['onpremises'], (1, 1))
+
 
 class TestOutputFormats(unittest.TestCase):
     """Test output format generation"""
@@ -295,6 +567,33 @@ class TestOutputFormats(unittest.TestCase):
         parsed = json.loads(json_str)
         self.assertEqual(len(parsed['subnets']), 2)
 
+    def test_environments_share_one_module(self):
+        """Test environments render one module and a tfvars file each"""
+        plans = {
+            name: build_plan('azure', cidr, calculate_subnets(cidr, 2, 'azure'), 'app')
+            for name, cidr in (('dev', '10.0.0.0/16'), ('prod', '10.1.0.0/16'))
+        }
+        files = render_environments('azure', plans, 'app')
+        self.assertEqual(list(files), ['main.tf', 'environments/dev.tfvars.json', 'environments/prod.tfvars.json'])
+        self.assertNotIn('10.0.0.0', files['main.tf'])
+        self.assertEqual(json.loads(files['environments/prod.tfvars.json']), {
+            'prefix': 'app-prod',
+            'vnet_cidr': '10.1.0.0/16',
+            'subnets': {'10-1-0-0-17': '10.1.0.0/17', '10-1-128-0-17': '10.1.128.0/17'},
+        })
+
+    def test_check_outputs(self):
+        """Test every format is checked against the plan without rendering it"""
+        result = generate_topology('transit-gateway', '10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'aws')
+        plan = build_plan('aws', '10.0.0.0/16', result, 'app')
+        check_outputs(plan, ['info', 'json', 'terraform', 'cloudformation'])
+        with self.assertRaises(ValueError):
+            check_outputs(plan, ['terraform', 'terraform-json'])
+        with self.assertRaises(ValueError):
+            check_outputs(plan, ['cloudformation', 'cloudformation-json'])
+        with self.assertRaises(ValueError):
+            check_outputs(plan, ['terraform'], compact=True)
+
 
 class TestEdgeCases(unittest.TestCase):
     """Test edge cases and boundary conditions"""
@@ -0,0 +1,44 @@
+"""Unit tests for JSON document serialization."""
+
+import sys
+import os
+import json
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import json_output
+from json_output import dumps, minify
+
+DOCUMENT = {
+    "resources": [{"name": "[concat(parameters('prefix'), '-vnet')]", "count": 3, "enabled": True}],
+    "outputs": {},
+    "tags": ["Zürich", None, 0.5],
+}
+
+
+class TestDumps(unittest.TestCase):
+
+    def test_pretty(self):
+        self.assertEqual(dumps(DOCUMENT), json.dumps(DOCUMENT, indent=2, ensure_ascii=False) + '\n')
+
+    def test_minified(self):
+        self.assertEqual(dumps(DOCUMENT, minify=True), json.dumps(DOCUMENT, separators=(',', ':'), ensure_ascii=False))
+
+    def test_json_fallback_matches_orjson(self):
+        texts = dumps(DOCUMENT), dumps(DOCUMENT, minify=True)
+        available = json_output.ORJSON_AVAILABLE
+        json_output.ORJSON_AVAILABLE = False
+        try:
+            self.assertEqual((dumps(DOCUMENT), dumps(DOCUMENT, minify=True)), texts)
+        finally:
+            json_output.ORJSON_AVAILABLE = available
+
+    def test_minify_text(self):
+        self.assertEqual(minify(dumps(DOCUMENT)), dumps(DOCUMENT, minify=True))
+        with self.assertRaises(ValueError):
+            minify('{"resources": [')
+
+
+if __name__ == '__main__':
+    unittest.main()
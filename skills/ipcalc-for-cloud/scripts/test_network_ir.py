@@ -0,0 +1,103 @@
+"""Unit tests for the network plan IR."""
+
+import sys
+import os
+import json
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from ipcalc import (
+    calculate_region_layout, calculate_subnets, generate_hub_spoke_topology, generate_topology, render_outputs
+)
+from network_ir import build_plan, plan_networks
+from route_tables import build_route_tables
+
+
+class TestBuildPlan(unittest.TestCase):
+
+    def test_single_network(self):
+        result = calculate_subnets('10.0.0.0/24', 2, 'aws')
+        plan = build_plan('aws', '10.0.0.0/24', result, 'app')
+        self.assertEqual(len(plan.networks), 1)
+        self.assertEqual([s.cidr for s in plan.hub.subnets], ['10.0.0.0/25', '10.0.0.128/25'])
+        self.assertEqual(plan.peerings, ())
+        self.assertEqual(plan.json_data(), {
+            "vnetCidr": '10.0.0.0/24', "provider": 'aws', "subnets": result["subnets"], "peeringEnabled": False
+        })
+        data = plan.template_data()
+        self.assertEqual((data["vpcCidr"], data["namePrefix"]), ('10.0.0.0/24', 'app'))
+        self.assertNotIn("spokeVPCs", data)
+
+    def test_hub_spoke(self):
+        result = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16', '10.2.0.0/16'], [2, 1], 'azure')
+        plan = build_plan('azure', '10.0.0.0/16', result)
+        self.assertEqual([n.cidr for n in plan.spokes], ['10.1.0.0/16', '10.2.0.0/16'])
+        self.assertEqual([(p.a, p.b) for p in plan.peerings], [(0, 1), (0, 2)])
+        data = plan.json_data()
+        self.assertEqual(data["spokeVNets"], result["spokes"])
+        self.assertTrue(data["peeringEnabled"])
+        self.assertNotIn("topology", data)
+
+    def test_transit_gateway_with_routes(self):
+        result = generate_topology('transit-gateway', '10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'aws')
+        result = dict(result, routeTables=build_route_tables(result))
+        plan = build_plan('aws', '10.0.0.0/16', result)
+        self.assertEqual(plan.transit_gateway, (0, 1))
+        self.assertEqual(plan.route_tables(), result["routeTables"])
+        data = plan.template_data()
+        self.assertEqual(data["topology"], 'transit-gateway')
+        self.assertEqual(data["transitGateway"], {"attachments": [0, 1]})
+        self.assertEqual(data["routeTables"], result["routeTables"])
+
+    def test_error_result(self):
+        with self.assertRaises(ValueError):
+            build_plan('azure', '10.0.0.0/30', calculate_subnets('10.0.0.0/30', 4, 'azure'))
+
+
+class TestRenderOutputs(unittest.TestCase):
+
+    def test_formats_from_one_plan(self):
+        result = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'gcp')
+        plan = build_plan('gcp', '10.0.0.0/16', result)
+        outputs = render_outputs(plan, ['terraform', 'json', 'gcloud', 'info'])
+        self.assertEqual(list(outputs), ['terraform', 'json', 'gcloud', 'info'])
+        self.assertEqual(json.loads(outputs["json"])["spokeVPCs"][0]["cidr"], '10.1.0.0/16')
+        self.assertIn('google_compute_network_peering', outputs["terraform"])
+        self.assertEqual(outputs["gcloud"], render_outputs(plan, ['gcloud'])["gcloud"])
+
+    def test_missing_template(self):
+        plan = build_plan('aws', '10.0.0.0/24', calculate_subnets('10.0.0.0/24', 2, 'aws'))
+        with self.assertRaises((FileNotFoundError, NotImplementedError)):
+            render_outputs(plan, ['bicep'])
+
+
+class TestPlanNetworks(unittest.TestCase):
+
+    def test_single_network(self):
+        result = calculate_subnets('10.0.0.0/24', 2, 'aws')
+        [network] = plan_networks(result, '10.0.0.0/24')
+        self.assertEqual(network[:3], (0, 'network', '10.0.0.0/24'))
+        self.assertEqual(network.subnets, result['subnets'])
+
+    def test_calculation_and_document_agree(self):
+        result = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16', '10.2.0.0/16'], [2, 2], 'azure')
+        document = build_plan('azure', '10.0.0.0/16', result).json_data()
+        expected = [(0, 'hub', '10.0.0.0/16'), (1, 'spoke1', '10.1.0.0/16'), (2, 'spoke2', '10.2.0.0/16')]
+        for plan in (result, document):
+            self.assertEqual([network[:3] for network in plan_networks(plan)], expected)
+
+    def test_locations(self):
+        result = generate_topology('multi-hub', '10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'azure',
+                                   hub_cidrs=['10.100.0.0/16'], hub_locations=['westeurope'])
+        self.assertEqual([network.location for network in plan_networks(result)], [None, None, 'westeurope'])
+
+    def test_region_layout(self):
+        layout = calculate_region_layout('10.0.0.0/15', 'aws', ['us-east-1', 'eu-west-1'], ['web'])
+        networks = plan_networks(layout)
+        self.assertEqual([(n.position, n.label, n.location) for n in networks],
+                         [(0, 'us-east-1', 'us-east-1'), (0, 'eu-west-1', 'eu-west-1')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Unit tests for incremental output directory writes."""
+
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from output_dir import MANIFEST_NAME, content_hash, load_manifest, write_directory
+
+FILES = {
+    'main.tf': 'resource "aws_vpc" "vpc" {}\n',
+    'stacks/subnets-1.yaml': 'Resources: {}\n',
+}
+
+
+class TestWriteDirectory(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self._tmp.name, 'out')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _path(self, relative_path):
+        return os.path.join(self.directory, *relative_path.split('/'))
+
+    def test_first_run_writes_files_and_manifest(self):
+        written, unchanged = write_directory(FILES, self.directory)
+        self.assertEqual((written, unchanged), (list(FILES), []))
+        for relative_path, content in FILES.items():
+            with open(self._path(relative_path)) as f:
+                self.assertEqual(f.read(), content)
+        self.assertEqual(load_manifest(self.directory), {
+            relative_path: content_hash(content.encode()) for relative_path, content in FILES.items()
+        })
+
+    def test_unchanged_files_are_not_written(self):
+        write_directory(FILES, self.directory)
+        stats = {p: os.stat(self._path(p)) for p in list(FILES) + [MANIFEST_NAME]}
+        written, unchanged = write_directory(FILES, self.directory)
+        self.assertEqual((written, unchanged), ([], list(FILES)))
+        for relative_path, stat in stats.items():
+            after = os.stat(self._path(relative_path))
+            self.assertEqual((after.st_ino, after.st_mtime_ns), (stat.st_ino, stat.st_mtime_ns))
+
+    def test_changed_file_is_replaced(self):
+        write_directory(FILES, self.directory)
+        changed = dict(FILES, **{'main.tf': 'resource "aws_vpc" "main" {}\n'})
+        written, unchanged = write_directory(changed, self.directory)
+        self.assertEqual((written, unchanged), (['main.tf'], ['stacks/subnets-1.yaml']))
+        with open(self._path('main.tf')) as f:
+            self.assertEqual(f.read(), changed['main.tf'])
+        self.assertEqual(load_manifest(self.directory)['main.tf'], content_hash(changed['main.tf'].encode()))
+        self.assertEqual(sorted(os.listdir(self.directory)), sorted([MANIFEST_NAME, 'main.tf', 'stacks']))
+
+    def test_deleted_file_is_rewritten(self):
+        write_directory(FILES, self.directory)
+        os.remove(self._path('main.tf'))
+        self.assertEqual(write_directory(FILES, self.directory)[0], ['main.tf'])
+
+    def test_unreadable_manifest_rewrites_everything(self):
+        write_directory(FILES, self.directory)
+        with open(self._path(MANIFEST_NAME), 'w') as f:
+            f.write('{')
+        self.assertEqual(write_directory(FILES, self.directory)[0], list(FILES))
+        with open(self._path(MANIFEST_NAME)) as f:
+            self.assertEqual(json.load(f)['algorithm'], 'sha256')
+
+
+if __name__ == '__main__':
+    unittest.main()
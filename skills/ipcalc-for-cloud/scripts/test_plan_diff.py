@@ -0,0 +1,104 @@
+"""Unit tests for the plan diff."""
+
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from plan_diff import diff_files, diff_plans, has_changes, load_plan
+
+
+def _plan(cidr, subnets, spokes=()):
+    """JSON plan as written by ipcalc.py --output json (only the fields the diff reads)."""
+    plan = {"vnetCidr": cidr, "subnets": [{"cidr": c, "name": f"subnet{i}"} for i, c in enumerate(subnets, 1)]}
+    if spokes:
+        plan["spokeVNets"] = [
+            {"cidr": spoke_cidr, "index": idx,
+             "subnets": [{"cidr": c, "name": f"subnet{i}"} for i, c in enumerate(spoke_subnets, 1)]}
+            for idx, (spoke_cidr, spoke_subnets) in enumerate(spokes, 1)
+        ]
+    return plan
+
+
+class TestDiffPlans(unittest.TestCase):
+
+    def test_identical(self):
+        plan = _plan('10.0.0.0/24', ['10.0.0.0/25', '10.0.0.128/25'])
+        diff = diff_plans(plan, plan)
+        self.assertFalse(has_changes(diff))
+        self.assertEqual(diff["unchanged"], 2)
+        self.assertEqual(diff["released"], [])
+        self.assertEqual(diff["conflicts"], [])
+
+    def test_change_kinds(self):
+        old = _plan('10.0.0.0/24', ['10.0.0.0/26', '10.0.0.64/26', '10.0.0.128/26'])
+        new = _plan('10.0.0.0/24', ['10.0.0.0/26', '10.0.0.192/26', '10.0.0.64/27', '10.0.0.96/27'])
+        diff = diff_plans(old, new)
+        self.assertEqual(diff["unchanged"], 1)
+        self.assertEqual(diff["renumbered"], [
+            {"network": "network", "name": "subnet2", "old": '10.0.0.64/26', "new": '10.0.0.192/26'}
+        ])
+        self.assertEqual(diff["resized"], [
+            {"network": "network", "name": "subnet3", "old": '10.0.0.128/26', "new": '10.0.0.64/27'}
+        ])
+        self.assertEqual(diff["added"], [{"network": "network", "name": "subnet4", "cidr": '10.0.0.96/27'}])
+        self.assertEqual(diff["removed"], [])
+        self.assertEqual(diff["released"], ['10.0.0.128/26'])
+        self.assertEqual(diff["allocated"], ['10.0.0.192/26'])
+        # subnet3 and subnet4 now use the old subnet2 range
+        self.assertEqual([c["name"] for c in diff["conflicts"]], ['subnet3', 'subnet4'])
+
+    def test_spokes(self):
+        old = _plan('10.0.0.0/24', ['10.0.0.0/24'], [('10.1.0.0/24', ['10.1.0.0/24']),
+                                                      ('10.2.0.0/24', ['10.2.0.0/24'])])
+        new = _plan('10.0.0.0/24', ['10.0.0.0/24'], [('10.1.0.0/23', ['10.1.0.0/24', '10.1.1.0/24'])])
+        diff = diff_plans(old, new)
+        self.assertEqual(diff["networks"], [
+            {"network": "spoke1", "old": '10.1.0.0/24', "new": '10.1.0.0/23'},
+            {"network": "spoke2", "old": '10.2.0.0/24', "new": None},
+        ])
+        self.assertEqual(diff["added"], [{"network": "spoke1", "name": "subnet2", "cidr": '10.1.1.0/24'}])
+        self.assertEqual(diff["removed"], [{"network": "spoke2", "name": "subnet1", "cidr": '10.2.0.0/24'}])
+        self.assertEqual(diff["released"], ['10.2.0.0/24'])
+        self.assertEqual(diff["allocated"], ['10.1.1.0/24'])
+
+    def test_hub_matches_single_network(self):
+        old = _plan('10.0.0.0/24', ['10.0.0.0/24'])
+        new = _plan('10.0.0.0/24', ['10.0.0.0/24'], [('10.1.0.0/24', ['10.1.0.0/24'])])
+        diff = diff_plans(old, new)
+        self.assertEqual(diff["unchanged"], 1)
+        self.assertEqual(len(diff["added"]), 1)
+
+    def test_large_plans(self):
+        old = _plan('10.0.0.0/8', [f'10.{i >> 8}.{i & 255}.0/24' for i in range(20000)])
+        new = _plan('10.0.0.0/8', [f'10.{i >> 8}.{i & 255}.0/24' for i in range(1, 20001)])
+        diff = diff_plans(old, new)
+        self.assertEqual(len(diff["renumbered"]), 20000)
+        self.assertEqual(diff["released"], ['10.0.0.0/24'])
+        self.assertEqual(diff["allocated"], ['10.78.32.0/24'])
+
+
+class TestFiles(unittest.TestCase):
+
+    def test_load_and_diff_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            old_path = os.path.join(tmp, 'old.json')
+            new_path = os.path.join(tmp, 'new.json')
+            bad_path = os.path.join(tmp, 'bad.json')
+            with open(old_path, 'w') as f:
+                json.dump(_plan('10.0.0.0/24', ['10.0.0.0/25']), f)
+            with open(new_path, 'w') as f:
+                json.dump(_plan('10.0.0.0/24', ['10.0.0.0/25', '10.0.0.128/25']), f)
+            with open(bad_path, 'w') as f:
+                f.write('variable "x" {}')
+
+            self.assertEqual(len(diff_files(old_path, new_path)["added"]), 1)
+            with self.assertRaises(ValueError):
+                load_plan(bad_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
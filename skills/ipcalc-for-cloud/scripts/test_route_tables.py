@@ -0,0 +1,124 @@
+"""Unit tests for summarized route tables."""
+
+import sys
+import os
+import json
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from ipcalc import generate_hub_spoke_topology, generate_topology
+from plan_limits import validate_plan_limits
+from route_tables import TRANSIT_GATEWAY_HOP, build_route_tables, route_table_entries, summarize_prefixes
+from template_processor import process_template
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+
+SPOKES = ['10.2.0.0/16', '10.3.0.0/16', '10.4.0.0/16']
+
+
+def _template_data(plan, provider):
+    spokes_key = 'spokeVNets' if provider == 'azure' else 'spokeVPCs'
+    return {
+        "vnetCidr": plan["hub"]["cidr"],
+        "vpcCidr": plan["hub"]["cidr"],
+        "subnets": plan["hub"]["subnets"],
+        "peeringEnabled": True,
+        "namePrefix": "test",
+        spokes_key: plan["spokes"],
+        "routeTables": plan["routeTables"],
+    }
+
+
+class TestSummaries(unittest.TestCase):
+
+    def test_summarize_prefixes(self):
+        self.assertEqual(summarize_prefixes(SPOKES), ['10.2.0.0/15', '10.4.0.0/16'])
+        self.assertEqual(summarize_prefixes(['10.0.1.0/24', '10.0.0.0/24', '10.0.0.0/23']), ['10.0.0.0/23'])
+        self.assertEqual(summarize_prefixes([]), [])
+
+
+class TestHubSpoke(unittest.TestCase):
+
+    def setUp(self):
+        self.plan = generate_hub_spoke_topology('10.0.0.0/16', 3, SPOKES, [2, 2, 2], 'azure')
+
+    def test_hub_and_spoke_routes(self):
+        tables = build_route_tables(self.plan)
+        self.assertEqual(tables["nextHop"], '10.0.0.3')
+        hub, spoke1, spoke2, spoke3 = tables["networks"]
+        self.assertEqual(hub, {"routes": ['10.2.0.0/15', '10.4.0.0/16'], "subnets": [2, 3]})
+        self.assertEqual(spoke1["routes"], ['10.3.0.0/16', '10.4.0.0/16'])
+        self.assertEqual(spoke2["routes"], ['10.2.0.0/16', '10.4.0.0/16'])
+        self.assertEqual(spoke3["routes"], ['10.2.0.0/15'])
+        self.assertEqual(spoke3["subnets"], [1, 2])
+
+    def test_single_spoke(self):
+        plan = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'azure')
+        entries = route_table_entries(build_route_tables(plan, '10.0.0.10'))
+        self.assertEqual(entries, [(0, ['10.1.0.0/16'], [2])])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            build_route_tables(self.plan, '10.9.0.1')
+        with self.assertRaises(ValueError):
+            build_route_tables(self.plan, 'not-an-ip')
+        mesh = generate_topology('mesh', '10.0.0.0/16', 2, SPOKES, [2, 2, 2], 'azure')
+        with self.assertRaises(ValueError):
+            build_route_tables(mesh)
+        with self.assertRaises(ValueError):
+            build_route_tables({"hub": self.plan["hub"], "spokes": []})
+
+
+class TestTransitGateway(unittest.TestCase):
+
+    def test_routes_to_gateway(self):
+        plan = generate_topology('transit-gateway', '10.0.0.0/16', 1, SPOKES, [1, 1, 1], 'aws')
+        tables = build_route_tables(plan)
+        self.assertEqual(tables["nextHop"], TRANSIT_GATEWAY_HOP)
+        self.assertEqual(tables["networks"][0]["routes"], ['10.2.0.0/15', '10.4.0.0/16'])
+        self.assertEqual(tables["networks"][1]["routes"], ['10.0.0.0/16', '10.3.0.0/16', '10.4.0.0/16'])
+        with self.assertRaises(ValueError):
+            build_route_tables(plan, '10.0.0.10')
+
+    def test_summaries_relieve_route_limits(self):
+        spoke_cidrs = [f'10.{i}.0.0/16' for i in range(1, 51)]
+        plan = generate_topology('transit-gateway', '10.0.0.0/16', 1, spoke_cidrs, [1] * 50, 'aws')
+        plan = dict(plan, routeTables=build_route_tables(plan))
+        self.assertEqual(validate_plan_limits(plan, 'aws', {'networks': 100}), [])
+
+        violations = validate_plan_limits(plan, 'aws', {'networks': 100, 'routes_per_route_table': 6})
+        self.assertTrue(violations)
+        self.assertTrue(all(v['limit'] == 'routes_per_route_table' for v in violations))
+
+
+class TestTemplates(unittest.TestCase):
+
+    def setUp(self):
+        plan = generate_hub_spoke_topology('10.0.0.0/16', 3, SPOKES, [2, 2, 2], 'azure')
+        self.data = _template_data(dict(plan, routeTables=build_route_tables(plan)), 'azure')
+
+    def test_azure_terraform(self):
+        output = process_template('azure', 'terraform', self.data, TEMPLATES_DIR)
+        self.assertIn('azurerm_route_table', output)
+        self.assertIn('azurerm_subnet_route_table_association', output)
+        self.assertIn('10.2.0.0/15', output)
+
+    def test_azure_arm_is_valid_json(self):
+        output = process_template('azure', 'arm', self.data, TEMPLATES_DIR)
+        template = json.loads(output)
+        types = [resource['type'] for resource in template['resources']]
+        self.assertIn('Microsoft.Network/routeTables', types)
+        hub = next(r for r in template['resources'] if r['type'] == 'Microsoft.Network/virtualNetworks')
+        self.assertIn('dependsOn', hub)
+
+    def test_gcp_terraform(self):
+        plan = generate_hub_spoke_topology('10.0.0.0/16', 2, SPOKES, [1, 1, 1], 'gcp')
+        data = _template_data(dict(plan, routeTables=build_route_tables(plan)), 'gcp')
+        output = process_template('gcp', 'terraform', data, TEMPLATES_DIR)
+        self.assertIn('google_compute_route', output)
+        self.assertIn('export_custom_routes', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Unit tests for the IP-to-subnet lookup index."""
+
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import subnet_lookup
+from subnet_lookup import NO_MATCH, SubnetLookup, parse_ipv4_addresses
+from ipcalc import calculate_region_layout, calculate_subnets, generate_hub_spoke_topology
+
+
+class TestSubnetLookup(unittest.TestCase):
+    """Single-address lookups."""
+
+    def setUp(self):
+        self.plan = generate_hub_spoke_topology(
+            '10.0.0.0/16', 3, ['10.2.0.0/16', '10.1.0.0/16'], [2, 2], 'azure'
+        )
+        self.index = SubnetLookup(self.plan)
+
+    def test_subnet_match(self):
+        result = self.index.lookup('10.1.200.1')
+        self.assertTrue(result['matched'])
+        self.assertEqual(result['subnet'], '10.1.128.0/17')
+        self.assertEqual(result['network'], 'spoke2')
+        self.assertEqual(result['networkCidr'], '10.1.0.0/16')
+        self.assertEqual(result['zone'], '2')
+
+    def test_boundaries(self):
+        self.assertEqual(self.index.lookup('10.0.0.0')['subnet'], '10.0.0.0/18')
+        self.assertEqual(self.index.lookup('10.0.63.255')['subnet'], '10.0.0.0/18')
+        self.assertEqual(self.index.lookup('10.0.64.0')['subnet'], '10.0.64.0/18')
+
+    def test_network_without_subnet(self):
+        self.assertEqual(
+            self.index.lookup('10.0.250.1'),
+            {'ip': '10.0.250.1', 'matched': False, 'network': 'hub', 'networkCidr': '10.0.0.0/16'}
+        )
+        self.assertEqual(self.index.lookup('8.8.8.8'), {'ip': '8.8.8.8', 'matched': False})
+
+    def test_region_layout(self):
+        layout = calculate_region_layout('10.0.0.0/12', 'aws', ['us-east-1', 'eu-west-1'], ['public', 'private'])
+        result = SubnetLookup(layout).lookup(layout['regions'][1]['subnets'][0]['first_usable'])
+        self.assertEqual(result['network'], 'eu-west-1')
+        self.assertEqual(result['zone'], 'eu-west-1a')
+
+    def test_overlapping_networks(self):
+        plan = {"hub": {"cidr": '10.0.0.0/16', "subnets": []},
+                "spokes": [{"cidr": '10.0.0.0/17', "subnets": []}]}
+        with self.assertRaises(ValueError):
+            SubnetLookup(plan)
+
+    def test_invalid_address(self):
+        with self.assertRaises(ValueError):
+            self.index.lookup('10.0.0.256')
+
+
+class TestBulkClassification(unittest.TestCase):
+    """Vectorized and per-address classification agree."""
+
+    def setUp(self):
+        self.index = SubnetLookup(calculate_subnets('10.0.0.0/16', 3, 'aws'), '10.0.0.0/16')
+        self.lines = ['10.0.0.1', '10.0.191.255', '10.0.192.0', '', 'bogus', '172.16.0.1', '10.0.64.1 ']
+
+    def test_parse(self):
+        addresses, rejected = parse_ipv4_addresses(self.lines)
+        self.assertEqual(len(addresses), 5)
+        self.assertEqual(addresses[0], 0x0A000001)
+        self.assertEqual(rejected, ['bogus'])
+
+    def test_classify_and_summarize(self):
+        addresses, _ = parse_ipv4_addresses(self.lines)
+        expected = [0, 2, NO_MATCH, NO_MATCH, 1]
+        self.assertEqual(list(self.index.classify(addresses)), expected)
+        with mock.patch.object(subnet_lookup, 'NUMPY_AVAILABLE', False):
+            self.assertEqual(self.index.classify(addresses), expected)
+
+        summary = self.index.summarize(self.index.classify(addresses))
+        self.assertEqual(summary['total'], 5)
+        self.assertEqual(summary['unmatched'], 2)
+        self.assertEqual([record['count'] for record in summary['subnets']], [1, 1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
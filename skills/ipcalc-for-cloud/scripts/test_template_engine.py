@@ -0,0 +1,108 @@
+"""Unit tests for the template engine."""
+
+import sys
+import os
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from template_engine import (
+    Template, clear_fragment_cache, compile_template, fragment_cache_info, render_fragments, render_template
+)
+
+
+class TestSyntax(unittest.TestCase):
+
+    def test_expressions(self):
+        self.assertEqual(render_template('a {{ x }} b {{ x * 2 }}%', {"x": 21}), 'a 21 b 42%')
+        self.assertEqual(render_template("{{ d['k'] }}", {"d": {"k": 'v'}}), 'v')
+
+    def test_for(self):
+        source = '{% for i, name in enumerate(names, 1) %}{{i}}={{name}};{% endfor %}'
+        self.assertEqual(render_template(source, {"names": ['a', 'b']}), '1=a;2=b;')
+        self.assertEqual(render_template(source, {"names": []}), '')
+
+    def test_if_elif_else(self):
+        source = '{% if n > 1 %}many{% elif n %}one{% else %}none{% endif %}'
+        self.assertEqual([render_template(source, {"n": n}) for n in (2, 1, 0)], ['many', 'one', 'none'])
+
+    def test_own_line_tags_are_dropped(self):
+        source = 'start\n  {% for i in range(2) %}\nline {{i}}\n  {% endfor %}\nend\n'
+        self.assertEqual(render_template(source, {}), 'start\nline 0\nline 1\nend\n')
+
+    def test_inline_tags_keep_line(self):
+        source = 'x{% if True %}y{% endif %}\nz'
+        self.assertEqual(render_template(source, {}), 'xy\nz')
+
+    def test_comprehension_variables_are_not_context(self):
+        template = Template("{{ ', '.join('s%d' % i for i in range(1, n + 1)) }}")
+        self.assertEqual(template.names, ['n'])
+        self.assertEqual(template.render({"n": 3}), 's1, s2, s3')
+
+
+class TestErrors(unittest.TestCase):
+
+    def test_missing_context(self):
+        with self.assertRaisesRegex(ValueError, 'missing template values: b'):
+            render_template('{{a}}{{b}}', {"a": 1}, 't')
+
+    def test_syntax_error_line(self):
+        with self.assertRaisesRegex(ValueError, r'^t:3: invalid expression'):
+            Template('one\ntwo\n{{ 1 + }}\n', 't')
+        with self.assertRaisesRegex(ValueError, r'^t:2: unclosed for'):
+            Template('x\n{% for i in y %}\n', 't')
+        with self.assertRaisesRegex(ValueError, r'^t:1: unexpected endif'):
+            Template('{% endif %}', 't')
+        with self.assertRaisesRegex(ValueError, 'unknown tag'):
+            Template('{% while x %}', 't')
+
+    def test_no_builtins(self):
+        with self.assertRaises(ValueError):
+            render_template('{{ open }}', {})
+
+    def test_fragment_uses_only_parameters(self):
+        with self.assertRaisesRegex(ValueError, 'fragment uses other which is not one of its parameters'):
+            Template('{% for i in items %}{% fragment i %}{{i}}{{other}}{% endfragment %}{% endfor %}', 't')
+
+
+class TestCaching(unittest.TestCase):
+
+    def setUp(self):
+        clear_fragment_cache()
+
+    def test_compile_once(self):
+        self.assertIs(compile_template('{{x}}', 'a'), compile_template('{{x}}', 'a'))
+        self.assertIsNot(compile_template('{{x}}', 'a'), compile_template('{{x}} ', 'a'))
+
+    def test_fragment_loop(self):
+        source = ('{% for idx, cidr in enumerate(cidrs, 1) %}\n'
+                  '{% fragment idx, cidr=cidr %}\n'
+                  'subnet{{idx}} = {{cidr}}\n'
+                  '{% endfragment %}\n'
+                  '{% endfor %}\n')
+        cidrs = ['10.0.0.0/24', '10.0.1.0/24', '10.0.2.0/24']
+        first = render_template(source, {"cidrs": cidrs})
+        self.assertEqual(first, 'subnet1 = 10.0.0.0/24\nsubnet2 = 10.0.1.0/24\nsubnet3 = 10.0.2.0/24\n')
+        self.assertEqual(fragment_cache_info()["misses"], 3)
+
+        cidrs[1] = '10.0.9.0/24'
+        self.assertIn('subnet2 = 10.0.9.0/24', render_template(source, {"cidrs": cidrs}))
+        info = fragment_cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (2, 4))
+
+    def test_render_fragments(self):
+        calls = []
+
+        def render(a, b):
+            calls.append(a)
+            return f'{a}-{b}'
+
+        self.assertEqual(render_fragments('block', [(1, 'x'), (2, 'y')], render), ['1-x', '2-y'])
+        self.assertEqual(render_fragments('block', [(2, 'y'), (3, 'z')], render), ['2-y', '3-z'])
+        self.assertEqual(calls, [1, 2, 3])
+        self.assertEqual(render_fragments('other', [(1, 'x')], render), ['1-x'])
+        self.assertEqual(calls, [1, 2, 3, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
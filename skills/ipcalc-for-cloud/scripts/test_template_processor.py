@@ -0,0 +1,316 @@
+"""
+Unit tests for the fragment cache, compact layouts, shared Terraform modules, split Terraform roots,
+CloudFormation nested stacks and the deployment region of region layouts.
+"""
+
+import sys
+import os
+import json
+import re
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from cloudformation_json import build_cloudformation_json
+from ipcalc import calculate_region_layout, generate_hub_spoke_topology
+from network_ir import build_plan
+from route_tables import build_route_tables
+from template_engine import clear_fragment_cache, fragment_cache_info
+from template_processor import (
+    cloudformation_stack_ranges, process_cloudformation_nested_stacks, process_template, process_terraform_module,
+    process_terraform_roots, subnet_key, terraform_tfvars
+)
+from terraform_json import build_terraform_json
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+
+
+def _data(subnets, **extra):
+    return dict({"vnetCidr": '10.0.0.0/16', "vpcCidr": '10.0.0.0/16', "namePrefix": "test",
+                 "subnets": [{"cidr": cidr, "name": f"subnet{i}"} for i, cidr in enumerate(subnets, 1)]},
+                **extra)
+
+
+class TestFragmentCache(unittest.TestCase):
+
+    def setUp(self):
+        clear_fragment_cache()
+
+    def test_rerender_hits(self):
+        data = _data([f'10.0.{i}.0/24' for i in range(10)])
+        first = process_template('aws', 'terraform', data, TEMPLATES_DIR)
+        misses = fragment_cache_info()["misses"]
+        self.assertEqual(process_template('aws', 'terraform', data, TEMPLATES_DIR), first)
+        info = fragment_cache_info()
+        self.assertEqual(info["misses"], misses)
+        self.assertEqual(info["hits"], misses)
+
+    def test_changed_subnet_misses_only_its_blocks(self):
+        cidrs = [f'10.0.{i}.0/24' for i in range(10)]
+        process_template('azure', 'terraform', _data(cidrs), TEMPLATES_DIR)
+        before = fragment_cache_info()["misses"]
+        cidrs[4] = '10.0.40.0/24'
+        output = process_template('azure', 'terraform', _data(cidrs), TEMPLATES_DIR)
+        # only the variable block of subnet 5 holds the CIDR; resources and outputs use the variable
+        self.assertEqual(fragment_cache_info()["misses"] - before, 1)
+        self.assertIn('10.0.40.0/24', output)
+        self.assertNotIn('10.0.4.0/24', output)
+
+    def test_name_prefix_not_cached(self):
+        cidrs = ['10.0.0.0/24', '10.0.1.0/24']
+        first = process_template('gcp', 'terraform', _data(cidrs, namePrefix='alpha'), TEMPLATES_DIR)
+        second = process_template('gcp', 'terraform', _data(cidrs, namePrefix='beta'), TEMPLATES_DIR)
+        self.assertIn('alpha', first)
+        self.assertIn('beta', second)
+        self.assertNotIn('alpha', second)
+
+    def test_route_association_is_keyed(self):
+        plan = generate_hub_spoke_topology('10.0.0.0/16', 3, ['10.2.0.0/16'], [2], 'azure')
+        data = _data([s["cidr"] for s in plan["hub"]["subnets"]], peeringEnabled=True, spokeVNets=plan["spokes"])
+        plain = process_template('azure', 'bicep', data, TEMPLATES_DIR)
+        routed = process_template('azure', 'bicep', dict(data, routeTables=build_route_tables(plan)), TEMPLATES_DIR)
+        self.assertNotIn('routeTable:', plain)
+        self.assertIn('routeTable:', routed)
+
+    def test_clear(self):
+        process_template('oracle', 'terraform', _data(['10.0.0.0/24']), TEMPLATES_DIR)
+        self.assertGreater(fragment_cache_info()["size"], 0)
+        clear_fragment_cache()
+        self.assertEqual(fragment_cache_info(), {"hits": 0, "misses": 0, "size": 0,
+                                                 "maxsize": fragment_cache_info()["maxsize"]})
+
+
+class TestCompactLayout(unittest.TestCase):
+
+    RESOURCES = {
+        'azure': 'resource "azurerm_subnet"',
+        'aws': 'resource "aws_subnet"',
+        'gcp': 'resource "google_compute_subnetwork"',
+        'oracle': 'resource "oci_core_subnet"',
+        'alicloud': 'resource "alicloud_vswitch"',
+    }
+
+    def test_one_resource_per_provider(self):
+        data = _data([f'10.0.{i}.0/24' for i in range(50)], compact=True)
+        for provider, resource in self.RESOURCES.items():
+            output = process_template(provider, 'terraform', data, TEMPLATES_DIR)
+            self.assertEqual(output.count(resource), 1, provider)
+            self.assertIn('for_each', output)
+            self.assertIn('"10-0-49-0-24"', output)
+            self.assertNotIn('subnet50', output)
+
+    def test_insert_keeps_keys(self):
+        before = process_template('azure', 'terraform', _data(['10.0.0.0/24', '10.0.2.0/24'], compact=True),
+                                  TEMPLATES_DIR)
+        after = process_template('azure', 'terraform',
+                                 _data(['10.0.0.0/24', '10.0.1.0/24', '10.0.2.0/24'], compact=True), TEMPLATES_DIR)
+        self.assertEqual(set(after.splitlines()) - set(before.splitlines()), {'    "10-0-1-0-24" = "10.0.1.0/24"'})
+
+    def test_hub_spoke(self):
+        plan = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16', '10.2.0.0/16'], [2, 2], 'gcp')
+        data = _data(['10.0.0.0/17', '10.0.128.0/17'], spokeVPCs=plan["spokes"], peeringEnabled=True, compact=True)
+        output = process_template('gcp', 'terraform', data, TEMPLATES_DIR)
+        self.assertEqual(output.count('resource "google_compute_network" "spoke"'), 1)
+        # Peerings stay chained so GCP creates them one at a time
+        self.assertIn('depends_on   = [google_compute_network_peering.spoke-10-1-0-0-16_to_hub]', output)
+
+    def test_route_tables_rejected(self):
+        plan = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16'], [2], 'azure')
+        data = _data(['10.0.0.0/17', '10.0.128.0/17'], spokeVNets=plan["spokes"], peeringEnabled=True,
+                     routeTables=build_route_tables(plan), compact=True)
+        with self.assertRaises(ValueError):
+            process_template('azure', 'terraform', data, TEMPLATES_DIR)
+
+    def test_azure_loops(self):
+        plan = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16', '10.2.0.0/16'], [2, 3], 'azure')
+        small = _data(['10.0.0.0/24'], spokeVNets=plan["spokes"], peeringEnabled=True, compact=True)
+        large = dict(small, subnets=_data([f'10.0.{i}.0/24' for i in range(200)])["subnets"])
+
+        arm = json.loads(process_template('azure', 'arm', large, TEMPLATES_DIR))
+        self.assertEqual(len(arm["resources"]), 4)
+        self.assertEqual(len(arm["parameters"]["subnets"]["defaultValue"]), 200)
+        self.assertEqual(arm["parameters"]["spokeVnets"]["defaultValue"][1]["subnets"][2],
+                         {"name": '10-2-128-0-18', "addressPrefix": '10.2.128.0/18'})
+        self.assertEqual(json.loads(process_template('azure', 'arm', small, TEMPLATES_DIR))["resources"],
+                         arm["resources"])
+
+        bicep = process_template('azure', 'bicep', large, TEMPLATES_DIR)
+        self.assertIn("subnets: [for subnet in subnets: {", bicep)
+        self.assertEqual(bicep.count("\nresource "), 4)
+
+    def test_subnet_key(self):
+        self.assertEqual(subnet_key('172.16.255.128/25'), '172-16-255-128-25')
+
+
+class TestTerraformModule(unittest.TestCase):
+
+    def test_module_has_no_network_defaults(self):
+        for provider in ('azure', 'aws', 'gcp', 'oracle', 'alicloud'):
+            module = process_terraform_module(provider, TEMPLATES_DIR, 'app')
+            self.assertNotIn('default = {', module, provider)
+            self.assertNotIn('{{', module, provider)
+            self.assertIn('for_each = var.', module, provider)
+            self.assertIn('app', module, provider)
+
+    def test_tfvars(self):
+        data = _data(['10.0.1.0/24', '10.0.2.0/24'])
+        self.assertEqual(terraform_tfvars('aws', data, 'app-dev'), {
+            'prefix': 'app-dev',
+            'vpc_cidr': '10.0.0.0/16',
+            'subnets': {'10-0-1-0-24': {'cidr': '10.0.1.0/24', 'zone': 0},
+                        '10-0-2-0-24': {'cidr': '10.0.2.0/24', 'zone': 1}},
+        })
+        self.assertEqual(terraform_tfvars('alicloud', data, 'app-dev')['vswitches']['10-0-2-0-24'],
+                         {'cidr': '10.0.2.0/24', 'zone': 1})
+
+    def test_tfvars_rejects_spokes(self):
+        data = _data(['10.0.1.0/24'], peeringEnabled=True, spokeVNets=[{"cidr": '10.1.0.0/16', "subnets": []}])
+        with self.assertRaises(ValueError):
+            terraform_tfvars('azure', data, 'app-dev')
+
+
+class TestTerraformRoots(unittest.TestCase):
+
+    def _data(self, provider, **extra):
+        result = generate_hub_spoke_topology('10.0.0.0/16', 2, ['10.1.0.0/16', '10.2.0.0/16'], [2, 3], provider)
+        spokes_key = 'spokeVNets' if provider == 'azure' else 'spokeVPCs'
+        return _data([s['cidr'] for s in result['hub']['subnets']], peeringEnabled=True,
+                     **{spokes_key: result['spokes']}, **extra)
+
+    def _blocks(self, code):
+        return set(re.findall(r'^(?:resource|data|output) "[^"]+"(?: "[^"]+")?', code, re.MULTILINE))
+
+    def test_layout_and_hub_root(self):
+        for provider in ('azure', 'gcp'):
+            data = self._data(provider)
+            roots = process_terraform_roots(provider, data, TEMPLATES_DIR)
+            self.assertEqual(list(roots), ['hub/main.tf', 'spokes/spoke1/main.tf', 'spokes/spoke2/main.tf'])
+            hub = process_template(provider, 'terraform', _data([s['cidr'] for s in data['subnets']]), TEMPLATES_DIR)
+            self.assertEqual(roots['hub/main.tf'], hub, provider)
+
+    def test_spoke_roots_keep_single_root_addresses(self):
+        for provider in ('azure', 'gcp'):
+            data = self._data(provider)
+            single = self._blocks(process_template(provider, 'terraform', data, TEMPLATES_DIR))
+            roots = process_terraform_roots(provider, data, TEMPLATES_DIR)
+            for spoke in (1, 2):
+                code = roots[f'spokes/spoke{spoke}/main.tf']
+                self.assertNotIn('{{', code)
+                self.assertIn('test', code)
+                resources = {b for b in self._blocks(code) if b.startswith('resource')}
+                expected = {b for b in single if b.startswith('resource') and re.search(rf'spoke{spoke}[_"]', b)}
+                self.assertEqual(resources, expected, provider)
+
+    def test_hub_is_referenced_through_data_sources(self):
+        azure = process_terraform_roots('azure', self._data('azure'), TEMPLATES_DIR)['spokes/spoke2/main.tf']
+        self.assertIn('remote_virtual_network_id = data.azurerm_virtual_network.vnet.id', azure)
+        self.assertNotRegex(azure, r'(?<!data\.)azurerm_(resource_group|virtual_network)\.(rg|vnet)\b')
+        gcp = process_terraform_roots('gcp', self._data('gcp'), TEMPLATES_DIR)['spokes/spoke1/main.tf']
+        self.assertIn('network      = data.google_compute_network.vpc.self_link', gcp)
+        self.assertNotRegex(gcp, r'(?<!data\.)google_compute_network\.vpc\b')
+
+    def test_rejections(self):
+        with self.assertRaises(ValueError):
+            process_terraform_roots('aws', self._data('azure'), TEMPLATES_DIR)
+        with self.assertRaises(ValueError):
+            process_terraform_roots('azure', _data(['10.0.1.0/24']), TEMPLATES_DIR)
+        with self.assertRaises(ValueError):
+            process_terraform_roots('azure', self._data('azure', topology='mesh', peerings=[[0, 1], [0, 2], [1, 2]]),
+                                    TEMPLATES_DIR)
+        data = self._data('gcp')
+        with self.assertRaises(ValueError):
+            process_terraform_roots('gcp', dict(data, routeTables={"nextHop": '10.0.0.4'}), TEMPLATES_DIR)
+
+
+class TestCloudFormationNestedStacks(unittest.TestCase):
+
+    def _cidrs(self, count):
+        return [f'10.{i // 256}.{i % 256}.0/24' for i in range(count)]
+
+    def test_small_plan_fits_one_template(self):
+        data = _data(self._cidrs(198))
+        self.assertEqual(cloudformation_stack_ranges(data), [])
+        self.assertEqual(process_cloudformation_nested_stacks(data, TEMPLATES_DIR), {})
+        self.assertIn('Subnet198Id:', process_template('aws', 'cloudformation', data, TEMPLATES_DIR))
+
+    def test_split_over_parameter_quota(self):
+        data = _data(self._cidrs(256))
+        self.assertEqual(cloudformation_stack_ranges(data), [(1, 100), (101, 200), (201, 256)])
+        parent = process_template('aws', 'cloudformation', data, TEMPLATES_DIR)
+        self.assertEqual(parent.count('Type: AWS::CloudFormation::Stack'), 3)
+        self.assertNotIn('Subnet1Cidr', parent)
+
+        stacks = process_cloudformation_nested_stacks(data, TEMPLATES_DIR)
+        self.assertEqual(list(stacks), [f'stacks/subnets-{n}.yaml' for n in (1, 2, 3)])
+        self.assertIn('TemplateURL: stacks/subnets-3.yaml', parent)
+        last = stacks['stacks/subnets-3.yaml']
+        self.assertEqual(last.count('Type: AWS::EC2::Subnet'), 56)
+        self.assertIn("Default: '10.0.255.0/24'", last)
+        self.assertIn("Name: !Sub '${ParentStackName}-Subnet256Id'", last)
+        self.assertIn('Default: test', last)
+
+    def test_stack_size(self):
+        data = _data(self._cidrs(256))
+        self.assertEqual(len(cloudformation_stack_ranges(data, max_subnets=50)), 6)
+        self.assertEqual(cloudformation_stack_ranges(data, max_subnets=1000), [(1, 197), (198, 256)])
+
+    def test_transit_gateway_attaches_nested_subnets(self):
+        data = _data(self._cidrs(256), transitGateway={"attachments": [0]})
+        parent = process_template('aws', 'cloudformation', data, TEMPLATES_DIR)
+        self.assertIn('- !GetAtt SubnetStack1.Outputs.Subnet3Id', parent)
+
+
+class TestPlannedRegion(unittest.TestCase):
+
+    @staticmethod
+    def _region_data(provider, region):
+        layout = calculate_region_layout('10.0.0.0/16', provider, [region], ['web'])
+        result = {"subnets": layout["regions"][0]["subnets"], "region": region}
+        return build_plan(provider, layout["regions"][0]["cidr"], result).template_data()
+
+    def test_region_defaults(self):
+        cases = [
+            ('aws', 'eu-west-1', 'terraform', 'default     = "eu-west-1"'),
+            ('aws', 'eu-west-1', 'cli', 'REGION="eu-west-1"'),
+            ('aws', 'eu-west-1', 'cloudformation', "!Equals [!Ref 'AWS::Region', 'eu-west-1']"),
+            ('azure', 'westeurope', 'terraform', 'default     = "westeurope"'),
+            ('azure', 'westeurope', 'bicep', "param location string = 'westeurope'"),
+            ('azure', 'westeurope', 'arm', '"defaultValue": "westeurope"'),
+            ('azure', 'westeurope', 'cli', 'LOCATION="westeurope"'),
+            ('azure', 'westeurope', 'powershell', '$Location = "westeurope"'),
+            ('alicloud', 'eu-central-1', 'terraform', 'default     = "eu-central-1"'),
+            ('alicloud', 'eu-central-1', 'aliyun', 'REGION="eu-central-1"'),
+            ('oracle', 'eu-frankfurt-1', 'terraform', 'default     = "eu-frankfurt-1"'),
+            ('oracle', 'eu-frankfurt-1', 'oci', 'export OCI_CLI_REGION="eu-frankfurt-1"'),
+        ]
+        for provider, region, output_format, expected in cases:
+            with self.subTest(provider=provider, output_format=output_format):
+                data = self._region_data(provider, region)
+                self.assertIn(expected, process_template(provider, output_format, data, TEMPLATES_DIR))
+                if output_format == 'terraform':
+                    self.assertIn(expected, process_template(provider, output_format, dict(data, compact=True),
+                                                             TEMPLATES_DIR))
+
+    def test_json_region(self):
+        self.assertEqual(build_terraform_json('aws', self._region_data('aws', 'eu-west-1'))
+                         ["variable"]["region"]["default"], 'eu-west-1')
+        self.assertEqual(build_terraform_json('azure', self._region_data('azure', 'westeurope'))
+                         ["variable"]["location"]["default"], 'westeurope')
+        self.assertEqual(build_terraform_json('alicloud', self._region_data('alicloud', 'eu-central-1'))
+                         ["variable"]["region"]["default"], 'eu-central-1')
+        oracle = build_terraform_json('oracle', self._region_data('oracle', 'eu-frankfurt-1'))
+        self.assertEqual(oracle["provider"]["oci"], {"region": "${var.region}"})
+        self.assertEqual(oracle["variable"]["region"]["default"], 'eu-frankfurt-1')
+        rule = build_cloudformation_json(self._region_data('aws', 'eu-west-1'))["Rules"]["PlannedRegion"]
+        self.assertEqual(rule["Assertions"][0]["Assert"], {"Fn::Equals": [{"Ref": "AWS::Region"}, 'eu-west-1']})
+
+    def test_default_region_unchanged(self):
+        data = _data(['10.0.0.0/24'])
+        self.assertIn('default     = "us-east-1"', process_template('aws', 'terraform', data, TEMPLATES_DIR))
+        self.assertNotIn('Rules:', process_template('aws', 'cloudformation', data, TEMPLATES_DIR))
+        self.assertNotIn('region', process_template('oracle', 'terraform', data, TEMPLATES_DIR))
+        self.assertNotIn('Rules', build_cloudformation_json(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Unit tests for the Terraform JSON output."""
+
+import sys
+import os
+import json
+import re
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from ipcalc import calculate_subnets, generate_topology, render_outputs
+from network_ir import build_plan
+from terraform_json import build_terraform_json, process_terraform_json
+
+# Blocks of the HCL output: (block type, label, label)
+_HCL_BLOCK = re.compile(r'^(resource|data|variable|output) "([^"]+)"(?: "([^"]+)")?', re.M)
+
+
+def _hcl_blocks(hcl):
+    return {(kind, first, second or '') for kind, first, second in _HCL_BLOCK.findall(hcl)}
+
+
+def _json_blocks(config):
+    blocks = set()
+    for kind in ('resource', 'data'):
+        for block_type, blocks_of_type in config.get(kind, {}).items():
+            blocks.update((kind, block_type, name) for name in blocks_of_type)
+    for kind in ('variable', 'output'):
+        blocks.update((kind, name, '') for name in config.get(kind, {}))
+    return blocks
+
+
+class TestTerraformJson(unittest.TestCase):
+
+    def _plan(self, provider, spokes=None, topology='hub-spoke'):
+        if spokes:
+            result = generate_topology(topology, '10.0.0.0/16', 3, spokes, [2] * len(spokes), provider)
+        else:
+            result = calculate_subnets('10.0.0.0/16', 3, provider)
+        return build_plan(provider, '10.0.0.0/16', result, 'app')
+
+    def test_blocks_match_hcl(self):
+        for provider in ('azure', 'aws', 'gcp', 'oracle', 'alicloud'):
+            with self.subTest(provider=provider):
+                outputs = render_outputs(self._plan(provider), ['terraform', 'terraform-json'])
+                config = json.loads(outputs['terraform-json'])
+                self.assertEqual(_json_blocks(config), _hcl_blocks(outputs['terraform']))
+                self.assertNotIn('myproject', outputs['terraform-json'])
+
+    def test_peerings_match_hcl(self):
+        for provider in ('azure', 'gcp'):
+            for topology in ('hub-spoke', 'mesh'):
+                with self.subTest(provider=provider, topology=topology):
+                    plan = self._plan(provider, ['10.1.0.0/16', '10.2.0.0/16'], topology)
+                    outputs = render_outputs(plan, ['terraform', 'terraform-json'])
+                    config = json.loads(outputs['terraform-json'])
+                    self.assertEqual(_json_blocks(config), _hcl_blocks(outputs['terraform']))
+
+    def test_gcp_peerings_are_chained(self):
+        plan = self._plan('gcp', ['10.1.0.0/16', '10.2.0.0/16'])
+        peerings = build_terraform_json('gcp', plan.template_data())['resource']['google_compute_network_peering']
+        names = list(peerings)
+        self.assertNotIn('depends_on', peerings[names[0]])
+        for previous, name in zip(names, names[1:]):
+            self.assertEqual(peerings[name]['depends_on'], [f'google_compute_network_peering.{previous}'])
+
+    def test_interpolations(self):
+        subnet = build_terraform_json('aws', self._plan('aws').template_data())['resource']['aws_subnet']['subnet2']
+        self.assertEqual(subnet['cidr_block'], '${var.subnet2_cidr}')
+        self.assertEqual(subnet['vpc_id'], '${aws_vpc.vpc.id}')
+
+    def test_route_tables_rejected(self):
+        data = self._plan('azure').template_data()
+        data['routeTables'] = [{'name': 'rt'}]
+        with self.assertRaises(ValueError):
+            build_terraform_json('azure', data)
+
+    def test_unsupported_provider(self):
+        with self.assertRaises(ValueError):
+            build_terraform_json('onpremises', {'subnets': []})
+
+    def test_name_prefix_escaped(self):
+        for provider in ('azure', 'aws', 'gcp', 'oracle', 'alicloud'):
+            with self.subTest(provider=provider):
+                data = self._plan(provider).template_data()
+                data['namePrefix'] = 'a"b\\c'
+                variables = json.loads(process_terraform_json(provider, data))['variable']
+                prefixed = [v['default'] for v in variables.values() if str(v.get('default', '')).startswith('a"b')]
+                self.assertTrue(prefixed)
+                self.assertTrue(all(default.startswith('a"b\\c') for default in prefixed))
+
+    def test_minified(self):
+        data = self._plan('gcp', ['10.1.0.0/16']).template_data()
+        minified = process_terraform_json('gcp', data, minify=True)
+        self.assertNotIn('\n', minified)
+        self.assertEqual(json.loads(minified), json.loads(process_terraform_json('gcp', data)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Network Topology Models
+
+Builds the peering graph for the supported network topologies:
+
+- hub-spoke:        every spoke peers with the primary hub
+- mesh:             every network peers with every other network
+- multi-hub:        regional hubs peer with each other, spokes peer with their hub
+- transit-gateway:  every VPC attaches to one AWS Transit Gateway (no peerings)
+
+Networks are addressed by position: 0 is the primary hub (the VNet/VPC given
+by --cidr) and 1..n are the entries of the spoke list, matching the spoke{n}
+naming used by the template processors. Peerings are returned as (a, b) pairs
+with a < b, each pair exactly once; processors emit both directions.
+"""
+
+import itertools
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Topology name -> providers whose templates can render it
+TOPOLOGIES: Dict[str, Tuple[str, ...]] = {
+    'hub-spoke': ('azure', 'gcp'),
+    'mesh': ('azure', 'gcp'),
+    'multi-hub': ('azure', 'gcp'),
+    'transit-gateway': ('aws',),
+}
+
+# Output formats able to render a topology, where narrower than the provider's outputs
+TOPOLOGY_OUTPUTS: Dict[str, Tuple[str, ...]] = {
+    'transit-gateway': ('info', 'json', 'terraform', 'cloudformation'),
+}
+
+
+def validate_topology(topology: str, provider: str, output_format: Optional[str] = None) -> None:
+    """
+    Validate that a topology can be rendered for a provider and output format.
+
+    Args:
+        topology: Topology name
+        provider: Cloud provider name
+        output_format: Optional output format to check as well
+
+    Raises:
+        ValueError: If the topology is unknown or not supported for the provider/format
+    """
+    if topology not in TOPOLOGIES:
+        available = ', '.join(TOPOLOGIES)
+        raise ValueError(f"Unsupported topology: {topology}. Available topologies: {available}")
+
+    providers = TOPOLOGIES[topology]
+    if provider.lower() not in providers:
+        raise ValueError(
+            f"Topology '{topology}' is only supported for {', '.join(p.upper() for p in providers)}, "
+            f"not {provider}"
+        )
+
+    outputs = TOPOLOGY_OUTPUTS.get(topology)
+    if output_format is not None and outputs is not None and output_format not in outputs:
+        raise ValueError(
+            f"Topology '{topology}' cannot be rendered as {output_format}. "
+            f"Supported: {', '.join(outputs)}"
+        )
+
+
+def hub_spoke_pairs(num_spokes: int) -> List[Tuple[int, int]]:
+    """Peer every spoke (1..num_spokes) with the primary hub (0)."""
+    return [(0, idx) for idx in range(1, num_spokes + 1)]
+
+
+def full_mesh_pairs(num_networks: int) -> List[Tuple[int, int]]:
+    """
+    Peer every network with every other network.
+
+    Args:
+        num_networks: Total number of networks including the primary hub
+
+    Returns:
+        n * (n - 1) / 2 unique (a, b) pairs in lexicographic order
+    """
+    return list(itertools.combinations(range(num_networks), 2))
+
+
+def multi_hub_pairs(hub_of: Sequence[Optional[int]]) -> List[Tuple[int, int]]:
+    """
+    Peer regional hubs with each other and each spoke with its own hub.
+
+    Args:
+        hub_of: For network n (1-based, hub_of[n - 1]) the index of the hub it
+            attaches to, or None if network n is itself a hub
+
+    Returns:
+        Sorted unique (a, b) pairs: a full mesh over the hubs plus one pair per spoke
+    """
+    hubs = [0] + [idx for idx, hub in enumerate(hub_of, 1) if hub is None]
+    pairs = list(itertools.combinations(hubs, 2))
+    for idx, hub in enumerate(hub_of, 1):
+        if hub is not None:
+            pairs.append((min(hub, idx), max(hub, idx)))
+    pairs.sort()
+    return pairs
+
+
+def assign_spokes_to_hubs(num_spokes: int, hub_indices: Sequence[int],
+                          spoke_hubs: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    Map each spoke to the network index of its hub.
+
+    Args:
+        num_spokes: Number of spokes
+        hub_indices: Network indices of all hubs, primary hub (0) first
+        spoke_hubs: Optional 1-based hub number per spoke (1 = primary hub);
+            spokes are distributed round-robin across hubs when omitted
+
+    Returns:
+        Hub network index for each spoke
+
+    Raises:
+        ValueError: If spoke_hubs has the wrong length or references an unknown hub
+    """
+    if spoke_hubs is None:
+        return [hub_indices[idx % len(hub_indices)] for idx in range(num_spokes)]
+
+    if len(spoke_hubs) != num_spokes:
+        raise ValueError("Number of spoke hub assignments must match number of spoke CIDRs")
+
+    assigned = []
+    for hub_number in spoke_hubs:
+        if hub_number < 1 or hub_number > len(hub_indices):
+            raise ValueError(f"Spoke hub assignment {hub_number} is out of range (1-{len(hub_indices)})")
+        assigned.append(hub_indices[hub_number - 1])
+    return assigned
@@ -5,7 +5,7 @@
 # ========================================
 # Variables
 # ========================================
-REGION="cn-hangzhou"
+REGION="{{region}}"
 VPC_NAME="myproject-vpc"
 VPC_CIDR="{{vpcCidr}}"
 
@@ -36,7 +36,63 @@ sleep 5
 # ========================================
 # Create vSwitches
 # ========================================
-{{vSwitchCreation}}
+# Discover available zones dynamically
+ZONE_LIST=$(aliyun vpc DescribeZones \
+  --RegionId "${REGION}" 2>/dev/null | python3 -c '
+import json,sys
+try:
+  d=json.load(sys.stdin)
+  zones=d.get("AvailableZones",{}).get("AvailableZone",[])
+  print("\n".join(z["ZoneId"] for z in zones))
+except: pass
+' 2>/dev/null)
+if [ -z "$ZONE_LIST" ]; then
+  ZONE_LIST=$(aliyun ecs DescribeZones \
+    --RegionId "${REGION}" 2>/dev/null | python3 -c '
+import json,sys
+try:
+  d=json.load(sys.stdin)
+  zones=d.get("Zones",{}).get("Zone",[])
+  print("\n".join(z["ZoneId"] for z in zones))
+except: pass
+' 2>/dev/null)
+fi
+mapfile -t AZ_ARRAY < <(echo "$ZONE_LIST" | grep -v '^$')
+AZ_COUNT=${#AZ_ARRAY[@]}
+if [ "$AZ_COUNT" -eq 0 ]; then
+  echo "Error: No available zones found in region ${REGION}"
+  exit 1
+fi
+echo "Available zones (${AZ_COUNT}): ${AZ_ARRAY[*]}"
+
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'], zone=zone_index(subnet, idx) %}
+ZONE="${AZ_ARRAY[$(( {{zone}} % AZ_COUNT ))]}"  # round-robin zone selection
+echo "Creating vSwitch {{idx}} in ${ZONE}..."
+VSWITCH{{idx}}_ID=$(aliyun vpc CreateVSwitch \
+  --RegionId "${REGION}" \
+  --VpcId "${VPC_ID}" \
+  --ZoneId "${ZONE}" \
+  --CidrBlock "{{cidr}}" \
+  --VSwitchName "${VPC_NAME}-vswitch{{idx}}" \
+  --Description "vSwitch {{idx}}" \
+  2>/dev/null | python3 -c "
+import json,sys
+try:
+  s=sys.stdin.read(); print(json.loads(s).get('VSwitchId','') if s.strip() else '')
+except: print('')
+")
+
+if [ -z "${VSWITCH{{idx}}_ID}" ]; then
+  echo "Error: Failed to create vSwitch {{idx}}"
+  exit 1
+fi
+echo "vSwitch {{idx}} created with ID: ${VSWITCH{{idx}}_ID}"
+sleep 2
+
+{% endfragment %}
+{% endfor %}
+
 echo "Alibaba Cloud VPC and vSwitches created successfully!"
 
 # ========================================
@@ -0,0 +1,160 @@
+# Terraform Configuration for Alibaba Cloud VPC and vSwitches
+# Generated by ipcalc.cloud
+#
+# Compact layout: vSwitches are a map keyed by a name derived from their CIDR
+# and are created with for_each. Adding a vSwitch adds one map entry.
+
+# ========================================
+# Provider Configuration
+# ========================================
+
+terraform {
+  required_providers {
+    alicloud = {
+      source  = "aliyun/alicloud"
+      version = "~> 1.0"
+    }
+  }
+}
+
+provider "alicloud" {
+  region = var.region
+}
+
+# ========================================
+# Variables
+# ========================================
+
+variable "region" {
+  description = "Alibaba Cloud Region"
+  type        = string
+  default     = "{{region}}"
+}
+
+variable "vpc_name" {
+  description = "Name of the VPC"
+  type        = string
+  default     = "myproject-vpc"
+}
+
+variable "vpc_cidr" {
+  description = "CIDR block for the VPC"
+  type        = string
+{% if not module %}
+  default     = "{{networkCidr}}"
+{% endif %}
+}
+
+
+data "alicloud_zones" "available" {
+  available_resource_creation = "VSwitch"
+}
+
+variable "vswitches" {
+  description = "vSwitches keyed by name: CIDR block and zone position"
+  type = map(object({
+    cidr = string
+    zone = number
+  }))
+{% if not module %}
+  default = {
+{% for key, cidr, zone in subnets %}
+    {{key}} = { cidr = "{{cidr}}", zone = {{zone}} }
+{% endfor %}
+  }
+{% endif %}
+}
+
+# ========================================
+# VPC
+# ========================================
+
+resource "alicloud_vpc" "vpc" {
+  vpc_name    = var.vpc_name
+  cidr_block  = var.vpc_cidr
+  description = "VPC created by Terraform"
+
+  tags = {
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+  }
+}
+
+# ========================================
+# vSwitches
+# ========================================
+
+resource "alicloud_vswitch" "vswitch" {
+  for_each = var.vswitches
+
+  vpc_id       = alicloud_vpc.vpc.id
+  cidr_block   = each.value.cidr
+  zone_id      = data.alicloud_zones.available.zones[each.value.zone % length(data.alicloud_zones.available.zones)].id
+  vswitch_name = "${var.vpc_name}-vswitch-${each.key}"
+  description  = "vSwitch ${each.value.cidr}"
+
+  tags = {
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+  }
+}
+
+# ========================================
+# Security Group (Example)
+# ========================================
+
+resource "alicloud_security_group" "sg" {
+  security_group_name = "${var.vpc_name}-sg"
+  description         = "Security group for ${var.vpc_name}"
+  vpc_id      = alicloud_vpc.vpc.id
+
+  tags = {
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+  }
+}
+
+# Allow internal communication
+resource "alicloud_security_group_rule" "allow_internal" {
+  type              = "ingress"
+  ip_protocol       = "all"
+  policy            = "accept"
+  port_range        = "-1/-1"
+  security_group_id = alicloud_security_group.sg.id
+  cidr_ip           = var.vpc_cidr
+}
+
+# ========================================
+# Outputs
+# ========================================
+
+output "vpc_id" {
+  description = "ID of the VPC"
+  value       = alicloud_vpc.vpc.id
+}
+
+output "vpc_name" {
+  description = "Name of the VPC"
+  value       = alicloud_vpc.vpc.vpc_name
+}
+
+output "vpc_cidr" {
+  description = "CIDR block of the VPC"
+  value       = alicloud_vpc.vpc.cidr_block
+}
+
+output "security_group_id" {
+  description = "ID of the Security Group"
+  value       = alicloud_security_group.sg.id
+}
+
+output "vswitch_ids" {
+  description = "vSwitch IDs keyed by vSwitch name"
+  value       = { for name, vswitch in alicloud_vswitch.vswitch : name => vswitch.id }
+}
+
+output "vswitch_zones" {
+  description = "Zones of the vSwitches keyed by vSwitch name"
+  value       = { for name, vswitch in alicloud_vswitch.vswitch : name => vswitch.zone_id }
+}
+
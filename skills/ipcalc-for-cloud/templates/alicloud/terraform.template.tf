@@ -25,7 +25,7 @@ provider "alicloud" {
 variable "region" {
   description = "Alibaba Cloud Region"
   type        = string
-  default     = "cn-hangzhou"
+  default     = "{{region}}"
 }
 
 variable "vpc_name" {
@@ -40,7 +40,21 @@ variable "vpc_cidr" {
   default     = "{{vpcCidr}}"
 }
 
-{{vSwitchVariables}}
+
+data "alicloud_zones" "available" {
+  available_resource_creation = "VSwitch"
+}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'] %}
+
+variable "vswitch{{idx}}_cidr" {
+  description = "CIDR block for vSwitch {{idx}}"
+  type        = string
+  default     = "{{cidr}}"
+}
+{% endfragment %}
+{% endfor %}
+
 # ========================================
 # VPC
 # ========================================
@@ -60,7 +74,24 @@ resource "alicloud_vpc" "vpc" {
 # vSwitches
 # ========================================
 
-{{vSwitchResources}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, zone=zone_index(subnet, idx) %}
+resource "alicloud_vswitch" "vswitch{{idx}}" {
+  vpc_id       = alicloud_vpc.vpc.id
+  cidr_block   = var.vswitch{{idx}}_cidr
+  zone_id      = data.alicloud_zones.available.zones[{{zone}} % length(data.alicloud_zones.available.zones)].id
+  vswitch_name = "${var.vpc_name}-vswitch{{idx}}"
+  description  = "vSwitch {{idx}}"
+
+  tags = {
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+  }
+}
+
+{% endfragment %}
+{% endfor %}
+
 # ========================================
 # Security Group (Example)
 # ========================================
@@ -110,4 +141,23 @@ output "security_group_id" {
   value       = alicloud_security_group.sg.id
 }
 
-{{vSwitchOutputs}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx %}
+
+output "vswitch{{idx}}_id" {
+  description = "ID of vSwitch {{idx}}"
+  value       = alicloud_vswitch.vswitch{{idx}}.id
+}
+
+output "vswitch{{idx}}_name" {
+  description = "Name of vSwitch {{idx}}"
+  value       = alicloud_vswitch.vswitch{{idx}}.vswitch_name
+}
+
+output "vswitch{{idx}}_zone" {
+  description = "Zone of vSwitch {{idx}}"
+  value       = alicloud_vswitch.vswitch{{idx}}.zone_id
+}
+{% endfragment %}
+{% endfor %}
+
@@ -6,10 +6,15 @@
 # Variables
 # ========================================
 PREFIX="myproject"
-REGION="us-east-1"
+REGION="{{region}}"
 VPC_CIDR="{{vpcCidr}}"
 
-{{subnetVariables}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'] %}
+SUBNET{{idx}}_CIDR="{{cidr}}"
+{% endfragment %}
+{% endfor %}
+
 
 # ========================================
 # Get Available Availability Zones
@@ -40,6 +45,24 @@ echo "VPC ID: ${VPC_ID}"
 # ========================================
 # Create Subnets
 # ========================================
-{{subnetCreation}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, zone=zone_index(subnet, idx) %}
+# Determine AZ for Subnet {{idx}}
+SUBNET{{idx}}_AZ="${AVAILABILITY_ZONES[{{zone}} % ${AZ_COUNT}]}"
+echo "Creating Subnet {{idx}} in ${SUBNET{{idx}}_AZ}..."
+SUBNET{{idx}}_ID=$(aws ec2 create-subnet \
+  --vpc-id "${VPC_ID}" \
+  --cidr-block "${SUBNET{{idx}}_CIDR}" \
+  --availability-zone "${SUBNET{{idx}}_AZ}" \
+  --region "${REGION}" \
+  --tag-specifications "ResourceType=subnet,Tags=[{Key=Name,Value=${PREFIX}-subnet{{idx}}}]" \
+  --query 'Subnet.SubnetId' \
+  --output text)
+
+echo "Subnet {{idx}} ID: ${SUBNET{{idx}}_ID}"
+
+{% endfragment %}
+{% endfor %}
+
 
 echo "AWS VPC and Subnets created successfully!"
@@ -0,0 +1,127 @@
+# Terraform Configuration for AWS VPC and Subnets
+# Generated by ipcalc.cloud
+#
+# Compact layout: subnets are a map keyed by a name derived from their CIDR
+# and are created with for_each. Adding a subnet adds one map entry.
+
+# ========================================
+# Provider Configuration
+# ========================================
+
+terraform {
+  required_providers {
+    aws = {
+      source  = "hashicorp/aws"
+      version = "~> 5.0"
+    }
+  }
+}
+
+provider "aws" {
+  region = var.region
+}
+
+# ========================================
+# Variables
+# ========================================
+
+variable "prefix" {
+  description = "Prefix for resource naming"
+  type        = string
+  default     = "myproject"
+}
+
+variable "region" {
+  description = "AWS region for resources"
+  type        = string
+  default     = "{{region}}"
+}
+
+variable "vpc_cidr" {
+  description = "CIDR block for the VPC"
+  type        = string
+{% if not module %}
+  default     = "{{networkCidr}}"
+{% endif %}
+}
+
+variable "subnets" {
+  description = "Subnets keyed by subnet name: CIDR block and availability zone position"
+  type = map(object({
+    cidr = string
+    zone = number
+  }))
+{% if not module %}
+  default = {
+{% for key, cidr, zone in subnets %}
+    {{key}} = { cidr = "{{cidr}}", zone = {{zone}} }
+{% endfor %}
+  }
+{% endif %}
+}
+
+# ========================================
+# Data Sources
+# ========================================
+
+data "aws_availability_zones" "available" {
+  state = "available"
+}
+
+# ========================================
+# VPC
+# ========================================
+
+resource "aws_vpc" "vpc" {
+  cidr_block           = var.vpc_cidr
+  enable_dns_hostnames = true
+  enable_dns_support   = true
+
+  tags = {
+    Name        = "${var.prefix}-vpc"
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+  }
+}
+
+# ========================================
+# Subnets
+# ========================================
+
+resource "aws_subnet" "subnet" {
+  for_each = var.subnets
+
+  vpc_id            = aws_vpc.vpc.id
+  cidr_block        = each.value.cidr
+  availability_zone = data.aws_availability_zones.available.names[each.value.zone % length(data.aws_availability_zones.available.names)]
+
+  tags = {
+    Name        = "${var.prefix}-subnet-${each.key}"
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+  }
+}
+
+# ========================================
+# Outputs
+# ========================================
+
+output "vpc_id" {
+  description = "ID of the VPC"
+  value       = aws_vpc.vpc.id
+}
+
+output "vpc_name" {
+  description = "Name of the VPC"
+  value       = aws_vpc.vpc.tags["Name"]
+}
+
+output "subnet_ids" {
+  description = "Subnet IDs keyed by subnet name"
+  value       = { for name, subnet in aws_subnet.subnet : name => subnet.id }
+}
+
+output "subnet_azs" {
+  description = "Availability Zones of the subnets keyed by subnet name"
+  value       = { for name, subnet in aws_subnet.subnet : name => subnet.availability_zone }
+}
@@ -31,7 +31,7 @@ variable "prefix" {
 variable "region" {
   description = "AWS region for resources"
   type        = string
-  default     = "us-east-1"
+  default     = "{{region}}"
 }
 
 variable "vpc_cidr" {
@@ -40,7 +40,17 @@ variable "vpc_cidr" {
   default     = "{{vpcCidr}}"
 }
 
-{{subnetVariables}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'] %}
+
+variable "subnet{{idx}}_cidr" {
+  description = "CIDR block for Subnet {{idx}}"
+  type        = string
+  default     = "{{cidr}}"
+}
+{% endfragment %}
+{% endfor %}
+
 
 # ========================================
 # Data Sources
@@ -70,7 +80,23 @@ resource "aws_vpc" "vpc" {
 # Subnets
 # ========================================
 
-{{subnetResources}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, zone=zone_index(subnet, idx) %}
+resource "aws_subnet" "subnet{{idx}}" {
+  vpc_id            = aws_vpc.vpc.id
+  cidr_block        = var.subnet{{idx}}_cidr
+  availability_zone = data.aws_availability_zones.available.names[{{zone}} % length(data.aws_availability_zones.available.names)]
+
+  tags = {
+    Name        = "${var.prefix}-subnet{{idx}}"
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+  }
+}
+
+{% endfragment %}
+{% endfor %}
+{{transitGatewayResources}}
 
 # ========================================
 # Outputs
@@ -86,4 +112,18 @@ output "vpc_name" {
   value       = aws_vpc.vpc.tags["Name"]
 }
 
-{{subnetOutputs}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx %}
+
+output "subnet{{idx}}_id" {
+  description = "ID of Subnet {{idx}}"
+  value       = aws_subnet.subnet{{idx}}.id
+}
+
+output "subnet{{idx}}_az" {
+  description = "Availability Zone of Subnet {{idx}}"
+  value       = aws_subnet.subnet{{idx}}.availability_zone
+}
+{% endfragment %}
+{% endfor %}
+{{transitGatewayOutputs}}
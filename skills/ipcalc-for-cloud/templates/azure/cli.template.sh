@@ -6,13 +6,30 @@
 # Variables
 # ========================================
 PREFIX="myproject"
-LOCATION="eastus"
+LOCATION="{{region}}"
 RESOURCE_GROUP="${PREFIX}-rg"
 VNET_NAME="${PREFIX}-vnet"
 VNET_CIDR="{{vnetCidr}}"
 
-{{subnetVariables}}
-{{spokeVnetVariables}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'] %}
+SUBNET{{idx}}_NAME="${PREFIX}-subnet{{idx}}"
+SUBNET{{idx}}_CIDR="{{cidr}}"
+{% endfragment %}
+{% endfor %}
+
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+SPOKE{{spoke_idx}}_VNET_NAME="${PREFIX}-spoke{{spoke_idx}}-vnet"
+SPOKE{{spoke_idx}}_VNET_CIDR="{{spoke['cidr']}}"
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, cidr=subnet['cidr'], network=spoke_idx %}
+SPOKE{{network}}_SUBNET{{idx}}_NAME="${PREFIX}-spoke{{network}}-vnet-subnet{{idx}}"
+SPOKE{{network}}_SUBNET{{idx}}_CIDR="{{cidr}}"
+{% endfragment %}
+{% endfor %}
+
+{% endfor %}
+
 
 # ========================================
 # Create Resource Group
@@ -35,9 +52,101 @@ az network vnet create \
 # ========================================
 # Create Subnets
 # ========================================
-{{subnetCreation}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx %}
+echo "Creating Subnet {{idx}}: ${SUBNET{{idx}}_NAME}"
+az network vnet subnet create \
+  --resource-group "${RESOURCE_GROUP}" \
+  --vnet-name "${VNET_NAME}" \
+  --name "${SUBNET{{idx}}_NAME}" \
+  --address-prefix "${SUBNET{{idx}}_CIDR}"
+
+{% endfragment %}
+{% endfor %}
+
+
+{% if spokes %}
+
+# ========================================
+# Create Spoke VNets
+# ========================================
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+
+echo "Creating Spoke VNET {{spoke_idx}}: ${SPOKE{{spoke_idx}}_VNET_NAME}"
+az network vnet create \
+  --resource-group "${RESOURCE_GROUP}" \
+  --name "${SPOKE{{spoke_idx}}_VNET_NAME}" \
+  --address-prefix "${SPOKE{{spoke_idx}}_VNET_CIDR}" \
+  --location "{{spoke.get('location') or '${LOCATION}'}}"
+
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, network=spoke_idx %}
+echo "Creating Spoke {{network}} Subnet {{idx}}: ${SPOKE{{network}}_SUBNET{{idx}}_NAME}"
+az network vnet subnet create \
+  --resource-group "${RESOURCE_GROUP}" \
+  --vnet-name "${SPOKE{{network}}_VNET_NAME}" \
+  --name "${SPOKE{{network}}_SUBNET{{idx}}_NAME}" \
+  --address-prefix "${SPOKE{{network}}_SUBNET{{idx}}_CIDR}"
+
+{% endfragment %}
+{% endfor %}
+{% endfor %}
+
+
+# ========================================
+# Create VNET Peering
+# ========================================
+{% for a, b in peerings %}
+{% for local, remote in ((a, b), (b, a)) %}
+{% if local == a %}
+
+{% endif %}
+echo "Creating peering from {{network_title(local)}} to {{network_title(remote)}}"
+az network vnet peering create \
+  --resource-group "${RESOURCE_GROUP}" \
+  --name "{{network_label(local)}}-to-{{network_label(remote)}}" \
+  --vnet-name "{{vnet_var(local)}}" \
+  --remote-vnet "{{vnet_var(remote)}}" \
+  --allow-vnet-access
+
+{% endfor %}
+{% endfor %}
+{% if route_tables %}
+
+# ========================================
+# Create Route Tables
+# ========================================
+
+{% for network_idx, routes, subnet_indices in route_tables %}
+echo "Creating route table for {{network_title(network_idx)}}"
+az network route-table create \
+  --resource-group "${RESOURCE_GROUP}" \
+  --name "${PREFIX}-{{network_label(network_idx)}}-rt" \
+  --location "{{network_location(network_idx) or '${LOCATION}'}}"
+
+{% for route_idx, prefix in enumerate(routes, 1) %}
+az network route-table route create \
+  --resource-group "${RESOURCE_GROUP}" \
+  --route-table-name "${PREFIX}-{{network_label(network_idx)}}-rt" \
+  --name "route{{route_idx}}" \
+  --address-prefix "{{prefix}}" \
+  --next-hop-type VirtualAppliance \
+  --next-hop-ip-address "{{next_hop}}"
+
+{% endfor %}
+{% for subnet_idx in subnet_indices %}
+az network vnet subnet update \
+  --resource-group "${RESOURCE_GROUP}" \
+  --vnet-name "{{vnet_var(network_idx)}}" \
+  --name "{% if network_idx %}${SPOKE{{network_idx}}_SUBNET{{subnet_idx}}_NAME}{% else %}${SUBNET{{subnet_idx}}_NAME}{% endif %}" \
+  --route-table "${PREFIX}-{{network_label(network_idx)}}-rt"
+
+{% endfor %}
+{% endfor %}
+{% endif %}
+{% else %}
+
+{% endif %}
 
-{{spokeVnetCreation}}
-{{vnetPeering}}
 
 echo "Azure VNet and Subnets created successfully!"
@@ -9,13 +9,30 @@
 # ========================================
 
 $Prefix = "myproject"
-$Location = "eastus"
+$Location = "{{region}}"
 $ResourceGroupName = "${Prefix}-rg"
 $VNetName = "${Prefix}-vnet"
 $VNetCidr = "{{vnetCidr}}"
 
-{{subnetVariables}}
-{{spokeVnetVariables}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'] %}
+$Subnet{{idx}}Name = "${Prefix}-subnet{{idx}}"
+$Subnet{{idx}}Cidr = "{{cidr}}"
+{% endfragment %}
+{% endfor %}
+
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+$Spoke{{spoke_idx}}VNetName = "${Prefix}-spoke{{spoke_idx}}-vnet"
+$Spoke{{spoke_idx}}VNetCidr = "{{spoke['cidr']}}"
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, cidr=subnet['cidr'], network=spoke_idx %}
+$Spoke{{network}}Subnet{{idx}}Name = "${Prefix}-spoke{{network}}-vnet-subnet{{idx}}"
+$Spoke{{network}}Subnet{{idx}}Cidr = "{{cidr}}"
+{% endfragment %}
+{% endfor %}
+
+{% endfor %}
+
 
 $Tags = @{
     Environment = "Production"
@@ -45,7 +62,16 @@ catch {
 # ========================================
 
 Write-Host "Creating subnet configurations..." -ForegroundColor Cyan
-{{subnetConfigurations}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx %}
+$SubnetConfig{{idx}} = New-AzVirtualNetworkSubnetConfig `
+    -Name $Subnet{{idx}}Name `
+    -AddressPrefix $Subnet{{idx}}Cidr
+Write-Host "  - Subnet {{idx}}: $Subnet{{idx}}Name ($Subnet{{idx}}Cidr)" -ForegroundColor Gray
+
+{% endfragment %}
+{% endfor %}
+
 
 # ========================================
 # Create Virtual Network (Hub)
@@ -58,7 +84,7 @@ try {
         -ResourceGroupName $ResourceGroupName `
         -Location $Location `
         -AddressPrefix $VNetCidr `
-        -Subnet {{subnetConfigList}} `
+        -Subnet {{', '.join('$SubnetConfig' + str(idx) for idx in range(1, len(subnets) + 1))}} `
         -Tag $Tags
     Write-Host "✓ Virtual Network created successfully" -ForegroundColor Green
 }
@@ -67,8 +93,67 @@ catch {
     exit 1
 }
 
-{{spokeVnetCreation}}
-{{vnetPeering}}
+{% if spokes %}
+
+# ========================================
+# Create Spoke VNets
+# ========================================
+
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+Write-Host "Creating Spoke {{spoke_idx}} subnet configurations..." -ForegroundColor Cyan
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, network=spoke_idx %}
+$Spoke{{network}}SubnetConfig{{idx}} = New-AzVirtualNetworkSubnetConfig `
+    -Name $Spoke{{network}}Subnet{{idx}}Name `
+    -AddressPrefix $Spoke{{network}}Subnet{{idx}}Cidr
+Write-Host "  - Spoke {{network}} Subnet {{idx}}: $Spoke{{network}}Subnet{{idx}}Name ($Spoke{{network}}Subnet{{idx}}Cidr)" -ForegroundColor Gray
+
+{% endfragment %}
+{% endfor %}
+Write-Host "Creating Spoke {{spoke_idx}} Virtual Network: $Spoke{{spoke_idx}}VNetName" -ForegroundColor Cyan
+try {
+    $spoke{{spoke_idx}}Vnet = New-AzVirtualNetwork `
+        -Name $Spoke{{spoke_idx}}VNetName `
+        -ResourceGroupName $ResourceGroupName `
+        -Location {% if spoke.get('location') %}"{{spoke['location']}}"{% else %}$Location{% endif %} `
+        -AddressPrefix $Spoke{{spoke_idx}}VNetCidr `
+        -Subnet {{', '.join('$Spoke%dSubnetConfig%d' % (spoke_idx, idx) for idx in range(1, len(spoke['subnets']) + 1))}} `
+        -Tag $Tags
+    Write-Host "✓ Spoke {{spoke_idx}} Virtual Network created successfully" -ForegroundColor Green
+}
+catch {
+    Write-Error "Failed to create Spoke {{spoke_idx}} Virtual Network: $_"
+    exit 1
+}
+
+{% endfor %}
+
+
+# ========================================
+# Create VNET Peering
+# ========================================
+
+{% for a, b in peerings %}
+{% for local, remote in ((a, b), (b, a)) %}
+Write-Host "Creating peering from {{network_title(local)}} to {{network_title(remote)}}" -ForegroundColor Cyan
+try {
+    Add-AzVirtualNetworkPeering `
+        -Name "{{network_label(local)}}-to-{{network_label(remote)}}" `
+        -VirtualNetwork {{ps_vnet(local)}} `
+        -RemoteVirtualNetworkId {{ps_vnet(remote)}}.Id
+    Write-Host "✓ Peering from {{network_title(local)}} to {{network_title(remote)}} created" -ForegroundColor Green
+}
+catch {
+    Write-Error "Failed to create peering from {{network_title(local)}} to {{network_title(remote)}}: $_"
+}
+
+{% endfor %}
+{% endfor %}
+
+{% else %}
+
+
+{% endif %}
 
 # ========================================
 # Display Results
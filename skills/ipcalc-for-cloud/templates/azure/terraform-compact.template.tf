@@ -0,0 +1,226 @@
+# Terraform Configuration for Azure VNet and Subnets
+# Generated by ipcalc.cloud
+#
+# Compact layout: subnets are a map keyed by a name derived from their CIDR
+# and are created with for_each. Adding a subnet adds one map entry.
+
+# ========================================
+# Provider Configuration
+# ========================================
+
+terraform {
+  required_providers {
+    azurerm = {
+      source  = "hashicorp/azurerm"
+      version = "~> 4.0"
+    }
+  }
+}
+
+provider "azurerm" {
+  features {}
+}
+
+# ========================================
+# Variables
+# ========================================
+
+variable "prefix" {
+  description = "Prefix for resource naming"
+  type        = string
+  default     = "myproject"
+}
+
+variable "location" {
+  description = "Azure region for resources"
+  type        = string
+  default     = "{{region}}"
+}
+
+variable "vnet_cidr" {
+  description = "CIDR block for the Virtual Network"
+  type        = string
+{% if not module %}
+  default     = "{{networkCidr}}"
+{% endif %}
+}
+
+variable "subnets" {
+  description = "Subnet CIDR blocks keyed by subnet name"
+  type        = map(string)
+{% if not module %}
+  default = {
+{% for key, cidr, zone in subnets %}
+    {{key}} = "{{cidr}}"
+{% endfor %}
+  }
+{% endif %}
+}
+{% if spokes %}
+
+variable "spoke_vnets" {
+  description = "Spoke VNets keyed by name, with their subnet CIDR blocks keyed by subnet name"
+  type = map(object({
+    cidr    = string
+    subnets = map(string)
+  }))
+  default = {
+{% for key, cidr, spoke_subnets in spokes %}
+    {{key}} = {
+      cidr = "{{cidr}}"
+      subnets = {
+{% for subnet_key, subnet_cidr, zone in spoke_subnets %}
+        {{subnet_key}} = "{{subnet_cidr}}"
+{% endfor %}
+      }
+    }
+{% endfor %}
+  }
+}
+
+locals {
+  # Spoke subnets keyed "<spoke>/<subnet>"
+  spoke_subnets = merge([
+    for spoke, vnet in var.spoke_vnets : {
+      for name, cidr in vnet.subnets : "${spoke}/${name}" => { spoke = spoke, cidr = cidr }
+    }
+  ]...)
+}
+{% endif %}
+
+# ========================================
+# Resource Group
+# ========================================
+
+resource "azurerm_resource_group" "rg" {
+  name     = "${var.prefix}-rg"
+  location = var.location
+
+  tags = {
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+  }
+}
+
+# ========================================
+# Virtual Network
+# ========================================
+
+resource "azurerm_virtual_network" "vnet" {
+  name                = "${var.prefix}-vnet"
+  address_space       = [var.vnet_cidr]
+  location            = azurerm_resource_group.rg.location
+  resource_group_name = azurerm_resource_group.rg.name
+
+  tags = {
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+  }
+}
+
+# ========================================
+# Subnets
+# ========================================
+
+resource "azurerm_subnet" "subnet" {
+  for_each = var.subnets
+
+  name                 = "${var.prefix}-subnet-${each.key}"
+  resource_group_name  = azurerm_resource_group.rg.name
+  virtual_network_name = azurerm_virtual_network.vnet.name
+  address_prefixes     = [each.value]
+}
+{% if spokes %}
+
+# ========================================
+# Spoke VNets
+# ========================================
+
+resource "azurerm_virtual_network" "spoke" {
+  for_each = var.spoke_vnets
+
+  name                = "${var.prefix}-spoke-${each.key}-vnet"
+  address_space       = [each.value.cidr]
+  location            = azurerm_resource_group.rg.location
+  resource_group_name = azurerm_resource_group.rg.name
+
+  tags = {
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+    Role        = "Spoke"
+  }
+}
+
+resource "azurerm_subnet" "spoke" {
+  for_each = local.spoke_subnets
+
+  name                 = "${var.prefix}-spoke-${replace(each.key, "/", "-subnet-")}"
+  resource_group_name  = azurerm_resource_group.rg.name
+  virtual_network_name = azurerm_virtual_network.spoke[each.value.spoke].name
+  address_prefixes     = [each.value.cidr]
+}
+
+# ========================================
+# VNET Peering
+# ========================================
+
+resource "azurerm_virtual_network_peering" "hub_to_spoke" {
+  for_each = var.spoke_vnets
+
+  name                         = "hub-to-spoke-${each.key}"
+  resource_group_name          = azurerm_resource_group.rg.name
+  virtual_network_name         = azurerm_virtual_network.vnet.name
+  remote_virtual_network_id    = azurerm_virtual_network.spoke[each.key].id
+  allow_virtual_network_access = true
+  allow_forwarded_traffic      = true
+  allow_gateway_transit        = false
+}
+
+resource "azurerm_virtual_network_peering" "spoke_to_hub" {
+  for_each = var.spoke_vnets
+
+  name                         = "spoke-${each.key}-to-hub"
+  resource_group_name          = azurerm_resource_group.rg.name
+  virtual_network_name         = azurerm_virtual_network.spoke[each.key].name
+  remote_virtual_network_id    = azurerm_virtual_network.vnet.id
+  allow_virtual_network_access = true
+  allow_forwarded_traffic      = true
+  use_remote_gateways          = false
+}
+{% endif %}
+
+# ========================================
+# Outputs
+# ========================================
+
+output "resource_group_name" {
+  description = "Name of the resource group"
+  value       = azurerm_resource_group.rg.name
+}
+
+output "vnet_name" {
+  description = "Name of the virtual network"
+  value       = azurerm_virtual_network.vnet.name
+}
+
+output "vnet_id" {
+  description = "ID of the virtual network"
+  value       = azurerm_virtual_network.vnet.id
+}
+
+output "subnet_ids" {
+  description = "Subnet IDs keyed by subnet name"
+  value       = { for name, subnet in azurerm_subnet.subnet : name => subnet.id }
+}
+{% if spokes %}
+
+output "spoke_vnet_ids" {
+  description = "Spoke Virtual Network IDs keyed by spoke name"
+  value       = { for name, vnet in azurerm_virtual_network.spoke : name => vnet.id }
+}
+
+output "spoke_subnet_ids" {
+  description = "Spoke subnet IDs keyed by <spoke>/<subnet>"
+  value       = { for name, subnet in azurerm_subnet.spoke : name => subnet.id }
+}
+{% endif %}
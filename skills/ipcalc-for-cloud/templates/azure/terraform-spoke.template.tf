@@ -0,0 +1,122 @@
+# Terraform Configuration for Azure Spoke VNet {{spoke_idx}}
+# Generated by ipcalc.cloud
+#
+# Root of spoke {{spoke_idx}} in a split hub-spoke layout: the spoke VNet, its subnets
+# and both directions of its peering with the hub, in a state of its own.
+# The hub is looked up by name, so apply the hub root first; spoke roots do
+# not depend on each other and can be applied in parallel.
+
+# ========================================
+# Provider Configuration
+# ========================================
+
+terraform {
+  required_providers {
+    azurerm = {
+      source  = "hashicorp/azurerm"
+      version = "~> 4.0"
+    }
+  }
+}
+
+provider "azurerm" {
+  features {}
+}
+
+# ========================================
+# Variables
+# ========================================
+
+variable "prefix" {
+  description = "Prefix for resource naming (same as the hub root)"
+  type        = string
+  default     = "myproject"
+}
+
+# ========================================
+# Hub (managed by the hub root)
+# ========================================
+
+data "azurerm_resource_group" "rg" {
+  name = "${var.prefix}-rg"
+}
+
+data "azurerm_virtual_network" "vnet" {
+  name                = "${var.prefix}-vnet"
+  resource_group_name = data.azurerm_resource_group.rg.name
+}
+
+# ========================================
+# Spoke VNet
+# ========================================
+
+resource "azurerm_virtual_network" "spoke{{spoke_idx}}_vnet" {
+  name                = "${var.prefix}-spoke{{spoke_idx}}-vnet"
+  address_space       = ["{{spoke['cidr']}}"]
+  location            = {% if spoke.get('location') %}"{{spoke['location']}}"{% else %}data.azurerm_resource_group.rg.location{% endif %}
+  resource_group_name = data.azurerm_resource_group.rg.name
+
+  tags = {
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+    Role        = "{{network_role(spoke)}}"
+  }
+}
+
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, cidr=subnet['cidr'], network=spoke_idx %}
+resource "azurerm_subnet" "spoke{{network}}_subnet{{idx}}" {
+  name                 = "${var.prefix}-spoke{{network}}-subnet{{idx}}"
+  resource_group_name  = data.azurerm_resource_group.rg.name
+  virtual_network_name = azurerm_virtual_network.spoke{{network}}_vnet.name
+  address_prefixes     = ["{{cidr}}"]
+}
+
+{% endfragment %}
+{% endfor %}
+# ========================================
+# VNET Peering
+# ========================================
+
+resource "azurerm_virtual_network_peering" "hub_to_spoke{{spoke_idx}}" {
+  name                      = "hub-to-spoke{{spoke_idx}}"
+  resource_group_name       = data.azurerm_resource_group.rg.name
+  virtual_network_name      = data.azurerm_virtual_network.vnet.name
+  remote_virtual_network_id = azurerm_virtual_network.spoke{{spoke_idx}}_vnet.id
+  allow_virtual_network_access = true
+  allow_forwarded_traffic      = true
+  allow_gateway_transit        = false
+}
+
+resource "azurerm_virtual_network_peering" "spoke{{spoke_idx}}_to_hub" {
+  name                      = "spoke{{spoke_idx}}-to-hub"
+  resource_group_name       = data.azurerm_resource_group.rg.name
+  virtual_network_name      = azurerm_virtual_network.spoke{{spoke_idx}}_vnet.name
+  remote_virtual_network_id = data.azurerm_virtual_network.vnet.id
+  allow_virtual_network_access = true
+  allow_forwarded_traffic      = true
+  use_remote_gateways          = false
+}
+
+# ========================================
+# Outputs
+# ========================================
+
+output "spoke{{spoke_idx}}_vnet_id" {
+  description = "ID of Spoke {{spoke_idx}} Virtual Network"
+  value       = azurerm_virtual_network.spoke{{spoke_idx}}_vnet.id
+}
+
+output "spoke{{spoke_idx}}_vnet_name" {
+  description = "Name of Spoke {{spoke_idx}} Virtual Network"
+  value       = azurerm_virtual_network.spoke{{spoke_idx}}_vnet.name
+}
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, network=spoke_idx %}
+
+output "spoke{{network}}_subnet{{idx}}_id" {
+  description = "ID of Spoke {{network}} Subnet {{idx}}"
+  value       = azurerm_subnet.spoke{{network}}_subnet{{idx}}.id
+}
+{% endfragment %}
+{% endfor %}
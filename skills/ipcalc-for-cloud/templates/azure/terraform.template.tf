@@ -31,7 +31,7 @@ variable "prefix" {
 variable "location" {
   description = "Azure region for resources"
   type        = string
-  default     = "eastus"
+  default     = "{{region}}"
 }
 
 variable "vnet_cidr" {
@@ -40,7 +40,17 @@ variable "vnet_cidr" {
   default     = "{{vnetCidr}}"
 }
 
-{{subnetVariables}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'] %}
+
+variable "subnet{{idx}}_cidr" {
+  description = "CIDR block for Subnet {{idx}}"
+  type        = string
+  default     = "{{cidr}}"
+}
+{% endfragment %}
+{% endfor %}
+
 
 # ========================================
 # Resource Group
@@ -76,10 +86,75 @@ resource "azurerm_virtual_network" "vnet" {
 # Subnets
 # ========================================
 
-{{subnetResources}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx %}
+resource "azurerm_subnet" "subnet{{idx}}" {
+  name                 = "${var.prefix}-subnet{{idx}}"
+  resource_group_name  = azurerm_resource_group.rg.name
+  virtual_network_name = azurerm_virtual_network.vnet.name
+  address_prefixes     = [var.subnet{{idx}}_cidr]
+}
+
+{% endfragment %}
+{% endfor %}
+
 
-{{spokeVnetResources}}
-{{vnetPeeringResources}}
+{% if spokes %}
+
+# ========================================
+# Spoke VNets
+# ========================================
+
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+resource "azurerm_virtual_network" "spoke{{spoke_idx}}_vnet" {
+  name                = "${var.prefix}-spoke{{spoke_idx}}-vnet"
+  address_space       = ["{{spoke['cidr']}}"]
+  location            = {% if spoke.get('location') %}"{{spoke['location']}}"{% else %}azurerm_resource_group.rg.location{% endif %}
+  resource_group_name = azurerm_resource_group.rg.name
+
+  tags = {
+    Environment = "Production"
+    ManagedBy   = "Terraform"
+    Role        = "{{network_role(spoke)}}"
+  }
+}
+
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, cidr=subnet['cidr'], network=spoke_idx %}
+resource "azurerm_subnet" "spoke{{network}}_subnet{{idx}}" {
+  name                 = "${var.prefix}-spoke{{network}}-subnet{{idx}}"
+  resource_group_name  = azurerm_resource_group.rg.name
+  virtual_network_name = azurerm_virtual_network.spoke{{network}}_vnet.name
+  address_prefixes     = ["{{cidr}}"]
+}
+
+{% endfragment %}
+{% endfor %}
+{% endfor %}
+
+# ========================================
+# VNET Peering
+# ========================================
+
+{% for a, b in peerings %}
+{% for local, remote, transit in ((a, b, 'allow_gateway_transit'), (b, a, 'use_remote_gateways')) %}
+resource "azurerm_virtual_network_peering" "{{network_label(local)}}_to_{{network_label(remote)}}" {
+  name                      = "{{network_label(local)}}-to-{{network_label(remote)}}"
+  resource_group_name       = azurerm_resource_group.rg.name
+  virtual_network_name      = {{vnet_ref(local)}}.name
+  remote_virtual_network_id = {{vnet_ref(remote)}}.id
+  allow_virtual_network_access = true
+  allow_forwarded_traffic      = true
+  {{transit.ljust(28)}} = false
+}
+
+{% endfor %}
+{% endfor %}
+{{routeTables}}
+{% else %}
+
+
+{% endif %}
 
 # ========================================
 # Outputs
@@ -100,5 +175,26 @@ output "vnet_id" {
   value       = azurerm_virtual_network.vnet.id
 }
 
-{{subnetOutputs}}
-{{spokeVnetOutputs}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx %}
+
+output "subnet{{idx}}_id" {
+  description = "ID of Subnet {{idx}}"
+  value       = azurerm_subnet.subnet{{idx}}.id
+}
+{% endfragment %}
+{% endfor %}
+
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+
+output "spoke{{spoke_idx}}_vnet_id" {
+  description = "ID of Spoke {{spoke_idx}} Virtual Network"
+  value       = azurerm_virtual_network.spoke{{spoke_idx}}_vnet.id
+}
+
+output "spoke{{spoke_idx}}_vnet_name" {
+  description = "Name of Spoke {{spoke_idx}} Virtual Network"
+  value       = azurerm_virtual_network.spoke{{spoke_idx}}_vnet.name
+}
+{% endfor %}
+
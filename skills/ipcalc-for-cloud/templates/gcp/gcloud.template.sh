@@ -9,7 +9,11 @@ PROJECT_ID="your-project-id"
 VPC_NAME="myproject-vpc"
 ROUTING_MODE="regional"  # or "global"
 MTU=1460                 # 1460 for standard, 1500 for Premium tier or Interconnect
-{{spokeVPCVariables}}
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+SPOKE{{spoke_idx}}_VPC_NAME="${VPC_NAME}-spoke{{spoke_idx}}"
+SPOKE{{spoke_idx}}_CIDR="{{spoke['cidr']}}"
+{% endfor %}
+
 
 # Set the project
 gcloud config set project "${PROJECT_ID}"
@@ -28,17 +32,66 @@ echo "Hub VPC ${VPC_NAME} created successfully"
 # ========================================
 # Create Hub Subnets
 # ========================================
-{{subnetCreation}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'], zone=gcp_region(subnet, idx) %}
+echo "Creating Subnet {{idx}} in {{zone}}..."
+gcloud compute networks subnets create "${VPC_NAME}-subnet{{idx}}" \
+  --network="${VPC_NAME}" \
+  --region="{{zone}}" \
+  --range="{{cidr}}" \
+  --enable-private-ip-google-access
+
+{% endfragment %}
+{% endfor %}
+
 
 # ========================================
 # Create Spoke VPCs and Subnets
 # ========================================
-{{spokeVPCCreation}}
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+
+echo "Creating Spoke VPC {{spoke_idx}}..."
+gcloud compute networks create "${SPOKE{{spoke_idx}}_VPC_NAME}" \
+  --subnet-mode=custom \
+  --bgp-routing-mode=regional
+
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, cidr=subnet['cidr'], zone=gcp_region(subnet, idx), network=spoke_idx %}
+echo "Creating Subnet {{idx}} in Spoke VPC {{network}}..."
+gcloud compute networks subnets create "${SPOKE{{network}}_VPC_NAME}-subnet{{idx}}" \
+  --network="${SPOKE{{network}}_VPC_NAME}" \
+  --region="{{zone}}" \
+  --range="{{cidr}}" \
+  --enable-private-ip-google-access
+
+{% endfragment %}
+{% endfor %}
+{% endfor %}
+
 
 # ========================================
 # Create VPC Peerings
 # ========================================
-{{spokePeeringCreation}}
+{% for pair_idx, (a, b) in enumerate(peerings, 1) %}
+{% for local, remote in ((a, b), (b, a)) %}
+{% if local == a %}
+
+{% endif %}
+echo "Creating peering from {{network_title(local)}} to {{network_title(remote)}}..."
+gcloud compute networks peerings create "{{network_label(local)}}-to-{{network_label(remote)}}" \
+  --network="{{gcloud_vpc(local)}}" \
+  --peer-project="$(gcloud config get-value project)" \
+  --peer-network="{{gcloud_vpc(remote)}}" \
+  --auto-create-routes
+
+{% endfor %}
+{% if pair_idx < len(peerings) %}
+echo "Waiting for peering to stabilize before next spoke..."
+sleep 10
+
+{% endif %}
+{% endfor %}
+
 
 echo "GCP VPC and Subnets created successfully!"
 
@@ -0,0 +1,231 @@
+# Terraform Configuration for GCP VPC and Subnets
+# Generated by ipcalc.cloud
+#
+# Compact layout: subnets are a map keyed by a name derived from their CIDR
+# and are created with for_each. Adding a subnet adds one map entry.
+
+# ========================================
+# Provider Configuration
+# ========================================
+
+terraform {
+  required_providers {
+    google = {
+      source  = "hashicorp/google"
+      version = "~> 5.0"
+    }
+  }
+}
+
+provider "google" {
+  project = var.project_id
+}
+
+# ========================================
+# Variables
+# ========================================
+
+variable "project_id" {
+  description = "GCP Project ID"
+  type        = string
+}
+
+variable "vpc_name" {
+  description = "Name of the VPC"
+  type        = string
+  default     = "myproject-vpc"
+}
+
+variable "routing_mode" {
+  description = "VPC routing mode"
+  type        = string
+  default     = "REGIONAL"
+}
+
+variable "mtu" {
+  description = "MTU for the VPC (1460 for standard, 1500 for Premium tier or Interconnect)"
+  type        = number
+  default     = 1460
+}
+
+variable "subnets" {
+  description = "Subnets keyed by subnet name: CIDR block and region"
+  type = map(object({
+    cidr   = string
+    region = string
+  }))
+{% if not module %}
+  default = {
+{% for key, cidr, region in subnets %}
+    {{key}} = { cidr = "{{cidr}}", region = "{{region}}" }
+{% endfor %}
+  }
+{% endif %}
+}
+{% if spokes %}
+
+variable "spoke_vpcs" {
+  description = "Spoke VPCs keyed by name, with their subnets keyed by subnet name"
+  type = map(object({
+    cidr = string
+    subnets = map(object({
+      cidr   = string
+      region = string
+    }))
+  }))
+  default = {
+{% for key, cidr, spoke_subnets in spokes %}
+    {{key}} = {
+      cidr = "{{cidr}}"
+      subnets = {
+{% for subnet_key, subnet_cidr, region in spoke_subnets %}
+        {{subnet_key}} = { cidr = "{{subnet_cidr}}", region = "{{region}}" }
+{% endfor %}
+      }
+    }
+{% endfor %}
+  }
+}
+
+locals {
+  # Spoke subnets keyed "<spoke>/<subnet>"
+  spoke_subnets = merge([
+    for spoke, vpc in var.spoke_vpcs : {
+      for name, subnet in vpc.subnets : "${spoke}/${name}" => merge(subnet, { spoke = spoke })
+    }
+  ]...)
+}
+{% endif %}
+
+# ========================================
+# Hub VPC Network
+# ========================================
+
+resource "google_compute_network" "vpc" {
+  name                    = var.vpc_name
+  auto_create_subnetworks = false
+  routing_mode            = var.routing_mode
+  mtu                     = var.mtu
+  project                 = var.project_id
+
+  description = "Hub VPC created by Terraform"
+}
+
+# ========================================
+# Hub Subnets
+# ========================================
+
+resource "google_compute_subnetwork" "subnet" {
+  for_each = var.subnets
+
+  name          = "${var.vpc_name}-subnet-${each.key}"
+  ip_cidr_range = each.value.cidr
+  region        = each.value.region
+  network       = google_compute_network.vpc.id
+  project       = var.project_id
+
+  private_ip_google_access = true
+
+  log_config {
+    aggregation_interval = "INTERVAL_10_MIN"
+    flow_sampling        = 0.5
+    metadata             = "INCLUDE_ALL_METADATA"
+  }
+}
+{% if spokes %}
+
+# ========================================
+# Spoke VPCs and Subnets
+# ========================================
+
+resource "google_compute_network" "spoke" {
+  for_each = var.spoke_vpcs
+
+  name                    = "${var.vpc_name}-spoke-${each.key}"
+  auto_create_subnetworks = false
+  routing_mode            = "REGIONAL"
+  project                 = var.project_id
+
+  description = "Spoke VPC ${each.value.cidr}"
+}
+
+resource "google_compute_subnetwork" "spoke" {
+  for_each = local.spoke_subnets
+
+  name          = "${var.vpc_name}-spoke-${replace(each.key, "/", "-subnet-")}"
+  ip_cidr_range = each.value.cidr
+  region        = each.value.region
+  network       = google_compute_network.spoke[each.value.spoke].id
+  project       = var.project_id
+
+  private_ip_google_access = true
+
+  log_config {
+    aggregation_interval = "INTERVAL_10_MIN"
+    flow_sampling        = 0.5
+    metadata             = "INCLUDE_ALL_METADATA"
+  }
+}
+
+# ========================================
+# VPC Peerings
+# ========================================
+{{spokePeeringResources}}
+{% endif %}
+
+# ========================================
+# Firewall Rules (Example)
+# ========================================
+
+# Allow internal communication
+resource "google_compute_firewall" "allow_internal" {
+  name    = "${var.vpc_name}-allow-internal"
+  network = google_compute_network.vpc.name
+  project = var.project_id
+
+  allow {
+    protocol = "all"
+  }
+
+{% if module %}
+  source_ranges = [for subnet in values(var.subnets) : subnet.cidr]
+{% else %}
+  source_ranges = ["{{networkCidr}}"]
+{% endif %}
+}
+
+# ========================================
+# Outputs
+# ========================================
+
+output "vpc_name" {
+  description = "Name of the VPC"
+  value       = google_compute_network.vpc.name
+}
+
+output "vpc_id" {
+  description = "ID of the VPC"
+  value       = google_compute_network.vpc.id
+}
+
+output "vpc_self_link" {
+  description = "Self link of the VPC"
+  value       = google_compute_network.vpc.self_link
+}
+
+output "subnet_ids" {
+  description = "Subnet IDs keyed by subnet name"
+  value       = { for name, subnet in google_compute_subnetwork.subnet : name => subnet.id }
+}
+
+output "subnet_self_links" {
+  description = "Subnet self links keyed by subnet name"
+  value       = { for name, subnet in google_compute_subnetwork.subnet : name => subnet.self_link }
+}
+{% if spokes %}
+
+output "spoke_vpc_ids" {
+  description = "Spoke VPC IDs keyed by spoke name"
+  value       = { for name, vpc in google_compute_network.spoke : name => vpc.id }
+}
+{% endif %}
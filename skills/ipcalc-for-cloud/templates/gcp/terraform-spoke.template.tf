@@ -0,0 +1,145 @@
+# Terraform Configuration for GCP Spoke VPC {{spoke_idx}}
+# Generated by ipcalc.cloud
+#
+# Root of spoke {{spoke_idx}} in a split hub-spoke layout: the spoke VPC, its subnets
+# and both directions of its peering with the hub, in a state of its own.
+# The hub is looked up by name, so apply the hub root first; spoke roots do
+# not depend on each other and can be applied in parallel. GCP runs one
+# peering operation per network at a time: the provider retries a peering
+# while another spoke's peering on the hub is in progress.
+
+# ========================================
+# Provider Configuration
+# ========================================
+
+terraform {
+  required_providers {
+    google = {
+      source  = "hashicorp/google"
+      version = "~> 5.0"
+    }
+  }
+}
+
+provider "google" {
+  project = var.project_id
+}
+
+# ========================================
+# Variables
+# ========================================
+
+variable "project_id" {
+  description = "GCP Project ID"
+  type        = string
+}
+
+variable "vpc_name" {
+  description = "Name of the hub VPC (same as the hub root)"
+  type        = string
+  default     = "myproject-vpc"
+}
+
+variable "spoke{{spoke_idx}}_cidr" {
+  description = "CIDR block for Spoke VPC {{spoke_idx}}"
+  type        = string
+  default     = "{{spoke['cidr']}}"
+}
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, cidr=subnet['cidr'], zone=gcp_region(subnet, idx), network=spoke_idx %}
+
+variable "spoke{{network}}_subnet{{idx}}_cidr" {
+  description = "CIDR block for Spoke {{network}} Subnet {{idx}}"
+  type        = string
+  default     = "{{cidr}}"
+}
+
+variable "spoke{{network}}_subnet{{idx}}_region" {
+  description = "Region for Spoke {{network}} Subnet {{idx}}"
+  type        = string
+  default     = "{{zone}}"
+}
+{% endfragment %}
+{% endfor %}
+
+# ========================================
+# Hub VPC (managed by the hub root)
+# ========================================
+
+data "google_compute_network" "vpc" {
+  name    = var.vpc_name
+  project = var.project_id
+}
+
+# ========================================
+# Spoke VPC and Subnets
+# ========================================
+
+resource "google_compute_network" "spoke{{spoke_idx}}_vpc" {
+  name                    = "${var.vpc_name}-spoke{{spoke_idx}}"
+  auto_create_subnetworks = false
+  routing_mode            = "REGIONAL"
+  project                 = var.project_id
+
+  description = "{{network_role(spoke)}} VPC {{spoke_idx}}"
+}
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, network=spoke_idx %}
+
+resource "google_compute_subnetwork" "spoke{{network}}_subnet{{idx}}" {
+  name          = "${var.vpc_name}-spoke{{network}}-subnet{{idx}}"
+  ip_cidr_range = var.spoke{{network}}_subnet{{idx}}_cidr
+  region        = var.spoke{{network}}_subnet{{idx}}_region
+  network       = google_compute_network.spoke{{network}}_vpc.id
+  project       = var.project_id
+
+  private_ip_google_access = true
+
+  log_config {
+    aggregation_interval = "INTERVAL_10_MIN"
+    flow_sampling        = 0.5
+    metadata             = "INCLUDE_ALL_METADATA"
+  }
+}
+{% endfragment %}
+{% endfor %}
+
+# ========================================
+# VPC Peerings
+# ========================================
+
+resource "google_compute_network_peering" "hub_to_spoke{{spoke_idx}}" {
+  name         = "hub-to-spoke{{spoke_idx}}"
+  network      = data.google_compute_network.vpc.self_link
+  peer_network = google_compute_network.spoke{{spoke_idx}}_vpc.self_link
+}
+
+resource "google_compute_network_peering" "spoke{{spoke_idx}}_to_hub" {
+  name         = "spoke{{spoke_idx}}-to-hub"
+  network      = google_compute_network.spoke{{spoke_idx}}_vpc.self_link
+  peer_network = data.google_compute_network.vpc.self_link
+  depends_on   = [google_compute_network_peering.hub_to_spoke{{spoke_idx}}]
+}
+
+# ========================================
+# Outputs
+# ========================================
+
+output "spoke{{spoke_idx}}_vpc_name" {
+  description = "Name of Spoke {{spoke_idx}} VPC"
+  value       = google_compute_network.spoke{{spoke_idx}}_vpc.name
+}
+
+output "spoke{{spoke_idx}}_vpc_id" {
+  description = "ID of Spoke {{spoke_idx}} VPC"
+  value       = google_compute_network.spoke{{spoke_idx}}_vpc.id
+}
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, network=spoke_idx %}
+
+output "spoke{{network}}_subnet{{idx}}_id" {
+  description = "ID of Spoke {{network}} Subnet {{idx}}"
+  value       = google_compute_subnetwork.spoke{{network}}_subnet{{idx}}.id
+}
+{% endfragment %}
+{% endfor %}
@@ -45,8 +45,48 @@ variable "mtu" {
   default     = 1460
 }
 
-{{subnetVariables}}
-{{spokeVPCVariables}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'], zone=gcp_region(subnet, idx) %}
+
+variable "subnet{{idx}}_cidr" {
+  description = "CIDR block for Subnet {{idx}}"
+  type        = string
+  default     = "{{cidr}}"
+}
+
+variable "subnet{{idx}}_region" {
+  description = "Region for Subnet {{idx}}"
+  type        = string
+  default     = "{{zone}}"
+}
+{% endfragment %}
+{% endfor %}
+
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+
+variable "spoke{{spoke_idx}}_cidr" {
+  description = "CIDR block for Spoke VPC {{spoke_idx}}"
+  type        = string
+  default     = "{{spoke['cidr']}}"
+}
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, cidr=subnet['cidr'], zone=gcp_region(subnet, idx), network=spoke_idx %}
+
+variable "spoke{{network}}_subnet{{idx}}_cidr" {
+  description = "CIDR block for Spoke {{network}} Subnet {{idx}}"
+  type        = string
+  default     = "{{cidr}}"
+}
+
+variable "spoke{{network}}_subnet{{idx}}_region" {
+  description = "Region for Spoke {{network}} Subnet {{idx}}"
+  type        = string
+  default     = "{{zone}}"
+}
+{% endfragment %}
+{% endfor %}
+{% endfor %}
+
 
 # ========================================
 # Hub VPC Network
@@ -66,19 +106,81 @@ resource "google_compute_network" "vpc" {
 # Hub Subnets
 # ========================================
 
-{{subnetResources}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx %}
+
+resource "google_compute_subnetwork" "subnet{{idx}}" {
+  name          = "${var.vpc_name}-subnet{{idx}}"
+  ip_cidr_range = var.subnet{{idx}}_cidr
+  region        = var.subnet{{idx}}_region
+  network       = google_compute_network.vpc.id
+  project       = var.project_id
+
+  private_ip_google_access = true
+
+  log_config {
+    aggregation_interval = "INTERVAL_10_MIN"
+    flow_sampling        = 0.5
+    metadata             = "INCLUDE_ALL_METADATA"
+  }
+}
+{% endfragment %}
+{% endfor %}
+
 
 # ========================================
 # Spoke VPCs and Subnets
 # ========================================
 
-{{spokeVPCResources}}
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+
+resource "google_compute_network" "spoke{{spoke_idx}}_vpc" {
+  name                    = "${var.vpc_name}-spoke{{spoke_idx}}"
+  auto_create_subnetworks = false
+  routing_mode            = "REGIONAL"
+  project                 = var.project_id
+
+  description = "{{network_role(spoke)}} VPC {{spoke_idx}}"
+}
+{% for idx, subnet in enumerate(spoke['subnets'], 1) %}
+{% fragment idx, network=spoke_idx %}
+
+resource "google_compute_subnetwork" "spoke{{network}}_subnet{{idx}}" {
+  name          = "${var.vpc_name}-spoke{{network}}-subnet{{idx}}"
+  ip_cidr_range = var.spoke{{network}}_subnet{{idx}}_cidr
+  region        = var.spoke{{network}}_subnet{{idx}}_region
+  network       = google_compute_network.spoke{{network}}_vpc.id
+  project       = var.project_id
+
+  private_ip_google_access = true
+
+  log_config {
+    aggregation_interval = "INTERVAL_10_MIN"
+    flow_sampling        = 0.5
+    metadata             = "INCLUDE_ALL_METADATA"
+  }
+}
+{% endfragment %}
+{% endfor %}
+{% endfor %}
+
 
 # ========================================
 # VPC Peerings
 # ========================================
 
 {{spokePeeringResources}}
+{% for route_idx, prefix in enumerate(hubRoutes, 1) %}
+resource "google_compute_route" "hub_route{{route_idx}}" {
+  name        = "${var.vpc_name}-hub-route{{route_idx}}"
+  network     = google_compute_network.vpc.id
+  dest_range  = "{{prefix}}"
+  next_hop_ip = "{{nextHop}}"
+  priority    = 1000
+  project     = var.project_id
+}
+
+{% endfor %}
 
 # ========================================
 # Firewall Rules (Example)
@@ -116,5 +218,36 @@ output "vpc_self_link" {
   value       = google_compute_network.vpc.self_link
 }
 
-{{subnetOutputs}}
-{{spokeOutputs}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx %}
+
+output "subnet{{idx}}_name" {
+  description = "Name of Subnet {{idx}}"
+  value       = google_compute_subnetwork.subnet{{idx}}.name
+}
+
+output "subnet{{idx}}_id" {
+  description = "ID of Subnet {{idx}}"
+  value       = google_compute_subnetwork.subnet{{idx}}.id
+}
+
+output "subnet{{idx}}_self_link" {
+  description = "Self link of Subnet {{idx}}"
+  value       = google_compute_subnetwork.subnet{{idx}}.self_link
+}
+{% endfragment %}
+{% endfor %}
+
+{% for spoke_idx, spoke in enumerate(spokes, 1) %}
+
+output "spoke{{spoke_idx}}_vpc_name" {
+  description = "Name of Spoke {{spoke_idx}} VPC"
+  value       = google_compute_network.spoke{{spoke_idx}}_vpc.name
+}
+
+output "spoke{{spoke_idx}}_vpc_id" {
+  description = "ID of Spoke {{spoke_idx}} VPC"
+  value       = google_compute_network.spoke{{spoke_idx}}_vpc.id
+}
+{% endfor %}
+
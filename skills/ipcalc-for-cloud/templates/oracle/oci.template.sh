@@ -9,6 +9,9 @@ COMPARTMENT_ID="ocid1.compartment.oc1..your-compartment-id"
 VCN_NAME="myproject-vcn"
 VCN_CIDR="{{vcnCidr}}"
 VCN_DNS_LABEL="myprojectvcn"
+{% if region %}
+export OCI_CLI_REGION="{{region}}"
+{% endif %}
 
 # ========================================
 # Create VCN
@@ -70,7 +73,25 @@ echo "Security List created with ID: ${SL_ID}"
 # ========================================
 # Create Subnets
 # ========================================
-{{subnetCreation}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'] %}
+echo "Creating Subnet {{idx}}..."
+SUBNET{{idx}}_ID=$(oci network subnet create \
+  --compartment-id "${COMPARTMENT_ID}" \
+  --vcn-id "${VCN_ID}" \
+  --cidr-block "{{cidr}}" \
+  --display-name "${VCN_NAME}-subnet{{idx}}" \
+  --dns-label "subnet{{idx}}" \
+  --route-table-id "${RT_ID}" \
+  --security-list-ids "[\"${SL_ID}\"]" \
+  --query 'data.id' \
+  --raw-output)
+
+echo "Subnet {{idx}} created with ID: ${SUBNET{{idx}}_ID}"
+
+{% endfragment %}
+{% endfor %}
+
 
 echo "OCI VCN and Subnets created successfully!"
 
@@ -17,6 +17,9 @@ terraform {
 provider "oci" {
   # Configure authentication via environment variables or config file
   # OCI_TENANCY_OCID, OCI_USER_OCID, OCI_FINGERPRINT, OCI_PRIVATE_KEY_PATH
+{% if region %}
+  region = var.region
+{% endif %}
 }
 
 # ========================================
@@ -27,6 +30,14 @@ variable "compartment_id" {
   description = "OCI Compartment OCID"
   type        = string
 }
+{% if region %}
+
+variable "region" {
+  description = "OCI region"
+  type        = string
+  default     = "{{region}}"
+}
+{% endif %}
 
 variable "vcn_name" {
   description = "Name of the VCN"
@@ -46,7 +57,17 @@ variable "vcn_dns_label" {
   default     = "myprojectvcn"
 }
 
-{{subnetVariables}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx, cidr=subnet['cidr'] %}
+
+variable "subnet{{idx}}_cidr" {
+  description = "CIDR block for Subnet {{idx}}"
+  type        = string
+  default     = "{{cidr}}"
+}
+{% endfragment %}
+{% endfor %}
+
 
 # ========================================
 # VCN
@@ -117,7 +138,27 @@ resource "oci_core_security_list" "sl" {
 # Subnets
 # ========================================
 
-{{subnetResources}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx %}
+resource "oci_core_subnet" "subnet{{idx}}" {
+  compartment_id             = var.compartment_id
+  vcn_id                     = oci_core_vcn.vcn.id
+  cidr_block                 = var.subnet{{idx}}_cidr
+  display_name               = "${var.vcn_name}-subnet{{idx}}"
+  dns_label                  = "subnet{{idx}}"
+  route_table_id             = oci_core_route_table.rt.id
+  security_list_ids          = [oci_core_security_list.sl.id]
+  prohibit_public_ip_on_vnic = false
+
+  freeform_tags = {
+    "Environment" = "Production"
+    "ManagedBy"   = "Terraform"
+  }
+}
+
+{% endfragment %}
+{% endfor %}
+
 
 # ========================================
 # Outputs
@@ -148,4 +189,18 @@ output "security_list_id" {
   value       = oci_core_security_list.sl.id
 }
 
-{{subnetOutputs}}
+{% for idx, subnet in enumerate(subnets, 1) %}
+{% fragment idx %}
+
+output "subnet{{idx}}_id" {
+  description = "OCID of Subnet {{idx}}"
+  value       = oci_core_subnet.subnet{{idx}}.id
+}
+
+output "subnet{{idx}}_name" {
+  description = "Name of Subnet {{idx}}"
+  value       = oci_core_subnet.subnet{{idx}}.display_name
+}
+{% endfragment %}
+{% endfor %}
+